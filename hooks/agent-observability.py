@@ -7,17 +7,25 @@ Sends agent telemetry data to OPTIMUS Command Center
 import os
 import sys
 import json
-import requests
 from datetime import datetime
 from pathlib import Path
 
-# OPTIMUS WebSocket server endpoint
-OPTIMUS_WS_URL = "http://localhost:3051"
+sys.path.insert(0, str(Path(__file__).parent / "utils"))
+from lazy_import import lazy_import
+
+# Only needed when telemetry is actually sent
+requests = lazy_import("requests")
+
+# OPTIMUS WebSocket server endpoint (e.g. http://localhost:3051); nothing is
+# sent, and requests is never loaded, unless POPKIT_OPTIMUS_URL is set
+OPTIMUS_WS_URL = os.environ.get("POPKIT_OPTIMUS_URL", "").rstrip("/")
 OPTIMUS_TELEMETRY_ENDPOINT = f"{OPTIMUS_WS_URL}/api/agent/activity"
 OPTIMUS_COLLABORATION_ENDPOINT = f"{OPTIMUS_WS_URL}/api/agent/collaboration"
 
 def send_to_optimus(endpoint, data):
     """Send data to OPTIMUS telemetry endpoint"""
+    if not OPTIMUS_WS_URL:
+        return False
     try:
         response = requests.post(
             endpoint,
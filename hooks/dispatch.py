@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Hook Dispatcher
+Single entry point per hook event. Reads the event payload once, runs every
+matching handler from hook_registry.json in-process (independent handlers in
+parallel threads) and merges their outputs into one hook response.
+
+Usage (from hooks.json, normally via hook_client.py):
+    python dispatch.py PostToolUse < payload.json
+    python dispatch.py --hooks-json      # Print hooks.json generated from the registry
+
+Handlers are ordinary hook scripts: each one is executed as __main__ with its
+own thread-local stdin/stdout/stderr, so scripts written for the one-process-
+per-hook protocol run unchanged.
+
+A thread cannot be stopped, so an in-process handler that overruns its
+timeout is reported as timed out but keeps running in the background.
+Handlers that may run long (quality-gate shells out to builds and tests) are
+marked "isolated" in the registry and run as a child process in their own
+process group instead, which is killed when the timeout expires.
+"""
+
+import io
+import os
+import re
+import sys
+import signal
+import subprocess
+import json
+import time
+import builtins
+import threading
+import traceback
+import importlib.machinery
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Set, Tuple
+
+HOOKS_DIR = Path(__file__).parent
+REGISTRY_PATH = HOOKS_DIR / "hook_registry.json"
+
+DEFAULT_TIMEOUT_MS = 5000
+
+# Events whose plain-text stdout is added to Claude's context
+CONTEXT_EVENTS = ("UserPromptSubmit", "SessionStart")
+
+# Higher rank wins when merging decisions
+DECISION_RANK = {"approve": 1, "allow": 1, "ask": 2, "deny": 3, "block": 3}
+
+
+@dataclass
+class HandlerSpec:
+    """One registered hook handler."""
+    name: str
+    script: str
+    matcher: str = ""
+    timeout: int = DEFAULT_TIMEOUT_MS
+    depends_on: List[str] = field(default_factory=list)
+    isolated: bool = False
+
+    def matches(self, tool_name: str) -> bool:
+        """Apply the hooks.json matcher semantics to a tool name."""
+        if self.matcher in ("", "*"):
+            return True
+        try:
+            return re.fullmatch(self.matcher, tool_name or "") is not None
+        except re.error:
+            return self.matcher == tool_name
+
+
+@dataclass
+class HandlerResult:
+    """Captured outcome of one handler run."""
+    name: str
+    exit_code: int
+    stdout: str = ""
+    stderr: str = ""
+    duration_ms: float = 0.0
+    timed_out: bool = False
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+def load_registry(path: Path = REGISTRY_PATH) -> Dict[str, List[HandlerSpec]]:
+    """Load event -> handler specs from the registry file."""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    registry = {}
+    for event, entries in config.get("events", {}).items():
+        registry[event] = [
+            HandlerSpec(
+                name=entry.get("name") or entry["script"][:-3],
+                script=entry["script"],
+                matcher=entry.get("matcher", ""),
+                timeout=entry.get("timeout", DEFAULT_TIMEOUT_MS),
+                depends_on=entry.get("depends_on", []),
+                isolated=entry.get("isolated", False),
+            )
+            for entry in entries
+        ]
+    return registry
+
+
+def union_matcher(handlers: List[HandlerSpec]) -> str:
+    """Smallest hooks.json matcher that covers every handler."""
+    names: List[str] = []
+    for handler in handlers:
+        if handler.matcher in ("", "*"):
+            return ""
+        for name in handler.matcher.split("|"):
+            if name not in names:
+                names.append(name)
+    return "|".join(names)
+
+
+def build_hooks_json(registry: Dict[str, List[HandlerSpec]]) -> Dict[str, Any]:
+    """Generate hooks.json with one dispatch command per event."""
+    events = {}
+    for event, handlers in registry.items():
+        events[event] = [{
+            "matcher": union_matcher(handlers),
+            "hooks": [{
+                "type": "command",
+                "command": f'python "${{CLAUDE_PLUGIN_ROOT}}/hooks/hook_client.py" dispatch.py {event}',
+                "timeout": max(h.timeout for h in handlers),
+            }]
+        }]
+    return {
+        "$schema": "https://claude.ai/schemas/hooks.json",
+        "description": "PopKit plugin hooks for orchestration, validation, and agent coordination",
+        "hooks": events,
+    }
+
+
+# =============================================================================
+# THREAD-LOCAL STDIO
+# =============================================================================
+
+class ThreadLocalStream:
+    """Stand-in for sys.stdin/stdout/stderr that routes per thread."""
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def bind(self, stream) -> None:
+        self._local.stream = stream
+
+    def unbind(self) -> None:
+        self._local.stream = None
+
+    @property
+    def current(self):
+        return getattr(self._local, "stream", None) or self._fallback
+
+    def write(self, s):
+        return self.current.write(s)
+
+    def read(self, *args):
+        return self.current.read(*args)
+
+    def readline(self, *args):
+        return self.current.readline(*args)
+
+    def readlines(self, *args):
+        return self.current.readlines(*args)
+
+    def flush(self):
+        return self.current.flush()
+
+    def isatty(self):
+        return False
+
+    def __iter__(self):
+        return iter(self.current)
+
+    def __getattr__(self, name):
+        return getattr(self.current, name)
+
+
+# =============================================================================
+# DISPATCHER
+# =============================================================================
+
+class HookDispatcher:
+    """Runs the registered handlers for one event and merges their output."""
+
+    def __init__(self, registry: Dict[str, List[HandlerSpec]], hooks_dir: Path = HOOKS_DIR):
+        self.registry = registry
+        self.hooks_dir = Path(hooks_dir)
+
+    def select(self, event: str, payload: Dict[str, Any]) -> List[HandlerSpec]:
+        """Handlers registered for an event that match the payload's tool."""
+        tool_name = payload.get("tool_name", "")
+        return [h for h in self.registry.get(event, []) if h.matches(tool_name)]
+
+    def load_code(self, script: str):
+        """Compile a handler script (bytecode is cached in __pycache__)."""
+        path = str(self.hooks_dir / script)
+        module_name = "popkit_hook_" + script[:-3].replace("-", "_")
+        return importlib.machinery.SourceFileLoader(module_name, path).get_code(module_name)
+
+    def run_handler(self, handler: HandlerSpec, raw_input: str) -> HandlerResult:
+        """Execute one handler script as __main__ on private stdio buffers."""
+        if handler.isolated:
+            return self.run_isolated(handler, raw_input)
+        stdin, stdout, stderr = io.StringIO(raw_input), io.StringIO(), io.StringIO()
+        sys.stdin.bind(stdin)
+        sys.stdout.bind(stdout)
+        sys.stderr.bind(stderr)
+
+        start = time.perf_counter()
+        exit_code = 0
+        try:
+            code = self.load_code(handler.script)
+            exec(code, {
+                "__name__": "__main__",
+                "__file__": str(self.hooks_dir / handler.script),
+                "__builtins__": builtins,
+            })
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                print(e.code, file=stderr)
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc(file=stderr)
+            exit_code = 1
+        finally:
+            # A handler that outlived its timeout may finish after the caller
+            # has put the real streams back
+            for stream in (sys.stdin, sys.stdout, sys.stderr):
+                if isinstance(stream, ThreadLocalStream):
+                    stream.unbind()
+
+        return HandlerResult(
+            name=handler.name,
+            exit_code=exit_code,
+            stdout=stdout.getvalue(),
+            stderr=stderr.getvalue(),
+            duration_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def run_isolated(self, handler: HandlerSpec, raw_input: str) -> HandlerResult:
+        """Run a handler script in a child process, killed on timeout."""
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, str(self.hooks_dir / handler.script)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, start_new_session=hasattr(os, "killpg"),
+        )
+        try:
+            stdout, stderr = proc.communicate(raw_input, timeout=handler.timeout / 1000)
+        except subprocess.TimeoutExpired:
+            # Kill the whole group so builds and test runners it spawned stop too
+            if hasattr(os, "killpg"):
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except OSError:
+                    pass
+            proc.kill()
+            stdout, stderr = proc.communicate()
+            return HandlerResult(
+                name=handler.name, exit_code=1, timed_out=True,
+                stderr=f"{handler.name} timed out after {handler.timeout}ms\n",
+                duration_ms=(time.perf_counter() - start) * 1000,
+            )
+        return HandlerResult(
+            name=handler.name,
+            exit_code=proc.returncode,
+            stdout=stdout,
+            stderr=stderr,
+            duration_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def run(self, handlers: List[HandlerSpec], raw_input: str) -> List[HandlerResult]:
+        """
+        Run handlers concurrently, honouring depends_on and per-handler timeouts.
+
+        A timed-out in-process handler is marked and left running in its
+        daemon thread; isolated handlers are killed by run_isolated. Handlers
+        that depend on a timed-out handler are skipped, never started early.
+
+        Returns:
+            Results in registry order (timed-out handlers are marked, not awaited)
+        """
+        if not handlers:
+            return []
+
+        _install_thread_local_stdio()
+        names = {h.name for h in handlers}
+        done = {h.name: threading.Event() for h in handlers}
+        started: Dict[str, float] = {}
+        results: Dict[str, HandlerResult] = {}
+        abandoned: Set[str] = set()  # Timed out, or skipped because of one
+        cond = threading.Condition()
+
+        def worker(handler: HandlerSpec) -> None:
+            for dep in handler.depends_on:
+                if dep in names:
+                    done[dep].wait()
+            with cond:
+                if handler.name in results:
+                    return  # Skipped: a dependency timed out
+                started[handler.name] = time.monotonic()
+            result = self.run_handler(handler, raw_input)
+            with cond:
+                results.setdefault(handler.name, result)
+                done[handler.name].set()
+                cond.notify_all()
+
+        for handler in handlers:
+            threading.Thread(target=worker, args=(handler,), daemon=True,
+                             name=f"hook-{handler.name}").start()
+
+        with cond:
+            while len(results) < len(handlers):
+                now = time.monotonic()
+                next_deadline = None
+                for handler in handlers:
+                    if handler.name in results or handler.name not in started:
+                        continue
+                    deadline = started[handler.name] + handler.timeout / 1000
+                    if now >= deadline:
+                        # done stays unset until the handler really finishes
+                        results[handler.name] = HandlerResult(
+                            name=handler.name, exit_code=1, timed_out=True,
+                            stderr=f"{handler.name} timed out after {handler.timeout}ms\n",
+                            duration_ms=handler.timeout,
+                        )
+                        abandoned.add(handler.name)
+                        _skip_dependents(handlers, results, started, abandoned)
+                    elif next_deadline is None or deadline < next_deadline:
+                        next_deadline = deadline
+                if len(results) < len(handlers):
+                    cond.wait(timeout=(next_deadline - now) if next_deadline else 0.05)
+
+        return [results[h.name] for h in handlers]
+
+
+def _skip_dependents(handlers: List[HandlerSpec], results: Dict[str, HandlerResult],
+                     started: Dict[str, float], abandoned: Set[str]) -> None:
+    """Mark not-yet-started handlers that (transitively) depend on an abandoned one."""
+    changed = True
+    while changed:
+        changed = False
+        for handler in handlers:
+            if handler.name in results or handler.name in started:
+                continue
+            dep = next((d for d in handler.depends_on if d in abandoned), None)
+            if dep is not None:
+                results[handler.name] = HandlerResult(
+                    name=handler.name, exit_code=1,
+                    stderr=f"{handler.name} skipped: {dep} did not finish\n",
+                )
+                abandoned.add(handler.name)
+                changed = True
+
+
+def _install_thread_local_stdio() -> None:
+    """Swap sys stdio for per-thread routers (idempotent)."""
+    for name in ("stdin", "stdout", "stderr"):
+        stream = getattr(sys, name)
+        if not isinstance(stream, ThreadLocalStream):
+            setattr(sys, name, ThreadLocalStream(stream))
+
+
+# =============================================================================
+# OUTPUT MERGING
+# =============================================================================
+
+def _stricter(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """Pick the more restrictive of two decisions."""
+    if DECISION_RANK.get(new, 0) > DECISION_RANK.get(current, 0):
+        return new
+    return current
+
+
+def _join(current: Optional[str], new: Optional[str], sep: str = "\n") -> Optional[str]:
+    """Join two optional messages, skipping empties and duplicates."""
+    if not new or new == current:
+        return current
+    if not current:
+        return new
+    return f"{current}{sep}{new}"
+
+
+def merge_json_outputs(outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge hook JSON responses in registry order.
+
+    Decisions take the most restrictive value, `continue` is AND-ed, messages
+    and additionalContext are concatenated, lists are extended, and any other
+    key keeps the first non-null value.
+    """
+    merged: Dict[str, Any] = {}
+    for output in outputs:
+        for key, value in output.items():
+            current = merged.get(key)
+            if key == "decision":
+                merged[key] = _stricter(current, value)
+            elif key == "continue":
+                merged[key] = value if current is None else (current and value)
+            elif key in ("reason", "stopReason", "systemMessage"):
+                merged[key] = _join(current, value)
+            elif key == "hookSpecificOutput" and isinstance(value, dict):
+                specific = dict(current or {})
+                for sub_key, sub_value in value.items():
+                    if sub_key == "permissionDecision":
+                        specific[sub_key] = _stricter(specific.get(sub_key), sub_value)
+                    elif sub_key in ("additionalContext", "permissionDecisionReason"):
+                        specific[sub_key] = _join(specific.get(sub_key), sub_value, "\n\n")
+                    elif specific.get(sub_key) is None:
+                        specific[sub_key] = sub_value
+                merged[key] = specific
+            elif current is None:
+                merged[key] = value
+            elif isinstance(current, list) and isinstance(value, list):
+                merged[key] = current + value
+    return merged
+
+
+def merge_results(event: str, results: List[HandlerResult]) -> Tuple[str, str, int]:
+    """
+    Combine handler results into one (stdout, stderr, exit code).
+
+    Exit code 2 (blocking) wins, then the first other non-zero code.
+    """
+    json_outputs = []
+    texts = []
+    stderr_parts = []
+    exit_code = 0
+
+    for result in results:
+        if result.stderr:
+            stderr_parts.append(result.stderr if result.stderr.endswith("\n") else result.stderr + "\n")
+        if result.exit_code == 2 or (result.exit_code and not exit_code):
+            exit_code = result.exit_code
+
+        text = result.stdout.strip()
+        if not text:
+            continue
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            json_outputs.append(parsed)
+        else:
+            texts.append(text)
+
+    if not json_outputs:
+        return "\n".join(texts), "".join(stderr_parts), exit_code
+
+    merged = merge_json_outputs(json_outputs)
+    if texts:
+        if event in CONTEXT_EVENTS:
+            specific = merged.setdefault("hookSpecificOutput", {})
+            specific.setdefault("hookEventName", event)
+            specific["additionalContext"] = _join(
+                specific.get("additionalContext"), "\n".join(texts), "\n\n"
+            )
+        else:
+            stderr_parts.extend(t + "\n" for t in texts)
+    return json.dumps(merged), "".join(stderr_parts), exit_code
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def main():
+    """Main entry point - JSON stdin/stdout protocol"""
+    if len(sys.argv) < 2:
+        print("usage: dispatch.py <Event> | --hooks-json", file=sys.stderr)
+        sys.exit(2)
+
+    registry = load_registry()
+
+    if sys.argv[1] == "--hooks-json":
+        print(json.dumps(build_hooks_json(registry), indent=2))
+        return
+
+    event = sys.argv[1]
+    raw_input = sys.stdin.read()
+    try:
+        payload = json.loads(raw_input) if raw_input.strip() else {}
+    except json.JSONDecodeError:
+        payload = {}  # Let handlers report the bad input themselves
+
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    dispatcher = HookDispatcher(registry)
+    results = dispatcher.run(dispatcher.select(event, payload), raw_input)
+    stdout, stderr, exit_code = merge_results(event, results)
+
+    if stderr:
+        real_stderr.write(stderr)
+    if stdout:
+        real_stdout.write(stdout + "\n")
+    real_stdout.flush()
+    real_stderr.flush()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Hook Client Shim
+Runs a PopKit hook through the warm hook daemon, falling back to in-process
+execution when the daemon is unavailable.
+
+Usage (from hooks.json):
+    python hook_client.py pre-tool-use.py [args...]
+
+The shim hands its own stdin/stdout/stderr file descriptors to the daemon,
+so the hook reads and writes the caller's streams directly and the exit code
+is passed straight through. Stdlib only; keep imports minimal - this file
+runs on every tool call.
+
+The request carries the caller's environment (API keys included) and
+stdio, so it is only sent to a socket in a directory owned by this user with
+mode 0700, served by a process running as this user. Anything else falls
+back to in-process execution.
+
+Environment:
+    POPKIT_HOOK_DAEMON=0   Disable the daemon (always run in-process)
+    POPKIT_HOOKD_DIR       Directory for daemon sockets and locks
+                           (default: $XDG_RUNTIME_DIR/popkit-hookd, else
+                           $TMPDIR/popkit-hookd-<uid>)
+"""
+
+import os
+import sys
+import json
+import stat
+import socket
+import struct
+import hashlib
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Env vars that hook modules read at import time; the daemon is keyed on them
+# so a warm process never serves a session with different configuration.
+CONFIG_ENV_PREFIXES = ("POPKIT_", "UPSTASH_", "VOYAGE_", "CLAUDE_PLUGIN_ROOT")
+
+CONNECT_TIMEOUT = 0.05
+DEFAULT_HOOK_TIMEOUT = 600
+
+# Daemon reply meaning "not run, stdin untouched": the daemon is outdated and
+# exiting, so the caller runs the hook itself.
+NOT_SERVED = -2 ** 31
+
+
+def daemon_enabled() -> bool:
+    """Whether the daemon can be used on this platform and configuration."""
+    if os.environ.get("POPKIT_HOOK_DAEMON", "1").lower() in ("0", "false", "off"):
+        return False
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds") and hasattr(os, "fork")
+
+
+def runtime_dir() -> str:
+    """Per-user directory holding daemon sockets."""
+    base = os.environ.get("POPKIT_HOOKD_DIR")
+    if base:
+        return base
+    xdg = os.environ.get("XDG_RUNTIME_DIR")
+    if xdg:
+        return os.path.join(xdg, "popkit-hookd")
+    tmp = os.environ.get("TMPDIR", "/tmp")
+    return os.path.join(tmp, f"popkit-hookd-{os.getuid()}")
+
+
+def is_private_dir(path: str) -> bool:
+    """Whether `path` is a real directory owned by this user with mode 0700."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid()
+            and stat.S_IMODE(st.st_mode) == 0o700)
+
+
+def ensure_runtime_dir() -> bool:
+    """
+    Create the runtime directory if needed and verify it is ours.
+
+    Returns:
+        False if the directory cannot be created or was not created by this
+        user (e.g. another local user claimed the predictable path first)
+    """
+    path = runtime_dir()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        os.mkdir(path, 0o700)
+        os.chmod(path, 0o700)  # mkdir's mode is filtered through the umask
+    except FileExistsError:
+        pass
+    except OSError:
+        return False
+    return is_private_dir(path)
+
+
+def peer_is_owner(sock: socket.socket) -> bool:
+    """Whether the process at the other end of a Unix socket runs as this user."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True  # No peer credentials here; the private directory is the check
+    try:
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    except OSError:
+        return False
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+
+def daemon_key(hooks_dir: str = HOOKS_DIR) -> str:
+    """Identify the daemon for this plugin checkout and configuration."""
+    config = sorted(
+        (k, v) for k, v in os.environ.items()
+        if k.startswith(CONFIG_ENV_PREFIXES) and k != "POPKIT_HOOK_DAEMON"
+    )
+    payload = json.dumps([hooks_dir, sys.executable, config])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def socket_path(hooks_dir: str = HOOKS_DIR) -> str:
+    """Unix socket path for this plugin's daemon."""
+    return os.path.join(runtime_dir(), f"{daemon_key(hooks_dir)}.sock")
+
+
+def run_via_daemon(hook_name: str, args: list):
+    """
+    Ask the daemon to run a hook on our stdio.
+
+    Returns:
+        Hook exit code, or None if the daemon could not be reached or declined
+        the request (stdin is untouched in that case, so the caller can still
+        run in-process)
+    """
+    if not is_private_dir(runtime_dir()):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        return None
+    if not peer_is_owner(sock):
+        sock.close()
+        return None
+
+    header = json.dumps({
+        "hook": hook_name,
+        "argv": args,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "timeout": DEFAULT_HOOK_TIMEOUT,
+    }).encode()
+
+    try:
+        sock.settimeout(None)
+        socket.send_fds(sock, [struct.pack("!I", len(header)) + header], [0, 1, 2])
+
+        reply = b""
+        while len(reply) < 4:
+            chunk = sock.recv(4 - len(reply))
+            if not chunk:
+                break
+            reply += chunk
+    except OSError:
+        reply = b""
+    finally:
+        sock.close()
+
+    if len(reply) < 4:
+        # The daemon took the request but died; our stdin may be consumed.
+        print(f"popkit hook daemon dropped {hook_name}", file=sys.stderr)
+        return 1
+    (exit_code,) = struct.unpack("!i", reply)
+    return None if exit_code == NOT_SERVED else exit_code
+
+
+def spawn_daemon() -> None:
+    """Start the daemon in the background for subsequent calls."""
+    import subprocess
+
+    directory = runtime_dir()
+    if os.path.lexists(directory) and not is_private_dir(directory):
+        return  # The daemon would refuse this directory too
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.join(HOOKS_DIR, "hook_daemon.py"), "serve"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        pass
+
+
+def run_in_process(hook_name: str, args: list) -> None:
+    """Execute the hook script in this interpreter as __main__."""
+    import runpy
+
+    hook_path = os.path.join(HOOKS_DIR, hook_name)
+    sys.argv = [hook_path] + args
+    sys.path.insert(0, HOOKS_DIR)
+    runpy.run_path(hook_path, run_name="__main__")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: hook_client.py <hook-script.py> [args...]", file=sys.stderr)
+        sys.exit(2)
+
+    hook_name = sys.argv[1]
+    args = sys.argv[2:]
+
+    if os.path.basename(hook_name) != hook_name or not hook_name.endswith(".py"):
+        print(f"Invalid hook name: {hook_name}", file=sys.stderr)
+        sys.exit(2)
+
+    if daemon_enabled():
+        code = run_via_daemon(hook_name, args)
+        if code is not None:
+            sys.exit(code)
+        spawn_daemon()
+
+    run_in_process(hook_name, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Hook Daemon
+Long-lived local hook server that keeps PopKit hooks warm.
+
+Every hook in hooks.json used to start a fresh interpreter and re-import
+requests, sqlite3 and the hooks/utils modules on each tool call. The daemon
+imports the hooks/utils modules the registered hooks use once (hook bodies
+themselves only run in children), then forks a child per request: the child
+inherits the warm modules, takes over the client's stdin/stdout/stderr (passed
+over the Unix socket) and runs the hook script as __main__ exactly as the
+interpreter would. Forking keeps hooks isolated from each other (sys.exit,
+os.environ, cwd and module globals never leak between calls).
+
+Warm modules go stale when the plugin is updated, so the daemon records the
+newest mtime in the hooks tree at startup. Once that changes it declines the
+next request (the client runs it in-process) and exits; the client then
+starts a fresh daemon.
+
+Usage:
+    python hook_daemon.py serve     # Run in foreground (hook_client.py spawns this)
+    python hook_daemon.py status    # Print daemon status as JSON
+    python hook_daemon.py stop      # Stop the daemon for this plugin checkout
+
+Environment:
+    POPKIT_HOOKD_IDLE      Seconds of inactivity before exiting (default 1800)
+"""
+
+import os
+import re
+import sys
+import ast
+import json
+import time
+import errno
+import fcntl
+import select
+import signal
+import socket
+import struct
+import importlib
+import traceback
+import importlib.util
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / "utils"))
+
+from hook_client import (
+    HOOKS_DIR, NOT_SERVED, ensure_runtime_dir, is_private_dir, peer_is_owner,
+    runtime_dir, socket_path
+)
+from lazy_import import is_loaded
+
+DEFAULT_IDLE_TIMEOUT = 1800
+MAX_HEADER_SIZE = 1024 * 1024
+
+
+def registered_hooks(hooks_json: Path) -> List[str]:
+    """List hook script names referenced by hooks.json and the dispatch registry."""
+    try:
+        config = json.loads(hooks_json.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+    names = []
+    for matchers in config.get("hooks", {}).values():
+        for matcher in matchers:
+            for hook in matcher.get("hooks", []):
+                for name in re.findall(r"([\w\-]+\.py)", hook.get("command", "")):
+                    if name not in ("hook_client.py", "hook_daemon.py") and name not in names:
+                        names.append(name)
+
+    if "dispatch.py" in names:
+        try:
+            registry = json.loads((hooks_json.parent / "hook_registry.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            registry = {}
+        for handlers in registry.get("events", {}).values():
+            for handler in handlers:
+                if handler.get("script") and handler["script"] not in names:
+                    names.append(handler["script"])
+    return names
+
+
+def hooks_tree_stamp(hooks_dir: Path) -> float:
+    """Newest mtime of the hook scripts, configs and hooks/utils modules."""
+    newest = 0.0
+    paths = list(hooks_dir.glob("*.py")) + list(hooks_dir.glob("*.json"))
+    paths += [p for p in (hooks_dir / "utils").rglob("*.py") if "__pycache__" not in p.parts]
+    for path in paths:
+        try:
+            newest = max(newest, path.stat().st_mtime)
+        except OSError:
+            pass
+    return newest
+
+
+def imported_modules(source: bytes) -> List[str]:
+    """Module names a hook imports, including ones deferred with lazy_import()."""
+    names: List[str] = []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            found = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            found = [node.module]
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+              and node.func.id == "lazy_import" and node.args
+              and isinstance(node.args[0], ast.Constant)
+              and isinstance(node.args[0].value, str)):
+            found = [node.args[0].value]
+        else:
+            continue
+        names.extend(name for name in found if name not in names)
+    return names
+
+
+class HookDaemon:
+    """Pre-forking hook server bound to one plugin checkout."""
+
+    def __init__(self, hooks_dir: str = HOOKS_DIR, idle_timeout: Optional[int] = None):
+        self.hooks_dir = Path(hooks_dir)
+        self.socket_path = Path(socket_path(str(hooks_dir)))
+        self.lock_path = self.socket_path.with_suffix(".lock")
+        self.idle_timeout = idle_timeout or int(
+            os.environ.get("POPKIT_HOOKD_IDLE", DEFAULT_IDLE_TIMEOUT)
+        )
+        # hook name -> (mtime, compiled code)
+        self.scripts: Dict[str, Tuple[float, Any]] = {}
+        self.requests_served = 0
+        self.started_at = time.time()
+        self.tree_stamp = 0.0
+        self.lock_file = None
+
+    # =========================================================================
+    # HOOK LOADING
+    # =========================================================================
+
+    def load_script(self, name: str) -> Optional[Any]:
+        """Compile a hook script, recompiling if it changed on disk."""
+        path = self.hooks_dir / name
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return None
+
+        cached = self.scripts.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        code = compile(path.read_bytes(), str(path), "exec")
+        self.scripts[name] = (mtime, code)
+        return code
+
+    def is_utils_module(self, name: str) -> bool:
+        """Whether `name` resolves to a module under hooks/utils."""
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            return False
+        utils_dir = str(self.hooks_dir / "utils") + os.sep
+        return bool(spec and spec.origin and spec.origin.startswith(utils_dir))
+
+    def preload(self) -> None:
+        """Compile every registered hook and import the hooks/utils modules it uses.
+
+        Hook bodies are not executed here: module-level side effects belong
+        to the child serving a request, with the client's cwd and environment.
+        """
+        modules: List[str] = []
+        for name in registered_hooks(self.hooks_dir / "hooks.json"):
+            try:
+                if self.load_script(name) is None:
+                    continue
+                source = (self.hooks_dir / name).read_bytes()
+                modules.extend(m for m in imported_modules(source) if m not in modules)
+            except (OSError, SyntaxError, ValueError):
+                # A broken hook must not take the daemon down; it will
+                # surface its error to the client when actually invoked.
+                pass
+
+        for module_name in modules:
+            if not self.is_utils_module(module_name):
+                continue
+            try:
+                importlib.import_module(module_name)
+            except BaseException:
+                pass
+
+        # Hooks defer heavy imports with lazy_import; resolve them here so
+        # forked children inherit loaded modules instead of loading per call.
+        for module in list(sys.modules.values()):
+            if module is not None and not is_loaded(module):
+                try:
+                    module.__dict__
+                except BaseException:
+                    pass
+
+    # =========================================================================
+    # SERVER
+    # =========================================================================
+
+    def acquire_lock(self):
+        """Hold an exclusive lock for the daemon's lifetime (one per socket)."""
+        lock_file = open(self.lock_path, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def serve(self) -> int:
+        """Run until idle timeout or SIGTERM."""
+        if not ensure_runtime_dir():
+            print(f"refusing insecure hook daemon directory: {runtime_dir()}", file=sys.stderr)
+            return 1
+        self.lock_file = self.acquire_lock()
+        if self.lock_file is None:
+            return 0  # Another daemon already serves this checkout
+
+        self.tree_stamp = hooks_tree_stamp(self.hooks_dir)
+        self.preload()
+
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        server.listen(64)
+
+        # Children report back over their own connection; let the kernel reap them.
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+        last_activity = time.time()
+        try:
+            while True:
+                ready, _, _ = select.select([server], [], [], 5.0)
+                if not ready:
+                    if time.time() - last_activity > self.idle_timeout or self.is_outdated():
+                        break
+                    continue
+
+                try:
+                    conn, _ = server.accept()
+                except OSError as e:
+                    if e.errno == errno.EINTR:
+                        continue
+                    raise
+
+                last_activity = time.time()
+                self.handle_connection(conn)
+                if self.lock_file is None:
+                    break
+        finally:
+            server.close()
+            self.retire()
+        return 0
+
+    def is_outdated(self) -> bool:
+        """Whether the hooks tree changed since this daemon loaded it."""
+        return hooks_tree_stamp(self.hooks_dir) != self.tree_stamp
+
+    def retire(self) -> None:
+        """Remove the socket and release the lock so a fresh daemon can start."""
+        if self.lock_file is None:
+            return
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+        self.lock_file.close()
+        self.lock_file = None
+
+    def handle_connection(self, conn: socket.socket) -> None:
+        """Read a request and fork a child to run it."""
+        fds: List[int] = []
+        try:
+            if not peer_is_owner(conn):
+                return
+            conn.settimeout(2.0)
+            data, fds, _, _ = socket.recv_fds(conn, MAX_HEADER_SIZE + 4, 3)
+            if len(data) < 4:
+                return
+            (size,) = struct.unpack("!I", data[:4])
+            body = data[4:]
+            while len(body) < size:
+                chunk = conn.recv(size - len(body))
+                if not chunk:
+                    return
+                body += chunk
+            request = json.loads(body)
+
+            if request.get("command") == "status":
+                conn.sendall(json.dumps(self.status()).encode())
+                return
+            if request.get("command") == "stop":
+                conn.sendall(b"{}")
+                raise SystemExit(0)
+
+            if len(fds) != 3:
+                return
+
+            if self.is_outdated():
+                # Warm utils modules predate the update. Retire before
+                # replying so the daemon the client spawns can take over.
+                self.retire()
+                conn.sendall(struct.pack("!i", NOT_SERVED))
+                return
+
+            code = self.load_script(request["hook"])
+            if code is None:
+                conn.sendall(struct.pack("!i", 127))
+                return
+
+            self.requests_served += 1
+            pid = os.fork()
+            if pid == 0:
+                self.run_child(conn, request, fds, code)  # Never returns
+        except (OSError, ValueError, KeyError, SyntaxError):
+            pass
+        finally:
+            for fd in fds:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            conn.close()
+
+    def run_child(self, conn: socket.socket, request: Dict[str, Any],
+                  fds: List[int], code: Any) -> None:
+        """Run one hook as __main__ on the client's stdio, then exit."""
+        exit_code = 1
+        try:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+            for target, fd in zip((0, 1, 2), fds):
+                os.dup2(fd, target)
+
+            os.environ.clear()
+            os.environ.update(request.get("env", {}))
+            os.chdir(request.get("cwd") or os.getcwd())
+
+            hook_path = str(self.hooks_dir / request["hook"])
+            sys.argv = [hook_path] + list(request.get("argv", []))
+            signal.alarm(int(request.get("timeout", 0)))
+
+            try:
+                exec(code, {"__name__": "__main__", "__file__": hook_path,
+                            "__builtins__": __builtins__})
+                exit_code = 0
+            except SystemExit as e:
+                if e.code is None:
+                    exit_code = 0
+                elif isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            except Exception:
+                pass
+            try:
+                conn.sendall(struct.pack("!i", exit_code))
+            except OSError:
+                pass
+            os._exit(0)
+
+    def status(self) -> Dict[str, Any]:
+        """Describe this daemon."""
+        return {
+            "pid": os.getpid(),
+            "hooks_dir": str(self.hooks_dir),
+            "socket": str(self.socket_path),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests_served": self.requests_served,
+            "hooks_loaded": sorted(self.scripts),
+        }
+
+
+# =============================================================================
+# CONTROL
+# =============================================================================
+
+def send_command(command: str) -> Optional[Dict[str, Any]]:
+    """Send a control command to the running daemon."""
+    if not is_private_dir(runtime_dir()):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(2.0)
+        sock.connect(socket_path())
+        if not peer_is_owner(sock):
+            return None
+        payload = json.dumps({"command": command}).encode()
+        sock.sendall(struct.pack("!I", len(payload)) + payload)
+        data = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+        return json.loads(data) if data else {}
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+
+    if command == "serve":
+        # Detach from whatever stdio we were launched with
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.close(devnull)
+        sys.exit(HookDaemon().serve())
+
+    elif command == "status":
+        status = send_command("status")
+        print(json.dumps(status or {"running": False, "socket": socket_path()}, indent=2))
+        sys.exit(0 if status else 1)
+
+    elif command == "stop":
+        stopped = send_command("stop") is not None
+        print(json.dumps({"stopped": stopped}))
+
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        print("usage: hook_daemon.py [serve|status|stop]", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
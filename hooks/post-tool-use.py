@@ -5,43 +5,31 @@ Logging, metrics collection, agent communication, and follow-up orchestration
 Analyzes tool results and coordinates next steps in multi-agent workflows
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import json
 import re
-import requests
-import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
+sys.path.insert(0, str(Path(__file__).parent / "utils"))
+from lazy_import import available, lazy_import
+
+# Heavy modules load on first use, so Read/Grep calls never pay for them
+requests = lazy_import("requests")
+sqlite3 = lazy_import("sqlite3")
+
 # Import project activity tracking
-try:
-    from utils.project_client import ProjectClient, ProjectActivity
-    HAS_PROJECT_CLIENT = True
-except ImportError:
-    HAS_PROJECT_CLIENT = False
+project_client = lazy_import("project_client")
 
 # Import skill state tracker for AskUserQuestion enforcement (Issue #159)
-sys.path.insert(0, str(Path(__file__).parent / "utils"))
-try:
-    from skill_state import get_tracker, SkillStateTracker
-    SKILL_STATE_AVAILABLE = True
-except ImportError:
-    SKILL_STATE_AVAILABLE = False
+skill_state = lazy_import("skill_state")
 
 # Import workflow response router (Issue #206)
-try:
-    from response_router import (
-        route_user_response,
-        should_route_response,
-        format_hook_output,
-        get_workflow_status,
-        get_pending_decision
-    )
-    WORKFLOW_ROUTER_AVAILABLE = True
-except ImportError:
-    WORKFLOW_ROUTER_AVAILABLE = False
+response_router = lazy_import("response_router")
 
 # Import test telemetry for sandbox testing (Issue #226)
 try:
@@ -49,24 +37,28 @@ try:
         is_test_mode, get_test_session_id,
         create_trace, create_decision, create_event
     )
-    from local_telemetry import (
-        get_local_storage,
-        log_trace_if_test_mode, log_decision_if_test_mode, log_event_if_test_mode
-    )
-    TEST_TELEMETRY_AVAILABLE = True
+    local_telemetry = lazy_import("local_telemetry")
 except ImportError:
-    TEST_TELEMETRY_AVAILABLE = False
+    local_telemetry = None
     # Define stubs when not available
     def is_test_mode(): return False
     def get_test_session_id(): return None
 
+def service_endpoint(env_var: str, path: str) -> Optional[str]:
+    """URL of a local PopKit service endpoint, or None if it is not configured."""
+    base_url = os.environ.get(env_var, "").rstrip("/")
+    return f"{base_url}{path}" if base_url else None
+
+
 class PostToolUseHook:
     def __init__(self):
         self.claude_dir = Path.home() / '.claude'
         self.config_dir = self.claude_dir / 'config'
         self.session_id = self.get_session_id()
-        self.observability_endpoint = "http://localhost:8001/events"
-        self.orchestrator_endpoint = "http://localhost:8005/followup"
+        # The local observability and orchestrator services are opt-in: with
+        # the variables unset no request is made and requests is never loaded
+        self.observability_endpoint = service_endpoint("POPKIT_OBSERVABILITY_URL", "/events")
+        self.orchestrator_endpoint = service_endpoint("POPKIT_ORCHESTRATOR_URL", "/followup")
         
         # Load configuration
         self.followup_rules = self.load_followup_rules()
@@ -423,6 +415,8 @@ class PostToolUseHook:
     
     def log_post_tool_event(self, tool_name: str, tool_args: Dict[str, Any], tool_result: Any, analysis: Dict[str, Any]):
         """Log post-tool-use event to observability system"""
+        if not self.observability_endpoint:
+            return
         try:
             event_data = {
                 "timestamp": datetime.now().isoformat(),
@@ -475,6 +469,8 @@ class PostToolUseHook:
     
     def request_followup_orchestration(self, tool_name: str, analysis: Dict[str, Any], followup_agents: List[str]) -> Optional[Dict]:
         """Request follow-up orchestration from orchestrator service"""
+        if not self.orchestrator_endpoint:
+            return None
         try:
             orchestration_data = {
                 "session_id": self.session_id,
@@ -575,10 +571,10 @@ class PostToolUseHook:
         Returns:
             Dict with pending decision info if any
         """
-        if not SKILL_STATE_AVAILABLE:
+        if not available(skill_state):
             return {"has_pending": False}
 
-        tracker = get_tracker()
+        tracker = skill_state.get_tracker()
 
         # Skip check for AskUserQuestion tool (it's being used, that's good)
         if tool_name == "AskUserQuestion":
@@ -669,18 +665,18 @@ class PostToolUseHook:
 
     def record_cloud_activity(self, tool_name: str, followup_agents: List[str]):
         """Record tool usage activity in PopKit Cloud for cross-project observability."""
-        if not HAS_PROJECT_CLIENT:
+        if not available(project_client):
             return
 
         try:
-            client = ProjectClient()
+            client = project_client.ProjectClient()
             if not client.is_available:
                 return
 
             # Extract agent name from follow-up agents (if any)
             agent_name = followup_agents[0] if followup_agents else None
 
-            activity = ProjectActivity(
+            activity = project_client.ProjectActivity(
                 tool_name=tool_name,
                 agent_name=agent_name
             )
@@ -703,16 +699,16 @@ class PostToolUseHook:
         Returns:
             Dict with routing result and any guidance for next steps
         """
-        if not WORKFLOW_ROUTER_AVAILABLE:
+        if not available(response_router):
             return {"routed": False, "reason": "workflow_router_unavailable"}
 
         # Only route AskUserQuestion responses
-        if not should_route_response(tool_name):
+        if not response_router.should_route_response(tool_name):
             return {"routed": False, "reason": "not_ask_user_question"}
 
         try:
             # Route the response to the workflow
-            result = route_user_response(tool_output)
+            result = response_router.route_user_response(tool_output)
 
             if result.routed:
                 return {
@@ -782,7 +778,7 @@ class PostToolUseHook:
         Returns:
             True if telemetry was captured
         """
-        if not TEST_TELEMETRY_AVAILABLE or not is_test_mode():
+        if not is_test_mode() or not available(local_telemetry):
             return False
 
         try:
@@ -796,7 +792,7 @@ class PostToolUseHook:
                 error=error
             )
 
-            return log_trace_if_test_mode(trace)
+            return local_telemetry.log_trace_if_test_mode(trace)
         except Exception:
             # Never block tool execution for telemetry failures
             return False
@@ -821,7 +817,7 @@ class PostToolUseHook:
         Returns:
             True if telemetry was captured
         """
-        if not TEST_TELEMETRY_AVAILABLE or not is_test_mode():
+        if not is_test_mode() or not available(local_telemetry):
             return False
 
         try:
@@ -833,7 +829,7 @@ class PostToolUseHook:
                 context=context
             )
 
-            return log_decision_if_test_mode(decision)
+            return local_telemetry.log_decision_if_test_mode(decision)
         except Exception:
             return False
 
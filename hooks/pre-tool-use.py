@@ -5,54 +5,116 @@ Safety checks, agent coordination, and orchestration before tool execution
 Prevents dangerous operations and coordinates multi-agent workflows
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import json
-import re
-import requests
-import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
-# Import premium checker
 sys.path.insert(0, str(Path(__file__).parent / "utils"))
-try:
-    from premium_checker import (
-        check_entitlement,
-        is_premium_feature,
-        get_upgrade_prompt_options,
-        check_rate_limit,
-        format_rate_limit_message,
-        RateLimitResult,
-        is_billing_live,
-        capture_waitlist_email
-    )
-    PREMIUM_CHECKER_AVAILABLE = True
-except ImportError:
-    PREMIUM_CHECKER_AVAILABLE = False
+from lazy_import import available, lazy_import
+
+# Heavy modules load on first use, so Read/Grep calls never pay for them
+requests = lazy_import("requests")
+sqlite3 = lazy_import("sqlite3")
+
+# Import premium checker
+premium_checker = lazy_import("premium_checker")
 
 # Import skill state tracker for AskUserQuestion enforcement (Issue #159)
-try:
-    from skill_state import get_tracker, SkillStateTracker
-    SKILL_STATE_AVAILABLE = True
-except ImportError:
-    SKILL_STATE_AVAILABLE = False
+skill_state = lazy_import("skill_state")
+
+# Precompiled safety rule matcher (only loaded for Bash/Write/Edit calls)
+safety_matcher = lazy_import("safety_matcher")
 
 # Import tool filter for context optimization (Issue #275)
-try:
-    from tool_filter import ToolFilter, filter_tools_for_workflow
-    TOOL_FILTER_AVAILABLE = True
-except ImportError:
-    TOOL_FILTER_AVAILABLE = False
+tool_filter = lazy_import("tool_filter")
+
+# Safety and coordination rules are static; build them once per process
+# (and once per hook daemon) rather than on every PreToolUseHook().
+SAFETY_RULES: Dict[str, List[str]] = {
+    "blocked_commands": [
+        r"rm\s+-rf\s+/",
+        r"sudo\s+rm\s+-rf",
+        r"format\s+c:",
+        r"del\s+/s\s+/q\s+c:",
+        r"DROP\s+DATABASE",
+        r"TRUNCATE\s+TABLE",
+        r"chmod\s+777",
+        r"chown\s+root",
+        r"dd\s+if=/dev/zero",
+        r":(){ :|:& };:",  # Fork bomb
+    ],
+    "sensitive_paths": [
+        r"\/etc\/passwd",
+        r"\/etc\/shadow",
+        r"\/root\/",
+        r"\/boot\/",
+        r"C:\\Windows\\System32",
+        r"C:\\Program Files",
+        r"\.ssh\/id_rsa",
+        r"\.aws\/credentials",
+        r"\.env",
+    ],
+    "dangerous_tools": [
+        "Bash:rm -rf",
+        "Bash:sudo",
+        "Bash:chmod 777",
+        "Write:/etc/",
+        "Write:/root/",
+        "Edit:/etc/",
+    ]
+}
+
+SAFETY_MESSAGES = {
+    "blocked_commands": "Blocked dangerous command: ",
+    "sensitive_paths": "Access to sensitive path blocked: ",
+    "dangerous_tools": "Dangerous tool usage blocked: ",
+}
+
+COORDINATION_RULES: Dict[str, Any] = {
+    "tool_conflicts": {
+        "Edit": ["Write", "MultiEdit"],
+        "Write": ["Edit", "MultiEdit"],
+        "MultiEdit": ["Edit", "Write"]
+    },
+    "agent_priorities": {
+        "security": ["security-auditor", "security-tester"],
+        "performance": ["performance-optimizer", "load-tester", "performance-profiler"],
+        "quality": ["code-reviewer", "quality-assurance-coordinator"],
+        "testing": ["automated-tester", "manual-tester", "compatibility-tester"]
+    },
+    "sequential_operations": [
+        ["security-auditor", "code-reviewer"],
+        ["test-writer-fixer", "automated-tester"],
+        ["ui-designer", "accessibility-guardian"]
+    ],
+    "parallel_operations": [
+        ["performance-optimizer", "seo-optimizer"],
+        ["growth-hacker", "tiktok-strategist"],
+        ["feedback-synthesizer", "trend-researcher"]
+    ]
+}
+
+
+def service_endpoint(env_var: str, path: str) -> Optional[str]:
+    """URL of a local PopKit service endpoint, or None if it is not configured."""
+    base_url = os.environ.get(env_var, "").rstrip("/")
+    return f"{base_url}{path}" if base_url else None
+
 
 class PreToolUseHook:
     def __init__(self):
         self.claude_dir = Path.home() / '.claude'
         self.config_dir = self.claude_dir / 'config'
         self.session_id = self.get_session_id()
-        self.observability_endpoint = "http://localhost:8001/events"
-        self.orchestrator_endpoint = "http://localhost:8005/coordinate"
+        # The local observability and orchestrator services are opt-in: with
+        # the variables unset no request is made and requests is never loaded
+        self.observability_endpoint = service_endpoint("POPKIT_OBSERVABILITY_URL", "/events")
+        self.orchestrator_endpoint = service_endpoint("POPKIT_ORCHESTRATOR_URL", "/coordinate")
         
         # Load configuration
         self.safety_rules = self.load_safety_rules()
@@ -85,65 +147,11 @@ class PreToolUseHook:
     
     def load_safety_rules(self) -> Dict[str, List[str]]:
         """Load safety rules for dangerous operations"""
-        return {
-            "blocked_commands": [
-                r"rm\s+-rf\s+/",
-                r"sudo\s+rm\s+-rf",
-                r"format\s+c:",
-                r"del\s+/s\s+/q\s+c:",
-                r"DROP\s+DATABASE",
-                r"TRUNCATE\s+TABLE",
-                r"chmod\s+777",
-                r"chown\s+root",
-                r"dd\s+if=/dev/zero",
-                r":(){ :|:& };:",  # Fork bomb
-            ],
-            "sensitive_paths": [
-                r"\/etc\/passwd",
-                r"\/etc\/shadow",
-                r"\/root\/",
-                r"\/boot\/",
-                r"C:\\Windows\\System32",
-                r"C:\\Program Files",
-                r"\.ssh\/id_rsa",
-                r"\.aws\/credentials",
-                r"\.env",
-            ],
-            "dangerous_tools": [
-                "Bash:rm -rf",
-                "Bash:sudo",
-                "Bash:chmod 777",
-                "Write:/etc/",
-                "Write:/root/",
-                "Edit:/etc/",
-            ]
-        }
+        return SAFETY_RULES
     
     def load_coordination_rules(self) -> Dict[str, Any]:
         """Load agent coordination and conflict resolution rules"""
-        return {
-            "tool_conflicts": {
-                "Edit": ["Write", "MultiEdit"],
-                "Write": ["Edit", "MultiEdit"],
-                "MultiEdit": ["Edit", "Write"]
-            },
-            "agent_priorities": {
-                "security": ["security-auditor", "security-tester"],
-                "performance": ["performance-optimizer", "load-tester", "performance-profiler"],
-                "quality": ["code-reviewer", "quality-assurance-coordinator"],
-                "testing": ["automated-tester", "manual-tester", "compatibility-tester"]
-            },
-            "sequential_operations": [
-                ["security-auditor", "code-reviewer"],
-                ["test-writer-fixer", "automated-tester"],
-                ["ui-designer", "accessibility-guardian"]
-            ],
-            "parallel_operations": [
-                ["performance-optimizer", "seo-optimizer"],
-                ["growth-hacker", "tiktok-strategist"],
-                ["feedback-synthesizer", "trend-researcher"]
-            ]
-        }
+        return COORDINATION_RULES
     
     def load_tool_permissions(self) -> Dict[str, Dict[str, Any]]:
         """Load tool permission matrix by context"""
@@ -190,31 +198,48 @@ class PreToolUseHook:
         # Check for development indicators or default
         return "development"
     
-    def check_safety_violations(self, tool_name: str, tool_args: Dict[str, Any]) -> List[str]:
-        """Check for safety violations in tool usage"""
-        violations = []
-        
+    def match_safety_rules(self, tool_name: str, tool_args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Find the safety rules a tool call triggers.
+
+        Regex rules go through the precompiled matcher (literal prefilter,
+        plan cached in ~/.claude/config keyed by rule hash).
+
+        Returns:
+            One dict per fired rule: category, index, rule and matched text
+        """
+        fired = []
+
         # Check blocked commands for Bash tool
         if tool_name == "Bash" and "command" in tool_args:
-            command = tool_args["command"]
-            for blocked_pattern in self.safety_rules["blocked_commands"]:
-                if re.search(blocked_pattern, command, re.IGNORECASE):
-                    violations.append(f"Blocked dangerous command: {blocked_pattern}")
-        
+            matcher = safety_matcher.get_matcher(
+                self.safety_rules["blocked_commands"], cache_dir=self.config_dir
+            )
+            for match in matcher.search(tool_args["command"]):
+                fired.append({"category": "blocked_commands", "index": match.index,
+                              "rule": match.pattern, "matched": match.matched})
+
         # Check sensitive paths for file operations
         if tool_name in ["Write", "Edit", "MultiEdit"] and "file_path" in tool_args:
-            file_path = tool_args["file_path"]
-            for sensitive_pattern in self.safety_rules["sensitive_paths"]:
-                if re.search(sensitive_pattern, file_path, re.IGNORECASE):
-                    violations.append(f"Access to sensitive path blocked: {sensitive_pattern}")
-        
+            matcher = safety_matcher.get_matcher(
+                self.safety_rules["sensitive_paths"], cache_dir=self.config_dir
+            )
+            for match in matcher.search(tool_args["file_path"]):
+                fired.append({"category": "sensitive_paths", "index": match.index,
+                              "rule": match.pattern, "matched": match.matched})
+
         # Check dangerous tool combinations
         tool_signature = f"{tool_name}:{tool_args.get('command', tool_args.get('file_path', ''))}"
-        for dangerous_tool in self.safety_rules["dangerous_tools"]:
+        for index, dangerous_tool in enumerate(self.safety_rules["dangerous_tools"]):
             if dangerous_tool in tool_signature:
-                violations.append(f"Dangerous tool usage blocked: {dangerous_tool}")
-        
-        return violations
+                fired.append({"category": "dangerous_tools", "index": index,
+                              "rule": dangerous_tool, "matched": dangerous_tool})
+
+        return fired
+
+    def check_safety_violations(self, tool_name: str, tool_args: Dict[str, Any]) -> List[str]:
+        """Check for safety violations in tool usage"""
+        return [SAFETY_MESSAGES[rule["category"]] + rule["rule"]
+                for rule in self.match_safety_rules(tool_name, tool_args)]
     
     def check_permission_requirements(self, tool_name: str, tool_args: Dict[str, Any], context: str) -> Tuple[bool, List[str]]:
         """Check if tool usage requires special permissions or confirmation"""
@@ -268,6 +293,8 @@ class PreToolUseHook:
     
     def log_pre_tool_event(self, tool_name: str, tool_args: Dict[str, Any], safety_check: Dict[str, Any]):
         """Log pre-tool-use event to observability system"""
+        if not self.observability_endpoint:
+            return
         try:
             event_data = {
                 "timestamp": datetime.now().isoformat(),
@@ -297,6 +324,8 @@ class PreToolUseHook:
     
     def request_orchestration(self, tool_name: str, tool_args: Dict[str, Any], coordination: Dict[str, Any]) -> Optional[Dict]:
         """Request orchestration guidance from orchestrator service"""
+        if not self.orchestrator_endpoint:
+            return None
         try:
             orchestration_data = {
                 "session_id": self.session_id,
@@ -389,7 +418,8 @@ class PreToolUseHook:
     
     def check_premium_feature(self, tool_name: str, tool_args: Dict[str, Any]) -> Dict[str, Any]:
         """Check if tool/skill requires premium tier and user has entitlement"""
-        if not PREMIUM_CHECKER_AVAILABLE:
+        # Only Skill and Task calls can be premium; don't load the checker otherwise
+        if tool_name not in ("Skill", "Task") or not available(premium_checker):
             return {"requires_premium": False}
 
         # Check if this is a Skill invocation
@@ -399,8 +429,8 @@ class PreToolUseHook:
             if skill_name.startswith("popkit:"):
                 skill_name = skill_name[7:]
 
-            if is_premium_feature(skill_name):
-                result = check_entitlement(skill_name)
+            if premium_checker.is_premium_feature(skill_name):
+                result = premium_checker.check_entitlement(skill_name)
                 if not result.allowed:
                     return {
                         "requires_premium": True,
@@ -410,14 +440,14 @@ class PreToolUseHook:
                         "required_tier": result.required_tier.value,
                         "upgrade_message": result.upgrade_message,
                         "fallback_available": result.fallback_available,
-                        "prompt_options": get_upgrade_prompt_options(skill_name)
+                        "prompt_options": premium_checker.get_upgrade_prompt_options(skill_name)
                     }
 
         # Check if this is a Task invocation with a premium agent
         if tool_name == "Task":
             agent_type = tool_args.get("subagent_type", "")
-            if is_premium_feature(agent_type):
-                result = check_entitlement(agent_type)
+            if premium_checker.is_premium_feature(agent_type):
+                result = premium_checker.check_entitlement(agent_type)
                 if not result.allowed:
                     return {
                         "requires_premium": True,
@@ -427,14 +457,14 @@ class PreToolUseHook:
                         "required_tier": result.required_tier.value,
                         "upgrade_message": result.upgrade_message,
                         "fallback_available": result.fallback_available,
-                        "prompt_options": get_upgrade_prompt_options(agent_type)
+                        "prompt_options": premium_checker.get_upgrade_prompt_options(agent_type)
                     }
 
         return {"requires_premium": False}
 
     def check_rate_limit(self, tool_name: str, tool_args: Dict[str, Any]) -> Dict[str, Any]:
         """Check if user has exceeded rate limits for a feature"""
-        if not PREMIUM_CHECKER_AVAILABLE:
+        if tool_name not in ("Skill", "Task") or not available(premium_checker):
             return {"rate_limited": False}
 
         feature_name = None
@@ -444,20 +474,20 @@ class PreToolUseHook:
             skill_name = tool_args.get("skill", "")
             if skill_name.startswith("popkit:"):
                 skill_name = skill_name[7:]
-            if is_premium_feature(skill_name):
+            if premium_checker.is_premium_feature(skill_name):
                 feature_name = skill_name
 
         # Check if this is a Task invocation with a rate-limited agent
         if tool_name == "Task":
             agent_type = tool_args.get("subagent_type", "")
-            if is_premium_feature(agent_type):
+            if premium_checker.is_premium_feature(agent_type):
                 feature_name = agent_type
 
         if not feature_name:
             return {"rate_limited": False}
 
         # Check rate limit
-        result = check_rate_limit(feature_name)
+        result = premium_checker.check_rate_limit(feature_name)
         if not result.allowed:
             return {
                 "rate_limited": True,
@@ -467,7 +497,7 @@ class PreToolUseHook:
                 "remaining": result.remaining,
                 "reset_at": result.reset_at,
                 "tier": result.tier,
-                "message": format_rate_limit_message(result)
+                "message": premium_checker.format_rate_limit_message(result)
             }
 
         return {
@@ -490,10 +520,10 @@ class PreToolUseHook:
         Returns:
             Dict with tracking info and any required decision prompts
         """
-        if not SKILL_STATE_AVAILABLE:
+        if not available(skill_state):
             return {"tracked": False}
 
-        tracker = get_tracker()
+        tracker = skill_state.get_tracker()
 
         # If this is a Skill invocation, start tracking it
         if tool_name == "Skill":
@@ -555,7 +585,7 @@ class PreToolUseHook:
         Returns:
             Dict with filtering info
         """
-        if not TOOL_FILTER_AVAILABLE:
+        if not available(tool_filter):
             return {"filtered": False}
 
         # Determine workflow
@@ -568,8 +598,7 @@ class PreToolUseHook:
         ]
 
         # Apply filtering
-        tool_filter = ToolFilter()
-        filtered_tools = tool_filter.filter(workflow, available_tools)
+        filtered_tools = tool_filter.ToolFilter().filter(workflow, available_tools)
 
         # Calculate reduction
         reduction = len(available_tools) - len(filtered_tools)
@@ -613,10 +642,14 @@ class PreToolUseHook:
             print(f"   Tools: {tool_filtering['original_count']} → {tool_filtering['filtered_count']} ({tool_filtering['reduction']} filtered)", file=sys.stderr)
 
         # Safety checks
-        safety_violations = self.check_safety_violations(tool_name, tool_args)
-        if safety_violations:
+        fired_rules = self.match_safety_rules(tool_name, tool_args)
+        if fired_rules:
             result["action"] = "block"
-            result["safety_check"] = {"passed": False, "violations": safety_violations}
+            result["safety_check"] = {
+                "passed": False,
+                "violations": [SAFETY_MESSAGES[r["category"]] + r["rule"] for r in fired_rules],
+                "rules": fired_rules
+            }
             return result
 
         # Premium feature gating
@@ -724,7 +757,7 @@ def main():
             response["premium_info"] = premium_info
 
             # Output premium message to stderr for user visibility
-            if PREMIUM_CHECKER_AVAILABLE and not is_billing_live():
+            if available(premium_checker) and not premium_checker.is_billing_live():
                 # Pre-launch mode: Show "coming soon"
                 print(f"🎉 Coming Soon: {premium_info.get('feature_name')}", file=sys.stderr)
                 print(f"   This premium feature is launching soon!", file=sys.stderr)
@@ -11,7 +11,6 @@ All state is explicit - no SQLite or environment variable dependencies.
 import os
 import sys
 import json
-import re
 from typing import Dict, List, Any
 
 # Add utils to path
@@ -19,6 +18,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'utils'))
 
 from stateless_hook import StatelessHook
 from context_carrier import HookContext
+from safety_matcher import get_matcher
 
 
 class PreToolUseStateless(StatelessHook):
@@ -111,16 +111,14 @@ class PreToolUseStateless(StatelessHook):
         # Check Bash commands
         if tool_name == "Bash":
             command = tool_input.get("command", "")
-            for pattern in self.BLOCKED_COMMANDS:
-                if re.search(pattern, command, re.IGNORECASE):
-                    violations.append(f"Blocked command pattern: {pattern}")
+            for match in get_matcher(self.BLOCKED_COMMANDS).search(command):
+                violations.append(f"Blocked command pattern: {match.pattern}")
 
         # Check file access
         if tool_name in ("Write", "Edit", "Read"):
             file_path = tool_input.get("file_path", "")
-            for pattern in self.SENSITIVE_PATHS:
-                if re.search(pattern, file_path):
-                    violations.append(f"Sensitive path access: {pattern}")
+            for match in get_matcher(self.SENSITIVE_PATHS, flags=0).search(file_path):
+                violations.append(f"Sensitive path access: {match.pattern}")
 
         return violations
 
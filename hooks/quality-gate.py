@@ -20,24 +20,79 @@ The 180s hook timeout allows running multiple quality gates:
 - Lint: up to 60s
 
 Mitigations for long runtime:
-1. Fail-fast mode (default) - stops on first failure
-2. Power Mode - runs lightweight 15s checks only
-3. Triggered only on high-risk changes or batch thresholds
-4. Individual gate timeouts prevent runaway processes
+0. Incremental mode (default) - gates check only files changed since the
+   last green run (eslint on those files, mypy on their import closure,
+   tsc --incremental with a persistent buildinfo) and skip files whose
+   content already passed; config changes, deletions and edits to file
+   types a gate doesn't list force a full run
+1. Independent gates run concurrently (bounded by options.max_parallel);
+   a gate listing "depends_on" starts only after those gates pass, so wall
+   time follows the critical path instead of the sum of all gates
+2. Fail-fast mode (default) - first failure cancels in-flight gates
+3. Power Mode - runs lightweight 15s checks only
+4. Triggered only on high-risk changes or batch thresholds
+5. Individual gate timeouts prevent runaway processes
 
 See Issue #195 for analysis.
 """
 
 import os
 import sys
+import ast
 import json
+import hashlib
+import shlex
 import subprocess
 import re
+import signal
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
+from queue import Queue
 from typing import Dict, List, Optional, Any
 
 
+# Gates run at once unless options.max_parallel says otherwise (at least 2:
+# much of a gate's time is npm/npx startup and I/O, not CPU)
+DEFAULT_MAX_PARALLEL = max(2, min(4, os.cpu_count() or 1))
+
+# Auto-detected gate ordering: gate -> gates that must pass first
+DEFAULT_DEPENDENCIES = {
+    "build": ["typescript", "typecheck"],
+}
+
+TS_EXTENSIONS = [".ts", ".tsx", ".mts", ".cts", ".js", ".jsx", ".mjs", ".cjs"]
+PY_EXTENSIONS = [".py", ".pyi"]
+
+# Incremental variants of auto-detected gates. A gate is scoped to the changed
+# files with one of its "extensions"; "{files}" in "incremental_command" expands
+# to those files ("closure": "python" adds every module importing them). Any
+# other changed file (e.g. .vue or .css, which vue-tsc or eslint may check) runs
+# the full command, since the gate's real coverage is unknown.
+INCREMENTAL_GATES = {
+    "typescript": {
+        "extensions": TS_EXTENSIONS,
+        "incremental_command": "npx tsc --noEmit --incremental --tsBuildInfoFile .claude/cache/tsc.tsbuildinfo",
+    },
+    "typecheck": {"extensions": TS_EXTENSIONS},
+    "lint": {"extensions": TS_EXTENSIONS, "incremental_command": "npx eslint {files}"},
+    "mypy": {"extensions": PY_EXTENSIONS, "incremental_command": "mypy {files}", "closure": "python"},
+}
+
+# Changed files no gate checks; they never force a full run
+UNGATED_EXTENSIONS = [".md", ".markdown", ".txt", ".rst"]
+
+# Past this many files a scoped command falls back to the full one
+MAX_SCOPED_FILES = 200
+
+# Per-gate limit on remembered passing file hashes
+MAX_PASS_CACHE_FILES = 5000
+
+SKIP_DIRS = {".git", ".claude", "node_modules", "__pycache__", ".venv", "venv",
+             ".tox", ".mypy_cache", "build", "dist"}
+
+
 # High-risk file patterns that trigger immediate validation
 HIGH_RISK_PATTERNS = [
     "tsconfig.json",
@@ -61,6 +116,112 @@ HIGH_RISK_PATTERNS = [
 ]
 
 
+# =============================================================================
+# Incremental Scope
+# =============================================================================
+
+def file_hash(path: Path) -> Optional[str]:
+    """Content hash of a file, or None if it can't be read."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+def quote_paths(paths: List[str]) -> str:
+    """Paths joined for a shell=True command line."""
+    if os.name == "posix":
+        return " ".join(shlex.quote(p) for p in paths)
+    return " ".join(f'"{p}"' for p in paths)
+
+
+def _module_names(rel: Path) -> List[str]:
+    """Importable names for a project-relative .py file (src/ layouts too)."""
+    parts = list(rel.with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    if not parts:
+        return []
+    names = [".".join(parts)]
+    if len(parts) > 1 and parts[0] in ("src", "lib"):
+        names.append(".".join(parts[1:]))
+    return names
+
+
+def _imported_names(tree: ast.AST, package: List[str]) -> List[str]:
+    """Modules (and from-imported names) referenced by a parsed file."""
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = package[:len(package) - (node.level - 1)] if node.level - 1 <= len(package) else []
+                base = ".".join(parent + ([base] if base else []))
+            if base:
+                names.append(base)
+            names.extend(f"{base}.{alias.name}" if base else alias.name
+                         for alias in node.names if alias.name != "*")
+    return names
+
+
+def python_import_closure(root: Path, files: List[str], limit: int = MAX_SCOPED_FILES) -> Optional[List[str]]:
+    """
+    Changed Python files plus every project file that imports them, transitively.
+
+    mypy follows a file's own imports, but not the files importing it, which
+    a changed signature can break.
+
+    Args:
+        root: Project root
+        files: Changed files, relative to root
+        limit: Give up past this many files
+
+    Returns:
+        Sorted relative paths, or None if the closure exceeds limit
+    """
+    modules: Dict[str, str] = {}
+    imports: Dict[str, List[str]] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+        for filename in filenames:
+            if not filename.endswith(".py"):
+                continue
+            path = Path(dirpath) / filename
+            rel = path.relative_to(root)
+            for name in _module_names(rel):
+                modules[name] = rel.as_posix()
+            try:
+                tree = ast.parse(path.read_bytes())
+            except (OSError, SyntaxError, ValueError):
+                continue
+            package = list(rel.parent.parts)
+            imports[rel.as_posix()] = _imported_names(tree, package)
+
+    importers: Dict[str, set] = {}
+    for rel, names in imports.items():
+        for name in names:
+            # "pkg.mod.func" depends on the longest prefix that is a module
+            parts = name.split(".")
+            for i in range(len(parts), 0, -1):
+                target = modules.get(".".join(parts[:i]))
+                if target:
+                    importers.setdefault(target, set()).add(rel)
+                    break
+
+    closure = set(files)
+    queue = list(files)
+    while queue:
+        for importer in importers.get(queue.pop(), ()):
+            if importer not in closure:
+                closure.add(importer)
+                queue.append(importer)
+                if len(closure) > limit:
+                    return None
+    return sorted(closure)
+
+
 class QualityGateHook:
     def __init__(self):
         self.cwd = Path.cwd()
@@ -68,6 +229,8 @@ class QualityGateHook:
         self.state_file = self.claude_dir / "quality-gate-state.json"
         self.config_file = self.claude_dir / "quality-gates.json"
         self.checkpoints_dir = self.claude_dir / "checkpoints"
+        # Per-gate content hashes of files that passed (incremental mode)
+        self.pass_cache_file = self.claude_dir / "cache" / "quality-gate-passes.json"
 
         # Ensure directories exist
         self.claude_dir.mkdir(exist_ok=True)
@@ -77,6 +240,10 @@ class QualityGateHook:
         self.state = self.load_state()
         self.config = self.load_config()
 
+        # In-flight gate processes, so fail-fast can cancel them
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._procs_lock = threading.Lock()
+
     def load_state(self) -> Dict[str, Any]:
         """Load hook state from file."""
         if self.state_file.exists():
@@ -89,6 +256,9 @@ class QualityGateHook:
             "recent_files": [],
             "recent_file_count": 0,
             "last_checkpoint": None,
+            # Files modified since the last green run (incremental mode)
+            "changed_files": [],
+            "full_run_required": False,
             # Session-only flaky test tracking
             "test_results": []  # List of {"test_name": str, "passed": bool, "timestamp": str}
         }
@@ -177,6 +347,13 @@ class QualityGateHook:
                     "enabled": True
                 })
 
+        names = {g["name"] for g in gates}
+        for gate in gates:
+            gate.update(INCREMENTAL_GATES.get(gate["name"], {}))
+            depends_on = [d for d in DEFAULT_DEPENDENCIES.get(gate["name"], []) if d in names]
+            if depends_on:
+                gate["depends_on"] = depends_on
+
         return gates
 
     def get_effective_gates(self) -> List[Dict[str, Any]]:
@@ -187,6 +364,9 @@ class QualityGateHook:
             for gate in self.config["gates"]:
                 name = gate["name"]
                 if name in detected:
+                    if "command" in gate and "incremental_command" not in gate:
+                        # A custom command has no known file-scoped form
+                        detected[name].pop("incremental_command", None)
                     detected[name].update(gate)
                 else:
                     detected[name] = gate
@@ -277,14 +457,147 @@ class QualityGateHook:
             self.state["recent_files"] = recent
             self.state["recent_file_count"] = len(set(recent))
 
+            # Everything changed since the last green run, for incremental gates
+            rel_path = self._project_relative(file_path) if file_path else None
+            changed = self.state.get("changed_files", [])
+            if rel_path and rel_path not in changed:
+                changed.append(rel_path)
+            self.state["changed_files"] = changed
+
+            # Deletions and config changes can break files that didn't change
+            if tool_name == "Delete" or not rel_path or any(
+                self.matches_pattern(Path(rel_path).name, p) for p in HIGH_RISK_PATTERNS
+            ):
+                self.state["full_run_required"] = True
+
             self.save_state()
 
+    def _project_relative(self, file_path: str) -> Optional[str]:
+        """Path relative to the project root, or None if outside it."""
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = self.cwd / path
+        try:
+            return path.resolve().relative_to(self.cwd.resolve()).as_posix()
+        except ValueError:
+            return None
+
+    # =========================================================================
+    # Incremental Mode
+    # =========================================================================
+
+    def changed_files_for_run(self) -> Optional[List[str]]:
+        """
+        Files to scope gates to, or None for a full run.
+
+        Full runs happen when incremental mode is off, after a deletion or
+        config change, or when no changed files are known.
+        """
+        if not (self.config or {}).get("options", {}).get("incremental", True):
+            return None
+        if self.state.get("full_run_required"):
+            return None
+        return self.state.get("changed_files") or None
+
+    def load_pass_cache(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.pass_cache_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save_pass_cache(self, cache: Dict[str, Any]):
+        try:
+            self.pass_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.pass_cache_file.write_text(json.dumps(cache))
+        except OSError as e:
+            print(f"Warning: Could not save gate cache: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _gate_signature(gate: Dict[str, Any]) -> str:
+        """Cached passes only count for the same gate definition."""
+        return gate.get("incremental_command") or gate.get("command", "")
+
+    def scope_gate(self, gate: Dict[str, Any], changed: Optional[List[str]],
+                   pass_cache: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Narrow a gate to the changed files it hasn't already passed.
+
+        Args:
+            gate: Gate definition
+            changed: Changed files (project-relative), or None for a full run
+            pass_cache: Loaded pass cache
+
+        Returns:
+            The gate to run: a copy with a file-scoped command and
+            "scope_files" (path -> hash, recorded if it passes), marked
+            "up_to_date" when there is nothing to check, or the gate
+            unchanged for a full run. A changed file of a type the gate
+            doesn't list forces a full run, and a gate without a file-scoped
+            form is only skipped when files of its listed types changed.
+        """
+        if changed is None or "extensions" not in gate:
+            return gate
+
+        hashes = {}
+        for path in changed:
+            suffix = Path(path).suffix
+            if suffix in gate["extensions"]:
+                digest = file_hash(self.cwd / path)
+                if digest:
+                    hashes[path] = digest
+            elif suffix not in UNGATED_EXTENSIONS:
+                return gate
+        if not hashes and not gate.get("incremental_command"):
+            return gate
+
+        cached = pass_cache.get(gate["name"], {})
+        passed = cached.get("files", {}) if cached.get("signature") == self._gate_signature(gate) else {}
+        stale = {path: digest for path, digest in hashes.items() if passed.get(path) != digest}
+        if not stale:
+            return dict(gate, up_to_date=True)
+
+        scoped = dict(gate, scope_files=stale)
+        template = gate.get("incremental_command")
+        if not template:
+            return scoped
+        if "{files}" not in template:
+            scoped["command"] = template
+            return scoped
+
+        targets = list(stale)
+        if gate.get("closure") == "python":
+            targets = python_import_closure(self.cwd, targets)
+        if targets is not None and len(targets) <= MAX_SCOPED_FILES:
+            scoped["command"] = template.replace("{files}", quote_paths(targets))
+        return scoped
+
+    def record_pass(self, gate: Dict[str, Any], pass_cache: Dict[str, Any]):
+        """Remember the file hashes a gate just passed."""
+        signature = self._gate_signature(gate)
+        entry = pass_cache.get(gate["name"])
+        if not entry or entry.get("signature") != signature:
+            entry = pass_cache[gate["name"]] = {"signature": signature, "files": {}}
+        files = entry["files"]
+        for path, digest in gate["scope_files"].items():
+            files.pop(path, None)
+            files[path] = digest
+        # Oldest entries first (insertion order)
+        for path in list(files)[:max(0, len(files) - MAX_PASS_CACHE_FILES)]:
+            del files[path]
+
     # =========================================================================
     # Gate Execution
     # =========================================================================
 
-    def run_gate(self, gate: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a single quality gate."""
+    def run_gate(self, gate: Dict[str, Any], cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Execute a single quality gate.
+
+        Args:
+            gate: Gate definition (name, command, timeout)
+            cancel: Set when fail-fast cancelled the run; a gate killed
+                because of it is reported as cancelled rather than failed
+        """
         result = {
             "name": gate["name"],
             "success": False,
@@ -295,20 +608,38 @@ class QualityGateHook:
 
         start = datetime.now()
         try:
-            proc = subprocess.run(
+            proc = subprocess.Popen(
                 gate["command"],
                 shell=True,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=gate.get("timeout", 60),
-                cwd=str(self.cwd)
+                cwd=str(self.cwd),
+                # Own process group, so cancelling also stops npm's children
+                start_new_session=(os.name == "posix")
             )
-
-            result["output"] = proc.stdout + proc.stderr
+            with self._procs_lock:
+                self._procs[gate["name"]] = proc
+            if cancel is not None and cancel.is_set():
+                self._kill(proc)  # Cancelled while starting
+            try:
+                stdout, stderr = proc.communicate(timeout=gate.get("timeout", 60))
+            except subprocess.TimeoutExpired:
+                self._kill(proc)
+                proc.communicate()
+                raise
+            finally:
+                with self._procs_lock:
+                    self._procs.pop(gate["name"], None)
+
+            result["output"] = stdout + stderr
             result["success"] = proc.returncode == 0
 
             if not result["success"]:
-                result["errors"] = self.parse_errors(gate["name"], result["output"])
+                if cancel is not None and cancel.is_set():
+                    result["cancelled"] = True
+                else:
+                    result["errors"] = self.parse_errors(gate["name"], result["output"])
 
         except subprocess.TimeoutExpired:
             result["output"] = f"Gate '{gate['name']}' timed out after {gate.get('timeout', 60)}s"
@@ -320,44 +651,142 @@ class QualityGateHook:
         result["duration"] = (datetime.now() - start).total_seconds()
         return result
 
+    def _kill(self, proc: subprocess.Popen):
+        """Stop a gate process and everything it started."""
+        try:
+            if os.name == "posix":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _cancel_running(self):
+        """Kill every in-flight gate (fail-fast)."""
+        with self._procs_lock:
+            procs = list(self._procs.values())
+        for proc in procs:
+            self._kill(proc)
+
     def run_all_gates(self) -> Dict[str, Any]:
-        """Execute all enabled quality gates."""
+        """
+        Execute all enabled quality gates.
+
+        Gates run concurrently (up to options.max_parallel) once the gates in
+        their "depends_on" list have passed. Each result is appended to
+        results["gates"] as its gate finishes. A gate whose dependency failed
+        is not run; with fail-fast (default) the first failure also cancels
+        gates still running. Both are listed in results["skipped_gates"].
+        """
         gates = self.get_effective_gates()
 
         if not gates:
             return {"passed": True, "gates": [], "total_errors": 0, "duration": 0, "skipped": "No gates detected"}
 
+        changed = self.changed_files_for_run()
+        pass_cache = self.load_pass_cache() if changed is not None else {}
+        gates = [self.scope_gate(g, changed, pass_cache) for g in gates]
+        recorded = False
+
         results = {
             "passed": True,
             "gates": [],
+            "skipped_gates": [],
             "total_errors": 0,
-            "duration": 0
+            "duration": 0,
+            "incremental": changed is not None
         }
 
-        for gate in gates:
-            # Skip optional gates unless explicitly enabled
-            if gate.get("optional") and not (self.config or {}).get("options", {}).get("run_tests"):
+        options = (self.config or {}).get("options", {})
+        # Fail fast if configured (default: true)
+        fail_fast = options.get("fail_fast", True)
+        max_parallel = max(1, options.get("max_parallel", DEFAULT_MAX_PARALLEL))
+
+        # Skip optional gates unless explicitly enabled
+        pending = [g for g in gates if not (g.get("optional") and not options.get("run_tests"))]
+        names = {g["name"] for g in pending}
+        passed, finished = set(), set()
+        running: Dict[str, Optional[threading.Thread]] = {}
+        done: Queue = Queue()
+        cancel = threading.Event()
+        start = time.monotonic()
+
+        def worker(gate: Dict[str, Any]):
+            done.put((gate, self.run_gate(gate, cancel)))
+
+        while pending or running:
+            # Start every gate whose dependencies have passed, up to the limit
+            for gate in list(pending):
+                if cancel.is_set():
+                    break
+                depends_on = [d for d in gate.get("depends_on", []) if d in names]
+                failed_dep = next((d for d in depends_on if d in finished and d not in passed), None)
+                if failed_dep:
+                    pending.remove(gate)
+                    finished.add(gate["name"])
+                    results["skipped_gates"].append(
+                        {"name": gate["name"], "reason": f"dependency '{failed_dep}' failed"})
+                elif gate.get("up_to_date") and all(d in passed for d in depends_on):
+                    # Every relevant file already passed this gate
+                    pending.remove(gate)
+                    running[gate["name"]] = None
+                    done.put((gate, {"name": gate["name"], "success": True, "output": "",
+                                     "errors": [], "duration": 0, "cached": True}))
+                elif all(d in passed for d in depends_on) and len(running) < max_parallel:
+                    pending.remove(gate)
+                    print(f"Running quality gate: {gate['name']}...", file=sys.stderr)
+                    thread = threading.Thread(target=worker, args=(gate,), daemon=True)
+                    running[gate["name"]] = thread
+                    thread.start()
+
+            if not running:
+                break
+
+            gate, gate_result = done.get()
+            thread = running.pop(gate["name"])
+            if thread:
+                thread.join()
+            finished.add(gate["name"])
+
+            if gate_result.get("cancelled"):
+                results["skipped_gates"].append({"name": gate["name"], "reason": "cancelled (fail-fast)"})
                 continue
 
-            print(f"Running quality gate: {gate['name']}...", file=sys.stderr)
-            gate_result = self.run_gate(gate)
             results["gates"].append(gate_result)
-            results["duration"] += gate_result["duration"]
+            status = "passed" if gate_result["success"] else "failed"
+            if gate_result.get("cached"):
+                status = "up to date"
+            print(f"Quality gate {gate['name']} {status} ({gate_result['duration']:.1f}s)", file=sys.stderr)
 
             # Track test results for flaky detection
             if gate["name"] == "test":
                 self.track_test_result("test_suite", gate_result["success"])
 
-            if not gate_result["success"]:
+            if gate_result["success"]:
+                passed.add(gate["name"])
+                if "scope_files" in gate:
+                    self.record_pass(gate, pass_cache)
+                    recorded = True
+            else:
                 results["passed"] = False
                 results["total_errors"] += len(gate_result["errors"])
-
-                # Fail fast if configured (default: true)
-                fail_fast = True
-                if self.config:
-                    fail_fast = self.config.get("options", {}).get("fail_fast", True)
-                if fail_fast:
-                    break
+                if fail_fast and not cancel.is_set():
+                    cancel.set()
+                    self._cancel_running()
+
+        for gate in pending:
+            reason = "cancelled (fail-fast)" if cancel.is_set() else "dependency cycle"
+            results["skipped_gates"].append({"name": gate["name"], "reason": reason})
+
+        results["duration"] = time.monotonic() - start
+
+        if recorded:
+            self.save_pass_cache(pass_cache)
+        if results["passed"] and not results["skipped_gates"]:
+            # Green: the next run only needs files changed from here on
+            self.state["changed_files"] = []
+            self.state["full_run_required"] = False
+            self.save_state()
 
         # Check for flaky tests and add warning
         flaky_tests = self.check_flaky_tests()
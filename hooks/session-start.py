@@ -19,6 +19,7 @@ from datetime import datetime
 
 # Add utils to path
 sys.path.insert(0, str(Path(__file__).parent / "utils"))
+from lazy_import import available, lazy_import
 
 # Import version check utility
 try:
@@ -35,11 +36,9 @@ except ImportError:
     HAS_PROJECT_CLIENT = False
 
 # Import agent loader for semantic filtering (Phase 2)
-try:
-    from agent_loader import AgentLoader
-    HAS_AGENT_LOADER = True
-except ImportError:
-    HAS_AGENT_LOADER = False
+# Lazy: it pulls in the embedding store and Voyage client, which are only
+# needed when the session opens with a user message.
+agent_loader = lazy_import("agent_loader")
 
 def create_logs_directory():
     """Create logs directory if it doesn't exist."""
@@ -230,20 +229,17 @@ def load_relevant_agents_for_session(data):
     Returns:
         dict: Agent loading info, or None on error
     """
-    if not HAS_AGENT_LOADER:
-        return None
-
     try:
         # Get initial user message (if available)
         messages = data.get('messages', [])
         user_message = next((m['content'] for m in messages if m['role'] == 'user'), '')
 
         # If no user message yet, skip agent filtering
-        if not user_message:
+        if not user_message or not available(agent_loader):
             return None
 
         # Load relevant agents
-        loader = AgentLoader()
+        loader = agent_loader.AgentLoader()
         relevant_agents = loader.load(user_message, top_k=10)
 
         # Output debug info to stderr
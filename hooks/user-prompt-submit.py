@@ -5,19 +5,25 @@ Handles keyword detection, agent routing, and security filtering
 Integrates with observability and orchestration systems
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import json
 import re
 import hashlib
-import sqlite3
-import requests
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
 # Import thinking flags parser
 sys.path.insert(0, str(Path(__file__).parent / 'utils'))
+from lazy_import import lazy_import
+
+# Heavy modules load on first use
+requests = lazy_import("requests")
+sqlite3 = lazy_import("sqlite3")
+
 try:
     from flag_parser import parse_thinking_flags
 except ImportError:
@@ -25,13 +31,21 @@ except ImportError:
         """Fallback if import fails"""
         return {"force_thinking": None, "budget_tokens": 10000}
 
+def service_endpoint(env_var: str, path: str) -> Optional[str]:
+    """URL of a local PopKit service endpoint, or None if it is not configured."""
+    base_url = os.environ.get(env_var, "").rstrip("/")
+    return f"{base_url}{path}" if base_url else None
+
+
 class UserPromptSubmitHook:
     def __init__(self):
         self.claude_dir = Path.home() / '.claude'
         self.config_dir = self.claude_dir / 'config'
         self.session_id = self.generate_session_id()
-        self.observability_endpoint = "http://localhost:8001/events"
-        self.orchestrator_endpoint = "http://localhost:8005/route"
+        # The local observability and orchestrator services are opt-in: with
+        # the variables unset no request is made and requests is never loaded
+        self.observability_endpoint = service_endpoint("POPKIT_OBSERVABILITY_URL", "/events")
+        self.orchestrator_endpoint = service_endpoint("POPKIT_ORCHESTRATOR_URL", "/route")
         
         # Load configuration
         self.keyword_patterns = self.load_keyword_patterns()
@@ -321,6 +335,8 @@ class UserPromptSubmitHook:
     
     def log_event(self, event_data: Dict[str, Any]):
         """Log event to observability system"""
+        if not self.observability_endpoint:
+            return
         try:
             response = requests.post(
                 self.observability_endpoint,
@@ -334,6 +350,8 @@ class UserPromptSubmitHook:
     
     def route_to_orchestrator(self, prompt: str, detected_agents: Dict, project_context: Dict) -> Optional[Dict]:
         """Send routing request to orchestrator"""
+        if not self.orchestrator_endpoint:
+            return None
         try:
             routing_data = {
                 "session_id": self.session_id,
@@ -7,24 +7,36 @@ Provides shared utilities for popkit hooks including:
 - github_issues: GitHub issue creation from errors and lessons
 """
 
-from .github_issues import (
-    create_issue_from_lesson,
-    create_issue_from_validation_failure,
-    save_lesson_locally,
-    save_error_locally
-)
+import importlib
+
+# Exports resolve on first access (PEP 562) so `import utils.<module>` from a
+# hook does not also pay for github_issues/version on every tool call.
+_LAZY_EXPORTS = {
+    # GitHub Issues
+    'create_issue_from_lesson': 'github_issues',
+    'create_issue_from_validation_failure': 'github_issues',
+    'save_lesson_locally': 'github_issues',
+    'save_error_locally': 'github_issues',
+    # Version
+    'check_for_updates': 'version',
+    'format_update_notification': 'version',
+    'get_current_version': 'version',
+    'SemanticVersion': 'version',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module(f".{module_name}", __name__)
+    except ImportError as e:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from e
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
-# Version utilities will be imported when available
-try:
-    from .version import (
-        check_for_updates,
-        format_update_notification,
-        get_current_version,
-        SemanticVersion
-    )
-except ImportError:
-    # version.py not yet created
-    pass
 
 __all__ = [
     # GitHub Issues
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Approximate Nearest-Neighbor (IVF) Index
+
+Inverted-file index over the packed vector sidecar for large EmbeddingStores.
+Vectors are clustered with spherical k-means; a query ranks the centroids and
+only the rows in the closest lists are scored, exactly, by
+PackedVectorIndex.search. Similarities stay exact; only recall is approximate.
+
+The index holds centroids and an id -> list assignment rather than vectors,
+so it stays small and is kept current incrementally: EmbeddingStore scores
+rows written since the packed sidecar was built from its delta, and when the
+sidecar is rebuilt sync() drops deleted ids and assigns only the new ones,
+so the file is rewritten once per rebuild rather than on every write.
+Centroids are retrained once the store has grown RETRAIN_GROWTH times past
+the size they were trained on.
+
+Files written next to the database:
+    <db stem>.ivf   JSON: centroids (base64 float32) + id -> list assignments
+
+Uses NumPy when it is installed. The stdlib path gives the same results but
+trains slowly, so EmbeddingStore only enables the index by default with NumPy.
+"""
+
+import os
+import sys
+import json
+import math
+import base64
+import random
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .vector_index import HAS_NUMPY, PackedVectorIndex, _dot
+except ImportError:
+    from vector_index import HAS_NUMPY, PackedVectorIndex, _dot
+
+if HAS_NUMPY:
+    import numpy as np
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+ANN_VERSION = 1
+
+# Lists ~ sqrt(rows), within these bounds
+MIN_LISTS = 4
+MAX_LISTS = 4096
+
+# k-means trains on a sample of this many points per list
+TRAIN_POINTS_PER_LIST = 64
+TRAIN_ITERATIONS = 10
+
+# Retrain centroids once the store has grown this many times over
+RETRAIN_GROWTH = 2.0
+
+
+def _unit(vector: Sequence[float]) -> List[float]:
+    """Normalize a vector (zero vectors stay zero)."""
+    values = [float(x) for x in vector]
+    norm = math.sqrt(_dot(values, values))
+    return [x / norm for x in values] if norm else values
+
+
+# =============================================================================
+# IVF INDEX
+# =============================================================================
+
+class IVFIndex:
+    """
+    Inverted-file ANN index keyed by embedding id.
+
+    Train with `IVFIndex.train()`, open with `IVFIndex.load()`, and call
+    `sync()` against the current PackedVectorIndex before `candidate_rows()`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        dim: int,
+        centroids: List[List[float]],
+        assignments: Dict[str, int],
+        trained_count: int,
+        generation: int = -1
+    ):
+        self.path = Path(path)
+        self.dim = dim
+        self.centroids = centroids
+        self.assignments = assignments
+        self.trained_count = trained_count
+        self.generation = generation
+        self.dirty = False
+        self._list_rows: Optional[List[List[int]]] = None
+        self._rows_key: Optional[Tuple[int, int]] = None
+        self._matrix = np.asarray(centroids, dtype=np.float32).reshape(len(centroids), dim) \
+            if HAS_NUMPY else None
+
+    @property
+    def n_lists(self) -> int:
+        """Number of inverted lists (centroids)."""
+        return len(self.centroids)
+
+    @staticmethod
+    def default_n_lists(count: int) -> int:
+        """Lists for a store of `count` rows."""
+        return max(MIN_LISTS, min(MAX_LISTS, int(math.sqrt(count))))
+
+    def default_n_probe(self) -> int:
+        """Lists to probe per query when the caller doesn't say."""
+        return max(4, self.n_lists // 10)
+
+    # =========================================================================
+    # TRAINING
+    # =========================================================================
+
+    @classmethod
+    def train(
+        cls,
+        path: Path,
+        index: PackedVectorIndex,
+        n_lists: Optional[int] = None,
+        iterations: int = TRAIN_ITERATIONS,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """
+        Cluster the packed vectors and assign every row.
+
+        Args:
+            path: Where the index will be saved
+            index: Packed vectors to train on
+            n_lists: Number of lists (defaults to ~sqrt(rows))
+            iterations: k-means iterations
+            seed: Sampling seed
+
+        Returns:
+            New IVFIndex synced to `index` (not yet saved)
+        """
+        count = index.count
+        n_lists = min(n_lists or cls.default_n_lists(count), max(count, 1))
+        rng = random.Random(seed)
+        sample_rows = sorted(rng.sample(range(count), min(count, n_lists * TRAIN_POINTS_PER_LIST)))
+        sample = cls._unit_rows(index, sample_rows)
+
+        if HAS_NUMPY:
+            centroids = sample[rng.sample(range(len(sample_rows)), n_lists)]
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                norms = np.linalg.norm(sums, axis=1)
+                empty = norms == 0
+                if empty.any():
+                    # Re-seed empty lists from random sample points
+                    sums[empty] = sample[rng.sample(range(len(sample_rows)), int(empty.sum()))]
+                    norms[empty] = np.linalg.norm(sums[empty], axis=1)
+                norms[norms == 0] = 1.0
+                centroids = (sums / norms[:, None]).astype(np.float32)
+            centroid_list = centroids.tolist()
+        else:
+            centroid_list = [list(sample[i]) for i in rng.sample(range(len(sample)), n_lists)]
+            for _ in range(iterations):
+                sums = [[0.0] * index.dim for _ in range(n_lists)]
+                counts = [0] * n_lists
+                for vector in sample:
+                    label = max(range(n_lists), key=lambda c: _dot(centroid_list[c], vector))
+                    counts[label] += 1
+                    acc = sums[label]
+                    for d, x in enumerate(vector):
+                        acc[d] += x
+                for c in range(n_lists):
+                    if counts[c] == 0:
+                        sums[c] = list(sample[rng.randrange(len(sample))])
+                centroid_list = [_unit(acc) for acc in sums]
+
+        ann = cls(path, index.dim, centroid_list, {}, trained_count=count)
+        ann.sync(index)
+        return ann
+
+    @staticmethod
+    def _unit_rows(index: PackedVectorIndex, rows: Sequence[int]):
+        """Normalized vectors for some packed rows."""
+        vectors = index.row_vectors(rows)
+        if HAS_NUMPY:
+            vectors = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1)
+            norms[norms == 0] = 1.0
+            return vectors / norms[:, None]
+        return [_unit(v) for v in vectors]
+
+    def needs_retrain(self, count: int) -> bool:
+        """Whether the store has outgrown the trained centroids."""
+        return count >= self.trained_count * RETRAIN_GROWTH
+
+    # =========================================================================
+    # INCREMENTAL UPDATES
+    # =========================================================================
+
+    def assign(self, vectors) -> List[int]:
+        """Nearest list for each normalized vector."""
+        if HAS_NUMPY:
+            vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+            if not len(vectors):
+                return []
+            return np.argmax(vectors @ self._matrix.T, axis=1).tolist()
+        centroids = self.centroids
+        return [
+            max(range(len(centroids)), key=lambda c: _dot(centroids[c], vector))
+            for vector in vectors
+        ]
+
+    def add(self, items: Iterable[Tuple[str, Sequence[float]]]) -> None:
+        """
+        Assign (or reassign) vectors by id.
+
+        Args:
+            items: (id, vector) pairs; vectors of another dimension are skipped
+        """
+        items = [(item_id, _unit(v)) for item_id, v in items if len(v) == self.dim]
+        if not items:
+            return
+        for (item_id, _), label in zip(items, self.assign([v for _, v in items])):
+            self.assignments[item_id] = int(label)
+        self._list_rows = None
+        self.dirty = True
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """Drop ids from the index."""
+        for item_id in ids:
+            if self.assignments.pop(item_id, None) is not None:
+                self._list_rows = None
+                self.dirty = True
+
+    def sync(self, index: PackedVectorIndex) -> None:
+        """
+        Reconcile with the packed index and map lists to its row numbers.
+
+        Ids no longer in the store are dropped and unseen ids are assigned
+        from their packed vectors. Cheap when nothing changed.
+        """
+        key = (index.generation, index.count)
+        if self._list_rows is not None and self._rows_key == key:
+            return
+
+        present = set(index.ids)
+        stale = [item_id for item_id in self.assignments if item_id not in present]
+        if stale:
+            self.remove(stale)
+
+        new_rows = [row for row, item_id in enumerate(index.ids) if item_id not in self.assignments]
+        for start in range(0, len(new_rows), 4096):
+            chunk = new_rows[start:start + 4096]
+            labels = self.assign(self._unit_rows(index, chunk))
+            for row, label in zip(chunk, labels):
+                self.assignments[index.ids[row]] = int(label)
+            self.dirty = True
+
+        list_rows: List[List[int]] = [[] for _ in range(self.n_lists)]
+        assignments = self.assignments
+        for row, item_id in enumerate(index.ids):
+            list_rows[assignments[item_id]].append(row)
+
+        if self.generation != index.generation:
+            self.generation = index.generation
+            self.dirty = True
+        self._list_rows = list_rows
+        self._rows_key = key
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def candidate_rows(
+        self,
+        query: Sequence[float],
+        min_candidates: int,
+        n_probe: Optional[int] = None,
+        allowed: Optional[Iterable[int]] = None
+    ) -> List[int]:
+        """
+        Packed rows in the lists closest to the query.
+
+        Probes at least n_probe lists, then keeps going until min_candidates
+        rows (that pass `allowed`) have been collected.
+
+        Args:
+            query: Query vector
+            min_candidates: Rows to gather before stopping
+            n_probe: Lists to probe at minimum (defaults to ~10% of lists)
+            allowed: Restrict to these rows (pre-resolved filters)
+
+        Returns:
+            Row indices for PackedVectorIndex.search
+        """
+        if self._list_rows is None:
+            raise RuntimeError("IVFIndex.sync() must be called before searching")
+        n_probe = n_probe or self.default_n_probe()
+        q = _unit(query)
+
+        if HAS_NUMPY:
+            order = np.argsort(-(self._matrix @ np.asarray(q, dtype=np.float32)), kind="stable").tolist()
+        else:
+            scores = [_dot(c, q) for c in self.centroids]
+            order = sorted(range(len(scores)), key=lambda c: -scores[c])
+
+        allowed = set(allowed) if allowed is not None else None
+        rows: List[int] = []
+        for probed, label in enumerate(order):
+            if probed >= n_probe and len(rows) >= min_candidates:
+                break
+            list_rows = self._list_rows[label]
+            rows.extend(list_rows if allowed is None else [r for r in list_rows if r in allowed])
+        return rows
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def save(self) -> bool:
+        """Write the index atomically; returns False if the directory is read-only."""
+        flat = array("f", (x for centroid in self.centroids for x in centroid))
+        if sys.byteorder != "little":
+            flat.byteswap()
+        data = {
+            "version": ANN_VERSION,
+            "dim": self.dim,
+            "generation": self.generation,
+            "trained_count": self.trained_count,
+            "centroids": base64.b64encode(flat.tobytes()).decode("ascii"),
+            "assignments": self.assignments,
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+        self.dirty = False
+        return True
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["IVFIndex"]:
+        """
+        Open a saved index.
+
+        Returns:
+            IVFIndex (call sync() before searching), or None if missing or corrupt
+        """
+        path = Path(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != ANN_VERSION:
+                return None
+            dim = int(data["dim"])
+            flat = array("f")
+            flat.frombytes(base64.b64decode(data["centroids"]))
+            if sys.byteorder != "little":
+                flat.byteswap()
+            if not dim or len(flat) % dim:
+                return None
+            centroids = [list(flat[i:i + dim]) for i in range(0, len(flat), dim)]
+            assignments = data["assignments"]
+            if any(not 0 <= label < len(centroids) for label in assignments.values()):
+                return None
+            return cls(path, dim, centroids, assignments,
+                       int(data["trained_count"]), int(data["generation"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
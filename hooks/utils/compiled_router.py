@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Compiled Route Matcher
+
+Precompiled matchers for SemanticRouter's keyword, file-pattern and
+error-pattern routes. The router used to lowercase the input and run an
+`in` check (or fnmatch) per configured pattern, so routing cost grew with
+the agent catalog.
+
+Instead:
+- Keywords and error strings are each compiled into one trie-shaped regex
+  (an Aho-Corasick style automaton run by the C regex engine). A single scan
+  finds the longest entry starting at each position; the shorter entries it
+  contains as prefixes are resolved from a dict, so every match is reported
+  and scan cost depends on the input length, not the number of entries.
+- Globs are translated with fnmatch and joined into one regex of optional
+  named lookaheads, so one match call reports every glob that fits.
+- The regex sources are cached on disk keyed by the config file's mtime and
+  size, so later processes skip trie building and glob translation.
+
+A pure-Python automaton walk (one dict lookup per character) would lose to
+these C-level scans at any catalog size the router sees, for the same
+reason safety_matcher.py prefilters with str.__contains__.
+
+Usage:
+    from compiled_router import load_compiled_routes
+
+    routes = load_compiled_routes(config["routing"], config_path=CONFIG_PATH)
+    for index in routes.keywords.matches("fix the login bug"):
+        print(routes.keywords.patterns[index])
+"""
+
+import os
+import re
+import json
+import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+ROUTER_CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = Path.home() / ".claude" / "config" / "router-cache.json"
+
+# Set to "off" to compile routes without the disk cache
+CACHE_PATH_ENV = "POPKIT_ROUTER_CACHE"
+
+# Marks the end of a literal in the trie
+_END = ""
+
+
+def literal_trie_regex(literals: List[str]) -> str:
+    """
+    Regex source matching the longest of `literals` at a position.
+
+    Children of each trie node start with distinct characters and a
+    terminal node makes its subtree optional (greedy), so the regex engine
+    never backtracks across siblings.
+
+    Args:
+        literals: Non-empty strings
+
+    Returns:
+        Regex source (empty string if there are no literals)
+    """
+    trie: Dict[str, Any] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child)
+                    for char, child in sorted(node.items()) if char != _END]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if _END in node else body
+
+    return emit(trie)
+
+
+def glob_set_regex(globs: List[str]) -> str:
+    """
+    Regex source whose named group g<i> is set when glob i matches.
+
+    Each glob is an optional lookahead at the start of the string, so a
+    single re.match evaluates all of them.
+    """
+    return "".join(
+        f"(?=(?P<g{i}>{fnmatch.translate(os.path.normcase(glob))}))?"
+        for i, glob in enumerate(globs)
+    )
+
+
+# =============================================================================
+# MATCHERS
+# =============================================================================
+
+class LiteralSet:
+    """Case-insensitive substring matcher over an ordered list of literals."""
+
+    def __init__(self, patterns: List[str], source: Optional[str] = None):
+        """
+        Args:
+            patterns: Literals, in reporting order
+            source: Precompiled literal_trie_regex() source (from the cache)
+        """
+        self.patterns = list(patterns)
+        self._indices: Dict[str, List[int]] = {}
+        self._always: List[int] = []
+        for i, pattern in enumerate(self.patterns):
+            literal = pattern.lower()
+            if literal:
+                self._indices.setdefault(literal, []).append(i)
+            else:
+                self._always.append(i)  # "" is in every string
+        self._lengths = sorted({len(literal) for literal in self._indices})
+        if source is None:
+            source = literal_trie_regex(list(self._indices))
+        self.source = source
+        self._regex = re.compile(f"(?=({source}))") if source else None
+
+    def matches(self, text: str) -> List[int]:
+        """
+        Indices of the literals that occur in `text` (case-insensitive).
+
+        Returns:
+            Sorted pattern indices
+        """
+        found = list(self._always)
+        if self._regex is None:
+            return found
+
+        seen = set()
+        indices = self._indices
+        for match in self._regex.finditer(text.lower()):
+            longest = match.group(1)
+            if longest in seen:
+                continue
+            # Shorter literals starting here are prefixes of the longest one
+            for length in self._lengths:
+                if length > len(longest):
+                    break
+                prefix = longest[:length]
+                if prefix not in seen and prefix in indices:
+                    seen.add(prefix)
+                    found.extend(indices[prefix])
+        return sorted(set(found))
+
+
+class GlobSet:
+    """fnmatch-compatible matcher over an ordered list of globs."""
+
+    def __init__(self, patterns: List[str], source: Optional[str] = None):
+        """
+        Args:
+            patterns: Globs, in reporting order
+            source: Precompiled glob_set_regex() source (from the cache)
+        """
+        self.patterns = list(patterns)
+        if source is None:
+            source = glob_set_regex(self.patterns)
+        self.source = source
+        self._regex = re.compile(source) if self.patterns else None
+
+    def matches(self, path: str) -> List[int]:
+        """
+        Indices of the globs `path` matches (as fnmatch.fnmatch would).
+
+        Returns:
+            Sorted pattern indices
+        """
+        if self._regex is None:
+            return []
+        groups = self._regex.match(os.path.normcase(path)).groupdict()
+        return [i for i in range(len(self.patterns)) if groups[f"g{i}"] is not None]
+
+
+# =============================================================================
+# COMPILED ROUTES
+# =============================================================================
+
+class CompiledRoutes:
+    """Keyword, file-pattern and error-pattern matchers plus their agents."""
+
+    def __init__(self, routing: Dict[str, Any], sources: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            routing: Config with "keywords", "filePatterns" and "errorPatterns"
+                maps of pattern -> agent list
+            sources: Cached regex sources keyed the same way
+        """
+        sources = sources or {}
+        keywords = routing.get("keywords", {})
+        file_patterns = routing.get("filePatterns", {})
+        error_patterns = routing.get("errorPatterns", {})
+
+        self.keywords = LiteralSet(list(keywords), sources.get("keywords"))
+        self.file_patterns = GlobSet(list(file_patterns), sources.get("filePatterns"))
+        self.error_patterns = LiteralSet(list(error_patterns), sources.get("errorPatterns"))
+        self.keyword_agents = list(keywords.values())
+        self.file_pattern_agents = list(file_patterns.values())
+        self.error_pattern_agents = list(error_patterns.values())
+
+    def sources(self) -> Dict[str, str]:
+        """Regex sources to cache."""
+        return {
+            "keywords": self.keywords.source,
+            "filePatterns": self.file_patterns.source,
+            "errorPatterns": self.error_patterns.source,
+        }
+
+
+def resolve_cache_path(cache_path: Optional[Path] = None) -> Optional[Path]:
+    """
+    Cache file to use: the argument, then POPKIT_ROUTER_CACHE, then the default.
+
+    Returns:
+        Path, or None if the disk cache is turned off
+    """
+    if cache_path is not None:
+        return Path(cache_path)
+    env = os.environ.get(CACHE_PATH_ENV)
+    if env is not None:
+        return None if env.lower() in ("", "0", "off", "false") else Path(env)
+    return DEFAULT_CACHE_PATH
+
+
+def load_compiled_routes(
+    routing: Dict[str, Any],
+    config_path: Optional[Path] = None,
+    cache_path: Optional[Path] = None
+) -> CompiledRoutes:
+    """
+    Compile routing patterns, reusing cached regex sources when the config
+    file is unchanged.
+
+    Args:
+        routing: Routing section of the agent config
+        config_path: File `routing` was loaded from (None skips the disk cache)
+        cache_path: Cache file (defaults to POPKIT_ROUTER_CACHE, then
+            ~/.claude/config/router-cache.json)
+
+    Returns:
+        CompiledRoutes
+    """
+    cache_path = resolve_cache_path(cache_path)
+    if config_path is None or cache_path is None:
+        return CompiledRoutes(routing)
+
+    try:
+        stat = Path(config_path).stat()
+    except OSError:
+        return CompiledRoutes(routing)
+    key = {
+        "version": ROUTER_CACHE_VERSION,
+        "config": str(config_path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("key") == key:
+            return CompiledRoutes(routing, cached["sources"])
+    except (OSError, ValueError, KeyError, TypeError, re.error):
+        pass
+
+    routes = CompiledRoutes(routing)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"key": key, "sources": routes.sources()}), encoding="utf-8")
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass  # Cache is an optimization only
+    return routes
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Persistent Embedding Cache
+
+Content-addressed on-disk cache for Voyage embeddings, shared by every hook
+process. VoyageClient's in-memory dict only lives as long as one hook run,
+so without this every prompt paid a network embed even when it had been
+seen before.
+
+Entries are keyed by VoyageClient._cache_key (model + input type + text),
+stored as 12-byte keys and float32 BLOBs in a WAL-mode SQLite table, and
+evicted least-recently-used once the table grows past max_bytes.
+
+Lookups are plain WAL reads, so concurrent hook processes never queue on the
+write lock to serve hits. An entry's last_used is only rewritten when it is
+more than TOUCH_INTERVAL seconds old, which is precise enough for LRU at this
+size. Hit/miss counters are kept per process and added to the running totals
+in the database with the next write (a put, a touch or close()).
+
+Cache errors never fail an embed: lookups miss and writes are dropped.
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    from .vector_codec import pack_embedding, unpack_embedding
+except ImportError:
+    from vector_codec import pack_embedding, unpack_embedding
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_CACHE_PATH = Path.home() / ".claude" / "config" / "embedding-cache.db"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # ~16k voyage-3.5 vectors
+
+# Hits refresh last_used only when it is older than this (seconds)
+TOUCH_INTERVAL = 60
+
+# Eviction trims to this fraction of max_bytes so it doesn't run on every put
+EVICT_LOW_WATER = 0.9
+
+# SQLite host parameter limit is 999 on older builds
+QUERY_CHUNK = 500
+
+# Set to "off" to keep embeddings in memory only
+CACHE_PATH_ENV = "POPKIT_EMBEDDING_CACHE"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    key BLOB PRIMARY KEY,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_vectors_last_used ON vectors(last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0), ('bytes', 0), ('evictions', 0);
+"""
+
+
+def resolve_cache_path(cache_path: Optional[Path] = None) -> Optional[Path]:
+    """
+    Cache file to use: the argument, then POPKIT_EMBEDDING_CACHE, then the default.
+
+    Returns:
+        Path, or None if persistence is turned off
+    """
+    if cache_path is not None:
+        return Path(cache_path)
+    env = os.environ.get(CACHE_PATH_ENV)
+    if env is not None:
+        return None if env.lower() in ("", "0", "off", "false") else Path(env)
+    return DEFAULT_CACHE_PATH
+
+
+# =============================================================================
+# EMBEDDING CACHE
+# =============================================================================
+
+class EmbeddingCache:
+    """
+    SQLite-backed LRU cache of embedding vectors.
+
+    Safe to share between processes (WAL, busy timeout) and threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path: SQLite file. Defaults to ~/.claude/config/embedding-cache.db
+            max_bytes: Vector bytes kept before least-recently-used eviction
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Counts not yet added to the database totals
+        self._unflushed_hits = 0
+        self._unflushed_misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Write pending hit/miss counts and close the database."""
+        if self._conn is not None:
+            if self._unflushed_hits or self._unflushed_misses:
+                self._write(lambda conn: None)
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _chunks(keys: List[bytes]) -> Iterable[List[bytes]]:
+        for start in range(0, len(keys), QUERY_CHUNK):
+            yield keys[start:start + QUERY_CHUNK]
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors with a plain read.
+
+        Hits whose last_used is older than TOUCH_INTERVAL are then marked as
+        recently used in one short write; fresher hits write nothing.
+
+        Args:
+            keys: Hex cache keys
+
+        Returns:
+            Mapping of key to vector for the keys that were cached
+        """
+        if not keys:
+            return {}
+        found: Dict[str, List[float]] = {}
+        stale: List[bytes] = []
+        raw_keys = [bytes.fromhex(k) for k in dict.fromkeys(keys)]
+        now = time.time()
+        try:
+            conn = self._connect()
+            for chunk in self._chunks(raw_keys):
+                marks = ",".join("?" * len(chunk))
+                for key, vector, last_used in conn.execute(
+                    f"SELECT key, vector, last_used FROM vectors WHERE key IN ({marks})", chunk
+                ):
+                    found[key.hex()] = unpack_embedding(vector)
+                    if now - last_used > TOUCH_INTERVAL:
+                        stale.append(key)
+        except (sqlite3.Error, OSError):
+            found, stale = {}, []
+        self.hits += len(found)
+        self.misses += len(raw_keys) - len(found)
+        self._unflushed_hits += len(found)
+        self._unflushed_misses += len(raw_keys) - len(found)
+
+        if stale:
+            def touch(conn: sqlite3.Connection) -> None:
+                for chunk in self._chunks(stale):
+                    conn.execute(
+                        f"UPDATE vectors SET last_used = ? WHERE key IN ({','.join('?' * len(chunk))})",
+                        [now, *chunk]
+                    )
+            self._write(touch)
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]) -> None:
+        """
+        Store vectors, evicting least-recently-used entries past max_bytes.
+
+        Args:
+            vectors: Mapping of hex cache key to vector
+        """
+        if not vectors:
+            return
+        rows = [(bytes.fromhex(k), pack_embedding(v)) for k, v in vectors.items()]
+        now = time.time()
+
+        def put(conn: sqlite3.Connection) -> None:
+            replaced = 0
+            for chunk in self._chunks([key for key, _ in rows]):
+                marks = ",".join("?" * len(chunk))
+                replaced += conn.execute(
+                    f"SELECT COALESCE(SUM(length(vector)), 0) FROM vectors WHERE key IN ({marks})",
+                    chunk
+                ).fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO vectors (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, blob, now) for key, blob in rows]
+            )
+            self._bump(conn, bytes=sum(len(blob) for _, blob in rows) - replaced)
+            self._evict(conn)
+
+        self._write(put)
+
+    def stats(self) -> Dict[str, int]:
+        """Entry/byte counts, this process's hits/misses and the all-time totals."""
+        stats = {"entries": 0, "bytes": 0, "max_bytes": self.max_bytes,
+                 "hits": self.hits, "misses": self.misses,
+                 "total_hits": 0, "total_misses": 0, "evictions": 0}
+        try:
+            conn = self._connect()
+            stats["entries"] = conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+        except (sqlite3.Error, OSError):
+            return stats
+        stats.update(bytes=counters.get("bytes", 0), evictions=counters.get("evictions", 0),
+                     total_hits=counters.get("hits", 0) + self._unflushed_hits,
+                     total_misses=counters.get("misses", 0) + self._unflushed_misses)
+        return stats
+
+    def clear(self) -> int:
+        """Delete every cached vector; returns how many were removed."""
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            count = conn.execute("DELETE FROM vectors").rowcount
+            conn.execute("UPDATE counters SET value = 0 WHERE name = 'bytes'")
+            conn.execute("COMMIT")
+            return count
+        except (sqlite3.Error, OSError):
+            return 0
+
+    # =========================================================================
+    # INTERNAL METHODS
+    # =========================================================================
+
+    def _write(self, apply: Callable[[sqlite3.Connection], None]) -> bool:
+        """
+        Run `apply` in a write transaction, adding the pending hit/miss counts.
+
+        Returns:
+            False if the write failed (it is dropped; counts stay pending)
+        """
+        hits, misses = self._unflushed_hits, self._unflushed_misses
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                apply(conn)
+                self._bump(conn, hits=hits, misses=misses)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, OSError):
+            return False
+        self._unflushed_hits -= hits
+        self._unflushed_misses -= misses
+        return True
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, **deltas: int) -> None:
+        conn.executemany(
+            "UPDATE counters SET value = value + ? WHERE name = ?",
+            [(delta, name) for name, delta in deltas.items() if delta]
+        )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop oldest entries until the table is under the low-water mark."""
+        total = conn.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * EVICT_LOW_WATER)
+        victims, freed = [], 0
+        for key, size in conn.execute(
+            "SELECT key, length(vector) FROM vectors ORDER BY last_used"
+        ):
+            if total - freed <= target:
+                break
+            victims.append(key)
+            freed += size
+        for chunk in self._chunks(victims):
+            conn.execute(
+                f"DELETE FROM vectors WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+        self._bump(conn, bytes=-freed, evictions=len(victims))
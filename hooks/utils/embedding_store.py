@@ -3,7 +3,13 @@
 Embedding Storage and Retrieval
 
 SQLite-based vector storage with cosine similarity search.
-Stores embeddings as JSON arrays for portability (no native vector type needed).
+Stores embeddings as little-endian float32 BLOBs (legacy JSON-array rows are
+converted in place on first open) and decodes them lazily on access.
+Searches run against a packed float32 sidecar (see vector_index.py). Rows
+changed since the sidecar was built are logged by SQLite triggers and scored
+from a small in-memory delta, so the sidecar is only rewritten once enough
+rows have changed; large stores also use an IVF approximate nearest-neighbor
+index (see ann_index.py) to pick which packed rows to score.
 
 Part of PopKit Issue #19 (Embeddings Enhancement).
 """
@@ -13,11 +19,21 @@ import json
 import sqlite3
 import math
 import hashlib
+from array import array
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterable, Set, Union
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
+try:
+    from .vector_codec import pack_embedding, unpack_embedding, unpack_embedding_array
+    from .vector_index import HAS_NUMPY, PackedVectorIndex
+    from .ann_index import IVFIndex
+except ImportError:
+    from vector_codec import pack_embedding, unpack_embedding, unpack_embedding_array
+    from vector_index import HAS_NUMPY, PackedVectorIndex
+    from ann_index import IVFIndex
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -26,6 +42,35 @@ DEFAULT_DB_PATH = Path.home() / ".claude" / "config" / "embeddings.db"
 DEFAULT_EMBEDDING_MODEL = "voyage-3.5"
 DEFAULT_EMBEDDING_DIM = 1024
 
+# Changed rows served from the in-memory delta before the sidecar is rebuilt
+VECTOR_DELTA_MAX_ROWS = 1024
+
+# Searches over fewer candidate rows than this stay exact
+ANN_MIN_ROWS = 10000
+
+# ANN searches score at least this many candidates per requested result
+ANN_CANDIDATES_PER_RESULT = 50
+ANN_MIN_CANDIDATES = 500
+
+# PRAGMA user_version once embeddings are stored as float32 BLOBs
+SCHEMA_VERSION_BINARY = 2
+
+# Metadata values are mirrored into embedding_metadata by triggers: scalars
+# as-is, lists one row per element (so {"tags": "redis"} matches membership)
+METADATA_INDEX_SQL = """
+    DELETE FROM embedding_metadata WHERE embedding_id = NEW.id;
+    INSERT INTO embedding_metadata (embedding_id, key, value)
+        SELECT NEW.id, m.key, m.value FROM json_each(NEW.metadata) AS m
+        WHERE m.type NOT IN ('array', 'object')
+        UNION ALL
+        SELECT NEW.id, m.key, e.value
+        FROM json_each(NEW.metadata) AS m, json_each(m.value) AS e
+        WHERE m.type = 'array' AND e.type NOT IN ('array', 'object');
+"""
+
+# Metadata predicate: exact value, or any of a list of values
+MetadataFilter = Dict[str, Union[str, int, float, bool, List[Any]]]
+
 
 # =============================================================================
 # DATA CLASSES
@@ -53,9 +98,48 @@ class EmbeddingRecord:
         """Create from dictionary."""
         return cls(**d)
 
+    @classmethod
+    def from_blob(cls, blob: bytes, **fields) -> 'EmbeddingRecord':
+        """
+        Create a record whose vector is decoded on first access.
+
+        Args:
+            blob: Little-endian float32 vector bytes
+            **fields: Remaining EmbeddingRecord fields
+
+        Returns:
+            EmbeddingRecord with a lazy `embedding`
+        """
+        record = cls(embedding=[], **fields)
+        del record.embedding
+        record._embedding_blob = bytes(blob)
+        return record
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached while a lazy record's vector is still undecoded
+        if name == "embedding":
+            blob = self.__dict__.get("_embedding_blob")
+            if blob is not None:
+                self.embedding = unpack_embedding(blob)
+                return self.embedding
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    @property
+    def is_decoded(self) -> bool:
+        """Whether the vector has been materialized as a list."""
+        return "embedding" in self.__dict__
+
+    def to_blob(self) -> bytes:
+        """Get the float32 bytes, reusing the stored blob if still undecoded."""
+        if not self.is_decoded:
+            return self.__dict__["_embedding_blob"]
+        return pack_embedding(self.embedding)
+
     @property
     def dimension(self) -> int:
         """Get embedding dimension."""
+        if not self.is_decoded:
+            return len(self.__dict__["_embedding_blob"]) // 4
         return len(self.embedding)
 
 
@@ -89,17 +173,45 @@ class EmbeddingStore:
     - Filter by source type
     - Batch operations
     - Thread-safe connections
+    - Packed vector index for batched similarity search
     """
 
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        use_vector_index: bool = True,
+        use_ann_index: Optional[bool] = None,
+        ann_threshold: int = ANN_MIN_ROWS,
+        ann_n_probe: Optional[int] = None
+    ):
         """
         Initialize the embedding store.
 
         Args:
             db_path: Path to SQLite database. Defaults to ~/.claude/config/embeddings.db
+            use_vector_index: Search through the packed sidecar index. When False,
+                every search decodes and scores the SQLite rows directly.
+            use_ann_index: Use the IVF index for searches over at least
+                ann_threshold rows. Defaults to on when NumPy is installed.
+            ann_threshold: Candidate count below which searches stay exact
+            ann_n_probe: IVF lists probed per query (defaults to ~10% of lists)
         """
         self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.db_path.with_suffix(".vectors")
+        self.ann_path = self.db_path.with_suffix(".ivf")
+        self.use_vector_index = use_vector_index
+        self.use_ann_index = HAS_NUMPY if use_ann_index is None else use_ann_index
+        self.ann_threshold = ann_threshold
+        self.ann_n_probe = ann_n_probe
+        self._vector_index: Optional[PackedVectorIndex] = None
+        self._ann_index: Optional[IVFIndex] = None
+        # Rows changed since _vector_index was built: id -> row (None if deleted)
+        self._delta_rows: Dict[str, Optional[Tuple[str, str, Optional[str], array]]] = {}
+        self._delta_index: Optional[PackedVectorIndex] = None
+        self._delta_generation = -1
+        self._masked_rows: Set[int] = set()
+        self._base_rows: Optional[Dict[str, int]] = None
         self._init_db()
 
     def _get_connection(self) -> sqlite3.Connection:
@@ -113,7 +225,7 @@ class EmbeddingStore:
                 CREATE TABLE IF NOT EXISTS embeddings (
                     id TEXT PRIMARY KEY,
                     content TEXT NOT NULL,
-                    embedding TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
                     source_type TEXT NOT NULL,
                     source_id TEXT NOT NULL,
                     metadata TEXT,
@@ -145,6 +257,13 @@ class EmbeddingStore:
             # Migration: Add project_path column if it doesn't exist (for existing DBs)
             self._migrate_add_project_path(conn)
 
+            # Migration: Convert JSON-array embeddings to float32 BLOBs
+            self._migrate_binary_embeddings(conn)
+
+            self._init_index_generation(conn)
+
+            self._metadata_indexed = self._init_metadata_index(conn)
+
     def _migrate_add_project_path(self, conn: sqlite3.Connection) -> None:
         """Add project_path column to existing databases."""
         try:
@@ -171,6 +290,175 @@ class EmbeddingStore:
         except Exception:
             pass  # Column already exists or other non-critical error
 
+    def _migrate_binary_embeddings(self, conn: sqlite3.Connection) -> None:
+        """
+        Convert legacy JSON-text embeddings to float32 BLOBs in place.
+
+        Runs once per database (tracked with PRAGMA user_version), in chunks
+        so large stores don't hold every vector in memory at once.
+        """
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION_BINARY:
+                return
+
+            converted = 0
+            last_rowid = 0
+            while True:
+                rows = conn.execute(
+                    """SELECT rowid, embedding FROM embeddings
+                       WHERE rowid > ? AND typeof(embedding) = 'text'
+                       ORDER BY rowid LIMIT 1000""",
+                    (last_rowid,)
+                ).fetchall()
+                if not rows:
+                    break
+
+                updates = []
+                for rowid, text in rows:
+                    last_rowid = rowid
+                    try:
+                        vector = json.loads(text)
+                    except ValueError:
+                        continue  # Leave unparseable rows for _row_to_record
+                    updates.append((pack_embedding(vector), len(vector), rowid))
+
+                conn.executemany(
+                    "UPDATE embeddings SET embedding = ?, embedding_dim = ? WHERE rowid = ?",
+                    updates
+                )
+                converted += len(updates)
+
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION_BINARY}")
+            conn.commit()
+
+            if converted:
+                conn.execute("VACUUM")  # Reclaim the space the JSON text used
+        except sqlite3.Error:
+            pass  # Read-only or locked DB; JSON rows are still readable
+
+    def _init_index_generation(self, conn: sqlite3.Connection) -> None:
+        """
+        Track a generation counter that moves on every row change.
+
+        Triggers keep it current for any writer, so the packed vector index
+        only has to compare one integer to know whether it is stale, and log
+        the changed id under the new generation in index_log so a stale index
+        can catch up on just those rows.
+        """
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    generation INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO index_state (id, generation) VALUES (0, 0)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_log (
+                    seq INTEGER PRIMARY KEY,
+                    generation INTEGER NOT NULL,
+                    id TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_index_log_generation
+                ON index_log(generation)
+            """)
+
+            log_sql = """
+                INSERT INTO index_log (generation, id)
+                    SELECT generation, {row}.id FROM index_state WHERE id = 0{where};
+            """
+            logged = {
+                "INSERT": log_sql.format(row="NEW", where=""),
+                "UPDATE": log_sql.format(row="NEW", where="")
+                          + log_sql.format(row="OLD", where=" AND OLD.id IS NOT NEW.id"),
+                "DELETE": log_sql.format(row="OLD", where=""),
+            }
+            for event, log in logged.items():
+                # Superseded by the logging triggers below
+                conn.execute(f"DROP TRIGGER IF EXISTS trg_embeddings_{event.lower()}_generation")
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_embeddings_{event.lower()}_index_log
+                    AFTER {event} ON embeddings
+                    BEGIN
+                        UPDATE index_state SET generation = generation + 1 WHERE id = 0;
+                        {log}
+                    END
+                """)
+
+            conn.commit()
+        except sqlite3.Error:
+            pass  # Read-only DB; searches fall back to row scans
+
+    def _init_metadata_index(self, conn: sqlite3.Connection) -> bool:
+        """
+        Keep an indexed (key, value) copy of each row's metadata.
+
+        Filtered searches resolve metadata predicates through this table
+        instead of decoding every row's JSON. Existing rows are backfilled
+        the first time the table is created.
+
+        Returns:
+            True if the table is usable (needs SQLite's JSON functions)
+        """
+        try:
+            created = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'embedding_metadata'"
+            ).fetchone() is None
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embedding_metadata (
+                    embedding_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_metadata_key_value
+                ON embedding_metadata(key, value, embedding_id)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_metadata_embedding
+                ON embedding_metadata(embedding_id)
+            """)
+
+            for event in ("INSERT", "UPDATE"):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_embeddings_{event.lower()}_metadata
+                    AFTER {event} ON embeddings
+                    WHEN json_valid(NEW.metadata)
+                    BEGIN
+                        {METADATA_INDEX_SQL}
+                    END
+                """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_embeddings_delete_metadata
+                AFTER DELETE ON embeddings
+                BEGIN
+                    DELETE FROM embedding_metadata WHERE embedding_id = OLD.id;
+                END
+            """)
+
+            if created:
+                conn.execute("""
+                    INSERT INTO embedding_metadata (embedding_id, key, value)
+                    SELECT r.id, m.key, m.value
+                    FROM embeddings AS r, json_each(r.metadata) AS m
+                    WHERE json_valid(r.metadata) AND m.type NOT IN ('array', 'object')
+                    UNION ALL
+                    SELECT r.id, m.key, e.value
+                    FROM embeddings AS r, json_each(r.metadata) AS m, json_each(m.value) AS e
+                    WHERE json_valid(r.metadata) AND m.type = 'array'
+                    AND e.type NOT IN ('array', 'object')
+                """)
+
+            conn.commit()
+            return True
+        except sqlite3.Error:
+            return False  # No JSON1 or read-only DB; metadata is filtered per row
+
     # =========================================================================
     # CRUD OPERATIONS
     # =========================================================================
@@ -193,13 +481,13 @@ class EmbeddingStore:
             """, (
                 record.id,
                 record.content,
-                json.dumps(record.embedding),
+                record.to_blob(),
                 record.source_type,
                 record.source_id,
                 json.dumps(record.metadata),
                 record.created_at,
                 record.embedding_model,
-                len(record.embedding),
+                record.dimension,
                 content_hash,
                 record.project_path
             ))
@@ -225,13 +513,13 @@ class EmbeddingStore:
                 data.append((
                     record.id,
                     record.content,
-                    json.dumps(record.embedding),
+                    record.to_blob(),
                     record.source_type,
                     record.source_id,
                     json.dumps(record.metadata),
                     record.created_at,
                     record.embedding_model,
-                    len(record.embedding),
+                    record.dimension,
                     content_hash,
                     record.project_path
                 ))
@@ -353,37 +641,134 @@ class EmbeddingStore:
         Returns:
             List of SearchResult ordered by similarity (descending)
         """
-        exclude_ids = exclude_ids or []
-
-        with self._get_connection() as conn:
-            if source_type:
-                rows = conn.execute(
-                    "SELECT * FROM embeddings WHERE source_type = ?",
-                    (source_type,)
-                ).fetchall()
-            else:
-                rows = conn.execute("SELECT * FROM embeddings").fetchall()
-
-        results = []
-        for row in rows:
-            record = self._row_to_record(row)
+        return self.search_filtered(
+            query_embedding,
+            source_type=source_type,
+            top_k=top_k,
+            min_similarity=min_similarity,
+            exclude_ids=exclude_ids
+        )
 
-            if record.id in exclude_ids:
-                continue
+    def search_filtered(
+        self,
+        query_embedding: List[float],
+        source_type: Optional[Union[str, Iterable[str]]] = None,
+        project_path: Optional[str] = None,
+        include_global: bool = False,
+        metadata: Optional[MetadataFilter] = None,
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        exclude_ids: Optional[List[str]] = None,
+        global_boost: float = 0.0
+    ) -> List[SearchResult]:
+        """
+        Top-k similarity search over only the rows matching every filter.
 
-            similarity = self._cosine_similarity(query_embedding, record.embedding)
+        Filters are resolved before any vector is scored (source type and
+        project through their indexed columns or the packed offset table,
+        metadata through embedding_metadata), so callers get exactly top_k
+        matches without over-fetching and filtering afterwards.
 
-            if similarity >= min_similarity:
-                results.append(SearchResult(record=record, similarity=similarity))
+        Args:
+            query_embedding: Query vector
+            source_type: Source type, or a list of accepted source types
+            project_path: Keep only rows for this project
+            include_global: With project_path, also keep rows with no project
+            metadata: Key -> value (or list of accepted values) predicates;
+                list-valued metadata matches if any element is equal
+            top_k: Number of results to return
+            min_similarity: Minimum similarity threshold
+            exclude_ids: IDs to exclude from results
+            global_boost: Added to the similarity of rows with no project
 
-        # Sort by similarity descending
-        results.sort(key=lambda x: x.similarity, reverse=True)
+        Returns:
+            List of SearchResult ordered by similarity (descending)
+        """
+        if isinstance(source_type, str):
+            source_types = [source_type]
+        else:
+            source_types = list(source_type) if source_type is not None else None
+        if source_types == []:
+            return []
+
+        index = self._get_vector_index(len(query_embedding))
+        if index is not None and (not metadata or self._metadata_indexed):
+            ids = self._metadata_ids(metadata) if metadata else None
+            if ids is not None and not ids:
+                return []
+            rows = index.candidate_rows(
+                source_type=source_types,
+                project_path=project_path,
+                include_global=include_global,
+                exclude_ids=exclude_ids,
+                ids=ids
+            )
+            if (rows is None and index.count >= self.ann_threshold) or \
+                    (rows is not None and len(rows) >= self.ann_threshold):
+                ann = self._get_ann_index(index)
+                if ann is not None:
+                    rows = ann.candidate_rows(
+                        query_embedding,
+                        min_candidates=max(top_k * ANN_CANDIDATES_PER_RESULT, ANN_MIN_CANDIDATES),
+                        n_probe=self.ann_n_probe,
+                        allowed=rows
+                    )
+            # Rows changed since the sidecar was built are masked there and
+            # scored from the delta instead
+            masked = self._masked_rows
+            hits = [
+                (index.ids[row], similarity)
+                for row, similarity in index.search(
+                    query_embedding, top_k + len(masked), min_similarity,
+                    rows=rows, global_boost=global_boost
+                )
+                if row not in masked
+            ]
+            delta = self._delta_index
+            if delta is not None and delta.count:
+                delta_rows = delta.candidate_rows(
+                    source_type=source_types,
+                    project_path=project_path,
+                    include_global=include_global,
+                    exclude_ids=exclude_ids,
+                    ids=ids
+                )
+                hits.extend(
+                    (delta.ids[row], similarity)
+                    for row, similarity in delta.search(
+                        query_embedding, top_k, min_similarity,
+                        rows=delta_rows, global_boost=global_boost
+                    )
+                )
+                hits.sort(key=lambda hit: -hit[1])
+            return self._hits_to_results(hits[:top_k])
+
+        clauses, params = [], []
+        if source_types is not None:
+            clauses.append(f"source_type IN ({','.join('?' * len(source_types))})")
+            params.extend(source_types)
+        if project_path is not None:
+            clauses.append(
+                "(project_path = ? OR project_path IS NULL)" if include_global
+                else "project_path = ?"
+            )
+            params.append(project_path)
+        if metadata and self._metadata_indexed:
+            subquery, subparams = self._metadata_subquery(metadata)
+            clauses.append(f"id IN ({subquery})")
+            params.extend(subparams)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._get_connection() as conn:
+            rows = conn.execute(f"SELECT * FROM embeddings{where}", params).fetchall()
 
-        # Add ranks and limit
-        for i, result in enumerate(results[:top_k]):
-            result.rank = i + 1
+        if metadata and not self._metadata_indexed:
+            rows = [row for row in rows if self._metadata_matches(row[5], metadata)]
 
-        return results[:top_k]
+        return self._scan_rows(
+            rows, query_embedding, top_k, min_similarity,
+            exclude_ids=exclude_ids, global_boost=global_boost
+        )
 
     def search_by_content(
         self,
@@ -448,7 +833,7 @@ class EmbeddingStore:
         self,
         query_embedding: List[float],
         project_path: str,
-        source_type: Optional[str] = None,
+        source_type: Optional[Union[str, Iterable[str]]] = None,
         top_k: int = 5,
         min_similarity: float = 0.0,
         include_global: bool = True,
@@ -463,7 +848,7 @@ class EmbeddingStore:
         Args:
             query_embedding: Query vector
             project_path: Project root path to scope results
-            source_type: Optional filter by source type
+            source_type: Optional filter by source type (or list of types)
             top_k: Number of results to return
             min_similarity: Minimum similarity threshold
             include_global: Whether to include global PopKit items
@@ -472,55 +857,15 @@ class EmbeddingStore:
         Returns:
             List of SearchResult ordered by similarity (descending)
         """
-        with self._get_connection() as conn:
-            # Build query based on filters
-            if include_global:
-                if source_type:
-                    rows = conn.execute(
-                        """SELECT * FROM embeddings
-                           WHERE (project_path = ? OR project_path IS NULL)
-                           AND source_type = ?""",
-                        (project_path, source_type)
-                    ).fetchall()
-                else:
-                    rows = conn.execute(
-                        """SELECT * FROM embeddings
-                           WHERE project_path = ? OR project_path IS NULL""",
-                        (project_path,)
-                    ).fetchall()
-            else:
-                if source_type:
-                    rows = conn.execute(
-                        """SELECT * FROM embeddings
-                           WHERE project_path = ? AND source_type = ?""",
-                        (project_path, source_type)
-                    ).fetchall()
-                else:
-                    rows = conn.execute(
-                        "SELECT * FROM embeddings WHERE project_path = ?",
-                        (project_path,)
-                    ).fetchall()
-
-        results = []
-        for row in rows:
-            record = self._row_to_record(row)
-            similarity = self._cosine_similarity(query_embedding, record.embedding)
-
-            # Apply boost for global items
-            if record.project_path is None and global_boost != 0.0:
-                similarity += global_boost
-
-            if similarity >= min_similarity:
-                results.append(SearchResult(record=record, similarity=similarity))
-
-        # Sort by similarity descending
-        results.sort(key=lambda x: x.similarity, reverse=True)
-
-        # Add ranks and limit
-        for i, result in enumerate(results[:top_k]):
-            result.rank = i + 1
-
-        return results[:top_k]
+        return self.search_filtered(
+            query_embedding,
+            source_type=source_type,
+            project_path=project_path,
+            include_global=include_global,
+            top_k=top_k,
+            min_similarity=min_similarity,
+            global_boost=global_boost
+        )
 
     def clear_project(
         self,
@@ -697,6 +1042,322 @@ class EmbeddingStore:
             for row in rows
         ]
 
+    # =========================================================================
+    # VECTOR INDEX
+    # =========================================================================
+
+    def _get_generation(self) -> Optional[int]:
+        """Current row generation, or None if the DB has no tracking table."""
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT generation FROM index_state WHERE id = 0"
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def _get_vector_index(self, query_dim: int) -> Optional[PackedVectorIndex]:
+        """
+        Get a packed index that, with the delta, matches the current SQLite rows.
+
+        Reuses the in-process index, then the on-disk sidecar, and catches up
+        on rows changed since it was built through index_log. The sidecar is
+        rebuilt from SQLite only when the log can't cover the gap or more than
+        VECTOR_DELTA_MAX_ROWS rows have changed.
+
+        Args:
+            query_dim: Dimension of the query vector
+
+        Returns:
+            PackedVectorIndex, or None to use the row-scan path (index disabled,
+            mixed dimensions in the store, or dimension mismatch with the query)
+        """
+        if not self.use_vector_index:
+            return None
+
+        generation = self._get_generation()
+        if generation is None:
+            return None
+
+        index = self._vector_index
+        if index is None or index.generation != generation:
+            # Another process may have rebuilt the sidecar past our copy
+            stored = PackedVectorIndex.stored_generation(self.index_path)
+            if stored is not None and (index is None or stored > index.generation):
+                loaded = PackedVectorIndex.load(self.index_path)
+                if loaded is not None:
+                    self._set_vector_index(loaded)
+                    index = loaded
+
+        if index is None or not self._sync_delta(index, generation):
+            index = self.rebuild_vector_index(generation)
+
+        if index is None or (index.count and index.dim != query_dim):
+            return None
+        return index
+
+    def _set_vector_index(self, index: Optional[PackedVectorIndex]) -> None:
+        """Swap in a new base index and drop the delta built against the old one."""
+        if self._vector_index is not None and self._vector_index is not index:
+            self._vector_index.close()
+        self._vector_index = index
+        self._delta_rows = {}
+        self._delta_index = None
+        self._delta_generation = index.generation if index is not None else -1
+        self._masked_rows = set()
+        self._base_rows = None
+
+    def _sync_delta(self, index: PackedVectorIndex, generation: int) -> bool:
+        """
+        Bring the delta over `index` up to `generation` from index_log.
+
+        Returns:
+            False if the index must be rebuilt instead (log incomplete, too
+            many changed rows, or a changed row with another dimension)
+        """
+        since = self._delta_generation
+        if since >= generation:
+            return True
+
+        try:
+            with self._get_connection() as conn:
+                first = conn.execute(
+                    "SELECT MIN(generation) FROM index_log WHERE generation > ?", (since,)
+                ).fetchone()[0]
+                if first != since + 1:
+                    return False  # Pruned past our index, or written before logging
+                changed = [row[0] for row in conn.execute(
+                    "SELECT DISTINCT id FROM index_log WHERE generation > ? LIMIT ?",
+                    (since, VECTOR_DELTA_MAX_ROWS + 1)
+                )]
+                if len(changed) > VECTOR_DELTA_MAX_ROWS:
+                    return False
+                current = {}
+                for start in range(0, len(changed), 500):
+                    chunk = changed[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    for row in conn.execute(
+                        "SELECT id, source_type, project_path, embedding FROM embeddings "
+                        f"WHERE id IN ({placeholders})", chunk
+                    ):
+                        current[row[0]] = (row[0], row[1], row[2], self._decode_vector(row[3]))
+        except sqlite3.Error:
+            return False
+
+        delta_rows = dict(self._delta_rows)
+        for item_id in changed:
+            delta_rows[item_id] = current.get(item_id)
+        if len(delta_rows) > VECTOR_DELTA_MAX_ROWS:
+            return False
+        live = [row for row in delta_rows.values() if row is not None]
+        if any(len(row[3]) != index.dim for row in live):
+            return False
+
+        if self._base_rows is None:
+            self._base_rows = {item_id: row for row, item_id in enumerate(index.ids)}
+        self._delta_rows = delta_rows
+        self._delta_index = PackedVectorIndex.from_rows(
+            self.index_path, live, index.dim, generation
+        ) if live else None
+        self._masked_rows = {
+            self._base_rows[item_id] for item_id in delta_rows if item_id in self._base_rows
+        }
+        self._delta_generation = generation
+        return True
+
+    def rebuild_vector_index(self, generation: Optional[int] = None) -> Optional[PackedVectorIndex]:
+        """
+        Rebuild the packed vector sidecar from the SQLite rows.
+
+        Args:
+            generation: Generation to stamp (defaults to the current one)
+
+        Returns:
+            The new index, or None if the store holds mixed dimensions
+        """
+        if generation is None:
+            generation = self._get_generation() or 0
+
+        with self._get_connection() as conn:
+            dims = conn.execute(
+                "SELECT DISTINCT embedding_dim FROM embeddings"
+            ).fetchall()
+            if len(dims) > 1:
+                return None
+            rows = conn.execute(
+                "SELECT id, source_type, project_path, embedding FROM embeddings ORDER BY rowid"
+            ).fetchall()
+
+        decoded = [(row[0], row[1], row[2], self._decode_vector(row[3])) for row in rows]
+        dim = len(decoded[0][3]) if decoded else 0
+        if any(len(vector) != dim for _, _, _, vector in decoded):
+            return None
+
+        self._set_vector_index(None)
+        index = PackedVectorIndex.build(self.index_path, decoded, dim, generation)
+        self._set_vector_index(index)
+        self._prune_index_log(generation)
+        return index
+
+    def _prune_index_log(self, generation: int) -> None:
+        """Forget changes already folded into a sidecar at `generation`."""
+        try:
+            with self._get_connection() as conn:
+                conn.execute("DELETE FROM index_log WHERE generation <= ?", (generation,))
+                conn.commit()
+        except sqlite3.Error:
+            pass  # Read-only DB; the log is pruned by the next writer's rebuild
+
+    # =========================================================================
+    # ANN INDEX
+    # =========================================================================
+
+    def _get_ann_index(self, index: PackedVectorIndex) -> Optional[IVFIndex]:
+        """
+        Get an IVF index synced to the packed index.
+
+        Loads the saved index (or trains one) on first use, and retrains when
+        the store has outgrown the centroids.
+
+        Returns:
+            IVFIndex, or None when disabled or the store is below ann_threshold
+        """
+        if not self.use_ann_index or index.count < self.ann_threshold:
+            return None
+
+        ann = self._ann_index or IVFIndex.load(self.ann_path)
+        if ann is None or ann.dim != index.dim or ann.needs_retrain(index.count):
+            ann = self.rebuild_ann_index(index)
+        else:
+            ann.sync(index)
+            if ann.dirty:
+                ann.save()
+        self._ann_index = ann
+        return ann
+
+    def rebuild_ann_index(self, index: Optional[PackedVectorIndex] = None) -> Optional[IVFIndex]:
+        """
+        Retrain the IVF index from the packed vectors and save it.
+
+        Args:
+            index: Packed index to train on (defaults to the current one)
+
+        Returns:
+            The new index, or None if the store has no usable packed index
+        """
+        if index is None:
+            generation = self._get_generation()
+            index = self._vector_index
+            if index is None or index.generation != generation:
+                index = self.rebuild_vector_index(generation)
+        if index is None or index.count == 0:
+            return None
+
+        ann = IVFIndex.train(self.ann_path, index)
+        ann.save()
+        self._ann_index = ann
+        return ann
+
+    def _get_records(self, ids: List[str]) -> Dict[str, EmbeddingRecord]:
+        """Load full records for a set of IDs in one query per chunk."""
+        records = {}
+        with self._get_connection() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT * FROM embeddings WHERE id IN ({placeholders})", chunk
+                ):
+                    records[row[0]] = self._row_to_record(row)
+        return records
+
+    def _hits_to_results(self, hits: List[Tuple[str, float]]) -> List[SearchResult]:
+        """Turn (id, similarity) hits into ranked SearchResults."""
+        records = self._get_records([item_id for item_id, _ in hits])
+
+        results = []
+        for item_id, similarity in hits:
+            record = records.get(item_id)
+            if record is None:
+                continue  # Deleted between index build and lookup
+            results.append(SearchResult(
+                record=record, similarity=similarity, rank=len(results) + 1
+            ))
+        return results
+
+    @staticmethod
+    def _metadata_subquery(metadata: MetadataFilter) -> Tuple[str, List[Any]]:
+        """SQL selecting the ids whose metadata satisfies every predicate."""
+        parts, params = [], []
+        for key, value in metadata.items():
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            parts.append(
+                "SELECT embedding_id FROM embedding_metadata "
+                f"WHERE key = ? AND value IN ({','.join('?' * len(values))})"
+            )
+            params.append(key)
+            params.extend(values)
+        return " INTERSECT ".join(parts), params
+
+    def _metadata_ids(self, metadata: MetadataFilter) -> Set[str]:
+        """IDs of rows whose metadata satisfies every predicate."""
+        subquery, params = self._metadata_subquery(metadata)
+        with self._get_connection() as conn:
+            return {row[0] for row in conn.execute(subquery, params)}
+
+    @staticmethod
+    def _metadata_matches(raw: Optional[str], metadata: MetadataFilter) -> bool:
+        """Check one row's metadata JSON (when embedding_metadata is unavailable)."""
+        try:
+            stored = json.loads(raw) if raw else {}
+        except ValueError:
+            return False
+        for key, value in metadata.items():
+            accepted = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            actual = stored.get(key)
+            actual_values = actual if isinstance(actual, list) else [actual]
+            if not any(v in accepted for v in actual_values if v is not None):
+                return False
+        return True
+
+    def _scan_rows(
+        self,
+        rows: List[tuple],
+        query_embedding: List[float],
+        top_k: int,
+        min_similarity: float,
+        exclude_ids: Optional[List[str]] = None,
+        global_boost: float = 0.0
+    ) -> List[SearchResult]:
+        """Score raw rows one by one (fallback when no packed index applies)."""
+        exclude_ids = exclude_ids or []
+
+        results = []
+        for row in rows:
+            record = self._row_to_record(row)
+
+            if record.id in exclude_ids:
+                continue
+
+            similarity = self._cosine_similarity(query_embedding, record.embedding)
+
+            # Apply boost for global items
+            if record.project_path is None and global_boost != 0.0:
+                similarity += global_boost
+
+            if similarity >= min_similarity:
+                results.append(SearchResult(record=record, similarity=similarity))
+
+        # Sort by similarity descending
+        results.sort(key=lambda x: x.similarity, reverse=True)
+
+        # Add ranks and limit
+        for i, result in enumerate(results[:top_k]):
+            result.rank = i + 1
+
+        return results[:top_k]
+
     # =========================================================================
     # UTILITIES
     # =========================================================================
@@ -724,14 +1385,19 @@ class EmbeddingStore:
 
         return dot_product / (norm_a * norm_b)
 
+    def _decode_vector(self, value) -> array:
+        """Decode a stored embedding (BLOB or legacy JSON text) to a float array."""
+        if isinstance(value, str):
+            return array("f", json.loads(value))
+        return unpack_embedding_array(value)
+
     def _row_to_record(self, row: tuple) -> EmbeddingRecord:
         """Convert database row to EmbeddingRecord."""
         # Row columns: id, content, embedding, source_type, source_id, metadata,
         #              created_at, embedding_model, embedding_dim, content_hash, project_path
-        return EmbeddingRecord(
+        fields = dict(
             id=row[0],
             content=row[1],
-            embedding=json.loads(row[2]),
             source_type=row[3],
             source_id=row[4],
             metadata=json.loads(row[5]) if row[5] else {},
@@ -739,6 +1405,9 @@ class EmbeddingStore:
             embedding_model=row[7] or DEFAULT_EMBEDDING_MODEL,
             project_path=row[10] if len(row) > 10 else None
         )
+        if isinstance(row[2], str):
+            return EmbeddingRecord(embedding=json.loads(row[2]), **fields)
+        return EmbeddingRecord.from_blob(row[2], **fields)
 
     def clear(self, source_type: Optional[str] = None) -> int:
         """
@@ -839,4 +1508,7 @@ if __name__ == "__main__":
     # Cleanup
     store.clear()
     test_db.unlink()
+    for sidecar in (store.index_path, PackedVectorIndex.table_path(store.index_path)):
+        if sidecar.exists():
+            sidecar.unlink()
     print("\nAll tests passed!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Lazy Imports for Hooks
+
+Hooks run as short-lived processes on every tool call, so module-level imports
+of heavy dependencies (requests, sqlite3, urllib-based API clients) are paid
+even on Read/Grep calls that never use them. `lazy_import` returns a module
+object that is only executed on first attribute access.
+
+Usage:
+    from lazy_import import lazy_import
+
+    requests = lazy_import("requests")          # Nothing loaded yet
+    premium_checker = lazy_import("premium_checker")
+
+    requests.post(...)                          # Loads requests here
+    if available(premium_checker):              # Loads it; False on ImportError
+        ...
+
+Note: `from x import y` defeats laziness (it reads an attribute immediately);
+keep the module object and access attributes at the call site instead. Hooks
+that annotate with lazy types (e.g. sqlite3.Connection) should use
+`from __future__ import annotations`.
+
+A found module can still fail to import (e.g. a dependency of its own is
+missing), and that error only surfaces on first use. Guard optional modules
+with `available(module)` where the old code checked a
+`try: import ... except ImportError` flag.
+"""
+
+import sys
+import importlib.util
+from types import ModuleType
+from typing import Optional, Set
+
+# Lazy modules whose deferred import raised ImportError
+_unavailable: Set[str] = set()
+
+
+def lazy_import(name: str) -> Optional[ModuleType]:
+    """
+    Import a module lazily.
+
+    Args:
+        name: Absolute module name (resolved against the current sys.path)
+
+    Returns:
+        The module (already-imported modules are returned as-is), or None if
+        it cannot be found - mirroring the `try: import ... except ImportError`
+        availability flags used throughout the hooks.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.loader is None:
+        return None
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_loaded(module: Optional[ModuleType]) -> bool:
+    """Whether a module returned by lazy_import has actually been executed."""
+    if module is None:
+        return False
+    # LazyLoader swaps the module's class back to ModuleType once it loads
+    return type(module).__name__ != "_LazyModule"
+
+
+def available(module: Optional[ModuleType]) -> bool:
+    """
+    Load a lazy module now and report whether it imported.
+
+    Args:
+        module: A module returned by lazy_import (or None)
+
+    Returns:
+        False if the module was not found or its import raised ImportError
+    """
+    if module is None:
+        return False
+    # Read the name without triggering the load
+    name = object.__getattribute__(module, "__name__")
+    if name in _unavailable:
+        return False
+    try:
+        getattr(module, "__name__")
+    except ImportError:
+        _unavailable.add(name)
+        if sys.modules.get(name) is module:
+            del sys.modules[name]
+        return False
+    return True
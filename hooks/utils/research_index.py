@@ -10,7 +10,10 @@ Part of PopKit Issue #142 (Research Index with Embeddings).
 
 import os
 import json
+import heapq
+import math
 import re
+from bisect import bisect_left
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field, asdict
@@ -28,6 +31,18 @@ INDEX_VERSION = "1.0.0"
 
 ENTRY_TYPES = ["decision", "finding", "learning", "spike"]
 
+# Inverted index for keyword search
+KEYWORD_INDEX_FILE = "keywords.json"
+KEYWORD_INDEX_VERSION = 1
+FIELD_WEIGHTS = {"title": 2.0, "tags": 3.0, "body": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Query words also match longer indexed words they prefix ("auth" -> "authentication")
+PREFIX_MIN_LENGTH = 3
+PREFIX_MATCH_WEIGHT = 0.5
+STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+             "is", "it", "of", "on", "or", "the", "to", "was", "we", "with"}
+
 
 # =============================================================================
 # DATA CLASSES
@@ -152,6 +167,149 @@ class ResearchIndex:
         )
 
 
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens for keyword indexing and queries."""
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def entry_field_terms(entry: 'ResearchEntry') -> Dict[str, float]:
+    """Field-weighted term frequencies for an entry."""
+    body = "\n".join([entry.content, entry.context, entry.rationale, " ".join(entry.alternatives)])
+    weighted: Dict[str, float] = {}
+    for field_name, text in (("title", entry.title), ("tags", " ".join(entry.tags)), ("body", body)):
+        weight = FIELD_WEIGHTS[field_name]
+        for token in tokenize(text):
+            weighted[token] = weighted.get(token, 0.0) + weight
+    return weighted
+
+
+@dataclass
+class KeywordIndex:
+    """
+    Inverted index over research entries, scored with BM25.
+
+    postings maps token -> {entry id: field-weighted term frequency}; docs
+    holds each entry's weighted length plus the type/project used by search
+    filters, so a query reads only its tokens' postings.
+    """
+    version: int = KEYWORD_INDEX_VERSION
+    postings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    docs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    total_length: float = 0.0
+    _vocabulary: Optional[List[str]] = field(default=None, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "version": self.version,
+            "postings": self.postings,
+            "docs": self.docs,
+            "totalLength": self.total_length,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'KeywordIndex':
+        """Create from dictionary."""
+        return cls(
+            version=d.get("version", 0),
+            postings=d.get("postings", {}),
+            docs=d.get("docs", {}),
+            total_length=d.get("totalLength", 0.0),
+        )
+
+    def add(self, entry: 'ResearchEntry') -> None:
+        """Index an entry (replacing any previous version)."""
+        if entry.id in self.docs:
+            self.remove(entry.id)
+        terms = entry_field_terms(entry)
+        for token, weight in terms.items():
+            self.postings.setdefault(token, {})[entry.id] = weight
+        length = sum(terms.values())
+        self.docs[entry.id] = {"length": length, "type": entry.type, "project": entry.project}
+        self.total_length += length
+        self._vocabulary = None
+
+    def remove(self, entry_id: str, entry: Optional['ResearchEntry'] = None) -> None:
+        """
+        Drop an entry's postings.
+
+        Args:
+            entry_id: Entry to remove
+            entry: The indexed version of the entry, if known, so only its
+                own tokens are visited instead of the whole vocabulary
+        """
+        doc = self.docs.pop(entry_id, None)
+        if doc is None:
+            return
+        self.total_length -= doc["length"]
+        tokens = entry_field_terms(entry) if entry is not None else list(self.postings)
+        for token in tokens:
+            postings = self.postings.get(token)
+            if postings and postings.pop(entry_id, None) is not None and not postings:
+                del self.postings[token]
+        self._vocabulary = None
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Indexed tokens a query term matches, with their weights."""
+        matches = [(term, 1.0)] if term in self.postings else []
+        if len(term) >= PREFIX_MIN_LENGTH:
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self.postings)
+            vocab = self._vocabulary
+            i = bisect_left(vocab, term)
+            while i < len(vocab) and vocab[i].startswith(term):
+                if vocab[i] != term:
+                    matches.append((vocab[i], PREFIX_MATCH_WEIGHT))
+                i += 1
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        entry_type: Optional[str] = None,
+        project: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank entries for a query.
+
+        Returns:
+            Up to limit (entry id, similarity) pairs, best first. Similarity is
+            the BM25 score divided by its upper bound for the query (0-1).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        n_docs = len(self.docs)
+        if not terms or not n_docs:
+            return []
+        avg_length = max(self.total_length / n_docs, 1e-9)
+
+        scores: Dict[str, float] = {}
+        ideal = 0.0
+        for term in terms:
+            term_best = 0.0
+            for token, match_weight in self._expand(term):
+                postings = self.postings[token]
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                term_best = max(term_best, idf * match_weight)
+                for entry_id, tf in postings.items():
+                    doc = self.docs.get(entry_id)
+                    if doc is None:
+                        continue
+                    if entry_type and doc["type"] != entry_type:
+                        continue
+                    if project and doc["project"] != project:
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc["length"] / avg_length)
+                    scores[entry_id] = scores.get(entry_id, 0.0) + \
+                        match_weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+            # Unmatched words still count against the query's coverage
+            ideal += (term_best or math.log(1 + (n_docs + 0.5) / 0.5)) * (BM25_K1 + 1)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(entry_id, min(score / ideal, 1.0)) for entry_id, score in top]
+
+
 @dataclass
 class SearchResult:
     """Result from research search."""
@@ -195,6 +353,7 @@ class ResearchIndexManager:
         self.project_root = Path(project_root) if project_root else Path.cwd()
         self.research_dir = self.project_root / RESEARCH_DIR
         self.index_path = self.research_dir / INDEX_FILE
+        self.keyword_index_path = self.research_dir / KEYWORD_INDEX_FILE
         self.entries_dir = self.research_dir / ENTRIES_DIR
 
         # Ensure directories exist
@@ -203,6 +362,10 @@ class ResearchIndexManager:
         # Load or create index
         self._index = self._load_index()
 
+        # Inverted keyword index, loaded on first search or change
+        self._keywords: Optional[KeywordIndex] = None
+        self._keywords_dirty = False
+
     # =========================================================================
     # INDEX MANAGEMENT
     # =========================================================================
@@ -224,6 +387,46 @@ class ResearchIndexManager:
         self._index.last_updated = datetime.utcnow().isoformat() + "Z"
         with open(self.index_path, 'w', encoding='utf-8') as f:
             json.dump(self._index.to_dict(), f, indent=2)
+        self._save_keyword_index()
+
+    def _save_keyword_index(self) -> None:
+        """Save the keyword index to disk if it changed."""
+        if self._keywords is None or not self._keywords_dirty:
+            return
+        with open(self.keyword_index_path, 'w', encoding='utf-8') as f:
+            json.dump(self._keywords.to_dict(), f, separators=(",", ":"))
+        self._keywords_dirty = False
+
+    def _keyword_index(self) -> KeywordIndex:
+        """
+        Load the keyword index, rebuilding it if missing or out of date.
+
+        A rebuild reads every entry once (first search after upgrading, or
+        after entries were changed without this manager).
+        """
+        if self._keywords is not None:
+            return self._keywords
+
+        keywords = None
+        if self.keyword_index_path.exists():
+            try:
+                with open(self.keyword_index_path, 'r', encoding='utf-8') as f:
+                    keywords = KeywordIndex.from_dict(json.load(f))
+            except (json.JSONDecodeError, OSError):
+                keywords = None
+
+        entry_ids = {e.id for e in self._index.entries}
+        if (keywords is None or keywords.version != KEYWORD_INDEX_VERSION
+                or set(keywords.docs) != entry_ids):
+            keywords = KeywordIndex()
+            for entry_id in entry_ids:
+                entry = self.get(entry_id)
+                if entry:
+                    keywords.add(entry)
+            self._keywords_dirty = True
+
+        self._keywords = keywords
+        return keywords
 
     def _generate_id(self) -> str:
         """Generate next entry ID."""
@@ -240,7 +443,15 @@ class ResearchIndexManager:
         return f"r{max_num + 1:03d}"
 
     def _update_indexes(self, entry: ResearchEntry, remove: bool = False) -> None:
-        """Update tag and project indexes."""
+        """Update tag, project and keyword indexes."""
+        # Update keyword index
+        keywords = self._keyword_index()
+        if remove:
+            keywords.remove(entry.id, entry)
+        else:
+            keywords.add(entry)
+        self._keywords_dirty = True
+
         # Update tag index
         for tag in entry.tags:
             if tag not in self._index.tag_index:
@@ -497,6 +708,9 @@ class ResearchIndexManager:
         """
         Search entries by keywords (fallback when embeddings unavailable).
 
+        Uses the BM25 inverted index in keywords.json, so only postings for
+        the query's words are scored and only the top results are loaded.
+
         Args:
             query: Search query
             entry_type: Optional type filter
@@ -506,51 +720,27 @@ class ResearchIndexManager:
         Returns:
             List of SearchResult
         """
-        query_words = set(query.lower().split())
         results = []
+        ranked = self._keyword_index().search(
+            query, limit, entry_type=entry_type, project=project
+        )
 
-        for idx_entry in self._index.entries:
-            # Apply filters
-            if entry_type and idx_entry.type != entry_type:
-                continue
-            if project and idx_entry.project != project:
-                continue
-
-            # Load full entry for content search
-            entry = self.get(idx_entry.id)
+        # Only the top-ranked entries are read from disk
+        for entry_id, similarity in ranked:
+            entry = self.get(entry_id)
             if not entry:
                 continue
+            results.append(SearchResult(
+                entry=entry,
+                similarity=similarity,
+                rank=len(results) + 1,
+                match_type="keyword"
+            ))
 
-            # Score by word matches
-            text = entry.searchable_text.lower()
-            matches = sum(1 for word in query_words if word in text)
-
-            # Boost for title matches
-            title_matches = sum(1 for word in query_words if word in entry.title.lower())
-            matches += title_matches * 2
-
-            # Boost for tag matches
-            tag_text = " ".join(entry.tags).lower()
-            tag_matches = sum(1 for word in query_words if word in tag_text)
-            matches += tag_matches * 3
-
-            if matches > 0:
-                # Normalize score to 0-1 range
-                similarity = min(matches / (len(query_words) * 3), 1.0)
-                results.append(SearchResult(
-                    entry=entry,
-                    similarity=similarity,
-                    match_type="keyword"
-                ))
-
-        # Sort by similarity
-        results.sort(key=lambda r: r.similarity, reverse=True)
-
-        # Add ranks
-        for i, result in enumerate(results[:limit]):
-            result.rank = i + 1
+        # Persist a rebuilt index so later searches skip the rebuild
+        self._save_keyword_index()
 
-        return results[:limit]
+        return results
 
     def search_tags(
         self,
@@ -650,14 +840,21 @@ class ResearchIndexManager:
         try:
             # Generate query embedding
             client = VoyageClient(api_key)
-            query_embedding = client.embed_text(query)
-
-            # Search embedding store
+            query_embedding = client.embed_query(query)
+
+            # Search embedding store, filtering before scoring
+            metadata = {}
+            if entry_type:
+                metadata["type"] = entry_type
+            if project:
+                metadata["project"] = project
             store = EmbeddingStore()
-            search_results = store.search(
+            search_results = store.search_filtered(
                 query_embedding=query_embedding,
                 source_type="research",
-                top_k=limit * 2,  # Get more for filtering
+                project_path=str(self.project_root),
+                metadata=metadata,
+                top_k=limit,
                 min_similarity=min_similarity
             )
 
@@ -671,21 +868,12 @@ class ResearchIndexManager:
                 if not entry:
                     continue
 
-                # Apply filters
-                if entry_type and entry.type != entry_type:
-                    continue
-                if project and entry.project != project:
-                    continue
-
                 results.append(SearchResult(
                     entry=entry,
                     similarity=sr.similarity,
                     match_type="semantic"
                 ))
 
-                if len(results) >= limit:
-                    break
-
             # Add ranks
             for i, result in enumerate(results):
                 result.rank = i + 1
@@ -807,76 +995,88 @@ class ResearchIndexManager:
         if entry.embedding_id and not force:
             return entry.embedding_id
 
+        return self._embed_entries([entry]).get(entry.id)
+
+    def embed_all(self, force: bool = False) -> Tuple[int, int]:
+        """
+        Embed all entries that don't have embeddings.
+
+        Texts are sent in batched API calls and go through the client's
+        persistent cache, so unchanged entries are not re-embedded remotely.
+
+        Args:
+            force: Re-embed even if already has embedding
+
+        Returns:
+            Tuple of (success_count, failure_count)
+        """
+        entries = [
+            self.get(idx_entry.id)
+            for idx_entry in self._index.entries
+            if force or not idx_entry.embedding_id
+        ]
+
+        pending = [entry for entry in entries if entry]
+        success = len(self._embed_entries(pending)) if pending else 0
+        return success, len(entries) - success
+
+    def _embed_entries(self, entries: List[ResearchEntry]) -> Dict[str, str]:
+        """
+        Embed entries in one batched call and store the vectors.
+
+        Returns:
+            Mapping of entry ID to embedding ID for the entries stored
+        """
         # Try to import embedding utilities
         try:
             from .voyage_client import VoyageClient
             from .embedding_store import EmbeddingStore, EmbeddingRecord
         except ImportError:
-            return None
+            return {}
 
         # Check for API key
         api_key = os.environ.get("VOYAGE_API_KEY") or os.environ.get("POPKIT_API_KEY")
         if not api_key:
-            return None
+            return {}
 
         try:
-            # Generate embedding
+            # Generate embeddings
             client = VoyageClient(api_key)
-            embedding = client.embed_text(entry.searchable_text)
-
-            # Store in embedding store
+            embeddings = client.embed([entry.searchable_text for entry in entries], "document")
             store = EmbeddingStore()
-            embedding_id = f"research_{entry.id}"
-
-            record = EmbeddingRecord(
-                id=embedding_id,
-                content=entry.searchable_text,
-                embedding=embedding,
-                source_type="research",
-                source_id=entry.id,
-                metadata={
-                    "type": entry.type,
-                    "title": entry.title,
-                    "tags": entry.tags,
-                    "project": entry.project,
-                },
-                project_path=str(self.project_root),
-            )
-            store.store(record)
-
-            # Update entry with embedding ID
-            entry.embedding_id = embedding_id
-            self.update(entry)
-
-            return embedding_id
-
         except Exception:
-            return None
-
-    def embed_all(self, force: bool = False) -> Tuple[int, int]:
-        """
-        Embed all entries that don't have embeddings.
-
-        Args:
-            force: Re-embed even if already has embedding
+            return {}
 
-        Returns:
-            Tuple of (success_count, failure_count)
-        """
-        success = 0
-        failure = 0
+        embedded = {}
+        for entry, embedding in zip(entries, embeddings):
+            try:
+                # Store in embedding store
+                embedding_id = f"research_{entry.id}"
+
+                record = EmbeddingRecord(
+                    id=embedding_id,
+                    content=entry.searchable_text,
+                    embedding=embedding,
+                    source_type="research",
+                    source_id=entry.id,
+                    metadata={
+                        "type": entry.type,
+                        "title": entry.title,
+                        "tags": entry.tags,
+                        "project": entry.project,
+                    },
+                    project_path=str(self.project_root),
+                )
+                store.store(record)
 
-        for idx_entry in self._index.entries:
-            if idx_entry.embedding_id and not force:
+                # Update entry with embedding ID
+                entry.embedding_id = embedding_id
+                self.update(entry)
+                embedded[entry.id] = embedding_id
+            except Exception:
                 continue
 
-            result = self.embed_entry(idx_entry.id, force=force)
-            if result:
-                success += 1
-            else:
-                failure += 1
-
-        return success, failure
+        return embedded
 
 
 # =============================================================================
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Safety Rule Matcher
+
+Precompiled matcher for the PreToolUse safety rules (blocked commands and
+sensitive paths). The hook used to run `re.search` over every rule on every
+tool call, which recompiled each pattern once per process.
+
+The matcher instead:
+- Extracts each rule's longest required literal (e.g. "chmod" for
+  `chmod\\s+777`) into a plan that is cached on disk, keyed by a hash of the
+  rules, so later processes skip regex parsing entirely.
+- Uses the literals as a prefilter: a rule's regex is only compiled and run
+  when its literal occurs in the text. Ordinary commands (git, npm, ls...)
+  contain none of the literals and never touch `re` at all.
+- Reports every rule that fired, with its index and matched text.
+
+The prefilter is a set of substring checks rather than a pure-Python
+Aho-Corasick automaton: for a few dozen short literals, `str.__contains__`
+(implemented in C) is faster than walking an automaton in Python.
+
+Usage:
+    from safety_matcher import get_matcher
+
+    matcher = get_matcher([r"rm\\s+-rf\\s+/", r"chmod\\s+777"], cache_dir=config_dir)
+    for match in matcher.search("sudo chmod 777 /srv"):
+        print(match.pattern, match.matched)
+"""
+
+import re
+import json
+import hashlib
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+    from re._constants import LITERAL
+except ImportError:
+    import sre_parse  # type: ignore
+    from sre_constants import LITERAL  # type: ignore
+
+PLAN_VERSION = 1
+MIN_LITERAL_LENGTH = 2
+
+# rules hash -> matcher, so repeated hook instances (and daemon-forked
+# children) share one set of compiled patterns.
+_matchers: Dict[str, "SafetyRuleMatcher"] = {}
+
+
+@dataclass
+class RuleMatch:
+    """A safety rule that fired."""
+    index: int
+    pattern: str
+    matched: str
+
+
+def rules_hash(patterns: List[str], flags: int) -> str:
+    """Stable hash identifying a rule set (and its compiled plan)."""
+    payload = json.dumps({"version": PLAN_VERSION, "flags": flags, "patterns": patterns})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def required_literal(pattern: str, flags: int = 0) -> Optional[str]:
+    """
+    Longest literal run that every match of `pattern` must contain.
+
+    Only the top-level sequence is inspected, so alternations, classes and
+    repeats simply end a run. Returns None when no usable literal exists, in
+    which case the rule is always checked.
+
+    Args:
+        pattern: Regular expression source
+        flags: re flags the rule is compiled with
+
+    Returns:
+        The literal (lowercased under IGNORECASE), or None
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+
+    best, run = "", []
+    for op, value in list(parsed) + [(None, None)]:
+        char = chr(value) if op == LITERAL else None
+        # Case folding is only predictable for ASCII
+        if char is not None and (char.isascii() or not flags & re.IGNORECASE):
+            run.append(char)
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+
+    if len(best) < MIN_LITERAL_LENGTH:
+        return None
+    return best.lower() if flags & re.IGNORECASE else best
+
+
+class SafetyRuleMatcher:
+    """Literal-prefiltered matcher over an ordered list of regex rules."""
+
+    def __init__(self, patterns: List[str], flags: int = re.IGNORECASE,
+                 cache_dir: Optional[Path] = None):
+        self.patterns = list(patterns)
+        self.flags = flags
+        self.rules_hash = rules_hash(self.patterns, flags)
+        self.literals = self._load_plan(cache_dir)
+        self._compiled: Dict[int, Optional[Pattern]] = {}
+        self._ignorecase = bool(flags & re.IGNORECASE)
+
+    # =========================================================================
+    # PLAN
+    # =========================================================================
+
+    def _plan_path(self, cache_dir: Path) -> Path:
+        return Path(cache_dir) / f"safety-rules-{self.rules_hash[:16]}.json"
+
+    def _load_plan(self, cache_dir: Optional[Path]) -> List[Optional[str]]:
+        """Read the literal plan from disk, building and saving it on a miss."""
+        if cache_dir is not None:
+            try:
+                plan = json.loads(self._plan_path(cache_dir).read_text(encoding="utf-8"))
+                if plan.get("hash") == self.rules_hash:
+                    return plan["literals"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        literals = [required_literal(p, self.flags) for p in self.patterns]
+
+        if cache_dir is not None:
+            path = self._plan_path(cache_dir)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps({
+                    "hash": self.rules_hash,
+                    "patterns": self.patterns,
+                    "literals": literals,
+                }), encoding="utf-8")
+                tmp_path.replace(path)
+            except OSError:
+                pass  # Cache is an optimization only
+        return literals
+
+    def _pattern(self, index: int) -> Optional[Pattern]:
+        """Compile a rule on first use (invalid rules never match)."""
+        if index not in self._compiled:
+            try:
+                self._compiled[index] = re.compile(self.patterns[index], self.flags)
+            except re.error:
+                self._compiled[index] = None
+        return self._compiled[index]
+
+    # =========================================================================
+    # MATCHING
+    # =========================================================================
+
+    def candidates(self, text: str) -> List[int]:
+        """Indices of rules whose required literal occurs in `text`."""
+        # Non-ASCII text can case-fold onto ASCII literals (e.g. U+017F -> 's'),
+        # so it skips the prefilter rather than risk missing a rule.
+        if not text.isascii():
+            return list(range(len(self.patterns)))
+        haystack = text.lower() if self._ignorecase else text
+        return [
+            i for i, literal in enumerate(self.literals)
+            if literal is None or literal in haystack
+        ]
+
+    def search(self, text: str) -> List[RuleMatch]:
+        """
+        Find every rule that matches `text`.
+
+        Args:
+            text: Command or file path to check
+
+        Returns:
+            Matches in rule order (empty if the text is safe)
+        """
+        matches = []
+        for index in self.candidates(text):
+            pattern = self._pattern(index)
+            found = pattern.search(text) if pattern is not None else None
+            if found:
+                matches.append(RuleMatch(index, self.patterns[index], found.group(0)))
+        return matches
+
+
+def get_matcher(patterns: List[str], flags: int = re.IGNORECASE,
+                cache_dir: Optional[Path] = None) -> SafetyRuleMatcher:
+    """
+    Get the shared matcher for a rule set.
+
+    Args:
+        patterns: Regex rules, in reporting order
+        flags: re flags for every rule
+        cache_dir: Directory for the on-disk plan cache (None disables it)
+
+    Returns:
+        SafetyRuleMatcher (one per distinct rule set per process)
+    """
+    key = rules_hash(list(patterns), flags)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = SafetyRuleMatcher(patterns, flags, cache_dir)
+        _matchers[key] = matcher
+    return matcher
@@ -22,6 +22,7 @@ from dataclasses import dataclass
 sys.path.insert(0, os.path.dirname(__file__))
 
 from embedding_store import EmbeddingStore
+from compiled_router import CompiledRoutes, load_compiled_routes
 from voyage_client import VoyageClient, is_available
 from cloud_agent_search import (
     search_agents as cloud_search_agents,
@@ -84,6 +85,11 @@ class SemanticRouter:
     - Confidence scoring
     """
 
+    # Compiled keyword/file/error matchers, rebuilt when _config is replaced
+    _routes: Optional[CompiledRoutes] = None
+    _routes_config: Optional[Dict[str, Any]] = None
+    _loaded_config: Optional[Dict[str, Any]] = None
+
     def __init__(self, project_path: Optional[str] = None):
         """
         Initialize the semantic router.
@@ -95,6 +101,7 @@ class SemanticRouter:
         self.store = EmbeddingStore()
         self.client = VoyageClient() if is_available() else None
         self._config = self._load_config()
+        self._loaded_config = self._config
 
         # Set up project awareness
         if project_path:
@@ -126,6 +133,24 @@ class SemanticRouter:
                 pass
         return {}
 
+    def _compiled_routes(self) -> CompiledRoutes:
+        """
+        Keyword/file/error matchers for the current config, compiled once.
+
+        Routes live under "routing" in agents/config.json; a flat config
+        with the route maps at the top level is accepted too.
+        """
+        if self._routes is None or self._routes_config is not self._config:
+            routing = self._config.get("routing")
+            if not isinstance(routing, dict):
+                routing = self._config
+            # The disk cache is keyed by the config file, so only use it for
+            # the config actually read from that file
+            config_path = CONFIG_PATH if self._config is self._loaded_config else None
+            self._routes = load_compiled_routes(routing, config_path=config_path)
+            self._routes_config = self._config
+        return self._routes
+
     # =========================================================================
     # PUBLIC API
     # =========================================================================
@@ -361,20 +386,16 @@ class SemanticRouter:
 
             # Use project-aware search if project path is set
             if self.project_path and self.store.count_project(self.project_path) > 0:
-                # Search project items + global agents
+                # Search project items + global agents (agent types only)
                 results = self.store.search_project(
                     query_embedding=query_embedding,
                     project_path=self.project_path,
-                    source_type=None,  # Search all types
-                    top_k=top_k * 2,  # Get more for filtering
+                    source_type=["agent", "project-agent", "generated-agent"],
+                    top_k=top_k * 2,  # Headroom for the project-item boost below
                     min_similarity=min_confidence,
                     include_global=True,
                     global_boost=0.0  # We'll handle boost ourselves
                 )
-
-                # Filter to agent types only
-                agent_types = {"agent", "project-agent", "generated-agent"}
-                results = [r for r in results if r.record.source_type in agent_types]
             else:
                 # Fall back to global search
                 results = self.store.search(
@@ -417,55 +438,52 @@ class SemanticRouter:
         top_k: int
     ) -> List[RoutingResult]:
         """Route using keyword matching."""
-        keywords = self._config.get("keywords", {})
-        query_lower = query.lower()
+        routes = self._compiled_routes()
 
         matches = []
-        for keyword, agents in keywords.items():
-            if keyword.lower() in query_lower:
-                for agent in agents:
-                    matches.append(RoutingResult(
-                        agent=agent,
-                        confidence=0.8,  # Keyword matches get 0.8 confidence
-                        reason=f"Keyword match: '{keyword}'",
-                        method="keyword"
-                    ))
+        for index in routes.keywords.matches(query):
+            keyword = routes.keywords.patterns[index]
+            for agent in routes.keyword_agents[index]:
+                matches.append(RoutingResult(
+                    agent=agent,
+                    confidence=0.8,  # Keyword matches get 0.8 confidence
+                    reason=f"Keyword match: '{keyword}'",
+                    method="keyword"
+                ))
 
         return matches[:top_k]
 
     def _file_pattern_route(self, file_path: str) -> List[RoutingResult]:
         """Route based on file pattern."""
-        import fnmatch
-
-        patterns = self._config.get("filePatterns", {})
+        routes = self._compiled_routes()
         results = []
 
-        for pattern, agents in patterns.items():
-            if fnmatch.fnmatch(file_path, pattern):
-                for agent in agents:
-                    results.append(RoutingResult(
-                        agent=agent,
-                        confidence=0.9,  # File patterns get 0.9 confidence
-                        reason=f"File pattern: '{pattern}'",
-                        method="file_pattern"
-                    ))
+        for index in routes.file_patterns.matches(file_path):
+            pattern = routes.file_patterns.patterns[index]
+            for agent in routes.file_pattern_agents[index]:
+                results.append(RoutingResult(
+                    agent=agent,
+                    confidence=0.9,  # File patterns get 0.9 confidence
+                    reason=f"File pattern: '{pattern}'",
+                    method="file_pattern"
+                ))
 
         return results
 
     def _error_pattern_route(self, error: str) -> List[RoutingResult]:
         """Route based on error pattern."""
-        patterns = self._config.get("errorPatterns", {})
+        routes = self._compiled_routes()
         results = []
 
-        for pattern, agents in patterns.items():
-            if pattern.lower() in error.lower():
-                for agent in agents:
-                    results.append(RoutingResult(
-                        agent=agent,
-                        confidence=0.85,  # Error patterns get 0.85 confidence
-                        reason=f"Error pattern: '{pattern}'",
-                        method="error_pattern"
-                    ))
+        for index in routes.error_patterns.matches(error):
+            pattern = routes.error_patterns.patterns[index]
+            for agent in routes.error_pattern_agents[index]:
+                results.append(RoutingResult(
+                    agent=agent,
+                    confidence=0.85,  # Error patterns get 0.85 confidence
+                    reason=f"Error pattern: '{pattern}'",
+                    method="error_pattern"
+                ))
 
         return results
 
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Embedding Vector Encoding
+
+Little-endian float32 BLOB encoding shared by EmbeddingStore and the
+persistent embedding cache. Stdlib only, so importing it (e.g. from
+voyage_client via embedding_cache) does not pull in the store, its vector
+indexes or NumPy.
+
+Part of PopKit Issue #19 (Embeddings Enhancement).
+"""
+
+import sys
+from array import array
+from typing import List
+
+
+def pack_embedding(embedding) -> bytes:
+    """Encode a vector as little-endian float32 bytes."""
+    packed = array("f", embedding)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_embedding_array(blob) -> array:
+    """Decode little-endian float32 bytes into a float array."""
+    unpacked = array("f")
+    unpacked.frombytes(blob)
+    if sys.byteorder != "little":
+        unpacked.byteswap()
+    return unpacked
+
+
+def unpack_embedding(blob) -> List[float]:
+    """Decode little-endian float32 bytes into a list of floats."""
+    return unpack_embedding_array(blob).tolist()
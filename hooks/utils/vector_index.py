@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Packed Vector Index
+
+Memory-mapped float32 sidecar for EmbeddingStore. Keeps every vector of the
+SQLite store in one contiguous little-endian matrix with precomputed norms and
+an id/source_type/project_path offset table, so a similarity query becomes a
+single batched dot product plus a partial top-k selection instead of parsing
+every row.
+
+Uses NumPy when it is installed; otherwise falls back to a stdlib path
+(mmap + memoryview + heapq) that still avoids per-row JSON decoding.
+
+Files written next to the database:
+    <db stem>.vectors       Binary header + norms + row-major matrix
+    <db stem>.vectors.json  Offset table (row order = matrix row order)
+
+Part of PopKit Issue #19 (Embeddings Enhancement).
+"""
+
+import os
+import sys
+import json
+import math
+import mmap
+import heapq
+import struct
+import operator
+from array import array
+from pathlib import Path
+from typing import List, Tuple, Optional, Iterable, Sequence, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+INDEX_MAGIC = b"PKVX"
+INDEX_VERSION = 1
+
+# magic, version, dim, count, generation
+HEADER_FORMAT = "<4sIIIq"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Python 3.12+ ships a C-level dot product
+_sumprod = getattr(math, "sumprod", None)
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    """Dot product of two equal-length sequences."""
+    if _sumprod is not None:
+        return _sumprod(a, b)
+    return sum(map(operator.mul, a, b))
+
+
+# =============================================================================
+# PACKED VECTOR INDEX
+# =============================================================================
+
+class PackedVectorIndex:
+    """
+    Read-only view over a packed vector sidecar.
+
+    Build with `PackedVectorIndex.build()`, open with `PackedVectorIndex.load()`.
+    Each instance is tied to the store generation it was built from; the
+    owning EmbeddingStore rebuilds it when the generation moves.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        dim: int,
+        generation: int,
+        ids: List[str],
+        source_types: List[str],
+        project_paths: List[Optional[str]],
+        norms,
+        vectors,
+        mapping: Optional[mmap.mmap] = None
+    ):
+        self.path = Path(path)
+        self.dim = dim
+        self.generation = generation
+        self.ids = ids
+        self.source_types = source_types
+        self.project_paths = project_paths
+        self._norms = norms
+        self._vectors = vectors
+        self._mapping = mapping
+
+    @property
+    def count(self) -> int:
+        """Number of indexed vectors."""
+        return len(self.ids)
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    @staticmethod
+    def table_path(path: Path) -> Path:
+        """Path of the JSON offset table for an index file."""
+        return Path(str(path) + ".json")
+
+    @staticmethod
+    def _pack(
+        rows: Iterable[Tuple[str, str, Optional[str], Sequence[float]]],
+        dim: int
+    ) -> Tuple[List[str], List[str], List[Optional[str]], array, array]:
+        """Collect rows into offset-table lists plus native-order norm and matrix arrays."""
+        ids: List[str] = []
+        source_types: List[str] = []
+        project_paths: List[Optional[str]] = []
+        norms = array("f")
+        matrix = array("f")
+
+        for row_id, source_type, project_path, vector in rows:
+            if len(vector) != dim:
+                raise ValueError(f"Vector {row_id} has dimension {len(vector)}, expected {dim}")
+            ids.append(row_id)
+            source_types.append(source_type)
+            project_paths.append(project_path)
+            matrix.extend(vector)
+            norms.append(math.sqrt(_dot(vector, vector)))
+        return ids, source_types, project_paths, norms, matrix
+
+    @classmethod
+    def from_rows(
+        cls,
+        path: Path,
+        rows: Iterable[Tuple[str, str, Optional[str], Sequence[float]]],
+        dim: int,
+        generation: int
+    ) -> "PackedVectorIndex":
+        """
+        Pack rows into an in-memory index without writing the sidecar.
+
+        Args:
+            path: Nominal index path (nothing is written)
+            rows: Iterable of (id, source_type, project_path, vector)
+            dim: Vector dimension (all rows must match)
+            generation: Store generation this snapshot reflects
+
+        Returns:
+            In-memory PackedVectorIndex
+        """
+        return cls._from_arrays(Path(path), dim, generation, *cls._pack(rows, dim))
+
+    @classmethod
+    def build(
+        cls,
+        path: Path,
+        rows: Iterable[Tuple[str, str, Optional[str], Sequence[float]]],
+        dim: int,
+        generation: int
+    ) -> "PackedVectorIndex":
+        """
+        Write a new index and return it opened.
+
+        Args:
+            path: Index file path
+            rows: Iterable of (id, source_type, project_path, vector)
+            dim: Vector dimension (all rows must match)
+            generation: Store generation this snapshot reflects
+
+        Returns:
+            Opened PackedVectorIndex
+        """
+        path = Path(path)
+        ids, source_types, project_paths, norms, matrix = cls._pack(rows, dim)
+
+        if sys.byteorder != "little":
+            norms.byteswap()
+            matrix.byteswap()
+
+        header = struct.pack(HEADER_FORMAT, INDEX_MAGIC, INDEX_VERSION, dim, len(ids), generation)
+        table = {
+            "version": INDEX_VERSION,
+            "generation": generation,
+            "dim": dim,
+            "ids": ids,
+            "source_types": source_types,
+            "project_paths": project_paths,
+        }
+
+        table_path = cls.table_path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_table = table_path.with_name(f"{table_path.name}.{os.getpid()}.tmp")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(norms.tobytes())
+                f.write(matrix.tobytes())
+            with open(tmp_table, "w", encoding="utf-8") as f:
+                json.dump(table, f, separators=(",", ":"))
+
+            # Table first: a reader that sees the new table with the old matrix
+            # rejects it on the generation check and rebuilds.
+            os.replace(tmp_table, table_path)
+            os.replace(tmp_path, path)
+            loaded = cls.load(path)
+        except OSError:
+            # Another process may hold the old file mapped (Windows) or the
+            # directory is read-only; serve this process from memory.
+            for tmp in (tmp_path, tmp_table):
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+            loaded = None
+
+        if loaded is not None and loaded.generation == generation:
+            return loaded
+
+        if sys.byteorder != "little":
+            norms.byteswap()
+            matrix.byteswap()
+        return cls._from_arrays(path, dim, generation, ids, source_types,
+                                project_paths, norms, matrix)
+
+    @classmethod
+    def _from_arrays(cls, path, dim, generation, ids, source_types,
+                     project_paths, norms: array, matrix: array) -> "PackedVectorIndex":
+        """Create an in-memory index from native-order arrays."""
+        if HAS_NUMPY:
+            norms_view = np.frombuffer(norms, dtype=np.float32)
+            vectors = np.frombuffer(matrix, dtype=np.float32).reshape(len(ids), dim)
+        else:
+            norms_view = memoryview(norms)
+            vectors = memoryview(matrix)
+        return cls(path, dim, generation, ids, source_types, project_paths,
+                   norms_view, vectors)
+
+    @staticmethod
+    def stored_generation(path: Path) -> Optional[int]:
+        """Generation stamped in an index file's header, without opening the table."""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+            magic, version, _, _, generation = struct.unpack(HEADER_FORMAT, header)
+        except (OSError, struct.error):
+            return None
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            return None
+        return generation
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["PackedVectorIndex"]:
+        """
+        Open an existing index.
+
+        Args:
+            path: Index file path
+
+        Returns:
+            PackedVectorIndex, or None if missing, corrupt or mismatched
+        """
+        path = Path(path)
+        table_path = cls.table_path(path)
+        if not path.exists() or not table_path.exists():
+            return None
+
+        try:
+            with open(table_path, "r", encoding="utf-8") as f:
+                table = json.load(f)
+
+            with open(path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+                if len(header) < HEADER_SIZE:
+                    return None
+                magic, version, dim, count, generation = struct.unpack(HEADER_FORMAT, header)
+                if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                    return None
+                if table.get("generation") != generation or len(table.get("ids", [])) != count:
+                    return None
+
+                expected_size = HEADER_SIZE + 4 * count + 4 * count * dim
+                if os.fstat(f.fileno()).st_size != expected_size:
+                    return None
+
+                mapping = None
+                if count:
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error):
+            return None
+
+        matrix_offset = HEADER_SIZE + 4 * count
+        if count == 0:
+            norms = array("f")
+            vectors = array("f")
+            if HAS_NUMPY:
+                norms = np.zeros(0, dtype=np.float32)
+                vectors = np.zeros((0, dim), dtype=np.float32)
+        elif HAS_NUMPY:
+            norms = np.frombuffer(mapping, dtype="<f4", count=count, offset=HEADER_SIZE)
+            vectors = np.frombuffer(
+                mapping, dtype="<f4", count=count * dim, offset=matrix_offset
+            ).reshape(count, dim)
+        elif sys.byteorder == "little":
+            view = memoryview(mapping)
+            norms = view[HEADER_SIZE:matrix_offset].cast("f")
+            vectors = view[matrix_offset:].cast("f")
+        else:
+            norms = array("f", mapping[HEADER_SIZE:matrix_offset])
+            vectors = array("f", mapping[matrix_offset:])
+            norms.byteswap()
+            vectors.byteswap()
+            mapping.close()
+            mapping = None
+
+        return cls(
+            path, dim, generation,
+            table["ids"], table["source_types"], table["project_paths"],
+            norms, vectors, mapping
+        )
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._norms = None
+        self._vectors = None
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                pass  # Still referenced by a live view; GC releases it
+            self._mapping = None
+
+    def row_vectors(self, rows: Sequence[int]):
+        """
+        Stored vectors for some rows.
+
+        Returns:
+            (len(rows), dim) float32 array with NumPy, else a list of
+            per-row views into the mapped matrix
+        """
+        if HAS_NUMPY:
+            return self._vectors[np.asarray(rows, dtype=np.int64)]
+        dim = self.dim
+        return [self._vectors[i * dim:(i + 1) * dim] for i in rows]
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def candidate_rows(
+        self,
+        source_type: Optional[Union[str, Iterable[str]]] = None,
+        project_path: Optional[str] = None,
+        include_global: bool = True,
+        exclude_ids: Optional[Iterable[str]] = None,
+        ids: Optional[Iterable[str]] = None
+    ) -> Optional[List[int]]:
+        """
+        Resolve filters against the offset table.
+
+        Args:
+            source_type: Keep only this source type (or any of several)
+            project_path: Keep only this project (plus globals if include_global)
+            include_global: With project_path, also keep rows with no project
+            exclude_ids: IDs to drop
+            ids: Keep only these IDs (e.g. from a metadata lookup)
+
+        Returns:
+            Row indices, or None when every row is a candidate
+        """
+        excluded = set(exclude_ids) if exclude_ids else None
+        allowed = set(ids) if ids is not None else None
+        if source_type is None and project_path is None and not excluded and allowed is None:
+            return None
+
+        source_types = {source_type} if isinstance(source_type, str) else (
+            set(source_type) if source_type is not None else None
+        )
+        rows = []
+        for i in range(self.count):
+            if source_types is not None and self.source_types[i] not in source_types:
+                continue
+            if allowed is not None and self.ids[i] not in allowed:
+                continue
+            if project_path is not None:
+                row_project = self.project_paths[i]
+                if row_project != project_path and not (include_global and row_project is None):
+                    continue
+            if excluded and self.ids[i] in excluded:
+                continue
+            rows.append(i)
+        return rows
+
+    def search(
+        self,
+        query: Sequence[float],
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        rows: Optional[List[int]] = None,
+        global_boost: float = 0.0
+    ) -> List[Tuple[int, float]]:
+        """
+        Cosine-similarity top-k over the packed matrix.
+
+        Args:
+            query: Query vector (must match self.dim)
+            top_k: Number of results
+            min_similarity: Minimum (boosted) similarity to keep
+            rows: Candidate row indices from candidate_rows(), None for all
+            global_boost: Added to rows whose project_path is None
+
+        Returns:
+            List of (row index, similarity) ordered by similarity descending
+        """
+        if top_k <= 0 or self.count == 0 or len(query) != self.dim:
+            return []
+        if rows is not None and not rows:
+            return []
+
+        if HAS_NUMPY:
+            return self._search_numpy(query, top_k, min_similarity, rows, global_boost)
+        return self._search_stdlib(query, top_k, min_similarity, rows, global_boost)
+
+    def _search_numpy(self, query, top_k, min_similarity, rows, global_boost):
+        """Vectorized search: one matvec plus argpartition."""
+        q = np.asarray(query, dtype=np.float32)
+        q_norm = float(np.linalg.norm(q))
+        if q_norm == 0:
+            return []
+
+        if rows is None:
+            row_idx = None
+            matrix = self._vectors
+            norms = self._norms
+        else:
+            row_idx = np.asarray(rows, dtype=np.int64)
+            matrix = self._vectors[row_idx]
+            norms = self._norms[row_idx]
+
+        dots = matrix @ q
+        denom = norms * q_norm
+        scores = np.zeros(len(dots), dtype=np.float64)
+        nonzero = denom > 0
+        scores[nonzero] = dots[nonzero] / denom[nonzero]
+
+        if global_boost != 0.0:
+            positions = range(self.count) if row_idx is None else rows
+            is_global = np.fromiter(
+                (self.project_paths[i] is None for i in positions),
+                dtype=bool, count=len(scores)
+            )
+            scores[is_global] += global_boost
+
+        keep = np.nonzero(scores >= min_similarity)[0]
+        if len(keep) == 0:
+            return []
+        kept_scores = scores[keep]
+
+        if len(keep) > top_k:
+            part = np.argpartition(-kept_scores, top_k - 1)[:top_k]
+        else:
+            part = np.arange(len(keep))
+        order = part[np.argsort(-kept_scores[part], kind="stable")]
+
+        results = []
+        for pos in order:
+            local = int(keep[pos])
+            row = local if row_idx is None else int(row_idx[local])
+            results.append((row, float(kept_scores[pos])))
+        return results
+
+    def _search_stdlib(self, query, top_k, min_similarity, rows, global_boost):
+        """Pure-Python search over the mapped matrix with heap selection."""
+        q = [float(x) for x in query]
+        q_norm = math.sqrt(_dot(q, q))
+        if q_norm == 0:
+            return []
+
+        dim = self.dim
+        vectors = self._vectors
+        norms = self._norms
+        project_paths = self.project_paths
+
+        def scored():
+            for i in (range(self.count) if rows is None else rows):
+                norm = norms[i]
+                if norm == 0:
+                    similarity = 0.0
+                else:
+                    start = i * dim
+                    similarity = _dot(vectors[start:start + dim], q) / (norm * q_norm)
+                if global_boost != 0.0 and project_paths[i] is None:
+                    similarity += global_boost
+                if similarity >= min_similarity:
+                    yield (i, similarity)
+
+        return heapq.nlargest(top_k, scored(), key=operator.itemgetter(1))
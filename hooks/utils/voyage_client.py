@@ -3,7 +3,9 @@
 Voyage Embedding Client
 
 Client for Voyage AI embedding API (voyage-3.5).
-Includes caching, rate limiting, and batch processing.
+Includes caching, rate limiting, and batch processing. Embeddings are cached
+in memory and in a persistent on-disk cache (embedding_cache.py) shared by
+every hook process.
 
 Part of PopKit Issue #19 (Embeddings Enhancement).
 """
@@ -18,6 +20,11 @@ from pathlib import Path
 import urllib.request
 import urllib.error
 
+try:
+    from .embedding_cache import EmbeddingCache, resolve_cache_path
+except ImportError:
+    from embedding_cache import EmbeddingCache, resolve_cache_path
+
 # Load .env file if available (for API keys)
 def _load_dotenv():
     """Load environment variables from .env files."""
@@ -50,7 +57,7 @@ _load_dotenv()
 # CONFIGURATION
 # =============================================================================
 
-VOYAGE_API_URL = "https://api.voyageai.com/v1/embeddings"
+VOYAGE_API_URL = os.environ.get("VOYAGE_API_URL", "https://api.voyageai.com/v1/embeddings")
 VOYAGE_MODEL = "voyage-3.5"
 EMBEDDING_DIM = 1024  # voyage-3.5 output dimension
 
@@ -123,7 +130,7 @@ class VoyageClient:
 
     Features:
     - Automatic API key from environment
-    - Response caching
+    - Response caching (in memory, then on disk across processes)
     - Rate limiting
     - Batch processing
     - Retry with backoff
@@ -133,7 +140,9 @@ class VoyageClient:
         self,
         api_key: Optional[str] = None,
         model: str = VOYAGE_MODEL,
-        cache_enabled: bool = True
+        cache_enabled: bool = True,
+        cache_path: Optional[Path] = None,
+        api_url: Optional[str] = None
     ):
         """
         Initialize Voyage client.
@@ -142,11 +151,21 @@ class VoyageClient:
             api_key: Voyage API key (defaults to VOYAGE_API_KEY env var)
             model: Embedding model name
             cache_enabled: Enable response caching
+            cache_path: Persistent cache file (defaults to POPKIT_EMBEDDING_CACHE,
+                then ~/.claude/config/embedding-cache.db; "off" disables it)
+            api_url: Embeddings endpoint (defaults to VOYAGE_API_URL)
         """
         self.api_key = api_key or os.environ.get("VOYAGE_API_KEY")
         self.model = model
+        self.api_url = api_url or VOYAGE_API_URL
         self.cache_enabled = cache_enabled
         self._cache: Dict[str, List[float]] = {}
+        self._disk_cache: Optional[EmbeddingCache] = None
+        if cache_enabled:
+            path = resolve_cache_path(cache_path)
+            if path is not None:
+                # Opened on first lookup, so clients that never embed stay cheap
+                self._disk_cache = EmbeddingCache(path)
         self._usage = EmbeddingUsage()
 
     # =========================================================================
@@ -196,6 +215,19 @@ class VoyageClient:
             uncached_texts.append(text)
             uncached_indices.append(i)
 
+        # Then the persistent cache, in one query
+        if uncached_texts and self._disk_cache:
+            keys = [self._cache_key(text, input_type) for text in uncached_texts]
+            stored = self._disk_cache.get_many(keys)
+            remaining = []
+            for text, i, key in zip(uncached_texts, uncached_indices, keys):
+                if key in stored:
+                    results[i] = self._cache[key] = stored[key]
+                else:
+                    remaining.append((text, i))
+            uncached_texts = [text for text, _ in remaining]
+            uncached_indices = [i for _, i in remaining]
+
         # Fetch uncached embeddings in batches
         if uncached_texts:
             for batch_start in range(0, len(uncached_texts), BATCH_SIZE):
@@ -211,6 +243,7 @@ class VoyageClient:
                 response = self._call_api_with_retry(batch_texts, input_type)
 
                 # Store results and update cache
+                fetched = {}
                 for j, embedding in enumerate(response.embeddings):
                     idx = batch_indices[j]
                     results[idx] = embedding
@@ -218,6 +251,10 @@ class VoyageClient:
                     if self.cache_enabled:
                         cache_key = self._cache_key(batch_texts[j], input_type)
                         self._cache[cache_key] = embedding
+                        fetched[cache_key] = embedding
+
+                if self._disk_cache:
+                    self._disk_cache.put_many(fetched)
 
                 # Update usage
                 self._usage.add(response.usage.get("total_tokens", 0))
@@ -263,6 +300,13 @@ class VoyageClient:
         """Get number of cached embeddings."""
         return len(self._cache)
 
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Get persistent cache size and hit/miss counters."""
+        if not self._disk_cache:
+            return {"entries": 0, "bytes": 0, "hits": 0, "misses": 0}
+        return self._disk_cache.stats()
+
     @property
     def usage(self) -> Dict[str, int]:
         """Get current usage stats."""
@@ -293,7 +337,7 @@ class VoyageClient:
         }).encode("utf-8")
 
         request = urllib.request.Request(
-            VOYAGE_API_URL,
+            self.api_url,
             data=data,
             headers=headers,
             method="POST"
@@ -358,9 +402,11 @@ class VoyageClient:
         return hashlib.sha256(content.encode()).hexdigest()[:24]
 
     def clear_cache(self) -> int:
-        """Clear the response cache."""
+        """Clear the in-memory and persistent response caches."""
         count = len(self._cache)
         self._cache.clear()
+        if self._disk_cache:
+            count = max(count, self._disk_cache.clear())
         return count
 
 
@@ -449,6 +495,7 @@ if __name__ == "__main__":
     print("\nTesting cache...")
     _ = client.embed_single("Hello, world!")  # Should be cached
     print(f"Cache size: {client.cache_size}")
+    print(f"Persistent cache: {client.cache_stats}")
 
     print(f"\nUsage: {client.usage}")
     print("\nAll tests passed!")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Per-Agent State Shards
+
+The check-in hook used to merge each agent's tracking state into the shared
+power-mode-state.json on every tool call: re-read the file, merge the whole
+dict (with ever-growing lists), rewrite it with indent. Concurrent agents
+raced on that read-modify-write, and the status line re-parsed the big file.
+
+Instead each agent owns two files in an "agents" directory next to the
+Power Mode state file:
+
+- <agent>.json: full tracking state, list fields capped as ring buffers
+- <agent>.summary.json: a few counters for the status line
+
+Both are written with write-then-rename, so readers never see a partial
+file and no two agents write the same file. The shared state file is left
+to the Power Mode fields (active, phases, config, ...).
+
+Usage:
+    from agent_state import load_agent_summaries, shard_paths
+
+    shard, summary = shard_paths(state_dir, agent_id)
+    summaries = load_agent_summaries(state_dir, since=activated_at)
+"""
+
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+AGENT_SHARD_DIR = "agents"
+SUMMARY_SUFFIX = ".summary.json"
+
+# Most recent entries kept per list field
+RING_LIMITS = {
+    "files_touched": 50,
+    "tools_used": 50,
+    "decisions": 20,
+    "blockers": 20,
+    "insights_received": 100,
+    "insights_shared": 100,
+}
+
+
+def shard_paths(state_dir: Path, agent_id: str) -> Tuple[Path, Path]:
+    """
+    Shard and summary file for an agent.
+
+    Args:
+        state_dir: Directory holding power-mode-state.json
+        agent_id: Agent ID (path separators are replaced)
+
+    Returns:
+        (state shard path, summary path)
+    """
+    name = agent_id.replace(os.sep, "_").replace("/", "_") or "agent"
+    directory = Path(state_dir) / AGENT_SHARD_DIR
+    return directory / f"{name}.json", directory / f"{name}{SUMMARY_SUFFIX}"
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write compact JSON to a temp file and rename it over `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def read_json(path: Path) -> Optional[Dict[str, Any]]:
+    """Parse a JSON object file; None if missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def remember(items: List[Any], value: Any, limit: int, unique: bool = True) -> bool:
+    """
+    Append to a ring buffer, dropping the oldest entries beyond `limit`.
+
+    Returns:
+        False if `unique` and the value is already present
+    """
+    if unique and value in items:
+        return False
+    items.append(value)
+    del items[:-limit]
+    return True
+
+
+# =============================================================================
+# SUMMARIES
+# =============================================================================
+
+def summarize(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Status line summary of an agent's tracking state."""
+    return {
+        "agent_id": state.get("agent_id"),
+        "agent_name": state.get("agent_name"),
+        "session_id": state.get("session_id"),
+        "progress": state.get("progress", 0.0),
+        "current_task": state.get("current_task", ""),
+        "tool_call_count": state.get("tool_call_count", 0),
+        "insights_shared": state.get("insights_shared_count", 0),
+        "insights_received": state.get("insights_received_count", 0),
+        "active_streams": len(state.get("active_streams", {})),
+        "last_checkin": state.get("last_checkin"),
+        "updated_at": datetime.now().isoformat(),
+    }
+
+
+def load_agent_summaries(state_dir: Path, since: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Read every agent summary in a state directory.
+
+    Args:
+        state_dir: Directory holding power-mode-state.json
+        since: ISO timestamp; older summaries (earlier sessions) are skipped
+
+    Returns:
+        Summaries keyed by agent ID
+    """
+    summaries = {}
+    directory = Path(state_dir) / AGENT_SHARD_DIR
+    try:
+        paths = sorted(directory.glob(f"*{SUMMARY_SUFFIX}"))
+    except OSError:
+        return summaries
+    for path in paths:
+        summary = read_json(path)
+        if summary is None or (since and summary.get("updated_at", "") < since):
+            continue
+        summaries[summary.get("agent_id") or path.name[:-len(SUMMARY_SUFFIX)]] = summary
+    return summaries
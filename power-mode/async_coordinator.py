@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Async Power Mode Coordinator
+
+asyncio-native run mode for PowerModeCoordinator. The threaded coordinator
+runs a listener thread plus a monitor thread that wakes every heartbeat
+interval to check agents, expire barriers and poll the cloud. Here one event
+loop multiplexes all of it:
+
+- Subscriptions: a single reader thread blocks in pubsub.get_message() (the
+  backends' clients are synchronous) and feeds a bounded AsyncQueue. When
+  handlers fall behind, the reader blocks on the full queue and stops
+  draining the backend, so a burst from dozens of agents costs bounded memory.
+- Heartbeat timers: agent health checks, cloud polling and write flushes
+  all run in the shared executor, since any of them may block on the backend
+  (a heartbeat-miss broadcast can fill and flush the write pipeline).
+- Barrier expiry: a task sleeps until the earliest barrier deadline and is
+  woken when a barrier is created, so expiry happens on time instead of on
+  the next monitor tick.
+
+The loop itself never touches the backend. Message handlers are the base
+coordinator's, run one at a time in the executor and awaited in inbox order,
+so protocol behaviour is identical; the shared registries are lock-protected
+exactly as in threaded mode, where the listener and monitor also overlap.
+
+Usage:
+    python coordinator.py start --async --objective "Build auth"
+
+    coordinator = AsyncPowerModeCoordinator(objective)
+    asyncio.run(coordinator.run())
+"""
+
+import sys
+import queue
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+from async_support import AsyncQueue, run_sync
+from coordinator import CONFIG, PowerModeCoordinator
+from protocol import Objective
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Messages buffered between the reader thread and the handlers
+INBOX_SIZE = 1000
+
+# Reader thread's get_message() / blocked put() slice, in seconds
+READ_TIMEOUT = 1.0
+
+
+# =============================================================================
+# ASYNC COORDINATOR
+# =============================================================================
+
+class AsyncPowerModeCoordinator(PowerModeCoordinator):
+    """
+    PowerModeCoordinator driven by one asyncio event loop.
+
+    Call `await run()`; it returns when stop() is called or the task is
+    cancelled.
+    """
+
+    def __init__(self, objective: Optional[Objective] = None, inbox_size: int = INBOX_SIZE):
+        super().__init__(objective)
+        self.inbox: AsyncQueue = AsyncQueue(maxsize=inbox_size)
+        self.messages_handled = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._barriers_changed: Optional[asyncio.Event] = None
+
+    @property
+    def heartbeat_seconds(self) -> float:
+        """Interval between agent health checks."""
+        return CONFIG.get("intervals", {}).get("heartbeat_seconds", 15)
+
+    async def run(self) -> bool:
+        """
+        Start the coordinator and serve until stopped.
+
+        Returns:
+            False if the backend could not be reached, True after a clean stop
+        """
+        if not await run_sync(self._start_session):
+            return False
+
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._barriers_changed = asyncio.Event()
+
+        # Base stop() joins the listener thread; here that's the reader
+        self._listener_thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._listener_thread.start()
+
+        tasks = [
+            asyncio.create_task(self._dispatch_loop()),
+            asyncio.create_task(self._every(self.heartbeat_seconds, self._monitor_tick)),
+            asyncio.create_task(self._barrier_loop()),
+        ]
+        print(f"Coordinator started (async). Session: {self.session_id}")
+
+        try:
+            await self._stopping.wait()
+        finally:
+            self.is_running = False
+            self.inbox.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await run_sync(super().stop)
+            self._loop = None
+        return True
+
+    def stop(self):
+        """Ask run() to shut down (safe from any thread)."""
+        loop, stopping = self._loop, self._stopping
+        if loop is None or stopping is None:
+            super().stop()
+            return
+        try:
+            loop.call_soon_threadsafe(stopping.set)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    # =========================================================================
+    # SUBSCRIPTIONS
+    # =========================================================================
+
+    def _read_loop(self):
+        """Reader thread: move pub/sub messages into the inbox."""
+        while self.is_running:
+            try:
+                message = self.pubsub.get_message(timeout=READ_TIMEOUT)
+            except Exception as e:
+                print(f"Listener error: {e}", file=sys.stderr)
+                continue
+            if not message or message["type"] != "message":
+                continue
+
+            # Backpressure: hold off reading while the handlers catch up
+            while self.is_running:
+                try:
+                    self.inbox.put((message["channel"], message["data"]), timeout=READ_TIMEOUT)
+                    break
+                except queue.Full:
+                    continue
+                except RuntimeError:
+                    return  # Inbox closed
+
+    async def _dispatch_loop(self):
+        """Handle inbox messages in order, each in the executor."""
+        async for channel, data in self.inbox:
+            try:
+                await run_sync(self._handle_message, channel, data)
+            except Exception as e:
+                print(f"Handler error: {e}", file=sys.stderr)
+            self.messages_handled += 1
+
+    # =========================================================================
+    # TIMERS
+    # =========================================================================
+
+    async def _every(self, seconds: float, tick: Callable[[], Any]):
+        """Run an async tick every `seconds`, logging its errors."""
+        while True:
+            await asyncio.sleep(seconds)
+            try:
+                await tick()
+            except Exception as e:
+                print(f"Monitor error: {e}", file=sys.stderr)
+
+    async def _monitor_tick(self):
+        """Health checks, cloud polling and flushes, all in the executor."""
+        await run_sync(self._check_agent_health)
+        await run_sync(self._poll_cloud_messages)
+        await run_sync(self._flush_writes)
+
+    async def _barrier_loop(self):
+        """Expire barriers at their deadlines."""
+        while True:
+            self._barriers_changed.clear()
+            expiry = self.sync_manager.next_expiry()
+            # Barriers made straight through sync_manager don't signal, so
+            # never sleep longer than the threaded monitor would have
+            wait = self.heartbeat_seconds
+            if expiry is not None:
+                wait = min(wait, max(0.0, (expiry - datetime.now()).total_seconds()))
+            try:
+                await asyncio.wait_for(self._barriers_changed.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await run_sync(self._cleanup_expired_barriers)
+            except Exception as e:
+                print(f"Monitor error: {e}", file=sys.stderr)
+
+    def create_sync_barrier(self, name: str, agents: List[str]) -> str:
+        """Create a sync barrier and reschedule barrier expiry."""
+        barrier_id = super().create_sync_barrier(name, agents)
+        loop, changed = self._loop, self._barriers_changed
+        if loop is not None and changed is not None:
+            loop.call_soon_threadsafe(changed.set)
+        return barrier_id
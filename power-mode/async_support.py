@@ -194,43 +194,89 @@ class AsyncQueue(Generic[T]):
     Thread-safe async queue for producer-consumer patterns.
 
     Useful for streaming chunks from sync producers to async consumers.
+    A bounded queue (maxsize > 0) gives backpressure: put() blocks the
+    producer thread until a consumer makes room. Waiting consumers are
+    woken by put() through their event loop, so an idle queue costs no CPU.
     """
 
     def __init__(self, maxsize: int = 0):
         self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
         self._closed = False
+        # (loop, future) per consumer awaiting an item
+        self._waiters: list = []
+        self._waiters_lock = threading.Lock()
 
     def put(self, item: T, block: bool = True, timeout: Optional[float] = None) -> None:
         """Put an item into the queue (sync)."""
         if self._closed:
             raise RuntimeError("Queue is closed")
         self._queue.put(item, block=block, timeout=timeout)
+        self._wake()
 
     def put_nowait(self, item: T) -> None:
         """Put an item without blocking."""
         self.put(item, block=False)
 
+    def qsize(self) -> int:
+        """Approximate number of queued items."""
+        return self._queue.qsize()
+
+    def _wake(self, everyone: bool = False) -> None:
+        """Wake one waiting consumer (or all of them)."""
+        with self._waiters_lock:
+            if everyone:
+                waiters, self._waiters = self._waiters, []
+            else:
+                waiters, self._waiters = self._waiters[:1], self._waiters[1:]
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # Consumer's loop already closed
+
+    def _forget(self, future: asyncio.Future) -> None:
+        """Drop a consumer's waiter, passing on a wakeup it didn't use."""
+        with self._waiters_lock:
+            self._waiters = [(l, f) for l, f in self._waiters if f is not future]
+        if future.done() and not future.cancelled() and not self._queue.empty():
+            self._wake()
+
     async def get(self, timeout: Optional[float] = None) -> T:
         """Get an item from the queue (async)."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
         while True:
             try:
-                return await run_sync(
-                    self._queue.get,
-                    block=True,
-                    timeout=0.1
-                )
+                item = self._queue.get_nowait()
             except queue.Empty:
-                if self._closed and self._queue.empty():
-                    raise StopAsyncIteration("Queue closed and empty")
-                if timeout is not None:
-                    timeout -= 0.1
-                    if timeout <= 0:
-                        raise asyncio.TimeoutError("Queue get timeout")
-                await asyncio.sleep(0.01)
+                pass
+            else:
+                if not self._queue.empty():
+                    self._wake()  # Let the next consumer at the rest
+                return item
+
+            if self._closed:
+                raise StopAsyncIteration("Queue closed and empty")
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                raise asyncio.TimeoutError("Queue get timeout")
+
+            future = loop.create_future()
+            with self._waiters_lock:
+                self._waiters.append((loop, future))
+            try:
+                # An item (or close) may have landed before we registered
+                if self._queue.empty() and not self._closed:
+                    await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                raise asyncio.TimeoutError("Queue get timeout")
+            finally:
+                self._forget(future)
 
     def close(self) -> None:
         """Close the queue (no more puts allowed)."""
         self._closed = True
+        self._wake(everyone=True)
 
     @property
     def closed(self) -> bool:
@@ -247,6 +293,12 @@ class AsyncQueue(Generic[T]):
             raise StopAsyncIteration
 
 
+def _resolve(future: asyncio.Future) -> None:
+    """Complete a waiter future (runs on its loop)."""
+    if not future.done():
+        future.set_result(None)
+
+
 # =============================================================================
 # ASYNC BATCH PROCESSOR
 # =============================================================================
@@ -7,19 +7,39 @@ Measures performance of different coordination modes:
 - Native Async: Parallel agents, minimal coordination
 - Redis Coordinated: Full pub/sub with context sharing
 
+And the local (no Redis) backends - json, log and sqlite:
+- publish -> receive latency (p50/p99), delivered throughput, and the CPU
+  an idle subscriber burns, per backend and change notifier
+- key-space throughput with concurrent agent processes
+
+And StreamManager state persistence: bytes written per chunk and time per
+save for full snapshots vs. the delta journal.
+
+And status line rendering: p50/p99 time per refresh with every widget
+enabled, without the render cache, from a warm cache, and with one source
+file changing between refreshes.
+
 Usage:
     python benchmark.py --mode native-async --issues 269,261,260
     python benchmark.py --mode redis-coordinated --issues 269,261,260
     python benchmark.py --compare
+    python benchmark.py --pubsub --subscribers 3 --messages 200
+    python benchmark.py --backend-ops --writers 4 --ops 500
+    python benchmark.py --stream-persistence --sessions 8 --chunks 2000
+    python benchmark.py --statusline --renders 200
 """
 
 import argparse
 import json
+import os
 import time
 import sys
+import statistics
+import subprocess
+import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 
 @dataclass
@@ -440,6 +460,510 @@ def compare_benchmarks():
     print()
 
 
+# =============================================================================
+# LOCAL BACKENDS: PUB/SUB TRANSPORT
+# =============================================================================
+
+PUBSUB_CHANNEL = "pop:bench"
+BACKEND_PATHS = {"json": "state.json", "log": "log", "sqlite": "power-mode.db"}
+
+
+@dataclass
+class PubSubBenchmarkResult:
+    """File-backend pub/sub run for one backend/notifier pair."""
+    backend: str    # "json", "log" or "sqlite"
+    notifier: str   # "inotify" or "stat"
+    subscribers: int
+    messages: int
+    latency_p50_ms: float
+    latency_p99_ms: float
+    throughput_msgs_per_sec: float   # Deliveries/sec across subscribers, burst phase
+    idle_cpu_ms_per_sec: float       # Subscriber CPU per second of waiting, mean
+    lost_messages: int
+
+
+def _pubsub_subscriber(backend: str, path: str, ready_file: str, expected: int):
+    """Subscriber process: report idle CPU and per-message receive times as JSON."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from file_fallback import create_file_client
+
+    pubsub = create_file_client(backend, path).pubsub()
+    pubsub.subscribe(PUBSUB_CHANNEL)
+    Path(ready_file).touch()
+
+    idle_start, idle_cpu_start = time.monotonic(), time.process_time()
+    received = []
+    while len(received) < expected:
+        message = pubsub.get_message(timeout=10)
+        if message is None:
+            break
+        now = time.time()
+        if not received:
+            idle = (time.monotonic() - idle_start, time.process_time() - idle_cpu_start)
+        received.append((json.loads(message["data"]), now))
+
+    idle_seconds, idle_cpu = idle if received else (0.0, 0.0)
+    print(json.dumps({
+        "idle_seconds": idle_seconds,
+        "idle_cpu": idle_cpu,
+        "received": [[m["phase"], m["sent"], now] for m, now in received],
+    }))
+
+
+def run_pubsub_benchmark(backend: str, notifier: str, subscribers: int = 3,
+                         messages: int = 200, interval_ms: float = 5.0,
+                         idle_seconds: float = 1.0) -> PubSubBenchmarkResult:
+    """
+    Measure one file backend with one change notifier.
+
+    Subscribers run as separate processes (like agents). After they sit idle
+    for `idle_seconds`, the publisher sends `messages` paced `interval_ms`
+    apart (latency phase), then `messages` back to back (throughput phase).
+
+    Args:
+        backend: "json", "log" or "sqlite"
+        notifier: "inotify" or "stat"
+        subscribers: Subscriber process count
+        messages: Messages per phase
+        interval_ms: Gap between messages in the latency phase
+        idle_seconds: Idle time before the first publish
+
+    Returns:
+        PubSubBenchmarkResult
+    """
+    sys.path.insert(0, str(Path(__file__).parent))
+    from file_fallback import create_file_client
+
+    env = dict(os.environ, POPKIT_FILE_NOTIFIER=notifier)
+    os.environ["POPKIT_FILE_NOTIFIER"] = notifier
+
+    with tempfile.TemporaryDirectory(prefix="popkit-pubsub-bench-") as tmp:
+        path = str(Path(tmp) / BACKEND_PATHS[backend])
+        publisher = create_file_client(backend, path)
+
+        procs = []
+        for n in range(subscribers):
+            ready = Path(tmp) / f"ready-{n}"
+            procs.append((ready, subprocess.Popen(
+                [sys.executable, __file__, "--pubsub-subscriber", backend, path,
+                 str(ready), str(2 * messages)],
+                stdout=subprocess.PIPE, env=env, text=True,
+            )))
+        while not all(ready.exists() for ready, _ in procs):
+            time.sleep(0.01)
+        time.sleep(idle_seconds)
+
+        for phase, gap in (("latency", interval_ms / 1000), ("burst", 0)):
+            for i in range(messages):
+                publisher.publish(PUBSUB_CHANNEL, json.dumps(
+                    {"phase": phase, "i": i, "sent": time.time()}
+                ))
+                if gap:
+                    time.sleep(gap)
+
+        reports = [json.loads(proc.communicate(timeout=120)[0]) for _, proc in procs]
+
+    latencies = sorted(
+        (received - sent) * 1000
+        for report in reports
+        for phase, sent, received in report["received"] if phase == "latency"
+    )
+    burst = [(sent, received) for report in reports
+             for phase, sent, received in report["received"] if phase == "burst"]
+    burst_seconds = max(r for _, r in burst) - min(s for s, _ in burst) if burst else 0
+    idle = [r["idle_cpu"] * 1000 / r["idle_seconds"] for r in reports if r["idle_seconds"]]
+
+    def percentile(values: List[float], q: float) -> float:
+        return round(values[min(len(values) - 1, int(len(values) * q))], 2) if values else 0.0
+
+    return PubSubBenchmarkResult(
+        backend=backend,
+        notifier=notifier,
+        subscribers=subscribers,
+        messages=messages,
+        latency_p50_ms=percentile(latencies, 0.50),
+        latency_p99_ms=percentile(latencies, 0.99),
+        throughput_msgs_per_sec=round(len(burst) / burst_seconds, 1) if burst_seconds else 0.0,
+        idle_cpu_ms_per_sec=round(statistics.mean(idle), 2) if idle else 0.0,
+        lost_messages=2 * messages * subscribers - sum(len(r["received"]) for r in reports),
+    )
+
+
+def pubsub_benchmarks(backends: List[str], notifiers: Optional[List[str]] = None,
+                      as_json: bool = False, **kwargs) -> List[PubSubBenchmarkResult]:
+    """Run and print the pub/sub benchmark for every backend/notifier pair."""
+    if notifiers is None:
+        notifiers = ["inotify", "stat"] if sys.platform.startswith("linux") else ["stat"]
+
+    results = [run_pubsub_benchmark(b, n, **kwargs) for b in backends for n in notifiers]
+
+    if as_json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return results
+
+    print(f"\n{'='*70}")
+    print("  LOCAL BACKEND PUB/SUB BENCHMARK")
+    print(f"{'='*70}\n")
+    print(f"{'Backend':<8} | {'Notifier':<8} | {'p50 ms':>8} | {'p99 ms':>8} | "
+          f"{'msgs/s':>9} | {'idle CPU ms/s':>13} | {'lost':>4}")
+    print("-" * 76)
+    for r in results:
+        print(f"{r.backend:<8} | {r.notifier:<8} | {r.latency_p50_ms:>8.2f} | "
+              f"{r.latency_p99_ms:>8.2f} | {r.throughput_msgs_per_sec:>9.1f} | "
+              f"{r.idle_cpu_ms_per_sec:>13.2f} | {r.lost_messages:>4}")
+    print()
+    return results
+
+
+# =============================================================================
+# LOCAL BACKENDS: KEY-SPACE OPERATIONS
+# =============================================================================
+
+@dataclass
+class BackendOpsResult:
+    """Concurrent key-space throughput for one local backend."""
+    backend: str
+    writers: int
+    ops_per_writer: int
+    ops_per_sec: float        # All writers together (4 operations per iteration)
+    read_p50_us: float        # HGETALL on a shared hash while writers run
+    read_p99_us: float
+    lost_writes: int
+
+
+def _ops_writer(backend: str, path: str, agent: str, iterations: int):
+    """Writer process: the coordinator's per-tool-call pattern."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from file_fallback import create_file_client
+
+    client = create_file_client(backend, path)
+    for i in range(iterations):
+        client.hset("pop:agents", agent, str(i))
+        client.hset(f"pop:agent:{agent}", mapping={"progress": str(i), "status": "active"})
+        client.lpush("pop:insights", f"{agent}-{i}")
+        client.get("pop:objective")
+
+
+def run_backend_ops_benchmark(backend: str, writers: int = 4,
+                              ops: int = 200) -> BackendOpsResult:
+    """
+    Measure one local backend under concurrent agent writes.
+
+    Args:
+        backend: "json", "log" or "sqlite"
+        writers: Writer process count
+        ops: Iterations per writer (4 operations each)
+
+    Returns:
+        BackendOpsResult
+    """
+    sys.path.insert(0, str(Path(__file__).parent))
+    from file_fallback import create_file_client
+
+    with tempfile.TemporaryDirectory(prefix="popkit-ops-bench-") as tmp:
+        path = str(Path(tmp) / BACKEND_PATHS[backend])
+        reader = create_file_client(backend, path)
+        reader.set("pop:objective", "benchmark")
+
+        start = time.perf_counter()
+        procs = [
+            subprocess.Popen([sys.executable, __file__, "--ops-writer", backend, path,
+                              f"agent-{n}", str(ops)])
+            for n in range(writers)
+        ]
+        reads = []
+        while any(proc.poll() is None for proc in procs):
+            t0 = time.perf_counter()
+            reader.hgetall("pop:agents")
+            reads.append((time.perf_counter() - t0) * 1e6)
+        elapsed = time.perf_counter() - start
+        failed = sum(proc.returncode != 0 for proc in procs)
+
+        final = reader.hgetall("pop:agents")
+        lost = writers * ops - len(reader.lrange("pop:insights", 0, -1))
+        if failed or final != {f"agent-{n}": str(ops - 1) for n in range(writers)}:
+            lost = max(lost, 1)
+
+    reads.sort()
+
+    def percentile(q: float) -> float:
+        return round(reads[min(len(reads) - 1, int(len(reads) * q))], 1) if reads else 0.0
+
+    return BackendOpsResult(
+        backend=backend,
+        writers=writers,
+        ops_per_writer=ops,
+        ops_per_sec=round(writers * ops * 4 / elapsed, 1),
+        read_p50_us=percentile(0.50),
+        read_p99_us=percentile(0.99),
+        lost_writes=lost,
+    )
+
+
+def backend_ops_benchmarks(backends: List[str], as_json: bool = False,
+                           **kwargs) -> List[BackendOpsResult]:
+    """Run and print the key-space benchmark for every local backend."""
+    results = [run_backend_ops_benchmark(b, **kwargs) for b in backends]
+
+    if as_json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return results
+
+    print(f"\n{'='*70}")
+    print("  LOCAL BACKEND KEY-SPACE BENCHMARK")
+    print(f"{'='*70}\n")
+    print(f"{'Backend':<8} | {'writers':>7} | {'ops/s':>9} | {'read p50 us':>11} | "
+          f"{'read p99 us':>11} | {'lost':>4}")
+    print("-" * 66)
+    for r in results:
+        print(f"{r.backend:<8} | {r.writers:>7} | {r.ops_per_sec:>9.1f} | "
+              f"{r.read_p50_us:>11.1f} | {r.read_p99_us:>11.1f} | {r.lost_writes:>4}")
+    print()
+    return results
+
+
+# =============================================================================
+# STREAM STATE PERSISTENCE
+# =============================================================================
+
+@dataclass
+class StreamPersistenceResult:
+    """Bytes and time spent persisting StreamManager state for one mode."""
+    mode: str
+    snapshot_every: int
+    sessions: int
+    chunks: int
+    bytes_per_chunk: float
+    save_p50_ms: float
+    save_p99_ms: float
+    replay_ms: float
+    restored_chunks: int
+
+
+def run_stream_persistence_benchmark(snapshot_every: int, mode: str, sessions: int = 8,
+                                     chunks: int = 2000, save_every: int = 10,
+                                     chunk_size: int = 200) -> StreamPersistenceResult:
+    """
+    Stream chunks into a journaled StreamManager, saving state periodically.
+
+    snapshot_every=1 rewrites every session on each save (the cost of
+    persisting full state); larger values append only the delta.
+
+    Args:
+        snapshot_every: Journal records between full snapshots
+        mode: Label for the result
+        sessions: Concurrent streaming sessions
+        chunks: Chunks per session
+        save_every: Chunks (per session) between save_state() calls
+        chunk_size: Characters per chunk
+
+    Returns:
+        StreamPersistenceResult
+    """
+    sys.path.insert(0, str(Path(__file__).parent))
+    from protocol import StreamChunk
+    from stream_manager import StreamManager
+
+    with tempfile.TemporaryDirectory(prefix="popkit-stream-bench-") as tmp:
+        tmp_path = Path(tmp)
+        state_file = tmp_path / "streaming-state.json"
+        manager = StreamManager(spill_dir=tmp_path / "spill", journal_dir=tmp_path / "journal",
+                                snapshot_every=snapshot_every)
+        session_ids = [manager.start_session(f"agent-{n}", "Bash") for n in range(sessions)]
+        content = "x" * chunk_size
+
+        saves = []
+        for i in range(chunks):
+            for n, session_id in enumerate(session_ids):
+                manager.add_chunk(StreamChunk(
+                    session_id=session_id, agent_id=f"agent-{n}", chunk_index=i,
+                    content=content, is_final=(i == chunks - 1)))
+            if (i + 1) % save_every == 0 or i == chunks - 1:
+                t0 = time.perf_counter()
+                manager.save_state(state_file)
+                saves.append((time.perf_counter() - t0) * 1000)
+        written = manager.persisted_bytes
+
+        t0 = time.perf_counter()
+        restored = StreamManager(spill_dir=tmp_path / "replay", journal_dir=tmp_path / "journal")
+        restored.load_state(state_file)
+        replay_ms = (time.perf_counter() - t0) * 1000
+        restored_chunks = sum(s.chunk_count for s in restored._sessions.values())
+
+    saves.sort()
+
+    def percentile(q: float) -> float:
+        return round(saves[min(len(saves) - 1, int(len(saves) * q))], 3)
+
+    return StreamPersistenceResult(
+        mode=mode,
+        snapshot_every=snapshot_every,
+        sessions=sessions,
+        chunks=sessions * chunks,
+        bytes_per_chunk=round(written / (sessions * chunks), 1),
+        save_p50_ms=percentile(0.50),
+        save_p99_ms=percentile(0.99),
+        replay_ms=round(replay_ms, 1),
+        restored_chunks=restored_chunks,
+    )
+
+
+def stream_persistence_benchmarks(as_json: bool = False,
+                                  **kwargs) -> List[StreamPersistenceResult]:
+    """Run and print the persistence benchmark for full snapshots vs. the journal."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from stream_manager import SNAPSHOT_EVERY_RECORDS
+
+    results = [
+        run_stream_persistence_benchmark(1, "snapshot", **kwargs),
+        run_stream_persistence_benchmark(SNAPSHOT_EVERY_RECORDS, "journal", **kwargs),
+    ]
+
+    if as_json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return results
+
+    print(f"\n{'='*70}")
+    print("  STREAM STATE PERSISTENCE BENCHMARK")
+    print(f"{'='*70}\n")
+    print(f"{'Mode':<8} | {'chunks':>7} | {'bytes/chunk':>11} | {'save p50 ms':>11} | "
+          f"{'save p99 ms':>11} | {'replay ms':>9}")
+    print("-" * 72)
+    for r in results:
+        print(f"{r.mode:<8} | {r.chunks:>7} | {r.bytes_per_chunk:>11.1f} | "
+              f"{r.save_p50_ms:>11.2f} | {r.save_p99_ms:>11.2f} | {r.replay_ms:>9.1f}")
+    print()
+    return results
+
+
+# =============================================================================
+# STATUS LINE RENDERING
+# =============================================================================
+
+@dataclass
+class StatuslineResult:
+    """Time per status line refresh for one cache mode."""
+    mode: str
+    renders: int
+    widgets: int
+    render_p50_ms: float
+    render_p99_ms: float
+    cache_hits: int
+
+
+def _statusline_project(root: Path) -> Path:
+    """A git project with a data file for every status line widget."""
+    project = root / "project"
+    popkit = project / ".claude" / "popkit"
+    (popkit / "agents").mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", str(project)], capture_output=True)
+    (popkit / "power-mode-state.json").write_text(json.dumps({
+        "active": True, "active_issue": 45, "current_phase": "implement", "phase_index": 3,
+        "total_phases": 7, "progress": 0.4, "batch_number": 2,
+        "streaming": {"active_streams": 2, "agents_streaming": ["explorer", "auditor"]},
+        "config": {"agents": ["explorer", "auditor", "writer"]}
+    }))
+    for n in range(3):
+        (popkit / "agents" / f"agent-{n}.summary.json").write_text(json.dumps({
+            "agent_id": f"agent-{n}", "insights_shared": n, "insights_received": 1,
+            "updated_at": datetime.now().isoformat()
+        }))
+    (popkit / "efficiency-metrics.json").write_text(json.dumps({
+        "duplicates_skipped": 12, "patterns_matched": 3, "insight_lengths": [120] * 40
+    }))
+    (popkit / "health-state.json").write_text(json.dumps({
+        "build": {"success": True}, "tests": {"passed": 12, "total": 12}, "lint": {"errors": 0}
+    }))
+    (project / ".claude" / "STATUS.json").write_text(json.dumps({
+        "workflow": {"type": "feature-dev", "current_step": "Implementation", "progress": 0.7}
+    }))
+    return project
+
+
+def run_statusline_benchmark(mode: str, renders: int = 200) -> StatuslineResult:
+    """
+    Time full status line refreshes with every widget enabled.
+
+    Each refresh starts from a fresh in-process cache, as the real status
+    line (a new process per refresh) does.
+
+    Args:
+        mode: "uncached", "cached" (no source changes) or "incremental"
+            (the efficiency metrics file changes before every refresh)
+        renders: Refreshes to time
+
+    Returns:
+        StatuslineResult
+    """
+    sys.path.insert(0, str(Path(__file__).parent))
+    import statusline
+
+    cwd, home = os.getcwd(), os.environ.get("HOME")
+    with tempfile.TemporaryDirectory(prefix="popkit-statusline-bench-") as tmp:
+        project = _statusline_project(Path(tmp))
+        metrics = project / ".claude" / "popkit" / "efficiency-metrics.json"
+        config = statusline.WidgetConfig(widgets=list(statusline.WIDGETS), compact_mode=False)
+        os.environ["HOME"] = str(Path(tmp) / "home")
+        os.chdir(project)
+        cache_path, statusline.RENDER_CACHE_PATH = statusline.RENDER_CACHE_PATH, Path(tmp) / "cache.json"
+        try:
+            statusline._render_cache = None
+            statusline.format_widget_status_line(config)  # Warm the cache file
+
+            times, hits = [], 0
+            for i in range(renders):
+                if mode == "incremental":
+                    metrics.write_text(json.dumps({"patterns_matched": i}))
+                statusline._render_cache = None if mode != "uncached" else statusline.RenderCache(enabled=False)
+                t0 = time.perf_counter()
+                statusline.format_widget_status_line(config)
+                times.append((time.perf_counter() - t0) * 1000)
+                hits += statusline.get_render_cache().hits
+        finally:
+            statusline.RENDER_CACHE_PATH = cache_path
+            statusline._render_cache = None
+            os.chdir(cwd)
+            if home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = home
+
+    times.sort()
+
+    def percentile(q: float) -> float:
+        return round(times[min(len(times) - 1, int(len(times) * q))], 3)
+
+    return StatuslineResult(
+        mode=mode,
+        renders=renders,
+        widgets=len(config.widgets),
+        render_p50_ms=percentile(0.50),
+        render_p99_ms=percentile(0.99),
+        cache_hits=hits,
+    )
+
+
+def statusline_benchmarks(as_json: bool = False, **kwargs) -> List[StatuslineResult]:
+    """Run and print the status line benchmark for each cache mode."""
+    results = [run_statusline_benchmark(mode, **kwargs)
+               for mode in ("uncached", "cached", "incremental")]
+
+    if as_json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return results
+
+    print(f"\n{'='*70}")
+    print("  STATUS LINE RENDER BENCHMARK")
+    print(f"{'='*70}\n")
+    print(f"{'Mode':<12} | {'renders':>7} | {'widgets':>7} | {'p50 ms':>8} | {'p99 ms':>8} | {'hits':>6}")
+    print("-" * 64)
+    for r in results:
+        print(f"{r.mode:<12} | {r.renders:>7} | {r.widgets:>7} | {r.render_p50_ms:>8.3f} | "
+              f"{r.render_p99_ms:>8.3f} | {r.cache_hits:>6}")
+    print()
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(description="Power Mode Benchmark Suite")
     parser.add_argument(
@@ -458,9 +982,90 @@ def main():
         action='store_true',
         help="Compare all benchmark results"
     )
+    parser.add_argument(
+        '--pubsub',
+        action='store_true',
+        help="Benchmark file-based pub/sub latency, throughput and idle CPU"
+    )
+    parser.add_argument(
+        '--backend-ops',
+        action='store_true',
+        help="Benchmark local backend key-space throughput under concurrent writers"
+    )
+    parser.add_argument(
+        '--stream-persistence',
+        action='store_true',
+        help="Benchmark StreamManager state persistence (full snapshots vs. delta journal)"
+    )
+    parser.add_argument(
+        '--statusline',
+        action='store_true',
+        help="Benchmark status line render time with and without the render cache"
+    )
+    parser.add_argument(
+        '--backends',
+        default="json,log,sqlite",
+        help="Local backends for --pubsub/--backend-ops (default: json,log,sqlite)"
+    )
+    parser.add_argument(
+        '--notifiers',
+        help="Change notifiers for --pubsub (default: inotify,stat on Linux, else stat)"
+    )
+    parser.add_argument('--subscribers', type=int, default=3, help="Subscriber processes for --pubsub")
+    parser.add_argument('--messages', type=int, default=200, help="Messages per --pubsub phase")
+    parser.add_argument('--writers', type=int, default=4, help="Writer processes for --backend-ops")
+    parser.add_argument('--ops', type=int, default=200, help="Iterations per --backend-ops writer")
+    parser.add_argument('--sessions', type=int, default=8, help="Streaming sessions for --stream-persistence")
+    parser.add_argument('--chunks', type=int, default=2000, help="Chunks per session for --stream-persistence")
+    parser.add_argument('--renders', type=int, default=200, help="Refreshes per --statusline mode")
+    parser.add_argument('--json', action='store_true',
+                        help="Output --pubsub/--backend-ops/--stream-persistence/--statusline results as JSON")
+    parser.add_argument('--pubsub-subscriber', nargs=4, help=argparse.SUPPRESS)
+    parser.add_argument('--ops-writer', nargs=4, help=argparse.SUPPRESS)
 
     args = parser.parse_args()
 
+    if args.pubsub_subscriber:
+        backend, path, ready_file, expected = args.pubsub_subscriber
+        _pubsub_subscriber(backend, path, ready_file, int(expected))
+        return
+
+    if args.ops_writer:
+        backend, path, agent, iterations = args.ops_writer
+        _ops_writer(backend, path, agent, int(iterations))
+        return
+
+    if args.statusline:
+        statusline_benchmarks(as_json=args.json, renders=args.renders)
+        return
+
+    if args.stream_persistence:
+        stream_persistence_benchmarks(
+            as_json=args.json,
+            sessions=args.sessions,
+            chunks=args.chunks,
+        )
+        return
+
+    if args.backend_ops:
+        backend_ops_benchmarks(
+            args.backends.split(','),
+            as_json=args.json,
+            writers=args.writers,
+            ops=args.ops,
+        )
+        return
+
+    if args.pubsub:
+        pubsub_benchmarks(
+            args.backends.split(','),
+            args.notifiers.split(',') if args.notifiers else None,
+            as_json=args.json,
+            subscribers=args.subscribers,
+            messages=args.messages,
+        )
+        return
+
     if args.compare:
         compare_benchmarks()
         return
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+File Change Notifier
+Wakes file-based Power Mode subscribers when their channels change.
+
+The file backends used to poll: every 100ms each subscriber took the global
+lock and parsed the whole state file, even when nothing had been published.
+Publishers now touch a per-channel file, and subscribers block here until one
+of *their* channel files changes.
+
+Backends:
+- inotify (Linux): kernel events via ctypes, zero CPU while idle
+- stat: mtime/size polling of just the watched files (no lock, no parse),
+  used on macOS/Windows or when inotify is unavailable; the interval backs
+  off from 5ms after activity to 100ms (the old fixed poll) while idle
+
+Usage:
+    notifier = ChangeNotifier(signal_dir)
+    notifier.arm(["pop_broadcast"])        # Before checking for messages
+    ...check for messages...
+    if notifier.wait(["pop_broadcast"], timeout=1.0):
+        ...something changed, check again...
+"""
+
+import os
+import re
+import sys
+import time
+import errno
+import select
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+try:
+    import ctypes
+    import ctypes.util
+    CTYPES_AVAILABLE = True
+except ImportError:
+    CTYPES_AVAILABLE = False
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+DEFAULT_POLL_INTERVAL = 0.005  # seconds, stat backend, right after a change
+MAX_POLL_INTERVAL = 0.1        # seconds, stat backend, once idle
+POLL_BACKOFF = 1.5
+
+# (mtime_ns, size, inode) per watched file
+FileStamp = Tuple[int, int, int]
+
+
+def channel_file_stem(channel: str) -> str:
+    """
+    Filesystem-safe file name stem for a pub/sub channel.
+
+    Distinct channels may sanitize to the same name, so a CRC of the raw
+    channel name is appended.
+    """
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", channel)
+    return f"{safe}-{zlib.crc32(channel.encode('utf-8')):08x}"
+
+
+def _load_libc():
+    """libc with inotify symbols, or None."""
+    if not CTYPES_AVAILABLE or not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class ChangeNotifier:
+    """
+    Wait for changes to files in one directory, filtered by name prefix.
+
+    A change counts for a caller if the changed file's name starts with any
+    of the prefixes it waits on (so "pop_broadcast" matches both a signal
+    file and rotated "pop_broadcast.00000002.log" segments).
+    """
+
+    def __init__(self, directory: Path, backend: Optional[str] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            directory: Directory holding the per-channel files
+            backend: "inotify" or "stat"; POPKIT_FILE_NOTIFIER, then
+                auto-detected, if None
+            poll_interval: Stat backend polling interval after a change, in
+                seconds (backs off to MAX_POLL_INTERVAL while idle)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self._interval = poll_interval
+        self._fd: Optional[int] = None
+        self._stamps: Dict[str, FileStamp] = {}
+        self._changed: Set[str] = set()
+
+        backend = backend or os.environ.get("POPKIT_FILE_NOTIFIER") or None
+        if backend not in (None, "inotify", "stat"):
+            raise ValueError(f"Unknown notifier backend: {backend} (expected inotify or stat)")
+        if backend in (None, "inotify"):
+            self._fd = self._init_inotify()
+        if self._fd is None and backend == "inotify":
+            raise OSError("inotify is not available on this platform")
+        self.backend = "inotify" if self._fd is not None else "stat"
+
+    def _init_inotify(self) -> Optional[int]:
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(str(self.directory)), WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def close(self):
+        """Release the inotify descriptor."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    # =========================================================================
+    # STAT BACKEND
+    # =========================================================================
+
+    def _scan(self, prefixes: Tuple[str, ...]) -> Dict[str, FileStamp]:
+        stamps = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return stamps
+        for entry in entries:
+            if entry.name.startswith(prefixes):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                stamps[entry.name] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return stamps
+
+    # =========================================================================
+    # INOTIFY BACKEND
+    # =========================================================================
+
+    def _drain(self) -> bool:
+        """Collect queued event names; True on queue overflow."""
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return overflow
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                elif name:
+                    self._changed.add(name)
+
+    # =========================================================================
+    # API
+    # =========================================================================
+
+    def arm(self, prefixes: Iterable[str]) -> None:
+        """
+        Record the current state of the watched files.
+
+        Call before checking for messages: anything written after this point
+        makes the next wait() return immediately instead of being missed.
+        """
+        prefixes = tuple(prefixes)
+        if self._fd is not None:
+            self._drain()
+            self._changed = {n for n in self._changed if not n.startswith(prefixes)}
+        else:
+            self._stamps.update(self._scan(prefixes))
+
+    def wait(self, prefixes: Iterable[str], timeout: Optional[float] = None) -> bool:
+        """
+        Block until a watched file changes.
+
+        Args:
+            prefixes: File name prefixes to wake for
+            timeout: Seconds to wait (None = forever)
+
+        Returns:
+            True if a matching file changed since arm()/the last wait, False on timeout
+        """
+        prefixes = tuple(prefixes)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            if self._fd is not None:
+                if self._drain():
+                    return True  # Lost events: assume everything changed
+                matched = {n for n in self._changed if n.startswith(prefixes)}
+                if matched:
+                    self._changed -= matched
+                    return True
+            else:
+                current = self._scan(prefixes)
+                watched = {n: s for n, s in self._stamps.items() if n.startswith(prefixes)}
+                if current != watched:
+                    for name in set(watched) - set(current):
+                        del self._stamps[name]
+                    self._stamps.update(current)
+                    self._interval = self.poll_interval
+                    return True
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+
+            if self._fd is not None:
+                try:
+                    select.select([self._fd], [], [], remaining)
+                except InterruptedError:
+                    pass
+            else:
+                time.sleep(self._interval if remaining is None else min(self._interval, remaining))
+                self._interval = min(self._interval * POLL_BACKOFF, max(self.poll_interval, MAX_POLL_INTERVAL))
@@ -15,9 +15,10 @@ import json
 import sys
 import os
 import hashlib
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 # Add power-mode to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -43,6 +44,10 @@ try:
 except ImportError:
     PROTOCOL_AVAILABLE = False
 
+from agent_state import (
+    RING_LIMITS, read_json, remember, shard_paths, summarize, write_json_atomic
+)
+
 try:
     from stream_manager import StreamManager, get_manager
     STREAM_MANAGER_AVAILABLE = True
@@ -112,6 +117,24 @@ def load_config() -> Dict:
 
 CONFIG = load_config()
 
+# Insight store: a hash of insight bodies plus one sorted set of insight
+# members per relevance tag, scored by push time. Members are
+# "<insight id>:<from agent>" so pulls can skip their own insights
+# without fetching bodies.
+INSIGHT_BODIES_KEY = "pop:insights:bodies"
+INSIGHT_INDEX_KEY = "pop:insights:index"
+INSIGHT_TAG_KEY = "pop:insights:tag:{tag}"
+INSIGHT_TTL_SECONDS = CONFIG.get("intervals", {}).get("insight_ttl_seconds", 600)
+
+# Newest members read per tag on a pull
+INSIGHT_CANDIDATES_PER_TAG = 50
+
+# Expired insights whose bodies are dropped per push
+INSIGHT_PRUNE_BATCH = 100
+
+# Inbox entries read per check-in (the rest wait for the next one)
+INBOX_BATCH = 100
+
 
 def get_git_root() -> Optional[Path]:
     """Get the git repository root directory.
@@ -198,8 +221,9 @@ def generate_session_id() -> str:
 class AgentStateTracker:
     """
     Tracks agent state across tool calls.
-    Uses a local file for persistence within a session.
-    Prefers project-local state file for status line integration.
+    Each agent persists to its own shard next to the Power Mode state file
+    (see agent_state.py), so concurrent agents never rewrite a shared file.
+    Prefers the project-local state directory for status line integration.
     """
 
     HOME_STATE_FILE = Path.home() / ".claude" / "popkit" / "power-mode-state.json"
@@ -209,8 +233,9 @@ class AgentStateTracker:
         self.agent_name = agent_name
         self.session_id = session_id
 
-        # Determine state file path (project-local preferred)
+        # Determine state file path (project-local preferred); shards live beside it
         self.STATE_FILE = self._get_state_file_path()
+        self.SHARD_FILE, self.SUMMARY_FILE = shard_paths(self.STATE_FILE.parent, agent_id)
 
         # Load or initialize state
         self.state = self._load_state()
@@ -237,45 +262,11 @@ class AgentStateTracker:
         return self.HOME_STATE_FILE
 
     def _load_state(self) -> Dict:
-        """Load state from file or create new.
-
-        Merges agent tracking data with existing Power Mode state if present.
-        """
-        existing_state = {}
-        if self.STATE_FILE.exists():
-            try:
-                with open(self.STATE_FILE) as f:
-                    existing_state = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
-
-        # If existing state has same session, return agent tracking portion
-        if existing_state.get("session_id") == self.session_id:
-            # Merge: keep Power Mode fields, return agent tracking fields
-            return {
-                # Agent tracking fields
-                "agent_id": existing_state.get("agent_id", self.agent_id),
-                "agent_name": existing_state.get("agent_name", self.agent_name),
-                "session_id": self.session_id,
-                "tool_call_count": existing_state.get("tool_call_count", 0),
-                "files_touched": existing_state.get("files_touched", []),
-                "tools_used": existing_state.get("tools_used", []),
-                "decisions": existing_state.get("decisions", []),
-                "blockers": existing_state.get("blockers", []),
-                "progress": existing_state.get("progress", 0.0),
-                "current_task": existing_state.get("current_task", ""),
-                "last_checkin": existing_state.get("last_checkin"),
-                "insights_received": existing_state.get("insights_received", []),
-                "insights_shared": existing_state.get("insights_shared", []),
-                # Streaming fields (Issue #23)
-                "active_streams": existing_state.get("active_streams", {}),
-                "completed_streams": existing_state.get("completed_streams", 0),
-                "total_stream_chunks": existing_state.get("total_stream_chunks", 0),
-                "total_stream_bytes": existing_state.get("total_stream_bytes", 0)
-            }
+        """Load this agent's shard, or create new state for a new session."""
+        existing_state = read_json(self.SHARD_FILE) or {}
 
         # New state (agent tracking portion only)
-        return {
+        state = {
             "agent_id": self.agent_id,
             "agent_name": self.agent_name,
             "session_id": self.session_id,
@@ -289,6 +280,9 @@ class AgentStateTracker:
             "last_checkin": None,
             "insights_received": [],
             "insights_shared": [],
+            "insights_received_count": 0,
+            "insights_shared_count": 0,
+            "inbox_cursor": "0",
             # Streaming fields (Issue #23)
             "active_streams": {},
             "completed_streams": 0,
@@ -296,69 +290,54 @@ class AgentStateTracker:
             "total_stream_bytes": 0
         }
 
-    def _save_state(self):
-        """Save state to file.
+        # Same session: resume the agent's tracking fields
+        if existing_state.get("session_id") == self.session_id:
+            state.update({k: existing_state[k] for k in state if k in existing_state})
 
-        Merges agent tracking data with existing Power Mode state to preserve
-        status line fields (active, current_phase, phase_index, etc.).
-        """
-        self.STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        return state
 
-        # Load existing state to preserve Power Mode fields
-        existing_state = {}
-        if self.STATE_FILE.exists():
-            try:
-                with open(self.STATE_FILE) as f:
-                    existing_state = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
-
-        # Merge: preserve Power Mode fields, update agent tracking fields
-        merged_state = existing_state.copy()
-        merged_state.update(self.state)
+    def _save_state(self, summary: bool = True):
+        """Write this agent's shard (and its summary) with write-then-rename.
 
-        # Preserve Power Mode status line fields from existing state
-        power_mode_fields = [
-            "active", "activated_at", "source", "active_issue",
-            "current_phase", "phase_index", "total_phases", "phases_completed", "config"
-        ]
-        for field in power_mode_fields:
-            if field in existing_state:
-                merged_state[field] = existing_state[field]
+        Args:
+            summary: Also refresh the status line summary; plain tool
+                counts skip it
+        """
+        write_json_atomic(self.SHARD_FILE, self.state)
+        if summary:
+            write_json_atomic(self.SUMMARY_FILE, summarize(self.state))
 
-        with open(self.STATE_FILE, "w") as f:
-            json.dump(merged_state, f, indent=2)
+    def _remember(self, field: str, value: Any, unique: bool = True) -> bool:
+        """Add to a ring-buffered list field."""
+        return remember(self.state[field], value, RING_LIMITS[field], unique)
 
     def record_tool_use(self, tool_name: str, tool_input: Dict, tool_result: Any):
         """Record a tool use."""
         self.state["tool_call_count"] += 1
 
         # Track tool
-        if tool_name not in self.state["tools_used"]:
-            self.state["tools_used"].append(tool_name)
+        self._remember("tools_used", tool_name)
 
         # Track files
         if file_path := tool_input.get("file_path"):
-            if file_path not in self.state["files_touched"]:
-                self.state["files_touched"].append(file_path)
+            self._remember("files_touched", file_path)
 
-        self._save_state()
+        self._save_state(summary=False)
 
     def record_decision(self, decision: str, reasoning: str, confidence: float):
         """Record a decision made by the agent."""
-        self.state["decisions"].append({
+        self._remember("decisions", {
             "decision": decision,
             "reasoning": reasoning,
             "confidence": confidence,
             "timestamp": datetime.now().isoformat()
-        })
-        self._save_state()
+        }, unique=False)
+        self._save_state(summary=False)
 
     def record_blocker(self, blocker: str):
         """Record a blocker encountered."""
-        if blocker not in self.state["blockers"]:
-            self.state["blockers"].append(blocker)
-        self._save_state()
+        self._remember("blockers", blocker)
+        self._save_state(summary=False)
 
     def update_progress(self, progress: float):
         """Update progress (0.0 to 1.0)."""
@@ -377,16 +356,22 @@ class AgentStateTracker:
 
     def record_insight_received(self, insight_id: str):
         """Record an insight received from another agent."""
-        if insight_id not in self.state["insights_received"]:
-            self.state["insights_received"].append(insight_id)
+        if self._remember("insights_received", insight_id):
+            self.state["insights_received_count"] += 1
         self._save_state()
 
     def record_insight_shared(self, insight_id: str):
         """Record an insight shared with other agents."""
-        if insight_id not in self.state["insights_shared"]:
-            self.state["insights_shared"].append(insight_id)
+        if self._remember("insights_shared", insight_id):
+            self.state["insights_shared_count"] += 1
         self._save_state()
 
+    def record_inbox_cursor(self, cursor: str):
+        """Record the last inbox entry read."""
+        if cursor != self.state["inbox_cursor"]:
+            self.state["inbox_cursor"] = cursor
+            self._save_state(summary=False)
+
     # =========================================================================
     # STREAMING METHODS (Issue #23)
     # =========================================================================
@@ -408,7 +393,7 @@ class AgentStateTracker:
             self.state["active_streams"][session_id]["bytes"] += len(content)
             self.state["total_stream_chunks"] += 1
             self.state["total_stream_bytes"] += len(content)
-            self._save_state()
+            self._save_state(summary=False)
 
     def end_stream(self, session_id: str, error: Optional[str] = None):
         """Record end of a streaming session."""
@@ -479,6 +464,7 @@ class PowerModeRedisClient:
     def __init__(self):
         self.redis: Optional[BaseRedisClient] = None
         self.connected = False
+        self.inbox_cursors: Dict[str, str] = {}
 
     def connect(self) -> bool:
         """Connect to Upstash Redis.
@@ -526,36 +512,67 @@ class PowerModeRedisClient:
         self.redis.expire(key, 600)  # 10 min TTL
 
     def push_insight(self, insight: Dict):
-        """Push an insight to Redis."""
+        """Push an insight to Redis, indexed by its relevance tags.
+
+        One round trip stores the body and adds the insight to each tag's
+        sorted set; bodies of expired insights are dropped in a second one.
+        """
         if not self.connected:
             return
 
-        self.redis.lpush("pop:insights", json.dumps(insight))
-        self.redis.ltrim("pop:insights", 0, 99)  # Keep last 100
+        now = time.time()
+        cutoff = now - INSIGHT_TTL_SECONDS
+        member = f"{insight.get('id', '')}:{insight.get('from_agent', '')}"
+
+        pipe = self.redis.pipeline()
+        pipe.hset(INSIGHT_BODIES_KEY, member, json.dumps(insight))
+        pipe.zadd(INSIGHT_INDEX_KEY, {member: now})
+        for tag in dict.fromkeys(insight.get("relevance_tags", [])):
+            tag_key = INSIGHT_TAG_KEY.format(tag=tag)
+            pipe.zadd(tag_key, {member: now})
+            pipe.zremrangebyscore(tag_key, "-inf", f"({cutoff}")
+            pipe.expire(tag_key, INSIGHT_TTL_SECONDS)
+        pipe.zrangebyscore(INSIGHT_INDEX_KEY, "-inf", f"({cutoff}", start=0, num=INSIGHT_PRUNE_BATCH)
+        expired = pipe.execute()[-1]
+
+        if expired:
+            pipe.hdel(INSIGHT_BODIES_KEY, *expired)
+            pipe.zrem(INSIGHT_INDEX_KEY, *expired)
+            pipe.execute()
 
     def pull_insights(self, tags: List[str], exclude_agent: str, limit: int = 3) -> List[Dict]:
-        """Pull relevant insights from Redis."""
-        if not self.connected:
+        """Pull the newest insights sharing a tag, skipping exclude_agent's.
+
+        Reads member ids from each tag's sorted set in one round trip, then
+        fetches only the chosen bodies with one HMGET.
+        """
+        if not self.connected or not tags:
             return []
 
-        insights = []
-        all_insights = self.redis.lrange("pop:insights", 0, 99)
+        cutoff = time.time() - INSIGHT_TTL_SECONDS
+        pipe = self.redis.pipeline()
+        for tag in dict.fromkeys(tags):
+            pipe.zrevrangebyscore(INSIGHT_TAG_KEY.format(tag=tag), "+inf", cutoff,
+                                  start=0, num=INSIGHT_CANDIDATES_PER_TAG, withscores=True)
+
+        scores: Dict[str, float] = {}
+        for hits in pipe.execute():
+            for member, score in hits:
+                scores[member] = score
+
+        candidates = [
+            member for member in sorted(scores, key=scores.get, reverse=True)
+            if member.partition(":")[2] != exclude_agent
+        ][:limit]
+        if not candidates:
+            return []
 
-        for insight_json in all_insights:
+        insights = []
+        for insight_json in self.redis.hmget(INSIGHT_BODIES_KEY, candidates):
+            if insight_json is None:
+                continue  # Pruned since the ids were read
             try:
-                insight = json.loads(insight_json)
-
-                # Skip own insights
-                if insight.get("from_agent") == exclude_agent:
-                    continue
-
-                # Check tag relevance
-                insight_tags = set(insight.get("relevance_tags", []))
-                if insight_tags & set(tags):
-                    insights.append(insight)
-                    if len(insights) >= limit:
-                        break
-
+                insights.append(json.loads(insight_json))
             except json.JSONDecodeError:
                 continue
 
@@ -569,30 +586,41 @@ class PowerModeRedisClient:
         msg = MessageFactory.heartbeat(agent_id, state)
         self.redis.publish(Channels.heartbeat(), msg.to_json())
 
-    def check_for_messages(self, agent_id: str) -> List[Dict]:
-        """Check for messages directed at this agent."""
-        if not self.connected:
-            return []
+    def read_inbox(self, agent_id: str, cursor: Optional[str] = None) -> Tuple[List[Dict], str]:
+        """Read direct messages after `cursor` from the agent's inbox stream.
+
+        One non-blocking XREAD. The coordinator appends to the stream, so
+        messages sent between check-ins wait there instead of being missed.
+
+        Args:
+            agent_id: Agent whose inbox to read
+            cursor: Last entry id already read (None or "0" for the start)
+
+        Returns:
+            (messages, cursor to pass to the next read)
+        """
+        cursor = cursor or "0"
+        if not self.connected or not PROTOCOL_AVAILABLE:
+            return [], cursor
 
         messages = []
-        channel = f"pop:agent:{agent_id}"
-
-        # Use a short-lived pubsub to check for messages
-        pubsub = self.redis.pubsub()
-        pubsub.subscribe(channel)
-
-        # Get any pending messages (non-blocking)
-        while True:
-            msg = pubsub.get_message(timeout=0.1)
-            if msg is None:
-                break
-            if msg["type"] == "message":
+        streams = self.redis.xread({Channels.inbox_key(agent_id): cursor}, count=INBOX_BATCH)
+        for _, entries in streams:
+            for entry_id, fields in entries:
+                cursor = entry_id
+                data = dict(zip(fields[::2], fields[1::2]))
                 try:
-                    messages.append(json.loads(msg["data"]))
+                    messages.append(json.loads(data.get("message", "")))
                 except json.JSONDecodeError:
                     pass
 
-        pubsub.unsubscribe()
+        return messages, cursor
+
+    def check_for_messages(self, agent_id: str) -> List[Dict]:
+        """Check for messages directed at this agent since the last check."""
+        messages, self.inbox_cursors[agent_id] = self.read_inbox(
+            agent_id, self.inbox_cursors.get(agent_id)
+        )
         return messages
 
     def get_objective(self) -> Optional[Dict]:
@@ -1050,8 +1078,15 @@ class PowerModeCheckInHook:
         if pulled_insights and checkin.get("search_mode") == "semantic" and self.efficiency_tracker:
             self.efficiency_tracker.record_context_reuse()
 
-        # 4. CHECK: Get any messages from coordinator
-        messages = self.redis_client.check_for_messages(self.state_tracker.agent_id)
+        # 4. CHECK: Get new messages from coordinator (inbox cursor persists across hooks)
+        read_inbox = getattr(self.redis_client, "read_inbox", None)
+        if read_inbox:
+            messages, cursor = read_inbox(
+                self.state_tracker.agent_id, self.state_tracker.state["inbox_cursor"]
+            )
+            self.state_tracker.record_inbox_cursor(cursor)
+        else:
+            messages = self.redis_client.check_for_messages(self.state_tracker.agent_id)
         if messages:
             checkin["coordinator_messages"] = messages
 
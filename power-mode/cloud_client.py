@@ -5,21 +5,30 @@ PopKit Cloud Client
 Redis-compatible client that connects to PopKit Cloud instead of local Redis.
 Provides the same interface as PowerModeRedisClient but uses HTTPS/WSS.
 
+Requests reuse keep-alive connections from a per-host pool instead of paying
+TCP+TLS setup on every agent tick. State, heartbeat and stream pushes are
+fire-and-forget, so they are coalesced: pending pushes are merged (latest
+state/heartbeat per agent wins, stream messages keep their order) and sent
+as one POST /redis/batch per flush interval.
+
 Part of Issue #68 (Hosted Redis Service).
 """
 
 import json
 import os
+import ssl
+import atexit
+import socket
 import sys
 import threading
 import time
 import hashlib
+import http.client
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, field
-import urllib.request
-import urllib.error
+from urllib.parse import urlsplit
 
 # Add power-mode to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -54,6 +63,15 @@ CONNECT_TIMEOUT = 10
 REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0
+IDEMPOTENT_METHODS = ("GET", "HEAD")  # Retried after any network error
+
+# Idle keep-alive connections kept per host
+MAX_IDLE_CONNECTIONS = 4
+
+# Coalesced pushes: seconds between flushes (0 sends each push immediately)
+# and the most entries sent in one batch request
+FLUSH_INTERVAL = 0.2
+MAX_BATCH_SIZE = 100
 
 
 # =============================================================================
@@ -67,6 +85,7 @@ class CloudConfig:
     base_url: str = POPKIT_CLOUD_URL
     user_id: Optional[str] = None
     tier: str = "free"
+    flush_interval: float = FLUSH_INTERVAL
 
     @classmethod
     def from_env(cls) -> Optional['CloudConfig']:
@@ -88,22 +107,173 @@ class UsageStats:
     commands_today: int = 0
     bytes_sent: int = 0
     bytes_received: int = 0
+    requests_today: int = 0          # HTTP round trips (a batch is one)
+    batches: int = 0
+    batched_commands: int = 0
     last_reset: str = field(default_factory=lambda: datetime.now().date().isoformat())
 
-    def add_request(self, sent: int, received: int):
-        """Track a request."""
+    def add_request(self, sent: int, received: int, commands: int = 1):
+        """Track a request carrying `commands` commands."""
         today = datetime.now().date().isoformat()
         if today != self.last_reset:
             # Reset daily counters
             self.commands_today = 0
             self.bytes_sent = 0
             self.bytes_received = 0
+            self.requests_today = 0
+            self.batches = 0
+            self.batched_commands = 0
             self.last_reset = today
 
-        self.commands_today += 1
+        self.commands_today += commands
+        self.requests_today += 1
         self.bytes_sent += sent
         self.bytes_received += received
 
+    def add_batch(self, commands: int, sent: int, received: int):
+        """Track one coalesced batch request."""
+        self.add_request(sent, received, commands)
+        self.batches += 1
+        self.batched_commands += commands
+
+
+class EndpointNotFoundError(RuntimeError):
+    """The API has no such endpoint (HTTP 404)."""
+
+
+class RequestNotSentError(ConnectionError):
+    """The request never reached the server, so it is safe to send again."""
+
+
+# =============================================================================
+# HTTP CONNECTION POOL
+# =============================================================================
+
+class HTTPConnectionPool:
+    """
+    Thread-safe pool of keep-alive http.client connections per host.
+
+    A connection is checked out for one request/response and returned
+    afterwards unless the server asked to close it. A reused connection the
+    server has since dropped is retried on a fresh one, but only when the
+    request cannot have reached the server: the send itself failed, or the
+    connection was reset before any response bytes arrived. A request that
+    could not be connected or sent on a fresh connection raises
+    RequestNotSentError; timeouts and failures while reading a response
+    raise the original error, as the server may have applied the request.
+    """
+
+    def __init__(self, max_idle: int = MAX_IDLE_CONNECTIONS, timeout: float = REQUEST_TIMEOUT):
+        """
+        Args:
+            max_idle: Idle connections kept per host
+            timeout: Socket timeout in seconds
+        """
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: Dict[Tuple[str, str, Optional[int]], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    def _connect(self, scheme: str, host: str, port: Optional[int]) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+            if scheme == "https" and self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout,
+                                               context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, str, bytes]:
+        """
+        Send a request over a pooled connection.
+
+        Returns:
+            (status, reason, response body)
+
+        Raises:
+            RequestNotSentError: Connecting or sending failed; safe to retry
+            OSError or http.client.HTTPException: The request may have been
+                received (e.g. a timeout waiting for the response)
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            reused = conn is not None
+            if conn is None:
+                conn = self._connect(*key)
+
+            if conn.sock is None:
+                try:
+                    conn.connect()
+                except OSError as e:
+                    conn.close()
+                    raise RequestNotSentError(f"Could not connect: {e}") from e
+
+            try:
+                conn.request(method, target, body=body, headers=headers or {})
+            except socket.timeout:
+                conn.close()
+                raise
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if reused:
+                    continue  # Server closed an idle connection; use a new one
+                raise RequestNotSentError(f"Send failed: {e}") from e
+
+            try:
+                response = conn.getresponse()
+            except (ConnectionResetError, BrokenPipeError):
+                # Includes RemoteDisconnected: closed before a status line
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+
+            try:
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                with self._lock:
+                    idle = self._idle.setdefault(key, [])
+                    if len(idle) < self.max_idle:
+                        idle.append(conn)
+                        conn = None
+                if conn is not None:
+                    conn.close()
+            return response.status, response.reason, data
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
 
 # =============================================================================
 # CLOUD CLIENT
@@ -136,6 +306,17 @@ class PopKitCloudClient:
         self._ws_thread: Optional[threading.Thread] = None
         self._ws_running = False
 
+        # Keep-alive connections and coalesced pushes
+        self._pool = HTTPConnectionPool()
+        self._pending: Dict[Any, Tuple[str, Dict]] = {}  # merge key -> (path, body)
+        self._pending_seq = 0
+        self._pending_lock = threading.Lock()
+        # Held across a send so batches reach the server in order
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_at_exit = False
+        self._batch_supported = True
+
     @classmethod
     def from_env(cls) -> Optional['PopKitCloudClient']:
         """Create client from environment variables."""
@@ -176,11 +357,13 @@ class PopKitCloudClient:
             return False
 
     def disconnect(self):
-        """Disconnect from PopKit Cloud."""
+        """Disconnect from PopKit Cloud, sending any coalesced pushes first."""
+        self.flush()
         self._ws_running = False
         if self._ws_thread and self._ws_thread.is_alive():
             self._ws_thread.join(timeout=2)
         self.connected = False
+        self._pool.close()
 
     # =========================================================================
     # REDIS-COMPATIBLE INTERFACE
@@ -195,14 +378,11 @@ class PopKitCloudClient:
         if not self.connected:
             return
 
-        try:
-            self._request("POST", "/redis/state", {
-                "agent_id": agent_id,
-                "state": state,
-                "ttl": 600  # 10 min TTL
-            })
-        except Exception:
-            pass  # Fail silently like local client
+        self._push(("state", agent_id), "/redis/state", {
+            "agent_id": agent_id,
+            "state": state,
+            "ttl": 600  # 10 min TTL
+        })
 
     def push_insight(self, insight: Dict):
         """
@@ -253,14 +433,11 @@ class PopKitCloudClient:
         if not self.connected or not PROTOCOL_AVAILABLE:
             return
 
-        try:
-            msg = MessageFactory.heartbeat(agent_id, state)
-            self._request("POST", "/redis/publish", {
-                "channel": Channels.heartbeat(),
-                "message": json.loads(msg.to_json())
-            })
-        except Exception:
-            pass
+        msg = MessageFactory.heartbeat(agent_id, state)
+        self._push(("heartbeat", agent_id), "/redis/publish", {
+            "channel": Channels.heartbeat(),
+            "message": json.loads(msg.to_json())
+        })
 
     def check_for_messages(self, agent_id: str) -> List[Dict]:
         """
@@ -310,34 +487,28 @@ class PopKitCloudClient:
         if not self.connected:
             return
 
-        try:
-            self._request("POST", "/redis/publish", {
-                "channel": Channels.coordinator(),
-                "message": {
-                    "type": "STREAM_START",
-                    "from_agent": agent_id,
-                    "payload": {
-                        "session_id": session_id,
-                        "tool_name": tool_name,
-                        "started_at": datetime.now().isoformat()
-                    }
+        self._push(None, "/redis/publish", {
+            "channel": Channels.coordinator(),
+            "message": {
+                "type": "STREAM_START",
+                "from_agent": agent_id,
+                "payload": {
+                    "session_id": session_id,
+                    "tool_name": tool_name,
+                    "started_at": datetime.now().isoformat()
                 }
-            })
-        except Exception:
-            pass
+            }
+        })
 
     def publish_stream_chunk(self, chunk: Any):
         """Publish a stream chunk."""
         if not self.connected:
             return
 
-        try:
-            self._request("POST", "/redis/publish", {
-                "channel": Channels.coordinator(),
-                "message": chunk.to_dict() if hasattr(chunk, 'to_dict') else chunk
-            })
-        except Exception:
-            pass
+        self._push(None, "/redis/publish", {
+            "channel": Channels.coordinator(),
+            "message": chunk.to_dict() if hasattr(chunk, 'to_dict') else chunk
+        })
 
     def publish_stream_end(
         self,
@@ -349,21 +520,18 @@ class PopKitCloudClient:
         if not self.connected:
             return
 
-        try:
-            self._request("POST", "/redis/publish", {
-                "channel": Channels.coordinator(),
-                "message": {
-                    "type": "STREAM_END" if not error else "STREAM_ERROR",
-                    "from_agent": agent_id,
-                    "payload": {
-                        "session_id": session_id,
-                        "ended_at": datetime.now().isoformat(),
-                        "error": error
-                    }
+        self._push(None, "/redis/publish", {
+            "channel": Channels.coordinator(),
+            "message": {
+                "type": "STREAM_END" if not error else "STREAM_ERROR",
+                "from_agent": agent_id,
+                "payload": {
+                    "session_id": session_id,
+                    "ended_at": datetime.now().isoformat(),
+                    "error": error
                 }
-            })
-        except Exception:
-            pass
+            }
+        })
 
     # =========================================================================
     # PUB/SUB (Polling-based, WebSocket in future)
@@ -405,6 +573,10 @@ class PopKitCloudClient:
         """Get current usage statistics."""
         return {
             "commands_today": self.usage.commands_today,
+            "requests_today": self.usage.requests_today,
+            "batches": self.usage.batches,
+            "batched_commands": self.usage.batched_commands,
+            "connections_opened": self._pool.connections_opened,
             "bytes_sent": self.usage.bytes_sent,
             "bytes_received": self.usage.bytes_received,
             "tier": self.config.tier
@@ -978,6 +1150,72 @@ class PopKitCloudClient:
             priority="high"  # Results are important
         )
 
+    # =========================================================================
+    # COALESCED PUSHES
+    # =========================================================================
+
+    def _push(self, merge_key: Any, path: str, body: Dict):
+        """
+        Queue a fire-and-forget push for the next batch.
+
+        Args:
+            merge_key: Pushes with the same key replace each other (latest
+                wins); None keeps every push, in order
+            path: API path the push would be POSTed to
+            body: Request body
+        """
+        if self.config.flush_interval <= 0:
+            try:
+                self._request("POST", path, body)
+            except Exception:
+                pass  # Fail silently like local client
+            return
+
+        with self._pending_lock:
+            if merge_key is None:
+                self._pending_seq += 1
+                merge_key = ("seq", self._pending_seq)
+            else:
+                self._pending.pop(merge_key, None)  # Re-queue at the end
+            self._pending[merge_key] = (path, body)
+            if not self._flush_at_exit:
+                # Hook processes exit right after pushing
+                atexit.register(self.flush)
+                self._flush_at_exit = True
+            full = len(self._pending) >= MAX_BATCH_SIZE
+            if not full and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.config.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Send coalesced pushes now, as one batch request."""
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending = list(self._pending.values()), {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            if not pending or not self.connected:
+                return
+
+            try:
+                if self._batch_supported:
+                    try:
+                        self._request("POST", "/redis/batch", {
+                            "requests": [{"path": path, "body": body} for path, body in pending]
+                        }, commands=len(pending))
+                        return
+                    except EndpointNotFoundError:
+                        self._batch_supported = False  # Server predates /redis/batch
+
+                for path, body in pending:
+                    self._request("POST", path, body)
+            except Exception:
+                pass  # Fail silently like local client
+
     # =========================================================================
     # INTERNAL HTTP CLIENT
     # =========================================================================
@@ -987,19 +1225,24 @@ class PopKitCloudClient:
         method: str,
         path: str,
         body: Optional[Dict] = None,
-        retry: int = 0
+        retry: int = 0,
+        commands: Optional[int] = None
     ) -> Dict:
         """
-        Make HTTP request to PopKit Cloud.
+        Make HTTP request to PopKit Cloud over a pooled keep-alive connection.
 
         Args:
             method: HTTP method (GET, POST, etc.)
             path: API path (e.g., "/redis/state")
             body: Request body for POST/PUT
             retry: Current retry count
+            commands: Commands carried, for a batch request (tracked in usage)
 
         Returns:
             Response JSON as dict
+
+        Raises:
+            EndpointNotFoundError: The endpoint doesn't exist (404)
         """
         url = f"{self.config.base_url}{path}"
 
@@ -1015,44 +1258,41 @@ class PopKitCloudClient:
             data = json.dumps(body).encode("utf-8")
             sent_bytes = len(data)
 
-        request = urllib.request.Request(
-            url,
-            data=data,
-            headers=headers,
-            method=method
-        )
-
         try:
-            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
-                response_data = response.read()
-                received_bytes = len(response_data)
-
-                # Track usage
-                self.usage.add_request(sent_bytes, received_bytes)
-
-                if response_data:
-                    return json.loads(response_data.decode("utf-8"))
-                return {}
+            status, reason, response_data = self._pool.request(method, url, data, headers)
+        except (OSError, http.client.HTTPException) as e:
+            # Only replay what the server cannot have applied: requests that
+            # were never sent, and reads
+            replayable = isinstance(e, RequestNotSentError) or method in IDEMPOTENT_METHODS
+            if replayable and retry < MAX_RETRIES:
+                time.sleep(RETRY_DELAY * (retry + 1))
+                return self._request(method, path, body, retry + 1, commands)
+            raise RuntimeError(f"Network error: {e}")
 
-        except urllib.error.HTTPError as e:
+        if status >= 400:
             # Handle specific error codes
-            if e.code == 401:
+            if status == 401:
                 raise ValueError("Invalid API key")
-            elif e.code == 429:
+            elif status == 404:
+                raise EndpointNotFoundError(f"API error 404: {reason}")
+            elif status == 429:
                 raise RuntimeError("Rate limit exceeded")
-            elif e.code >= 500 and retry < MAX_RETRIES:
+            elif status >= 500 and retry < MAX_RETRIES:
                 # Retry server errors
                 time.sleep(RETRY_DELAY * (retry + 1))
-                return self._request(method, path, body, retry + 1)
+                return self._request(method, path, body, retry + 1, commands)
             else:
-                body = e.read().decode("utf-8") if e.fp else ""
-                raise RuntimeError(f"API error {e.code}: {e.reason}\n{body}")
+                raise RuntimeError(f"API error {status}: {reason}\n{response_data.decode('utf-8', 'replace')}")
 
-        except urllib.error.URLError as e:
-            if retry < MAX_RETRIES:
-                time.sleep(RETRY_DELAY * (retry + 1))
-                return self._request(method, path, body, retry + 1)
-            raise RuntimeError(f"Network error: {e.reason}")
+        # Track usage
+        if commands is None:
+            self.usage.add_request(sent_bytes, len(response_data))
+        else:
+            self.usage.add_batch(commands, sent_bytes, len(response_data))
+
+        if response_data:
+            return json.loads(response_data.decode("utf-8"))
+        return {}
 
 
 # =============================================================================
@@ -375,8 +375,8 @@ class ConsensusCoordinator:
         """Initialize file-based mode for consensus."""
         # Use the existing file fallback from power-mode
         try:
-            from file_fallback import FileBasedPowerMode
-            self.redis = FileBasedPowerMode()
+            from file_fallback import create_file_client
+            self.redis = create_file_client()
             return True
         except ImportError:
             print("File fallback not available", file=sys.stderr)
@@ -12,9 +12,11 @@ import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set, Callable
+from typing import Dict, Deque, List, Optional, Any, Set, Callable, Tuple
 from dataclasses import dataclass, field
 import hashlib
+import heapq
+from collections import deque
 
 # Issue #191: Use unified adapter for Upstash/Local Redis
 try:
@@ -63,6 +65,9 @@ def load_config() -> Dict:
 
 CONFIG = load_config()
 
+# Entries kept in each agent's inbox stream
+INBOX_MAXLEN = 100
+
 
 # =============================================================================
 # AGENT REGISTRY
@@ -214,6 +219,14 @@ class SyncManager:
 
             return complete
 
+    def next_expiry(self) -> Optional[datetime]:
+        """When the earliest open barrier times out (None if there are none)."""
+        with self._lock:
+            return min(
+                (b.created_at + timedelta(seconds=b.timeout_seconds) for b in self.barriers.values()),
+                default=None
+            )
+
     def cleanup_expired(self) -> List[str]:
         """Remove expired barriers, return their IDs."""
         with self._lock:
@@ -335,23 +348,40 @@ class DocumentationBarrier:
 # =============================================================================
 
 class InsightPool:
-    """Manages shared insights between agents."""
+    """Manages shared insights between agents.
+
+    Insights are indexed by relevance tag (oldest first per tag) and by
+    normalized content, so adds and relevance lookups touch only matching
+    insights instead of scanning the pool.
+    """
 
     def __init__(self, max_insights: int = 100, on_insight_added: Optional[Callable] = None):
         self.insights: List[Insight] = []
         self.max_insights = max_insights
         self.on_insight_added = on_insight_added  # Callback for documentation tracking
         self._lock = threading.Lock()
+        self._added = 0
+        self._by_tag: Dict[str, Deque[Tuple[int, Insight]]] = {}
+        self._contents: Set[Tuple[Any, str]] = set()
+
+    @staticmethod
+    def _content_key(insight: Insight) -> Tuple[Any, str]:
+        """Insights with the same type and content are duplicates."""
+        return insight.type, insight.content.lower().strip()
 
     def add(self, insight: Insight):
         """Add an insight to the pool."""
         with self._lock:
             # Deduplication check
-            for existing in self.insights:
-                if self._is_duplicate(existing, insight):
-                    return
+            key = self._content_key(insight)
+            if key in self._contents:
+                return
 
             self.insights.append(insight)
+            self._contents.add(key)
+            self._added += 1
+            for tag in set(insight.relevance_tags):
+                self._by_tag.setdefault(tag, deque()).append((self._added, insight))
 
             # Notify callback (for documentation barrier tracking - Issue #87)
             if self.on_insight_added:
@@ -359,28 +389,44 @@ class InsightPool:
 
             # Trim if over limit
             if len(self.insights) > self.max_insights:
+                for dropped in self.insights[:-self.max_insights]:
+                    self._forget(dropped)
                 self.insights = self.insights[-self.max_insights:]
 
+    def _forget(self, insight: Insight):
+        """Drop a trimmed insight (the oldest) from the indexes."""
+        self._contents.discard(self._content_key(insight))
+        for tag in set(insight.relevance_tags):
+            entries = self._by_tag[tag]
+            entries.popleft()
+            if not entries:
+                del self._by_tag[tag]
+
     def get_relevant(
         self,
         tags: List[str],
         exclude_agent: Optional[str] = None,
         limit: int = 3
     ) -> List[Insight]:
-        """Get insights relevant to the given tags."""
+        """Get insights relevant to the given tags, most recent first."""
         with self._lock:
+            # Newest-first merge of the matching tags' entries
+            matches = heapq.merge(
+                *(reversed(self._by_tag[tag]) for tag in set(tags) if tag in self._by_tag),
+                key=lambda entry: entry[0], reverse=True
+            )
             relevant = []
-            for insight in reversed(self.insights):  # Most recent first
+            last = None
+            for order, insight in matches:
+                if order == last:
+                    continue  # Same insight under another tag
+                last = order
                 # Skip if from the requesting agent
                 if exclude_agent and insight.from_agent == exclude_agent:
                     continue
-
-                # Check tag overlap
-                tag_overlap = set(insight.relevance_tags) & set(tags)
-                if tag_overlap:
-                    relevant.append(insight)
-                    if len(relevant) >= limit:
-                        break
+                relevant.append(insight)
+                if len(relevant) >= limit:
+                    break
 
             return relevant
 
@@ -392,14 +438,6 @@ class InsightPool:
                     insight.consumed_by.append(agent_id)
                     break
 
-    def _is_duplicate(self, a: Insight, b: Insight) -> bool:
-        """Check if two insights are duplicates."""
-        # Simple content similarity check
-        return (
-            a.type == b.type and
-            a.content.lower().strip() == b.content.lower().strip()
-        )
-
 
 # =============================================================================
 # PATTERN LEARNING
@@ -548,6 +586,8 @@ class PowerModeCoordinator:
         # Redis connection (Issue #191: supports Upstash or local)
         self.redis: Optional[BaseRedisClient] = None
         self.pubsub: Optional[BasePubSub] = None
+        # Fire-and-forget writes; an auto-flushing pipeline on Upstash
+        self._writes: Optional[BaseRedisClient] = None
 
         # Cloud workflow integration (Issue #103 Phase 3)
         self.cloud_client: Optional[PopKitCloudClient] = None
@@ -584,6 +624,7 @@ class PowerModeCoordinator:
             self.redis = get_redis_client()
             self.redis.ping()
             self.pubsub = self.redis.pubsub()
+            self._writes = self._create_write_batcher()
             return True
         except ValueError as e:
             # Upstash not configured - fall back to file mode
@@ -595,9 +636,29 @@ class PowerModeCoordinator:
 
     def start(self):
         """Start the coordinator."""
+        if not self._start_session():
+            return False
+
+        # Start listener thread
+        self._listener_thread = threading.Thread(target=self._listen_loop, daemon=True)
+        self._listener_thread.start()
+
+        # Start monitor thread
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self._monitor_thread.start()
+
+        print(f"Coordinator started. Session: {self.session_id}")
+        return True
+
+    def _start_session(self) -> bool:
+        """Connect, subscribe and publish the objective (shared by all run modes)."""
         if not self.redis:
             if not self.connect():
                 return False
+        if self._writes is None:
+            self._writes = self._create_write_batcher()
+        if self.pubsub is None:
+            self.pubsub = self.redis.pubsub()
 
         self.is_running = True
 
@@ -608,14 +669,6 @@ class PowerModeCoordinator:
         self.pubsub.subscribe(Channels.insights())
         self.pubsub.subscribe(Channels.human())
 
-        # Start listener thread
-        self._listener_thread = threading.Thread(target=self._listen_loop, daemon=True)
-        self._listener_thread.start()
-
-        # Start monitor thread
-        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._monitor_thread.start()
-
         # Store objective in Redis
         if self.objective:
             self.redis.set(
@@ -627,7 +680,6 @@ class PowerModeCoordinator:
         if self.use_cloud_workflows and CLOUD_CLIENT_AVAILABLE:
             self._start_cloud_workflow()
 
-        print(f"Coordinator started. Session: {self.session_id}")
         return True
 
     def _start_cloud_workflow(self):
@@ -710,6 +762,8 @@ class PowerModeCoordinator:
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2)
 
+        self._flush_writes()
+
         # Issue #103 Phase 3: Final sync to cloud workflow
         if self.cloud_client and self.cloud_workflow_id:
             self._update_cloud_workflow()
@@ -725,6 +779,31 @@ class PowerModeCoordinator:
 
         print("Coordinator stopped.")
 
+    def _create_write_batcher(self) -> Optional[BaseRedisClient]:
+        """
+        Auto-flushing pipeline for fire-and-forget writes.
+
+        Heartbeat state, broadcasts and stream tracking don't need replies,
+        so on Upstash they share REST round trips instead of costing one
+        each. Clients without pipelines (file backends) are used directly.
+        """
+        cfg = CONFIG.get("upstash", {}).get("pipeline", {})
+        if not self.redis or not cfg.get("enabled", True):
+            return self.redis
+        try:
+            return self.redis.pipeline(
+                max_commands=cfg.get("max_commands", 32),
+                max_delay=cfg.get("max_delay_ms", 50) / 1000
+            )
+        except (AttributeError, TypeError):
+            return self.redis
+
+    def _flush_writes(self):
+        """Send any batched writes now."""
+        flush = getattr(self._writes, "flush", None)
+        if flush and self._writes is not self.redis:
+            flush()
+
     def _listen_loop(self):
         """Main message listening loop."""
         while self.is_running:
@@ -743,6 +822,7 @@ class PowerModeCoordinator:
                 self._cleanup_expired_barriers()
                 # Issue #109: Poll for cloud messages
                 self._poll_cloud_messages()
+                self._flush_writes()
                 time.sleep(CONFIG.get("intervals", {}).get("heartbeat_seconds", 15))
             except Exception as e:
                 print(f"Monitor error: {e}", file=sys.stderr)
@@ -758,23 +838,24 @@ class PowerModeCoordinator:
         Part of Issue #109 (Inter-Agent Communication Protocol).
         Called periodically in the monitor loop.
         """
+        for msg in self._fetch_cloud_messages():
+            self._handle_cloud_message(msg)
+
+    def _fetch_cloud_messages(self) -> List[Dict]:
+        """Fetch pending coordinator messages from cloud (network only, no state changes)."""
         if not self.cloud_client or not self.cloud_client.connected:
-            return
+            return []
 
         try:
-            # Poll for coordinator messages
-            messages = self.cloud_client.poll_messages(
+            return self.cloud_client.poll_messages(
                 agent_id="coordinator",
                 session_id=self.session_id,
                 limit=20,
                 mark_read=True
             )
-
-            for msg in messages:
-                self._handle_cloud_message(msg)
-
         except Exception as e:
             print(f"Cloud message polling error: {e}", file=sys.stderr)
+            return []
 
     def _handle_cloud_message(self, msg: Dict):
         """
@@ -951,7 +1032,7 @@ class PowerModeCoordinator:
 
         # Store state in Redis
         if state_data:
-            self.redis.hset(
+            self._writes.hset(
                 Channels.state_key(agent_id),
                 mapping={k: json.dumps(v) if isinstance(v, (dict, list)) else str(v)
                          for k, v in state_data.items()}
@@ -1065,7 +1146,7 @@ class PowerModeCoordinator:
         self.human_pending.append(msg)
 
         # Store in Redis for human to see
-        self.redis.lpush(
+        self._writes.lpush(
             Channels.human(),
             msg.to_json()
         )
@@ -1136,7 +1217,7 @@ class PowerModeCoordinator:
 
         # Store session mapping in Redis for other agents
         if self.redis:
-            self.redis.hset(
+            self._writes.hset(
                 f"pop:streams:{self.session_id}",
                 agent_id,
                 json.dumps({
@@ -1177,10 +1258,10 @@ class PowerModeCoordinator:
 
             if session and self.redis:
                 # Clean up Redis tracking
-                self.redis.hdel(f"pop:streams:{self.session_id}", msg.from_agent)
+                self._writes.hdel(f"pop:streams:{self.session_id}", msg.from_agent)
 
                 # Store completed stream summary
-                self.redis.hset(
+                self._writes.hset(
                     f"pop:streams:completed:{self.session_id}",
                     session_id,
                     json.dumps(session.to_dict())
@@ -1300,7 +1381,7 @@ class PowerModeCoordinator:
         }
 
         # Store in Redis
-        self.redis.lpush("pop:tasks:orphaned", json.dumps(orphaned))
+        self._writes.lpush("pop:tasks:orphaned", json.dumps(orphaned))
 
         # Broadcast availability
         self._broadcast(Message(
@@ -1427,7 +1508,7 @@ class PowerModeCoordinator:
 
     def _broadcast(self, msg: Message):
         """Broadcast a message to all agents."""
-        self.redis.publish(Channels.broadcast(), msg.to_json())
+        self._writes.publish(Channels.broadcast(), msg.to_json())
 
     def _broadcast_drift_alert(self, agent_id: str, drift: Dict):
         """Broadcast a drift alert."""
@@ -1440,8 +1521,20 @@ class PowerModeCoordinator:
         ))
 
     def _send_to_agent(self, agent_id: str, msg: Message):
-        """Send a message to a specific agent."""
-        self.redis.publish(Channels.agent(agent_id), msg.to_json())
+        """Send a message to a specific agent.
+
+        Besides the live channel, the message is appended to the agent's
+        inbox stream, which check-ins read from a cursor so nothing sent
+        between check-ins is lost. Clients without streams (file backends)
+        only publish.
+        """
+        data = msg.to_json()
+        self._writes.publish(Channels.agent(agent_id), data)
+        xadd = getattr(self._writes, "xadd", None)
+        if xadd:
+            inbox = Channels.inbox_key(agent_id)
+            xadd(inbox, {"message": data}, maxlen=INBOX_MAXLEN)
+            self._writes.expire(inbox, CONFIG.get("intervals", {}).get("message_ttl_seconds", 300))
 
     # =========================================================================
     # PUBLIC API
@@ -1471,7 +1564,7 @@ class PowerModeCoordinator:
         Increments batch number when a new wave of agents spawns (detected by
         significant increase in active agent count).
         """
-        current_active = len(self.stream_manager.active_sessions)
+        current_active = len(self.stream_manager.get_active_sessions())
 
         # Increment batch when we get new agents (spawning a new batch)
         if current_active > self._last_agent_count:
@@ -1606,6 +1699,8 @@ def main():
     parser.add_argument("--phases", nargs="+", help="Phase names")
     parser.add_argument("--success-criteria", nargs="+", help="Success criteria")
     parser.add_argument("--session", help="Session ID for metrics lookup")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run on a single asyncio event loop (async_coordinator.py)")
 
     args = parser.parse_args()
 
@@ -1618,6 +1713,20 @@ def main():
                 phases=args.phases or ["explore", "implement", "review"]
             )
 
+        if args.use_async:
+            import asyncio
+            from async_coordinator import AsyncPowerModeCoordinator
+
+            print("Press Ctrl+C to stop...")
+            try:
+                started = asyncio.run(AsyncPowerModeCoordinator(objective).run())
+            except KeyboardInterrupt:
+                started = True
+            if not started:
+                print("Failed to start coordinator")
+                sys.exit(1)
+            return
+
         coordinator = PowerModeCoordinator(objective)
         if coordinator.start():
             print("Press Ctrl+C to stop...")
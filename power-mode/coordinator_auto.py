@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Auto-Detecting Power Mode Coordinator
-Automatically uses Redis if available, falls back to file-based storage.
+Automatically uses Redis if available, falls back to local storage
+(SQLite WAL database where possible, otherwise file-based).
 
 Usage:
     from coordinator_auto import create_coordinator
@@ -26,13 +27,37 @@ except ImportError:
         REDIS_AVAILABLE = False
 
 # Import file fallback
-from file_fallback import FileBasedPowerMode
+from file_fallback import FILE_BACKEND_PATHS, create_file_client, resolve_file_backend
 
 # Import base coordinator
 from coordinator import PowerModeCoordinator, load_config
 from protocol import Objective
 
 
+# What to expect from each local backend, printed when the coordinator starts
+FILE_BACKEND_NOTES = {
+    "json": [
+        "One JSON state file rewritten under one lock per operation",
+        "Best for 2-3 agents, performance degrades with 4+",
+    ],
+    "log": [
+        "Append-only segment logs; each channel has its own log",
+        "Agents append without rewriting shared state",
+    ],
+    "sqlite": [
+        "SQLite WAL database; readers never block on writers",
+        "Row-level writes; agents don't rewrite shared state",
+    ],
+}
+
+
+def file_client_location(client) -> Path:
+    """Database, log directory or state file behind a file-based client."""
+    return Path(getattr(client, "db_path", None)
+                or getattr(client, "state_dir", None)
+                or client.state_file)
+
+
 def redis_is_running() -> bool:
     """Check if Redis is actually running and accessible.
 
@@ -72,6 +97,7 @@ class AutoCoordinator(PowerModeCoordinator):
         super().__init__(objective)
         self.force_file_mode = force_file_mode
         self.is_file_mode = False
+        self.file_backend: Optional[str] = None
 
     def connect(self) -> bool:
         """Connect to Redis or fallback to file-based storage."""
@@ -92,15 +118,17 @@ class AutoCoordinator(PowerModeCoordinator):
                 reason = "redis not running"
 
             print(f"📁 Using file-based fallback for Power Mode ({reason})")
-            print(f"   State file: .claude/popkit/power-mode-state.json")
-            print(f"   Limitations: polling (not true pub/sub), single-machine only")
-            print()
 
             self.is_file_mode = True
 
-            # Create file-based client
+            # Create local client (file_mode.backend; "auto" = SQLite, else segment log)
             try:
-                self.redis = FileBasedPowerMode()
+                self.file_backend, backend_reason = resolve_file_backend()
+                self.redis = create_file_client(self.file_backend)
+                print(f"   Backend: {self.file_backend} ({backend_reason})")
+                print(f"   State: {file_client_location(self.redis)}")
+                print(f"   Limitations: single-machine only")
+                print()
                 if not self.redis.ping():
                     print("Failed to initialize file-based storage", file=sys.stderr)
                     return False
@@ -119,9 +147,10 @@ class AutoCoordinator(PowerModeCoordinator):
 
         if result and self.is_file_mode:
             print()
-            print("⚠️  File-based mode limitations:")
-            print("   - Polling-based (100ms intervals), not instant")
-            print("   - Best for 2-3 agents, performance degrades with 4+")
+            print(f"⚠️  File-based mode ({self.file_backend}):")
+            for note in FILE_BACKEND_NOTES.get(self.file_backend, []):
+                print(f"   - {note}")
+            print("   - Change-notified pub/sub (inotify on Linux, stat polling elsewhere)")
             print("   - Single machine only")
             print("   - To use Redis: docker run -d -p 6379:6379 redis")
             print()
@@ -153,6 +182,8 @@ def get_mode_info() -> dict:
             "mode": "redis" | "file",
             "redis_available": bool,
             "redis_running": bool,
+            "file_backend": "json" | "log" | "sqlite" (if file mode),
+            "file_backend_reason": str (if file mode),
             "file_path": str (if file mode),
             "recommendation": str
         }
@@ -161,7 +192,8 @@ def get_mode_info() -> dict:
     redis_running = redis_is_running() if redis_available else False
 
     mode = "redis" if redis_running else "file"
-    file_path = str(Path.cwd() / ".claude" / "popkit" / "power-mode-state.json")
+    backend, backend_reason = resolve_file_backend() if mode == "file" else (None, None)
+    file_path = FILE_BACKEND_PATHS.get(backend)
 
     if not redis_available:
         recommendation = "Install redis: pip install redis"
@@ -174,7 +206,9 @@ def get_mode_info() -> dict:
         "mode": mode,
         "redis_available": redis_available,
         "redis_running": redis_running,
-        "file_path": file_path if mode == "file" else None,
+        "file_backend": backend,
+        "file_backend_reason": backend_reason,
+        "file_path": str(Path.cwd() / file_path) if file_path else None,
         "recommendation": recommendation
     }
 
@@ -202,30 +236,35 @@ if __name__ == "__main__":
         print(f"Mode: {info['mode']}")
         print(f"Redis available: {info['redis_available']}")
         print(f"Redis running: {info['redis_running']}")
+        if info['file_backend']:
+            print(f"File backend: {info['file_backend']} ({info['file_backend_reason']})")
         if info['file_path']:
             print(f"File path: {info['file_path']}")
         print(f"\n{info['recommendation']}")
 
     elif args.command == "cleanup":
-        # Clean up old messages
-        from file_fallback import cleanup_old_messages, get_stats
-
-        state_file = Path.cwd() / ".claude" / "popkit" / "power-mode-state.json"
-        if not state_file.exists():
-            print("No state file found")
+        # Clean up old messages in whichever local backend is in use
+        backend, _ = resolve_file_backend()
+        state_path = FILE_BACKEND_PATHS.get(backend)
+        if state_path is None or not (Path.cwd() / state_path).exists():
+            print(f"No {backend} Power Mode state found")
             sys.exit(0)
 
+        client = create_file_client(backend)
+        print(f"Backend: {backend} ({file_client_location(client)})")
+
+        def print_stats(stats):
+            if "total_messages" in stats:
+                print(f"  Messages: {stats['total_messages']}")
+            print(f"  File size: {stats['file_size_kb']} KB")
+
         print("Before cleanup:")
-        stats = get_stats(state_file)
-        print(f"  Messages: {stats['total_messages']}")
-        print(f"  File size: {stats['file_size_kb']} KB")
+        print_stats(client.stats())
 
-        cleanup_old_messages(state_file, max_age_hours=24)
+        client.cleanup(max_age_hours=24)
 
         print("\nAfter cleanup:")
-        stats = get_stats(state_file)
-        print(f"  Messages: {stats['total_messages']}")
-        print(f"  File size: {stats['file_size_kb']} KB")
+        print_stats(client.stats())
 
     elif args.command == "start":
         # Start coordinator
@@ -9,7 +9,8 @@ This fallback enables Power Mode to work WITHOUT Docker/Redis for:
 - 2-3 agent scenarios
 
 Limitations:
-- No true pub/sub (uses polling instead)
+- Pub/sub is emulated: publishers touch a per-channel signal file and
+  subscribers wake on it (inotify, or stat polling of just those files)
 - File locking for concurrency (not as robust as Redis)
 - Single machine only (no network distribution)
 - Performance degrades with 4+ agents
@@ -20,11 +21,14 @@ import os
 import sys
 import time
 import threading
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 
+from change_notifier import ChangeNotifier, channel_file_stem
+
 # Platform-specific imports for file locking
 if sys.platform == 'win32':
     import msvcrt
@@ -102,9 +106,12 @@ class StateData:
     # Subscriptions (client_id -> set of channels)
     subscriptions: Dict[str, Set[str]] = field(default_factory=dict)
 
-    # Last read position for each subscription (client_id -> channel -> index)
+    # Legacy: read positions now live in per-client cursor files
     read_positions: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
+    # Last message id assigned per channel (ids survive the 100-message trim)
+    sequences: Dict[str, int] = field(default_factory=dict)
+
     # Metadata
     last_updated: str = field(default_factory=lambda: datetime.now().isoformat())
 
@@ -117,6 +124,7 @@ class StateData:
             "lists": self.lists,
             "subscriptions": {k: list(v) for k, v in self.subscriptions.items()},
             "read_positions": self.read_positions,
+            "sequences": self.sequences,
             "last_updated": self.last_updated
         }
 
@@ -162,6 +170,8 @@ class FileBasedPowerMode:
             self.state_file = Path.cwd() / ".claude" / "popkit" / "power-mode-state.json"
 
         self.lock_file = self.state_file.with_suffix('.lock')
+        # Per-channel files touched on publish (subscribers wait on these)
+        self.signal_dir = self.state_file.with_suffix('.signals')
 
         # Client ID for this instance
         self.client_id = f"client-{os.getpid()}-{id(self)}"
@@ -220,8 +230,13 @@ class FileBasedPowerMode:
             if channel not in state.messages:
                 state.messages[channel] = []
 
+            # Per-channel message id (subscriber cursors point at these)
+            msg_id = state.sequences.get(channel, len(state.messages[channel])) + 1
+            state.sequences[channel] = msg_id
+
             # Add message with timestamp
             msg_data = {
+                "id": msg_id,
                 "data": message,
                 "timestamp": datetime.now().isoformat(),
                 "channel": channel
@@ -239,6 +254,7 @@ class FileBasedPowerMode:
             )
 
             self._save_state(state)
+            signal_channel(self.signal_dir, channel)
             return subscriber_count
 
     def get(self, key: str) -> Optional[str]:
@@ -343,34 +359,91 @@ class FileBasedPowerMode:
             self._save_state(state)
             return count
 
+    def stats(self) -> Dict:
+        """Storage statistics (see get_stats)."""
+        return get_stats(self.state_file)
+
+    def cleanup(self, max_age_hours: int = 24) -> None:
+        """Remove messages older than max_age_hours (see cleanup_old_messages)."""
+        cleanup_old_messages(self.state_file, max_age_hours)
+
     def pubsub(self) -> 'PubSubEmulator':
         """Get a pub/sub object."""
         if self._pubsub is None:
-            self._pubsub = PubSubEmulator(self.state_file, self.lock_file, self.client_id)
+            self._pubsub = PubSubEmulator(
+                self.state_file, self.lock_file, self.client_id, self.signal_dir
+            )
         return self._pubsub
 
 
+SIGNAL_MAX_BYTES = 4096  # Signal files are truncated past this
+
+
+def signal_channel(signal_dir: Path, channel: str):
+    """Touch a channel's signal file so waiting subscribers wake up."""
+    path = signal_dir / (channel_file_stem(channel) + ".sig")
+    try:
+        f = open(path, 'ab')
+    except FileNotFoundError:
+        signal_dir.mkdir(parents=True, exist_ok=True)
+        f = open(path, 'ab')
+    with f:
+        f.write(b".")
+        if f.tell() > SIGNAL_MAX_BYTES:
+            f.truncate(0)
+
+
 # =============================================================================
 # PUB/SUB EMULATOR
 # =============================================================================
 
 class PubSubEmulator:
     """
-    Emulates Redis pub/sub using polling.
-
-    NOT true pub/sub - polls the file for new messages.
-    Good enough for 2-3 agents, but not scalable.
+    Emulates Redis pub/sub over the shared state file.
+
+    Subscribers block on a ChangeNotifier watching per-channel signal files
+    and only read the state file when one of their channels was published
+    to. Read cursors (last message id per channel) are kept per client in
+    <state>.cursors/<client_id>.json, so consuming never rewrites shared state.
+    Cursors are written once per fetched batch, after its last message is
+    delivered (and on close), not per message.
     """
 
-    def __init__(self, state_file: Path, lock_file: Path, client_id: str):
+    def __init__(self, state_file: Path, lock_file: Path, client_id: str,
+                 signal_dir: Optional[Path] = None):
         self.state_file = state_file
         self.lock_file = lock_file
         self.client_id = client_id
         self.subscribed_channels: Set[str] = set()
-        self.read_positions: Dict[str, int] = {}  # channel -> last_read_index
+        self.read_positions: Dict[str, int] = {}  # channel -> last message id seen
+        self.cursor_file = state_file.with_suffix('.cursors') / f"{client_id}.json"
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._unsaved = False
+        self._notifier = ChangeNotifier(signal_dir or state_file.with_suffix('.signals'))
+
+        # Resume from a previous session of the same client; anything
+        # published since then was signalled before we were watching
+        try:
+            self.read_positions.update(json.loads(self.cursor_file.read_text()))
+        except (OSError, ValueError):
+            pass
+        self._stale = bool(self.read_positions)
+
+    def _prefixes(self, channels) -> List[str]:
+        return [channel_file_stem(c) + "." for c in channels]
+
+    def _save_cursors(self):
+        """Persist this client's cursors (private file, no lock needed)."""
+        self.cursor_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cursor_file.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.read_positions))
+        os.replace(tmp, self.cursor_file)
+        self._unsaved = False
 
     def subscribe(self, *channels: str):
         """Subscribe to channels."""
+        self._notifier.arm(self._prefixes(channels))
+
         with FileLock(self.lock_file):
             state = StateData.from_dict(json.load(open(self.state_file)))
 
@@ -381,19 +454,16 @@ class PubSubEmulator:
                 state.subscriptions[self.client_id].add(channel)
                 self.subscribed_channels.add(channel)
 
-                # Initialize read position to current message count
+                # Only messages published from now on are delivered
                 if channel not in self.read_positions:
-                    current_count = len(state.messages.get(channel, []))
-                    self.read_positions[channel] = current_count
-
-            # Save subscription state
-            if self.client_id not in state.read_positions:
-                state.read_positions[self.client_id] = {}
-            state.read_positions[self.client_id].update(self.read_positions)
+                    self.read_positions[channel] = state.sequences.get(channel, 0)
 
+            # Subscriptions stay shared: publish() reports subscriber counts
             with open(self.state_file, 'w') as f:
                 json.dump(state.to_dict(), f, indent=2)
 
+        self._save_cursors()
+
     def unsubscribe(self, *channels: str):
         """Unsubscribe from channels."""
         with FileLock(self.lock_file):
@@ -407,12 +477,47 @@ class PubSubEmulator:
             with open(self.state_file, 'w') as f:
                 json.dump(state.to_dict(), f, indent=2)
 
+        for channel in channels:
+            self.read_positions.pop(channel, None)
+        self._pending = deque(m for m in self._pending if m["channel"] not in channels)
+        if self.read_positions:
+            self._save_cursors()
+        else:
+            try:
+                self.cursor_file.unlink()
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        """Persist delivered cursors and release the change notifier."""
+        if self._unsaved and self.read_positions:
+            self._save_cursors()
+        self._notifier.close()
+
+    def _fetch(self):
+        """Queue every message past this client's cursors (read-only)."""
+        with FileLock(self.lock_file):
+            state = StateData.from_dict(json.load(open(self.state_file)))
+
+        for channel in sorted(self.subscribed_channels):
+            last_read = self.read_positions.get(channel, 0)
+            for msg in state.messages.get(channel, []):
+                if msg.get("id", 0) > last_read:
+                    self._pending.append({
+                        "type": "message",
+                        "channel": channel,
+                        "data": msg["data"],
+                        "timestamp": msg.get("timestamp"),
+                        "id": msg["id"],
+                    })
+
     def get_message(self, timeout: float = 0) -> Optional[Dict]:
         """
         Get next message from subscribed channels.
 
-        This POLLS the file - not real pub/sub.
-        timeout: How long to wait for messages (in seconds).
+        Waits on the subscribed channels' signal files; the state file is
+        only read after a publish to one of them.
+        timeout: How long to wait for messages (in seconds, 0 = forever).
 
         Returns:
             {
@@ -422,45 +527,105 @@ class PubSubEmulator:
             }
             or None if no messages
         """
-        start_time = time.time()
+        deadline = time.monotonic() + timeout if timeout else None
+        changed, self._stale = self._stale, False
 
         while True:
-            # Check for new messages
-            with FileLock(self.lock_file):
-                state = StateData.from_dict(json.load(open(self.state_file)))
-
-                # Check each subscribed channel
-                for channel in self.subscribed_channels:
-                    messages = state.messages.get(channel, [])
-                    last_read = self.read_positions.get(channel, 0)
-
-                    # New messages available?
-                    if len(messages) > last_read:
-                        msg = messages[last_read]
-                        self.read_positions[channel] = last_read + 1
-
-                        # Update read position in state
-                        if self.client_id not in state.read_positions:
-                            state.read_positions[self.client_id] = {}
-                        state.read_positions[self.client_id][channel] = last_read + 1
-
-                        with open(self.state_file, 'w') as f:
-                            json.dump(state.to_dict(), f, indent=2)
-
-                        return {
-                            "type": "message",
-                            "channel": channel,
-                            "data": msg["data"],
-                            "timestamp": msg.get("timestamp")
-                        }
-
-            # Check timeout
-            elapsed = time.time() - start_time
-            if timeout and elapsed >= timeout:
+            if not self._pending and changed:
+                self._fetch()
+
+            if self._pending:
+                msg = self._pending.popleft()
+                self.read_positions[msg["channel"]] = msg.pop("id")
+                self._unsaved = True
+                if not self._pending:
+                    self._save_cursors()
+                return msg
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
                 return None
+            changed = self._notifier.wait(self._prefixes(self.subscribed_channels), remaining)
+
 
-            # No messages, sleep a bit before polling again
-            time.sleep(0.1)  # 100ms polling interval
+# =============================================================================
+# BACKEND SELECTION
+# =============================================================================
+
+FILE_BACKENDS = ("json", "log", "sqlite")
+
+# Default storage of each backend, relative to the working directory
+FILE_BACKEND_PATHS = {
+    "json": Path(".claude") / "popkit" / "power-mode-state.json",
+    "log": Path(".claude") / "popkit" / "power-mode-log",
+    "sqlite": Path(".claude") / "popkit" / "power-mode.db",
+}
+
+
+def _file_mode_config() -> Dict[str, Any]:
+    """file_mode section of config.json ({} if unreadable)."""
+    config_path = Path(__file__).parent / "config.json"
+    try:
+        return json.loads(config_path.read_text()).get("file_mode", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def resolve_file_backend(backend: Optional[str] = None,
+                         path: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Pick the backend create_file_client would use, without creating it.
+
+    Args:
+        backend: Explicit backend name or "auto". Defaults to
+            POPKIT_FILE_BACKEND, then config.json file_mode.backend, then "auto".
+        path: Storage path, used by "auto" to probe the directory
+
+    Returns:
+        Tuple of (backend name, reason_string)
+    """
+    if backend:
+        reason = "requested"
+    elif os.environ.get("POPKIT_FILE_BACKEND"):
+        backend, reason = os.environ["POPKIT_FILE_BACKEND"], "POPKIT_FILE_BACKEND"
+    else:
+        backend = _file_mode_config().get("backend", "auto")
+        reason = f"file_mode.backend = {backend}"
+    if backend == "auto":
+        from mode_selector import ModeSelector
+        return ModeSelector().select_file_backend(Path(path).parent if path else None)
+    return backend, reason
+
+
+def create_file_client(backend: Optional[str] = None, path: Optional[str] = None):
+    """
+    Create a file-based Redis-compatible client.
+
+    Args:
+        backend: "json" (single state file, FileBasedPowerMode), "log"
+            (append-only segment logs, LogStructuredPowerMode), "sqlite"
+            (WAL database, SQLitePowerMode) or "auto" (sqlite where WAL is
+            usable, else log; see ModeSelector.select_file_backend).
+            Defaults to POPKIT_FILE_BACKEND, then config.json
+            file_mode.backend, then "auto".
+        path: State file (json), state directory (log) or database (sqlite);
+            backend default if None
+
+    Returns:
+        FileBasedPowerMode, LogStructuredPowerMode or SQLitePowerMode
+    """
+    backend, _ = resolve_file_backend(backend, path)
+    if backend == "json":
+        return FileBasedPowerMode(path)
+    if backend == "log":
+        from segment_log import LogStructuredPowerMode, DEFAULT_SEGMENT_BYTES
+        return LogStructuredPowerMode(
+            path, segment_bytes=_file_mode_config().get("segment_bytes", DEFAULT_SEGMENT_BYTES)
+        )
+    if backend == "sqlite":
+        from sqlite_backend import SQLitePowerMode
+        return SQLitePowerMode(path)
+    raise ValueError(f"Unknown file backend: {backend} (expected auto or one of {FILE_BACKENDS})")
 
 
 # =============================================================================
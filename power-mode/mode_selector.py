@@ -5,7 +5,8 @@ Power Mode Selector
 Auto-selects the best Power Mode based on environment:
 1. Native Async (Claude Code 2.0.64+) - Zero config, uses background agents
 2. Upstash Mode - Cloud Redis for Pro users (no Docker required)
-3. File Mode - Fallback for free tier, works everywhere but limited
+3. SQLite Mode - Local WAL database when Redis is unreachable
+4. File Mode - Fallback for free tier, works everywhere but limited
 
 Issue #191: Simplified architecture - removed local Docker Redis option.
 - Pro users: Upstash cloud (zero local setup)
@@ -26,6 +27,7 @@ class PowerMode(Enum):
     """Available Power Mode implementations."""
     NATIVE = "native"      # Claude Code native async (2.0.64+)
     UPSTASH = "upstash"    # Upstash cloud Redis (Pro tier, no Docker)
+    SQLITE = "sqlite"      # Local SQLite WAL database (Redis unreachable)
     FILE = "file"          # File-based coordination (free tier fallback)
     DISABLED = "disabled"  # Power Mode not available
 
@@ -34,7 +36,7 @@ class ModeSelector:
     """
     Selects the best available Power Mode based on environment.
 
-    Priority order: native -> upstash -> file
+    Priority order: native -> upstash -> sqlite -> file
 
     Issue #191: Simplified to remove local Docker Redis dependency.
     """
@@ -62,10 +64,11 @@ class ModeSelector:
             Tuple of (PowerMode, reason_string)
 
         Issue #191: Simplified priority - native -> upstash -> file
-        (removed local Docker Redis option)
+        (removed local Docker Redis option). SQLite slots in before file:
+        same zero-setup, but concurrent readers and row-level writes.
         """
         # Check configured priority order
-        priority = self.config.get("mode_priority", ["native", "upstash", "file"])
+        priority = self.config.get("mode_priority", ["native", "upstash", "sqlite", "file"])
 
         for mode_name in priority:
             if mode_name == "native":
@@ -78,6 +81,11 @@ class ModeSelector:
                 if available:
                     return PowerMode.UPSTASH, reason
 
+            elif mode_name == "sqlite":
+                available, reason = self._check_sqlite_available()
+                if available:
+                    return PowerMode.SQLITE, reason
+
             elif mode_name == "file":
                 # File mode is always available (free tier)
                 return PowerMode.FILE, "File-based mode (free tier, always available)"
@@ -134,6 +142,41 @@ class ModeSelector:
 
         return False, "Upstash not configured (set UPSTASH_REDIS_REST_URL and UPSTASH_REDIS_REST_TOKEN)"
 
+    def _check_sqlite_available(self, directory: Optional[Path] = None) -> Tuple[bool, str]:
+        """
+        Check if the SQLite WAL backend can run.
+
+        Args:
+            directory: Where the database would live (default .claude/popkit)
+        """
+        try:
+            from sqlite_backend import wal_available
+        except ImportError as e:
+            return False, f"SQLite backend unavailable: {e}"
+        return wal_available(directory)
+
+    def select_file_backend(self, directory: Optional[Path] = None) -> Tuple[str, str]:
+        """
+        Pick the local backend used when Redis is unreachable.
+
+        Honors file_mode.backend from config unless it is "auto", in which
+        case SQLite is preferred and the segment log is the fallback.
+
+        Args:
+            directory: Where the backend's files would live
+
+        Returns:
+            Tuple of (backend name for create_file_client, reason_string)
+        """
+        configured = self.config.get("file_mode", {}).get("backend", "auto")
+        if configured != "auto":
+            return configured, f"file_mode.backend = {configured}"
+
+        available, reason = self._check_sqlite_available(directory)
+        if available:
+            return "sqlite", reason
+        return "log", f"Segment log ({reason})"
+
     def _get_claude_code_version(self) -> Optional[str]:
         """
         Try to detect Claude Code version.
@@ -231,6 +274,11 @@ class ModeSelector:
                 "Setup: Set env vars (Pro tier)",
                 "Max Agents: 6+ (parallel)"
             ])
+        elif mode == PowerMode.SQLITE:
+            status_lines.extend([
+                "Max Agents: 6+ (concurrent readers, row-level writes)",
+                "Setup: None required (local database)"
+            ])
         elif mode == PowerMode.FILE:
             status_lines.extend([
                 "Max Agents: 2-3 (sequential)",
@@ -276,7 +324,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Power Mode Selector")
     parser.add_argument("--select", action="store_true", help="Auto-select best mode")
     parser.add_argument("--status", action="store_true", help="Show full status")
-    parser.add_argument("--check", type=str, choices=["native", "upstash", "file"], help="Check specific mode")
+    parser.add_argument("--check", type=str, choices=["native", "upstash", "sqlite", "file"], help="Check specific mode")
     parser.add_argument("--tier", type=str, default="free", help="User tier (free, premium, pro)")
 
     args = parser.parse_args()
@@ -297,6 +345,9 @@ if __name__ == "__main__":
         elif args.check == "upstash":
             available, reason = selector._check_upstash_available()
             print(f"Upstash: {'Yes' if available else 'No'} - {reason}")
+        elif args.check == "sqlite":
+            available, reason = selector._check_sqlite_available()
+            print(f"SQLite: {'Yes' if available else 'No'} - {reason}")
         elif args.check == "file":
             print("File: Yes - Always available (free tier)")
 
@@ -530,6 +530,11 @@ class Channels:
         """Redis key for agent state hash."""
         return f"{cls.PREFIX}:state:{agent_id}"
 
+    @classmethod
+    def inbox_key(cls, agent_id: str) -> str:
+        """Redis stream of direct messages an agent reads from its cursor."""
+        return f"{cls.PREFIX}:inbox:{agent_id}"
+
     @classmethod
     def objective_key(cls) -> str:
         """Redis key for current objective."""
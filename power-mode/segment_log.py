@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+"""
+Log-Structured Power Mode Backend
+A Redis-compatible interface backed by append-only segment logs.
+
+FileBasedPowerMode rewrites one JSON state file (under one global lock) on
+every publish/set/hset/lpush, so each operation is O(total state) and all
+agents serialize on that lock. This backend instead:
+
+- Appends one JSON line per operation to a segment log, holding the log's
+  lock only for the append itself
+- Gives every pub/sub channel its own log, so publishers on different
+  channels never contend and subscribers tail from their own byte offsets
+- Keeps the key space (keys/hashes/lists/sets) in memory, tailing the shared
+  data log incrementally; a snapshot is written and old segments dropped
+  once the active segment grows past `segment_bytes` (compaction)
+
+Layout (default .claude/popkit/power-mode-log/):
+    data.00000001.log        Key-space operations (active segment)
+    data.snapshot.json       State as of a (segment, offset) position
+    channels/<name>.<seq>.log  Per-channel message segments
+
+Same API as FileBasedPowerMode, plus the hdel/ltrim/expire/sadd/srem calls
+the coordinator and check-in hook make against real Redis.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from file_fallback import FileLock
+from change_notifier import ChangeNotifier, channel_file_stem
+
+DEFAULT_SEGMENT_BYTES = 1024 * 1024      # Data log compaction threshold
+CHANNEL_SEGMENT_BYTES = 256 * 1024       # Channel log rotation threshold
+CHANNEL_RETAIN_SEGMENTS = 2              # Older channel segments are deleted
+
+# (segment sequence, byte offset) within a SegmentLog
+Position = Tuple[int, int]
+
+
+# =============================================================================
+# SEGMENT LOG
+# =============================================================================
+
+class SegmentLog:
+    """
+    Append-only JSON-lines log split into numbered segments.
+
+    Writers append under a per-log lock; readers never lock. They read whole
+    lines from a (segment, offset) position and move on to the next segment
+    when they reach the end of one that has been rotated.
+    """
+
+    def __init__(self, directory: Path, name: str, segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        self.directory = Path(directory)
+        self.name = name
+        self.segment_bytes = segment_bytes
+        self.lock_file = self.directory / f"{name}.lock"
+        self._active = 0  # Cached active segment (verified under the lock)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def segment_path(self, seq: int) -> Path:
+        return self.directory / f"{self.name}.{seq:08d}.log"
+
+    def segments(self) -> List[int]:
+        """Existing segment numbers, oldest first."""
+        prefix = f"{self.name}."
+        seqs = []
+        for entry in os.scandir(self.directory):
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(".log"):
+                middle = name[len(prefix):-4]
+                if middle.isdigit():
+                    seqs.append(int(middle))
+        return sorted(seqs)
+
+    def lock(self) -> FileLock:
+        return FileLock(self.lock_file)
+
+    def active_segment(self) -> int:
+        """Newest segment number (call with the lock held to be exact)."""
+        if self._active == 0 or not self.segment_path(self._active).exists():
+            # First use, or our cached segment was compacted away
+            existing = self.segments()
+            self._active = max(existing[-1] if existing else 1, self._active)
+        # Another process may have rotated since we last looked
+        while self.segment_path(self._active + 1).exists():
+            self._active += 1
+        return self._active
+
+    def end(self) -> Position:
+        """Position just past the last complete record."""
+        seq = self.active_segment()
+        try:
+            return seq, self.segment_path(seq).stat().st_size
+        except FileNotFoundError:
+            return seq, 0
+
+    def append(self, records: List[Dict[str, Any]]) -> Position:
+        """
+        Append records (lock must be held).
+
+        Returns:
+            Position after the appended records
+        """
+        seq = self.active_segment()
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        with open(self.segment_path(seq), "a", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            return seq, f.tell()
+
+    def rotate(self) -> int:
+        """Start a new segment (lock must be held)."""
+        seq = self.active_segment() + 1
+        self.segment_path(seq).touch()
+        self._active = seq
+        return seq
+
+    def prune(self, keep_from: int) -> None:
+        """Delete segments older than `keep_from` (lock must be held)."""
+        for seq in self.segments():
+            if seq >= keep_from:
+                break
+            try:
+                self.segment_path(seq).unlink()
+            except OSError:
+                pass
+
+    def read(self, position: Position) -> Tuple[List[Dict[str, Any]], Position]:
+        """
+        Read complete records from a position.
+
+        Raises:
+            FileNotFoundError: The position's segment was compacted away
+        """
+        seq, offset = position
+        records: List[Dict[str, Any]] = []
+        while True:
+            path = self.segment_path(seq)
+            # Checked before reading: once the next segment exists nothing
+            # more is appended to this one, so reading it to EOF is complete.
+            sealed = self.segment_path(seq + 1).exists()
+            try:
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    chunk = f.read()
+            except FileNotFoundError:
+                # Never written yet (fresh log) vs. compacted away
+                if offset == 0 and not any(s > seq for s in self.segments()):
+                    return records, (seq, offset)
+                raise
+
+            # A writer may be mid-append: only consume whole lines
+            complete = chunk.rfind(b"\n") + 1
+            for line in chunk[:complete].splitlines():
+                if line:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+            offset += complete
+
+            if not sealed or complete < len(chunk):
+                return records, (seq, offset)
+            seq, offset = seq + 1, 0
+
+
+# =============================================================================
+# LOG-STRUCTURED REDIS CLIENT
+# =============================================================================
+
+class LogStructuredPowerMode:
+    """
+    A Redis-compatible interface using append-only segment logs.
+
+    Mimics the Redis operations used by PowerModeCoordinator:
+    - publish(channel, message) / pubsub()
+    - get/set, hset/hget/hgetall/hdel, lpush/lrange/ltrim
+    - sadd/srem/smembers, expire, delete, ping()
+    """
+
+    def __init__(self, state_dir: Optional[str] = None,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        """
+        Initialize log-structured client.
+
+        Args:
+            state_dir: Log directory. Defaults to .claude/popkit/power-mode-log
+            segment_bytes: Compact the data log once its active segment exceeds this
+        """
+        if state_dir:
+            self.state_dir = Path(state_dir)
+        else:
+            self.state_dir = Path.cwd() / ".claude" / "popkit" / "power-mode-log"
+
+        self.data = SegmentLog(self.state_dir, "data", segment_bytes)
+        self.snapshot_file = self.state_dir / "data.snapshot.json"
+        self.channels_dir = self.state_dir / "channels"
+        self.channels_dir.mkdir(parents=True, exist_ok=True)
+
+        self.client_id = f"client-{os.getpid()}-{id(self)}"
+        self._pubsub = None
+        self._channel_logs: Dict[str, SegmentLog] = {}
+        self._mutex = threading.RLock()
+
+        self._reset_state()
+        self._position: Optional[Position] = None
+
+    # =========================================================================
+    # STATE
+    # =========================================================================
+
+    def _reset_state(self):
+        self.keys: Dict[str, str] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.lists: Dict[str, List[str]] = {}
+        self.sets: Dict[str, Set[str]] = {}
+        self.expires: Dict[str, float] = {}
+        self.subscriptions: Dict[str, Set[str]] = {}
+
+    def _load_snapshot(self):
+        """Reset in-memory state to the latest snapshot."""
+        self._reset_state()
+        try:
+            snapshot = json.loads(self.snapshot_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            existing = self.data.segments()
+            self._position = (existing[0] if existing else 1, 0)
+            return
+
+        self.keys = snapshot.get("keys", {})
+        self.hashes = snapshot.get("hashes", {})
+        self.lists = snapshot.get("lists", {})
+        self.sets = {k: set(v) for k, v in snapshot.get("sets", {}).items()}
+        self.expires = snapshot.get("expires", {})
+        self.subscriptions = {k: set(v) for k, v in snapshot.get("subscriptions", {}).items()}
+        self._position = tuple(snapshot["position"])
+
+    def _refresh(self):
+        """Apply records appended since we last looked."""
+        if self._position is None:
+            self._load_snapshot()
+        for _ in range(3):
+            try:
+                records, self._position = self.data.read(self._position)
+                break
+            except FileNotFoundError:
+                # Our segment was compacted into a newer snapshot
+                self._load_snapshot()
+        else:
+            return
+        for record in records:
+            self._apply(record)
+
+    def _apply(self, r: Dict[str, Any]):
+        """Apply one logged operation to in-memory state."""
+        op, k = r["op"], r.get("k")
+        # Expiry is judged at the record's own timestamp so every reader
+        # replays the log to the same state.
+        if k is not None and op != "expire":
+            deadline = self.expires.get(k)
+            if deadline is not None and deadline <= r.get("t", 0):
+                self._drop(k)
+
+        if op == "set":
+            self._drop(k)
+            self.keys[k] = r["v"]
+        elif op == "hset":
+            self.hashes.setdefault(k, {}).update(r["m"])
+        elif op == "hdel":
+            fields = self.hashes.get(k, {})
+            for name in r["f"]:
+                fields.pop(name, None)
+            if not fields:
+                self.hashes.pop(k, None)
+        elif op == "lpush":
+            self.lists[k] = list(reversed(r["v"])) + self.lists.get(k, [])
+        elif op == "ltrim":
+            lst = self.lists.get(k, [])
+            stop = r["stop"]
+            self.lists[k] = lst[r["start"]:stop + 1 if stop != -1 else None]
+        elif op == "sadd":
+            self.sets.setdefault(k, set()).update(r["v"])
+        elif op == "srem":
+            self.sets.get(k, set()).difference_update(r["v"])
+        elif op == "expire":
+            if any(k in store for store in (self.keys, self.hashes, self.lists, self.sets)):
+                self.expires[k] = r["at"]
+        elif op == "del":
+            for name in r["names"]:
+                self._drop(name)
+        elif op == "sub":
+            self.subscriptions.setdefault(r["client"], set()).update(r["channels"])
+        elif op == "unsub":
+            self.subscriptions.get(r["client"], set()).difference_update(r["channels"])
+
+    def _drop(self, name: str):
+        for store in (self.keys, self.hashes, self.lists, self.sets, self.expires):
+            store.pop(name, None)
+
+    def _exists(self, name: str) -> bool:
+        return not self._expired(name) and any(
+            name in store for store in (self.keys, self.hashes, self.lists, self.sets)
+        )
+
+    def _expired(self, name: str) -> bool:
+        deadline = self.expires.get(name)
+        return deadline is not None and deadline <= time.time()
+
+    def _write(self, record: Dict[str, Any], count=None) -> Any:
+        """
+        Append one operation under the data-log lock, compacting if needed.
+
+        Args:
+            record: Operation to log
+            count: Optional callable evaluated on the up-to-date state just
+                before the operation applies (for Redis-style return values)
+        """
+        record["t"] = time.time()
+        with self._mutex, self.data.lock():
+            self._refresh()
+            result = count() if count else None
+            self._apply(record)
+            self._position = self.data.append([record])
+            if self._position[1] >= self.data.segment_bytes:
+                self._compact()
+            return result
+
+    def _compact(self):
+        """Snapshot state and drop old data segments (data lock held)."""
+        now = time.time()
+        expired = [k for k, at in self.expires.items() if at <= now]
+        for name in expired:
+            self._drop(name)
+
+        new_segment = self.data.rotate()
+        snapshot = {
+            "position": [new_segment, 0],
+            "keys": self.keys,
+            "hashes": self.hashes,
+            "lists": self.lists,
+            "sets": {k: sorted(v) for k, v in self.sets.items()},
+            "expires": self.expires,
+            "subscriptions": {k: sorted(v) for k, v in self.subscriptions.items()},
+        }
+        tmp_path = self.snapshot_file.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(snapshot, separators=(",", ":")), encoding="utf-8")
+        tmp_path.replace(self.snapshot_file)
+        self.data.prune(new_segment)
+        self._position = (new_segment, 0)
+
+    @contextmanager
+    def _reading(self):
+        """Refreshed in-memory state, held against other threads."""
+        with self._mutex:
+            self._refresh()
+            yield
+
+    def channel_log(self, channel: str) -> SegmentLog:
+        """The segment log for one pub/sub channel."""
+        log = self._channel_logs.get(channel)
+        if log is None:
+            log = SegmentLog(self.channels_dir, channel_file_stem(channel), CHANNEL_SEGMENT_BYTES)
+            self._channel_logs[channel] = log
+        return log
+
+    # =========================================================================
+    # REDIS COMPATIBILITY API
+    # =========================================================================
+
+    def ping(self) -> bool:
+        """Check if the storage is accessible."""
+        try:
+            return self.state_dir.is_dir() and os.access(self.state_dir, os.W_OK)
+        except Exception:
+            return False
+
+    def publish(self, channel: str, message: str) -> int:
+        """
+        Publish a message to a channel.
+
+        Returns: Number of subscribers to the channel.
+        """
+        log = self.channel_log(channel)
+        record = {"data": message, "timestamp": datetime.now().isoformat()}
+        with log.lock():
+            _, offset = log.append([record])
+            if offset >= log.segment_bytes:
+                new_segment = log.rotate()
+                log.prune(new_segment - CHANNEL_RETAIN_SEGMENTS + 1)
+
+        with self._reading():
+            return sum(1 for subs in self.subscriptions.values() if channel in subs)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a value by key."""
+        with self._reading():
+            return None if self._expired(key) else self.keys.get(key)
+
+    def set(self, key: str, value: str) -> bool:
+        """Set a key-value pair."""
+        self._write({"op": "set", "k": key, "v": value})
+        return True
+
+    def hset(self, name: str, key: Optional[str] = None, value: Optional[str] = None,
+             mapping: Optional[Dict[str, str]] = None) -> int:
+        """
+        Set hash field(s).
+
+        Supports both single field and mapping.
+        """
+        fields = {}
+        if key is not None and value is not None:
+            fields[key] = value
+        if mapping:
+            fields.update(mapping)
+        if fields:
+            self._write({"op": "hset", "k": name, "m": fields})
+        return (1 if key is not None and value is not None else 0) + len(mapping or {})
+
+    def hget(self, name: str, key: str) -> Optional[str]:
+        """Get a hash field value."""
+        with self._reading():
+            return None if self._expired(name) else self.hashes.get(name, {}).get(key)
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        """Get all hash fields."""
+        with self._reading():
+            return {} if self._expired(name) else dict(self.hashes.get(name, {}))
+
+    def hdel(self, name: str, *keys: str) -> int:
+        """Delete hash fields."""
+        return self._write(
+            {"op": "hdel", "k": name, "f": list(keys)},
+            count=lambda: sum(1 for k in keys if k in self.hashes.get(name, {}))
+        )
+
+    def lpush(self, name: str, *values: str) -> int:
+        """Push values to the head of a list."""
+        return self._write(
+            {"op": "lpush", "k": name, "v": list(values)},
+            count=lambda: len(values) + (0 if self._expired(name) else len(self.lists.get(name, [])))
+        )
+
+    def lrange(self, name: str, start: int, stop: int) -> List[str]:
+        """Get a range of elements from a list."""
+        with self._reading():
+            if self._expired(name):
+                return []
+            lst = self.lists.get(name, [])
+            return lst[start:stop + 1 if stop != -1 else None]
+
+    def ltrim(self, name: str, start: int, stop: int) -> bool:
+        """Trim a list to the given range."""
+        self._write({"op": "ltrim", "k": name, "start": start, "stop": stop})
+        return True
+
+    def sadd(self, name: str, *values: str) -> int:
+        """Add members to a set."""
+        return self._write(
+            {"op": "sadd", "k": name, "v": list(values)},
+            count=lambda: len(set(values) - self.sets.get(name, set()))
+        )
+
+    def srem(self, name: str, *values: str) -> int:
+        """Remove members from a set."""
+        return self._write(
+            {"op": "srem", "k": name, "v": list(values)},
+            count=lambda: len(set(values) & self.sets.get(name, set()))
+        )
+
+    def smembers(self, name: str) -> Set[str]:
+        """Get all members of a set."""
+        with self._reading():
+            return set() if self._expired(name) else set(self.sets.get(name, set()))
+
+    def expire(self, name: str, seconds: int) -> bool:
+        """Expire a key after `seconds`."""
+        return self._write(
+            {"op": "expire", "k": name, "at": time.time() + seconds},
+            count=lambda: self._exists(name)
+        )
+
+    def delete(self, *names: str) -> int:
+        """Delete keys."""
+        return self._write(
+            {"op": "del", "names": list(names)},
+            count=lambda: sum(1 for name in names if self._exists(name))
+        )
+
+    def pubsub(self) -> 'LogPubSub':
+        """Get a pub/sub object."""
+        if self._pubsub is None:
+            self._pubsub = LogPubSub(self)
+        return self._pubsub
+
+    def compact(self):
+        """Force a snapshot of the data log."""
+        with self._mutex, self.data.lock():
+            self._refresh()
+            self._compact()
+
+    def cleanup(self, max_age_hours: int = 24) -> None:
+        """
+        Compact the data log, dropping expired keys and old segments.
+
+        Channel logs need no age-based cleanup: they rotate at
+        CHANNEL_SEGMENT_BYTES and keep only CHANNEL_RETAIN_SEGMENTS segments,
+        so max_age_hours is accepted for API parity and ignored.
+        """
+        self.compact()
+
+    def stats(self) -> Dict[str, Any]:
+        """Storage statistics (mirrors file_fallback.get_stats)."""
+        with self._reading():
+            size = sum(p.stat().st_size for p in self.state_dir.rglob("*") if p.is_file())
+            return {
+                "channels": len({p.name.rsplit(".", 2)[0] for p in self.channels_dir.glob("*.log")}),
+                "subscribers": len(self.subscriptions),
+                "keys": len(self.keys),
+                "hashes": len(self.hashes),
+                "lists": len(self.lists),
+                "sets": len(self.sets),
+                "data_segments": len(self.data.segments()),
+                "file_size_kb": round(size / 1024, 2),
+            }
+
+
+# =============================================================================
+# PUB/SUB
+# =============================================================================
+
+class LogPubSub:
+    """
+    Redis-style pub/sub over per-channel logs.
+
+    Each subscriber keeps its own (segment, offset) cursor per channel, so
+    reading never takes a lock and never rewrites shared state. Channel logs
+    are only re-read when the notifier reports that one of them changed.
+    """
+
+    POLL_INTERVAL = 0.1  # seconds, listen() timeout slice
+
+    def __init__(self, client: LogStructuredPowerMode):
+        self.client = client
+        self.client_id = client.client_id
+        self.subscribed_channels: Set[str] = set()
+        self.positions: Dict[str, Position] = {}
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._notifier = ChangeNotifier(client.channels_dir)
+
+    def _prefixes(self, channels) -> List[str]:
+        return [channel_file_stem(c) + "." for c in channels]
+
+    def subscribe(self, *channels: str):
+        """Subscribe to channels (only messages published afterwards are seen)."""
+        self._notifier.arm(self._prefixes(channels))
+        for channel in channels:
+            if channel not in self.positions:
+                self.positions[channel] = self.client.channel_log(channel).end()
+            self.subscribed_channels.add(channel)
+        self.client._write({"op": "sub", "client": self.client_id, "channels": list(channels)})
+
+    def unsubscribe(self, *channels: str):
+        """Unsubscribe from channels."""
+        for channel in channels:
+            self.subscribed_channels.discard(channel)
+            self.positions.pop(channel, None)
+        self._pending = deque(m for m in self._pending if m["channel"] not in channels)
+        self.client._write({"op": "unsub", "client": self.client_id, "channels": list(channels)})
+
+    def close(self):
+        """Release the change notifier."""
+        self._notifier.close()
+
+    def _poll(self) -> None:
+        """Tail every subscribed channel from its cursor."""
+        for channel in sorted(self.subscribed_channels):
+            log = self.client.channel_log(channel)
+            try:
+                records, self.positions[channel] = log.read(self.positions[channel])
+            except FileNotFoundError:
+                # Fell behind channel retention: resume from the oldest segment
+                existing = log.segments()
+                self.positions[channel] = (existing[0] if existing else 1, 0)
+                records, self.positions[channel] = log.read(self.positions[channel])
+            for record in records:
+                self._pending.append({
+                    "type": "message",
+                    "channel": channel,
+                    "data": record["data"],
+                    "timestamp": record.get("timestamp"),
+                })
+
+    def get_message(self, timeout: float = 0) -> Optional[Dict]:
+        """
+        Get next message from subscribed channels.
+
+        Blocks on the change notifier rather than re-reading every channel
+        log on a fixed interval.
+        timeout: How long to wait for messages (in seconds, 0 = forever).
+
+        Returns:
+            {"type": "message", "channel": ..., "data": ..., "timestamp": ...}
+            or None if no messages
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        changed = True
+        while True:
+            if not self._pending and changed:
+                self._poll()
+            if self._pending:
+                return self._pending.popleft()
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            changed = self._notifier.wait(self._prefixes(self.subscribed_channels), remaining)
+
+    def listen(self) -> Iterator[Dict]:
+        """Yield messages as they arrive."""
+        while True:
+            message = self.get_message(timeout=self.POLL_INTERVAL)
+            if message:
+                yield message
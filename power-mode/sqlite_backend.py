@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+SQLite Power Mode Backend
+A Redis-compatible interface backed by one SQLite database in WAL mode.
+
+Sits between the file backends and Redis: no server to run, but unlike
+FileBasedPowerMode (one JSON file under one global lock) it gives
+
+- Concurrent readers: WAL readers never block on the writer
+- Row-level writes: HSET touches one (name, field) row, not the whole state
+- Indexed pub/sub: messages live in one table indexed by (channel, id) and
+  each subscriber reads forward from its own per-channel cursor
+
+Publishers also touch a per-channel signal file so subscribers block on the
+change notifier instead of polling the database.
+
+Layout (default .claude/popkit/):
+    power-mode.db            Key space, messages, subscriptions, cursors
+    power-mode.db-wal/-shm   WAL files (managed by SQLite)
+    power-mode.signals/      Per-channel signal files
+
+Same API as LogStructuredPowerMode.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import sqlite3
+    SQLITE_AVAILABLE = True
+except ImportError:
+    SQLITE_AVAILABLE = False
+
+from change_notifier import ChangeNotifier, channel_file_stem
+from file_fallback import signal_channel
+
+MIN_SQLITE_VERSION = (3, 7, 0)   # First release with WAL
+BUSY_TIMEOUT_SECONDS = 5         # Same as FileLock
+MESSAGE_RETENTION = 1000         # Messages kept per channel
+PRUNE_EVERY = 100                # Publishes between retention passes
+FETCH_BATCH = 500                # Messages read per channel per wakeup
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    name TEXT PRIMARY KEY, value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hashes (
+    name TEXT, field TEXT, value TEXT NOT NULL, PRIMARY KEY (name, field)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS lists (
+    name TEXT, pos INTEGER, value TEXT NOT NULL, PRIMARY KEY (name, pos)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sets (
+    name TEXT, member TEXT, PRIMARY KEY (name, member)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS expires (
+    name TEXT PRIMARY KEY, at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL, data TEXT NOT NULL, timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_by_channel ON messages (channel, id);
+CREATE TABLE IF NOT EXISTS subscriptions (
+    client TEXT, channel TEXT, PRIMARY KEY (client, channel)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS subscriptions_by_channel ON subscriptions (channel);
+CREATE TABLE IF NOT EXISTS cursors (
+    client TEXT, channel TEXT, last_id INTEGER NOT NULL, PRIMARY KEY (client, channel)
+) WITHOUT ROWID;
+"""
+
+KEYSPACE_TABLES = ("kv", "hashes", "lists", "sets")
+
+
+def wal_available(directory: Optional[Path] = None) -> Tuple[bool, str]:
+    """
+    Check whether the SQLite backend can run here.
+
+    Args:
+        directory: Where the database would live (default .claude/popkit)
+
+    Returns:
+        Tuple of (available, reason)
+    """
+    if not SQLITE_AVAILABLE:
+        return False, "sqlite3 module not available"
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        return False, f"SQLite {sqlite3.sqlite_version} has no WAL (needs 3.7.0+)"
+
+    directory = Path(directory) if directory else Path.cwd() / ".claude" / "popkit"
+    existing = directory
+    while not existing.exists() and existing != existing.parent:
+        existing = existing.parent
+    if not os.access(existing, os.W_OK):
+        return False, f"{existing} is not writable"
+    return True, f"SQLite {sqlite3.sqlite_version} (WAL)"
+
+
+def connect(db_path: Path) -> 'sqlite3.Connection':
+    """Open a WAL-mode connection in autocommit mode."""
+    conn = sqlite3.connect(
+        str(db_path), timeout=BUSY_TIMEOUT_SECONDS,
+        isolation_level=None, check_same_thread=False,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+# =============================================================================
+# SQLITE CLIENT
+# =============================================================================
+
+class SQLitePowerMode:
+    """
+    A Redis-compatible interface using SQLite in WAL mode.
+
+    Mimics the Redis operations used by PowerModeCoordinator:
+    - publish(channel, message) / pubsub()
+    - get/set, hset/hget/hgetall/hdel, lpush/lrange/ltrim
+    - sadd/srem/smembers, expire, delete, ping()
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize SQLite client.
+
+        Args:
+            db_path: Database file. Defaults to .claude/popkit/power-mode.db
+        """
+        if not SQLITE_AVAILABLE:
+            raise RuntimeError("sqlite3 module not available")
+
+        if db_path:
+            self.db_path = Path(db_path)
+        else:
+            self.db_path = Path.cwd() / ".claude" / "popkit" / "power-mode.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.signal_dir = self.db_path.with_suffix(".signals")
+
+        self.client_id = f"client-{os.getpid()}-{id(self)}"
+        self._pubsub = None
+        self._mutex = threading.RLock()
+        self._publishes = 0
+
+        self.conn = connect(self.db_path)
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator['sqlite3.Connection']:
+        """Write transaction, taken up front so read-modify-write is atomic."""
+        with self._mutex:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _scalar(self, sql: str, *params: Any) -> Any:
+        with self._mutex:
+            row = self.conn.execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    # =========================================================================
+    # EXPIRY
+    # =========================================================================
+
+    def _expired(self, name: str) -> bool:
+        at = self._scalar("SELECT at FROM expires WHERE name = ?", name)
+        return at is not None and at <= time.time()
+
+    def _drop(self, c: 'sqlite3.Connection', name: str):
+        for table in KEYSPACE_TABLES + ("expires",):
+            c.execute(f"DELETE FROM {table} WHERE name = ?", (name,))
+
+    def _purge(self, c: 'sqlite3.Connection', name: str):
+        """Drop `name` if it has expired (inside a write transaction)."""
+        if self._expired(name):
+            self._drop(c, name)
+
+    def _exists(self, name: str) -> bool:
+        return not self._expired(name) and any(
+            self._scalar(f"SELECT 1 FROM {table} WHERE name = ? LIMIT 1", name)
+            for table in KEYSPACE_TABLES
+        )
+
+    def _list_slice(self, name: str, start: int, stop: int) -> Tuple[int, int]:
+        """Redis-style (offset, count) for a list range."""
+        length = self._scalar("SELECT COUNT(*) FROM lists WHERE name = ?", name)
+        if start < 0:
+            start = max(length + start, 0)
+        if stop < 0:
+            stop = length + stop
+        stop = min(stop, length - 1)
+        return start, max(stop - start + 1, 0)
+
+    # =========================================================================
+    # REDIS COMPATIBILITY API
+    # =========================================================================
+
+    def ping(self) -> bool:
+        """Check if the database is accessible."""
+        try:
+            return self._scalar("SELECT 1") == 1
+        except Exception:
+            return False
+
+    def publish(self, channel: str, message: str) -> int:
+        """
+        Publish a message to a channel.
+
+        Returns: Number of subscribers to the channel.
+        """
+        with self._transaction() as c:
+            c.execute(
+                "INSERT INTO messages (channel, data, timestamp) VALUES (?, ?, ?)",
+                (channel, message, datetime.now().isoformat()),
+            )
+            self._publishes += 1
+            if self._publishes % PRUNE_EVERY == 0:
+                c.execute(
+                    "DELETE FROM messages WHERE channel = ? AND id < ("
+                    " SELECT id FROM messages WHERE channel = ?"
+                    " ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (channel, channel, MESSAGE_RETENTION - 1),
+                )
+            count = c.execute(
+                "SELECT COUNT(*) FROM subscriptions WHERE channel = ?", (channel,)
+            ).fetchone()[0]
+        signal_channel(self.signal_dir, channel)
+        return count
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a value by key."""
+        if self._expired(key):
+            return None
+        return self._scalar("SELECT value FROM kv WHERE name = ?", key)
+
+    def set(self, key: str, value: str) -> bool:
+        """Set a key-value pair."""
+        with self._transaction() as c:
+            self._drop(c, key)
+            c.execute("INSERT INTO kv (name, value) VALUES (?, ?)", (key, value))
+        return True
+
+    def hset(self, name: str, key: Optional[str] = None, value: Optional[str] = None,
+             mapping: Optional[Dict[str, str]] = None) -> int:
+        """
+        Set hash field(s).
+
+        Supports both single field and mapping.
+        """
+        fields = {}
+        if key is not None and value is not None:
+            fields[key] = value
+        if mapping:
+            fields.update(mapping)
+        if fields:
+            with self._transaction() as c:
+                self._purge(c, name)
+                c.executemany(
+                    "INSERT OR REPLACE INTO hashes (name, field, value) VALUES (?, ?, ?)",
+                    [(name, k, v) for k, v in fields.items()],
+                )
+        return (1 if key is not None and value is not None else 0) + len(mapping or {})
+
+    def hget(self, name: str, key: str) -> Optional[str]:
+        """Get a hash field value."""
+        if self._expired(name):
+            return None
+        return self._scalar("SELECT value FROM hashes WHERE name = ? AND field = ?", name, key)
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        """Get all hash fields."""
+        if self._expired(name):
+            return {}
+        with self._mutex:
+            return dict(self.conn.execute(
+                "SELECT field, value FROM hashes WHERE name = ?", (name,)
+            ).fetchall())
+
+    def hdel(self, name: str, *keys: str) -> int:
+        """Delete hash fields."""
+        with self._transaction() as c:
+            self._purge(c, name)
+            return sum(
+                c.execute("DELETE FROM hashes WHERE name = ? AND field = ?", (name, k)).rowcount
+                for k in set(keys)
+            )
+
+    def lpush(self, name: str, *values: str) -> int:
+        """Push values to the head of a list."""
+        with self._transaction() as c:
+            self._purge(c, name)
+            head = c.execute("SELECT MIN(pos) FROM lists WHERE name = ?", (name,)).fetchone()[0]
+            head = 0 if head is None else head
+            # Each value becomes the new head in turn, as in Redis
+            c.executemany(
+                "INSERT INTO lists (name, pos, value) VALUES (?, ?, ?)",
+                [(name, head - i - 1, v) for i, v in enumerate(values)],
+            )
+            return c.execute("SELECT COUNT(*) FROM lists WHERE name = ?", (name,)).fetchone()[0]
+
+    def lrange(self, name: str, start: int, stop: int) -> List[str]:
+        """Get a range of elements from a list."""
+        if self._expired(name):
+            return []
+        with self._mutex:
+            offset, count = self._list_slice(name, start, stop)
+            return [row[0] for row in self.conn.execute(
+                "SELECT value FROM lists WHERE name = ? ORDER BY pos LIMIT ? OFFSET ?",
+                (name, count, offset),
+            )]
+
+    def ltrim(self, name: str, start: int, stop: int) -> bool:
+        """Trim a list to the given range."""
+        with self._transaction() as c:
+            self._purge(c, name)
+            offset, count = self._list_slice(name, start, stop)
+            c.execute(
+                "DELETE FROM lists WHERE name = ? AND pos NOT IN ("
+                " SELECT pos FROM lists WHERE name = ? ORDER BY pos LIMIT ? OFFSET ?)",
+                (name, name, count, offset),
+            )
+        return True
+
+    def sadd(self, name: str, *values: str) -> int:
+        """Add members to a set."""
+        with self._transaction() as c:
+            self._purge(c, name)
+            return sum(
+                c.execute("INSERT OR IGNORE INTO sets (name, member) VALUES (?, ?)", (name, v)).rowcount
+                for v in set(values)
+            )
+
+    def srem(self, name: str, *values: str) -> int:
+        """Remove members from a set."""
+        with self._transaction() as c:
+            self._purge(c, name)
+            return sum(
+                c.execute("DELETE FROM sets WHERE name = ? AND member = ?", (name, v)).rowcount
+                for v in set(values)
+            )
+
+    def smembers(self, name: str) -> Set[str]:
+        """Get all members of a set."""
+        if self._expired(name):
+            return set()
+        with self._mutex:
+            return {row[0] for row in self.conn.execute(
+                "SELECT member FROM sets WHERE name = ?", (name,)
+            )}
+
+    def expire(self, name: str, seconds: int) -> bool:
+        """Expire a key after `seconds`."""
+        with self._transaction() as c:
+            if not self._exists(name):
+                return False
+            c.execute(
+                "INSERT OR REPLACE INTO expires (name, at) VALUES (?, ?)",
+                (name, time.time() + seconds),
+            )
+        return True
+
+    def delete(self, *names: str) -> int:
+        """Delete keys."""
+        with self._transaction() as c:
+            count = 0
+            for name in names:
+                count += self._exists(name)
+                self._drop(c, name)
+        return count
+
+    def pubsub(self) -> 'SQLitePubSub':
+        """Get a pub/sub object."""
+        if self._pubsub is None:
+            self._pubsub = SQLitePubSub(self)
+        return self._pubsub
+
+    def stats(self) -> Dict[str, Any]:
+        """Storage statistics (mirrors file_fallback.get_stats)."""
+        size = sum(
+            p.stat().st_size for p in self.db_path.parent.glob(self.db_path.name + "*")
+            if p.is_file()
+        )
+        return {
+            "total_messages": self._scalar("SELECT COUNT(*) FROM messages"),
+            "channels": self._scalar("SELECT COUNT(DISTINCT channel) FROM messages"),
+            "subscribers": self._scalar("SELECT COUNT(DISTINCT client) FROM subscriptions"),
+            "keys": self._scalar("SELECT COUNT(*) FROM kv"),
+            "hashes": self._scalar("SELECT COUNT(DISTINCT name) FROM hashes"),
+            "lists": self._scalar("SELECT COUNT(DISTINCT name) FROM lists"),
+            "sets": self._scalar("SELECT COUNT(DISTINCT name) FROM sets"),
+            "file_size_kb": round(size / 1024, 2),
+        }
+
+    def cleanup(self, max_age_hours: int = 24) -> int:
+        """
+        Remove messages older than max_age_hours.
+
+        Returns:
+            Number of messages removed
+        """
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+        with self._transaction() as c:
+            return c.execute("DELETE FROM messages WHERE timestamp < ?", (cutoff,)).rowcount
+
+    def close(self):
+        """Close the database connection."""
+        if self._pubsub is not None:
+            self._pubsub.close()
+        self.conn.close()
+
+
+# =============================================================================
+# PUB/SUB
+# =============================================================================
+
+class SQLitePubSub:
+    """
+    Redis-style pub/sub over the messages table.
+
+    Each subscriber reads forward from its own per-channel cursor (the last
+    message id it was handed), stored as a row in the cursors table. The
+    database is only queried after a publish to a subscribed channel, or
+    while a backlog larger than FETCH_BATCH is being drained. Cursor rows
+    are written once per drained batch, not once per message.
+    """
+
+    POLL_INTERVAL = 0.1  # seconds, listen() timeout slice
+
+    def __init__(self, client: SQLitePowerMode):
+        self.client = client
+        self.client_id = client.client_id
+        self.subscribed_channels: Set[str] = set()
+        self.read_positions: Dict[str, int] = {}  # channel -> last message id seen
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._stale = False
+        self._unsaved: Set[str] = set()  # Channels whose cursor row lags read_positions
+        # Own connection: the coordinator's listener thread reads while the
+        # main thread writes through the client
+        self.conn = connect(client.db_path)
+        self._notifier = ChangeNotifier(client.signal_dir)
+
+    def _prefixes(self, channels) -> List[str]:
+        return [channel_file_stem(c) + "." for c in channels]
+
+    def subscribe(self, *channels: str):
+        """Subscribe to channels (only messages published afterwards are seen)."""
+        self._notifier.arm(self._prefixes(channels))
+        c = self.conn
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            latest = c.execute("SELECT COALESCE(MAX(id), 0) FROM messages").fetchone()[0]
+            for channel in channels:
+                c.execute(
+                    "INSERT OR IGNORE INTO subscriptions (client, channel) VALUES (?, ?)",
+                    (self.client_id, channel),
+                )
+                # An existing cursor row means we're resuming
+                c.execute(
+                    "INSERT OR IGNORE INTO cursors (client, channel, last_id) VALUES (?, ?, ?)",
+                    (self.client_id, channel, latest),
+                )
+                self.read_positions[channel] = c.execute(
+                    "SELECT last_id FROM cursors WHERE client = ? AND channel = ?",
+                    (self.client_id, channel),
+                ).fetchone()[0]
+                self.subscribed_channels.add(channel)
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+        c.execute("COMMIT")
+        # A resumed cursor may already be behind
+        self._stale = True
+
+    def unsubscribe(self, *channels: str):
+        """Unsubscribe from channels."""
+        for channel in channels:
+            self.subscribed_channels.discard(channel)
+            self.read_positions.pop(channel, None)
+            self._unsaved.discard(channel)
+            self.conn.execute(
+                "DELETE FROM subscriptions WHERE client = ? AND channel = ?", (self.client_id, channel)
+            )
+            self.conn.execute(
+                "DELETE FROM cursors WHERE client = ? AND channel = ?", (self.client_id, channel)
+            )
+        self._pending = deque(m for m in self._pending if m["channel"] not in channels)
+
+    def close(self):
+        """Save cursors, then release the connection and change notifier."""
+        self._save_cursors()
+        self._notifier.close()
+        self.conn.close()
+
+    def _save_cursors(self):
+        """Write the cursor rows of channels read since the last save."""
+        if not self._unsaved:
+            return
+        c = self.conn
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            c.executemany(
+                "UPDATE cursors SET last_id = ? WHERE client = ? AND channel = ?",
+                [(self.read_positions[ch], self.client_id, ch) for ch in self._unsaved],
+            )
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+        c.execute("COMMIT")
+        self._unsaved.clear()
+
+    def _fetch(self) -> bool:
+        """
+        Queue messages past each channel cursor, in publish order.
+
+        Returns:
+            True if a channel filled its FETCH_BATCH, so more may be waiting
+        """
+        rows = []
+        more = False
+        for channel in self.subscribed_channels:
+            batch = self.conn.execute(
+                "SELECT id, channel, data, timestamp FROM messages"
+                " WHERE channel = ? AND id > ? ORDER BY id LIMIT ?",
+                (channel, self.read_positions[channel], FETCH_BATCH),
+            ).fetchall()
+            more = more or len(batch) == FETCH_BATCH
+            rows.extend(batch)
+        for msg_id, channel, data, timestamp in sorted(rows):
+            self._pending.append({
+                "type": "message",
+                "channel": channel,
+                "data": data,
+                "timestamp": timestamp,
+                "id": msg_id,
+            })
+        return more
+
+    def get_message(self, timeout: float = 0) -> Optional[Dict]:
+        """
+        Get next message from subscribed channels.
+
+        timeout: How long to wait for messages (in seconds, 0 = forever).
+
+        Returns:
+            {"type": "message", "channel": ..., "data": ..., "timestamp": ...}
+            or None if no messages
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            if not self._pending and self._stale:
+                # Stays stale while a channel still has a full batch behind it
+                self._stale = self._fetch()
+            if self._pending:
+                msg = self._pending.popleft()
+                msg_id = msg.pop("id")
+                self.read_positions[msg["channel"]] = msg_id
+                self._unsaved.add(msg["channel"])
+                if not self._pending:
+                    self._save_cursors()
+                return msg
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            if self._notifier.wait(self._prefixes(self.subscribed_channels), remaining):
+                self._stale = True
+
+    def listen(self) -> Iterator[Dict]:
+        """Yield messages as they arrive."""
+        while True:
+            message = self.get_message(timeout=self.POLL_INTERVAL)
+            if message:
+                yield message
@@ -29,6 +29,7 @@ Part of the popkit plugin system.
 """
 
 import json
+import os
 import re
 import sys
 from datetime import datetime
@@ -36,6 +37,14 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass
 
+try:
+    from agent_state import AGENT_SHARD_DIR, SUMMARY_SUFFIX, load_agent_summaries
+    AGENT_STATE_AVAILABLE = True
+except ImportError:
+    AGENT_STATE_AVAILABLE = False
+    AGENT_SHARD_DIR = "agents"
+    SUMMARY_SUFFIX = ".summary.json"
+
 
 # ANSI color codes
 class Colors:
@@ -98,6 +107,128 @@ class WidgetConfig:
         return cls.default()
 
 
+# =============================================================================
+# RENDER CACHE
+# =============================================================================
+
+# The status line is a new process on every refresh, so the cache lives on disk
+RENDER_CACHE_PATH = Path.home() / ".claude" / "popkit" / "statusline-cache.json"
+RENDER_CACHE_VERSION = 1
+
+
+def source_stamp(paths: List[Path]) -> List[List[Any]]:
+    """[path, mtime_ns, size] per source file (None fields if missing)."""
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamp.append([str(path), st.st_mtime_ns, st.st_size])
+        except OSError:
+            stamp.append([str(path), None, None])
+    return stamp
+
+
+class RenderCache:
+    """
+    Last output per widget keyed by the mtimes of the files it reads, plus
+    the git root of each working directory.
+
+    A widget whose sources are unchanged returns its last string without
+    loading or parsing anything, and git runs once per directory instead
+    of on every refresh.
+    """
+
+    def __init__(self, path: Optional[Path] = None, enabled: bool = True):
+        """
+        Args:
+            path: Cache file (None keeps the cache in memory)
+            enabled: False renders and resolves everything every time
+        """
+        self.path = path
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._git_roots: Dict[str, Optional[str]] = {}
+        self._widgets: Dict[str, Dict[str, Any]] = {}
+
+        if enabled and path is not None:
+            try:
+                data = json.loads(Path(path).read_text(encoding="utf-8"))
+                if data.get("version") == RENDER_CACHE_VERSION:
+                    self._git_roots = data["git_roots"]
+                    self._widgets = data["widgets"]
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+
+    def git_root(self, cwd: Path) -> Optional[Path]:
+        """Git root for `cwd`, running git only when the cached answer is stale."""
+        if not self.enabled:
+            return resolve_git_root()
+
+        key = str(cwd)
+        if key in self._git_roots:
+            root = self._git_roots[key]
+            if root is not None and (Path(root) / ".git").exists():
+                return Path(root)
+            if root is None and not any((p / ".git").exists() for p in [cwd, *cwd.parents]):
+                return None
+
+        root = resolve_git_root()
+        self._git_roots[key] = str(root) if root else None
+        self._dirty = True
+        return root
+
+    def render(self, key: str, sources: List[Path], render: Callable[[], str]) -> str:
+        """
+        Cached output for `key`, re-rendered when any source file changed.
+
+        Args:
+            key: Cache entry (widget, mode and project)
+            sources: Files (or directories) the output is derived from
+            render: Produces the output on a miss
+        """
+        if not self.enabled:
+            return render()
+
+        stamp = source_stamp(sources)
+        entry = self._widgets.get(key)
+        if entry and entry.get("stamp") == stamp:
+            self.hits += 1
+            return entry["output"]
+
+        self.misses += 1
+        output = render()
+        self._widgets[key] = {"stamp": stamp, "output": output}
+        self._dirty = True
+        return output
+
+    def save(self):
+        """Persist the cache if anything changed (write-then-rename)."""
+        if not self._dirty or self.path is None:
+            return
+        data = {"version": RENDER_CACHE_VERSION, "git_roots": self._git_roots, "widgets": self._widgets}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Cache is an optimization only
+        self._dirty = False
+
+
+_render_cache: Optional[RenderCache] = None
+
+
+def get_render_cache() -> RenderCache:
+    """This process's render cache, loaded from RENDER_CACHE_PATH."""
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache(RENDER_CACHE_PATH)
+    return _render_cache
+
+
 # =============================================================================
 # DATA LOADERS
 # =============================================================================
@@ -105,6 +236,17 @@ class WidgetConfig:
 def get_git_root() -> Optional[Path]:
     """Get the git repository root directory (Issue #66).
 
+    Resolved once per working directory and remembered in the render cache.
+
+    Returns:
+        Path to git root, or None if not in a git repo.
+    """
+    return get_render_cache().git_root(Path.cwd())
+
+
+def resolve_git_root() -> Optional[Path]:
+    """Ask git for the repository root of the current directory.
+
     Returns:
         Path to git root, or None if not in a git repo.
     """
@@ -183,6 +325,20 @@ def load_power_mode_state() -> Dict[str, Any]:
         return {"active": False}
 
 
+def load_agent_activity(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Load this Power Mode session's per-agent summaries.
+
+    Agents write small summary files beside the state file instead of
+    merging into it, so this reads a few tiny files, not the agents' state.
+
+    Returns:
+        Summaries keyed by agent ID (empty if none)
+    """
+    if not AGENT_STATE_AVAILABLE:
+        return {}
+    return load_agent_summaries(get_state_file_path().parent, since=state.get("activated_at"))
+
+
 def load_efficiency_metrics() -> Optional[Dict[str, Any]]:
     """Load efficiency metrics from file (Issue #66 - bug fix).
 
@@ -501,12 +657,13 @@ def widget_power_mode(compact: bool = True) -> str:
     percent = int(progress * 100)
 
     # Agent count
+    activity = load_agent_activity(state) if not compact else {}
     agents = state.get("config", {}).get("agents", [])
-    agent_count = len(agents) if agents else 0
+    agent_count = len(agents) if agents else len(activity)
 
     # Insights
-    insights_shared = state.get("insights_shared", 0)
-    insights_received = state.get("insights_received", 0)
+    insights_shared = sum(a.get("insights_shared", 0) for a in activity.values())
+    insights_received = sum(a.get("insights_received", 0) for a in activity.values())
 
     parts = []
 
@@ -660,11 +817,55 @@ WIDGETS: Dict[str, Callable[[bool], str]] = {
 }
 
 
+def _popkit_files(name: str) -> List[Path]:
+    """Project-local and home candidates for a .claude/popkit file."""
+    return [
+        get_project_root() / ".claude" / "popkit" / name,
+        Path.home() / ".claude" / "popkit" / name,
+    ]
+
+
+def _power_mode_sources() -> List[Path]:
+    """State file candidates plus every agent summary.
+
+    Only the summaries are stamped: agents rewrite their full shards in the
+    same directory on every tool call, which must not invalidate the cache.
+    """
+    shard_dir = get_state_file_path().parent / AGENT_SHARD_DIR
+    try:
+        summaries = sorted(shard_dir.glob(f"*{SUMMARY_SUFFIX}"))
+    except OSError:
+        summaries = []
+    return _popkit_files("power-mode-state.json") + summaries
+
+
+# Files each widget reads; its cached output is reused while they're unchanged.
+# Widgets missing here are rendered every time.
+WIDGET_SOURCES: Dict[str, Callable[[], List[Path]]] = {
+    "popkit": lambda: [],
+    "efficiency": lambda: _popkit_files("efficiency-metrics.json"),
+    "power_mode": _power_mode_sources,
+    "batch_status": lambda: _popkit_files("power-mode-state.json"),
+    "workflow": lambda: [get_project_root() / ".claude" / "STATUS.json"],
+    "health": lambda: _popkit_files("health-state.json"),
+}
+
+
+def _cached_render(name: str, compact: bool, sources: Callable[[], List[Path]],
+                   render: Callable[[], str]) -> str:
+    """Render through the cache, keyed by widget, mode and project."""
+    key = f"{get_project_root()}|{name}|{int(compact)}"
+    return get_render_cache().render(key, sources(), render)
+
+
 def get_widget_output(widget_name: str, compact: bool = True) -> str:
-    """Get output for a single widget."""
-    if widget_name in WIDGETS:
-        return WIDGETS[widget_name](compact)
-    return ""
+    """Get output for a single widget (cached while its sources are unchanged)."""
+    if widget_name not in WIDGETS:
+        return ""
+    widget = WIDGETS[widget_name]
+    if widget_name not in WIDGET_SOURCES:
+        return widget(compact)
+    return _cached_render(widget_name, compact, WIDGET_SOURCES[widget_name], lambda: widget(compact))
 
 
 def format_widget_status_line(config: Optional[WidgetConfig] = None) -> str:
@@ -687,14 +888,19 @@ def format_widget_status_line(config: Optional[WidgetConfig] = None) -> str:
             outputs.append(output)
 
     if not outputs:
+        get_render_cache().save()
         return ""
 
     # Add hints if configured
     if config.show_hints:
-        state = load_power_mode_state()
-        if state.get("active"):
-            outputs.append(f"{Colors.DIM}(/stats | /power stop){Colors.RESET}")
-
+        hint = _cached_render("hints", True, _power_mode_sources, lambda: (
+            f"{Colors.DIM}(/stats | /power stop){Colors.RESET}"
+            if load_power_mode_state().get("active") else ""
+        ))
+        if hint:
+            outputs.append(hint)
+
+    get_render_cache().save()
     return config.separator.join(outputs)
 
 
@@ -1212,6 +1418,7 @@ def main():
             # Single widget output
             compact = "--full" not in sys.argv
             output = get_widget_output(arg, compact=compact)
+            get_render_cache().save()
             if output:
                 print(output)
 
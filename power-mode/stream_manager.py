@@ -5,6 +5,17 @@ Stream Session Manager for Power Mode
 Tracks active streaming sessions, buffers chunks, and coordinates
 with the status line display.
 
+Each session keeps its most recent chunks in memory and appends older ones
+to a per-session JSONL spill file, so long agent outputs don't grow memory
+without bound. Length and count are running counters; iter_content()
+streams the full output without building one string.
+
+With a journal_dir, save_state() also persists the sessions themselves as a
+delta journal: only session starts, chunks and transitions since the last
+save are appended, and a full snapshot (which truncates the journal) is
+written every snapshot_every records. load_state() replays snapshot plus
+journal.
+
 Part of PopKit Issue #23 (Fine-grained Streaming).
 """
 
@@ -13,8 +24,9 @@ import sys
 import json
 import uuid
 import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Callable, Any
+from typing import Deque, Dict, Iterator, List, Optional, Callable, Any
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
@@ -26,9 +38,18 @@ from protocol import Message, MessageType, StreamChunk
 # CONFIGURATION
 # =============================================================================
 
-# Maximum chunks to keep per session
+# Chunks kept in memory per session; older chunks spill to disk
 MAX_CHUNKS_PER_SESSION = 1000
 
+# Per-session spill files (<session_id>.jsonl)
+SPILL_DIR = Path(".claude/popkit/streams")
+
+# Delta persistence: journal records between full snapshots
+SNAPSHOT_EVERY_RECORDS = 2000
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+SNAPSHOT_VERSION = 1
+
 # Session cleanup after completion (seconds)
 SESSION_CLEANUP_DELAY = 300
 
@@ -46,31 +67,90 @@ class StreamSession:
     """
     Active streaming session from an agent.
 
-    Tracks all chunks received and provides aggregation methods.
+    Holds the last max_memory_chunks chunks in `chunks`; earlier chunks are
+    appended to spill_path. Use iter_chunks()/iter_content() to read the
+    whole stream in order.
     """
     session_id: str
     agent_id: str
     tool_name: Optional[str] = None
     started_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    chunks: List[StreamChunk] = field(default_factory=list)
+    chunks: Deque[StreamChunk] = field(default_factory=deque)
     is_complete: bool = False
     error: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    max_memory_chunks: int = MAX_CHUNKS_PER_SESSION
+    spill_path: Optional[Path] = None
+    _chunk_count: int = field(default=0, init=False, repr=False)
+    _content_length: int = field(default=0, init=False, repr=False)
+    _spilled: int = field(default=0, init=False, repr=False)
+    _spill_disabled: bool = field(default=False, init=False, repr=False)
+    _spill_file: Any = field(default=None, init=False, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def append(self, chunk: StreamChunk) -> None:
+        """Add a chunk, spilling the oldest in-memory chunk if the buffer is full."""
+        with self._lock:
+            if (self.spill_path is not None and not self._spill_disabled
+                    and len(self.chunks) >= self.max_memory_chunks):
+                self._spill(self.chunks[0])
+            self.chunks.append(chunk)
+            self._chunk_count += 1
+            self._content_length += len(chunk.content)
+
+    def _spill(self, chunk: StreamChunk) -> None:
+        """Move the oldest chunk to the spill file (kept in memory if that fails)."""
+        try:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+            self._spill_file.write(json.dumps(chunk.to_dict()) + "\n")
+        except OSError:
+            # Unwritable; keep later chunks in memory. The path stays set so
+            # chunks already spilled can still be read and deleted.
+            self._spill_disabled = True
+            return
+        self.chunks.popleft()
+        self._spilled += 1
 
     @property
     def chunk_count(self) -> int:
         """Get number of chunks received."""
-        return len(self.chunks)
+        return self._chunk_count
+
+    @property
+    def spilled_chunks(self) -> int:
+        """Number of chunks moved to the spill file."""
+        return self._spilled
+
+    def iter_chunks(self) -> Iterator[StreamChunk]:
+        """Yield every chunk in arrival order, reading spilled ones from disk."""
+        with self._lock:
+            spilled = self._spilled
+            recent = list(self.chunks)
+            if self._spill_file is not None:
+                self._spill_file.flush()
+
+        if spilled:
+            with open(self.spill_path, "r", encoding="utf-8") as f:
+                for _, line in zip(range(spilled), f):
+                    yield StreamChunk.from_dict(json.loads(line))
+        yield from recent
+
+    def iter_content(self) -> Iterator[str]:
+        """Yield the content of every chunk in order, without concatenating."""
+        for chunk in self.iter_chunks():
+            yield chunk.content
 
     @property
     def total_content(self) -> str:
-        """Get concatenated content from all chunks."""
-        return "".join(chunk.content for chunk in self.chunks)
+        """Get concatenated content from all chunks (prefer iter_content for long streams)."""
+        return "".join(self.iter_content())
 
     @property
     def content_length(self) -> int:
         """Get total content length."""
-        return sum(len(chunk.content) for chunk in self.chunks)
+        return self._content_length
 
     @property
     def last_chunk_at(self) -> Optional[str]:
@@ -89,6 +169,22 @@ class StreamSession:
             end = datetime.now()
         return (end - start).total_seconds()
 
+    def close(self) -> None:
+        """Close the spill file (it stays readable)."""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def discard(self) -> None:
+        """Close and delete the spill file."""
+        self.close()
+        if self._spilled and self.spill_path is not None:
+            try:
+                self.spill_path.unlink()
+            except OSError:
+                pass
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary (without full chunk data)."""
         return {
@@ -130,7 +226,7 @@ class StreamManager:
 
     Features:
     - Track sessions by ID and agent
-    - Buffer chunks with size limits
+    - Bounded in-memory chunk buffers that spill to disk
     - Callbacks for real-time processing
     - Statistics for status line
     - Thread-safe operations
@@ -140,7 +236,10 @@ class StreamManager:
         self,
         on_chunk: Optional[Callable[[StreamChunk], None]] = None,
         on_session_complete: Optional[Callable[[StreamSession], None]] = None,
-        max_chunks: int = MAX_CHUNKS_PER_SESSION
+        max_chunks: int = MAX_CHUNKS_PER_SESSION,
+        spill_dir: Optional[Path] = SPILL_DIR,
+        journal_dir: Optional[Path] = None,
+        snapshot_every: int = SNAPSHOT_EVERY_RECORDS
     ):
         """
         Initialize stream manager.
@@ -148,13 +247,27 @@ class StreamManager:
         Args:
             on_chunk: Callback for each chunk received
             on_session_complete: Callback when session completes
-            max_chunks: Maximum chunks to keep per session
+            max_chunks: Maximum chunks to keep in memory per session
+            spill_dir: Directory for per-session spill files (None keeps
+                every chunk in memory)
+            journal_dir: Directory for the session journal and snapshot
+                (None persists only the status summary)
+            snapshot_every: Journal records between full snapshots
         """
         self._sessions: Dict[str, StreamSession] = {}
         self._lock = threading.RLock()
         self._on_chunk = on_chunk
         self._on_session_complete = on_session_complete
         self._max_chunks = max_chunks
+        self._spill_dir = Path(spill_dir) if spill_dir is not None else None
+
+        # Delta persistence
+        self._journal_dir = Path(journal_dir) if journal_dir is not None else None
+        self._snapshot_every = max(1, snapshot_every)
+        self._pending: List[Dict[str, Any]] = []
+        self._seq = 0
+        self._journal_records = 0
+        self.persisted_bytes = 0
 
     # =========================================================================
     # SESSION LIFECYCLE
@@ -180,15 +293,24 @@ class StreamManager:
         session_id = str(uuid.uuid4())[:8]
 
         with self._lock:
-            self._sessions[session_id] = StreamSession(
-                session_id=session_id,
-                agent_id=agent_id,
-                tool_name=tool_name,
-                metadata=metadata or {}
-            )
+            session = self._new_session(session_id, agent_id, tool_name, metadata=metadata or {})
+            self._sessions[session_id] = session
+            self._record("start", session=self._session_header(session))
 
         return session_id
 
+    def _new_session(self, session_id: str, agent_id: str, tool_name: Optional[str],
+                     **fields: Any) -> StreamSession:
+        """Create a session wired to this manager's buffer and spill settings."""
+        return StreamSession(
+            session_id=session_id,
+            agent_id=agent_id,
+            tool_name=tool_name,
+            max_memory_chunks=self._max_chunks,
+            spill_path=self._spill_dir / f"{session_id}.jsonl" if self._spill_dir else None,
+            **fields
+        )
+
     def add_chunk(self, chunk: StreamChunk) -> bool:
         """
         Add a chunk to a session.
@@ -204,13 +326,13 @@ class StreamManager:
             if not session:
                 return False
 
-            # Enforce chunk limit
-            if len(session.chunks) < self._max_chunks:
-                session.chunks.append(chunk)
+            session.append(chunk)
+            self._record("chunk", chunk=chunk.to_dict())
 
             # Mark complete if final chunk
             if chunk.is_final:
                 session.is_complete = True
+                session.close()
 
         # Notify callback
         if self._on_chunk:
@@ -248,6 +370,8 @@ class StreamManager:
             if session:
                 session.is_complete = True
                 session.error = error
+                session.close()
+                self._record("end", session_id=session_id, error=error)
 
                 # Notify callback
                 if self._on_session_complete:
@@ -343,7 +467,8 @@ class StreamManager:
                         to_remove.append(session_id)
 
             for session_id in to_remove:
-                del self._sessions[session_id]
+                self._sessions.pop(session_id).discard()
+                self._record("remove", session_id=session_id)
                 removed += 1
 
         return removed
@@ -352,6 +477,9 @@ class StreamManager:
         """Clear all sessions."""
         with self._lock:
             count = len(self._sessions)
+            for session_id, session in self._sessions.items():
+                session.discard()
+                self._record("remove", session_id=session_id)
             self._sessions.clear()
             return count
 
@@ -369,6 +497,9 @@ class StreamManager:
         """
         state_file = state_file or STATE_FILE
 
+        if self._journal_dir is not None:
+            self._persist_sessions()
+
         # Ensure directory exists
         state_file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -397,12 +528,19 @@ class StreamManager:
         """
         Load streaming state from file.
 
+        With a journal_dir, sessions are first restored by replaying the
+        snapshot and journal, and the summary reflects them.
+
         Args:
             state_file: Path to state file
 
         Returns:
             Streaming state dictionary
         """
+        if self._journal_dir is not None:
+            self._replay_sessions()
+            return self.get_status_summary()
+
         state_file = state_file or STATE_FILE
 
         if state_file.exists():
@@ -416,6 +554,151 @@ class StreamManager:
         return {}
 
 
+    # =========================================================================
+    # DELTA PERSISTENCE
+    # =========================================================================
+
+    @staticmethod
+    def _session_header(session: StreamSession) -> Dict[str, Any]:
+        """Session fields other than its chunks."""
+        return {
+            "session_id": session.session_id,
+            "agent_id": session.agent_id,
+            "tool_name": session.tool_name,
+            "started_at": session.started_at,
+            "is_complete": session.is_complete,
+            "error": session.error,
+            "metadata": session.metadata,
+        }
+
+    def _record(self, op: str, **fields: Any) -> None:
+        """Queue a journal record for the next save (caller holds the lock)."""
+        if self._journal_dir is None:
+            return
+        self._seq += 1
+        self._pending.append({"seq": self._seq, "op": op, **fields})
+
+    def _persist_sessions(self) -> None:
+        """Append pending records to the journal, snapshotting when it is long enough."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            self._journal_dir.mkdir(parents=True, exist_ok=True)
+            if self._journal_records + len(pending) >= self._snapshot_every:
+                self._write_snapshot()
+                return
+
+            data = "".join(json.dumps(record) + "\n" for record in pending)
+            with open(self._journal_dir / JOURNAL_FILE, "a", encoding="utf-8") as f:
+                f.write(data)
+            self._journal_records += len(pending)
+            self.persisted_bytes += len(data.encode("utf-8"))
+
+    def _write_snapshot(self) -> None:
+        """Write every session in full and truncate the journal (caller holds the lock)."""
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "seq": self._seq,
+            "sessions": [
+                {**self._session_header(session),
+                 "chunks": [chunk.to_dict() for chunk in session.iter_chunks()]}
+                for session in self._sessions.values()
+            ],
+        }
+        data = json.dumps(snapshot)
+        path = self._journal_dir / SNAPSHOT_FILE
+        tmp_path = path.with_name(f"{SNAPSHOT_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        # Records up to seq are now in the snapshot; replay skips any left behind
+        open(self._journal_dir / JOURNAL_FILE, "w").close()
+        self._journal_records = 0
+        self.persisted_bytes += len(data.encode("utf-8"))
+
+    def _replay_sessions(self) -> None:
+        """Rebuild sessions from the snapshot and the journal records after it."""
+        snapshot: Dict[str, Any] = {}
+        try:
+            with open(self._journal_dir / SNAPSHOT_FILE, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if snapshot.get("version", SNAPSHOT_VERSION) != SNAPSHOT_VERSION:
+            snapshot = {}
+
+        records: List[Dict[str, Any]] = []
+        try:
+            with open(self._journal_dir / JOURNAL_FILE, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break  # Torn final write
+        except OSError:
+            pass
+
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._pending = []
+
+            for entry in snapshot.get("sessions", []):
+                chunks = entry.pop("chunks", [])
+                session = self._restore_session(entry)
+                for chunk in chunks:
+                    session.append(StreamChunk.from_dict(chunk))
+
+            seq = snapshot.get("seq", 0)
+            for record in records:
+                if record.get("seq", 0) <= seq:
+                    continue
+                seq = record["seq"]
+                op = record.get("op")
+                if op == "start":
+                    self._restore_session(record["session"])
+                elif op == "chunk":
+                    session = self._sessions.get(record["chunk"]["session_id"])
+                    if session:
+                        chunk = StreamChunk.from_dict(record["chunk"])
+                        session.append(chunk)
+                        session.is_complete = session.is_complete or chunk.is_final
+                elif op == "end":
+                    session = self._sessions.get(record["session_id"])
+                    if session:
+                        session.is_complete = True
+                        session.error = record.get("error")
+                elif op == "remove":
+                    session = self._sessions.pop(record["session_id"], None)
+                    if session:
+                        session.discard()
+
+            for session in self._sessions.values():
+                if session.is_complete:
+                    session.close()
+            self._seq = seq
+            self._journal_records = len(records)
+
+    def _restore_session(self, header: Dict[str, Any]) -> StreamSession:
+        """Recreate a session from its header, replacing any stale spill file."""
+        session = self._new_session(
+            header["session_id"], header["agent_id"], header.get("tool_name"),
+            started_at=header.get("started_at") or datetime.now().isoformat(),
+            is_complete=header.get("is_complete", False),
+            error=header.get("error"),
+            metadata=header.get("metadata") or {}
+        )
+        if session.spill_path is not None:
+            try:
+                session.spill_path.unlink()
+            except OSError:
+                pass
+        self._sessions[session.session_id] = session
+        return session
+
+
 # =============================================================================
 # MODULE-LEVEL FUNCTIONS
 # =============================================================================
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for durable agent inboxes: the coordinator appends direct messages to
+per-agent streams and check-ins read them from a persisted cursor.
+
+Run: python -m pytest power-mode/test_agent_inbox.py -q
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from coordinator import PowerModeCoordinator
+from protocol import Channels, Message, MessageType
+from upstash_adapter import UpstashRedisClient
+from upstash_standin import UpstashStandIn
+
+spec = importlib.util.spec_from_file_location("checkin_hook", Path(__file__).parent / "checkin-hook.py")
+checkin_hook = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(checkin_hook)
+
+
+@pytest.fixture
+def server():
+    with UpstashStandIn() as standin:
+        yield standin
+
+
+@pytest.fixture
+def coordinator(server):
+    coordinator = PowerModeCoordinator()
+    coordinator.redis = UpstashRedisClient(url=server.url, token=server.token)
+    coordinator._writes = coordinator._create_write_batcher()
+    return coordinator
+
+
+def agent_client(server):
+    client = checkin_hook.PowerModeRedisClient()
+    client.redis = UpstashRedisClient(url=server.url, token=server.token)
+    client.connected = True
+    return client
+
+
+def send(coordinator, agent_id, n):
+    coordinator._send_to_agent(agent_id, Message(
+        id=f"m{n}", type=MessageType.COURSE_CORRECT, from_agent="coordinator",
+        to_agent=agent_id, payload={"n": n}
+    ))
+    coordinator._flush_writes()
+
+
+def test_messages_wait_in_inbox_between_check_ins(server, coordinator):
+    # Sent before the agent's first check-in
+    send(coordinator, "agent-1", 0)
+    send(coordinator, "agent-2", 1)
+    assert coordinator.redis.ttl(Channels.inbox_key("agent-1")) > 0
+
+    client = agent_client(server)
+    server.reset_counts()
+    messages, cursor = client.read_inbox("agent-1")
+    assert [m["payload"]["n"] for m in messages] == [0]
+    assert server.round_trips == 1
+
+    # Sent between check-ins with no subscriber listening
+    send(coordinator, "agent-1", 2)
+    send(coordinator, "agent-1", 3)
+    messages, cursor = agent_client(server).read_inbox("agent-1", cursor)
+    assert [m["payload"]["n"] for m in messages] == [2, 3]
+
+    assert agent_client(server).read_inbox("agent-1", cursor) == ([], cursor)
+    assert [m["id"] for m in client.check_for_messages("agent-2")] == ["m1"]
+    assert client.check_for_messages("agent-2") == []
+
+
+def test_cursor_persists_in_agent_state(server, coordinator, tmp_path, monkeypatch):
+    monkeypatch.setattr(checkin_hook, "get_project_root", lambda: tmp_path)
+    monkeypatch.setattr(checkin_hook.AgentStateTracker, "HOME_STATE_FILE", tmp_path / "state.json")
+
+    send(coordinator, "agent-1", 0)
+    tracker = checkin_hook.AgentStateTracker("agent-1", "writer", "session-1")
+    messages, cursor = agent_client(server).read_inbox("agent-1", tracker.state["inbox_cursor"])
+    tracker.record_inbox_cursor(cursor)
+    assert len(messages) == 1
+
+    send(coordinator, "agent-1", 1)
+    tracker = checkin_hook.AgentStateTracker("agent-1", "writer", "session-1")
+    assert tracker.state["inbox_cursor"] == cursor
+    messages, _ = agent_client(server).read_inbox("agent-1", tracker.state["inbox_cursor"])
+    assert [m["payload"]["n"] for m in messages] == [1]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for per-agent state shards (agent_state.py) and the check-in hook's
+AgentStateTracker.
+
+Run: python -m pytest power-mode/test_agent_state.py -q
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import statusline
+from agent_state import RING_LIMITS, load_agent_summaries, shard_paths
+
+spec = importlib.util.spec_from_file_location("checkin_hook", Path(__file__).parent / "checkin-hook.py")
+checkin_hook = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(checkin_hook)
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    state_file = tmp_path / "power-mode-state.json"
+    state_file.write_text(json.dumps({"active": True, "progress": 0.25, "activated_at": "2000-01-01"}))
+    monkeypatch.setattr(checkin_hook, "get_project_root", lambda: tmp_path)
+    monkeypatch.setattr(checkin_hook.AgentStateTracker, "HOME_STATE_FILE", state_file)
+    return state_file
+
+
+def test_agents_write_their_own_shards(state_file):
+    shared = state_file.read_bytes()
+    a = checkin_hook.AgentStateTracker("agent-a", "writer", "s1")
+    b = checkin_hook.AgentStateTracker("agent-b", "tester", "s1")
+
+    for i in range(120):
+        a.record_tool_use("Edit", {"file_path": f"src/{i}.py"}, "ok")
+        b.record_tool_use("Read", {"file_path": "README.md"}, "ok")
+    a.record_insight_shared("i1")
+    a.record_insight_shared("i1")
+    b.update_progress(0.5)
+
+    # The shared Power Mode file is never rewritten
+    assert state_file.read_bytes() == shared
+    assert sorted(p.name for p in (state_file.parent / "agents").iterdir()) == [
+        "agent-a.json", "agent-a.summary.json", "agent-b.json", "agent-b.summary.json"
+    ]
+
+    # List fields are bounded ring buffers of the newest entries
+    shard = json.loads(shard_paths(state_file.parent, "agent-a")[0].read_text())
+    assert shard["tool_call_count"] == 120
+    assert len(shard["files_touched"]) == RING_LIMITS["files_touched"]
+    assert shard["files_touched"][-1] == "src/119.py"
+
+    summaries = load_agent_summaries(state_file.parent)
+    assert summaries["agent-a"]["insights_shared"] == 1
+    assert summaries["agent-b"]["progress"] == 0.5
+
+
+def test_tracker_resumes_same_session_only(state_file):
+    tracker = checkin_hook.AgentStateTracker("agent-a", "writer", "s1")
+    tracker.record_tool_use("Edit", {"file_path": "a.py"}, "ok")
+    tracker.record_inbox_cursor("5-0")
+
+    resumed = checkin_hook.AgentStateTracker("agent-a", "writer", "s1")
+    assert resumed.state["tool_call_count"] == 1
+    assert resumed.state["files_touched"] == ["a.py"]
+    assert resumed.state["inbox_cursor"] == "5-0"
+
+    fresh = checkin_hook.AgentStateTracker("agent-a", "writer", "s2")
+    assert fresh.state["tool_call_count"] == 0
+
+
+def test_statusline_sums_agent_summaries(state_file, monkeypatch):
+    for agent in ("agent-a", "agent-b"):
+        tracker = checkin_hook.AgentStateTracker(agent, "writer", "s1")
+        tracker.record_insight_shared(f"{agent}-1")
+        tracker.record_insight_received("x")
+
+    monkeypatch.setattr(statusline, "get_state_file_path", lambda: state_file)
+    output = statusline.widget_power_mode(compact=False)
+    assert "Agents:2" in output
+    assert "2↑2↓" in output
+    assert "25%" in output  # Phase progress is no longer overwritten by agents
+
+    # Summaries from before the session was activated are ignored
+    state_file.write_text(json.dumps({"active": True, "activated_at": "9999-01-01"}))
+    assert "Agents" not in statusline.widget_power_mode(compact=False)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio coordinator (async_coordinator.py) on the SQLite backend.
+
+Run: python -m pytest power-mode/test_async_coordinator.py -q
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from async_coordinator import AsyncPowerModeCoordinator
+from async_support import AsyncQueue
+from file_fallback import create_file_client
+from protocol import Channels, Message, MessageType
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.02)
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    coordinator = AsyncPowerModeCoordinator(inbox_size=4)
+    coordinator.use_cloud_workflows = False
+    coordinator.metrics_collector = None
+    coordinator.redis = create_file_client("sqlite", str(tmp_path / "power-mode.db"))
+    return coordinator
+
+
+def test_handles_agent_messages_and_expires_barriers_on_one_loop(tmp_path, coordinator):
+    agents = create_file_client("sqlite", str(tmp_path / "power-mode.db"))
+    watcher = agents.pubsub()
+    watcher.subscribe(Channels.broadcast())
+
+    async def scenario():
+        runner = asyncio.create_task(coordinator.run())
+        await wait_for(lambda: coordinator._loop is not None)
+
+        identities = [coordinator.register_agent(f"agent-{i}") for i in range(12)]
+        for n in range(3):
+            for identity in identities:
+                agents.publish(Channels.heartbeat(), Message(
+                    id=f"hb-{identity.id}-{n}", type=MessageType.HEARTBEAT,
+                    from_agent=identity.id, to_agent="coordinator", payload={"beat": n}
+                ).to_json())
+        # More messages than the inbox holds: the reader waits for the handlers
+        await wait_for(lambda: coordinator.messages_handled == 36)
+        assert json.loads(coordinator.redis.hget(Channels.state_key(identities[0].id), "beat")) == 2
+
+        barrier_id = coordinator.create_sync_barrier("phase", [i.id for i in identities])
+        coordinator.sync_manager.barriers[barrier_id].timeout_seconds = 0.2
+        await wait_for(lambda: barrier_id not in coordinator.sync_manager.barriers, timeout=2)
+
+        coordinator.stop()
+        assert await runner is True
+        return barrier_id
+
+    barrier_id = asyncio.run(scenario())
+
+    assert not coordinator.is_running
+    assert not coordinator._listener_thread.is_alive()
+    expired = []
+    while True:
+        message = watcher.get_message(timeout=0.1)
+        if message is None:
+            break
+        payload = json.loads(message["data"])["payload"]
+        if payload.get("status") == "expired":
+            expired.append(payload["barrier_id"])
+    assert expired == [barrier_id]
+
+
+def test_handlers_and_monitor_run_off_the_loop(tmp_path, coordinator, monkeypatch):
+    monkeypatch.setattr(AsyncPowerModeCoordinator, "heartbeat_seconds", 0.05)
+    agents = create_file_client("sqlite", str(tmp_path / "power-mode.db"))
+    threads = {}
+
+    def record(name, func):
+        def wrapper(*args):
+            threads.setdefault(name, threading.get_ident())
+            return func(*args)
+        monkeypatch.setattr(coordinator, name, wrapper)
+
+    for name in ("_handle_message", "_check_agent_health", "_cleanup_expired_barriers"):
+        record(name, getattr(coordinator, name))
+
+    async def scenario():
+        runner = asyncio.create_task(coordinator.run())
+        await wait_for(lambda: coordinator._loop is not None)
+        loop_thread = threading.get_ident()
+
+        identity = coordinator.register_agent("agent-0")
+        agents.publish(Channels.heartbeat(), Message(
+            id="hb-0", type=MessageType.HEARTBEAT, from_agent=identity.id,
+            to_agent="coordinator", payload={}
+        ).to_json())
+        await wait_for(lambda: len(threads) == 3)
+
+        coordinator.stop()
+        assert await runner is True
+        return loop_thread
+
+    loop_thread = asyncio.run(scenario())
+    assert loop_thread not in threads.values()
+
+
+def test_async_queue_backpressure_and_wakeup():
+    inbox = AsyncQueue(maxsize=1)
+
+    def produce():
+        inbox.put("a")
+        inbox.put("b", timeout=2)  # Blocks until "a" is taken
+        time.sleep(0.1)
+        inbox.put("c")  # Wakes the waiting consumer
+
+    async def consume():
+        await asyncio.sleep(0.05)
+        assert inbox.qsize() == 1
+        items = [await inbox.get(), await inbox.get()]
+        with pytest.raises(asyncio.TimeoutError):
+            await inbox.get(timeout=0.01)
+        items.append(await inbox.get(timeout=2))
+        return items
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    assert asyncio.run(consume()) == ["a", "b", "c"]
+    producer.join()
+
+    inbox.close()
+    with pytest.raises(StopAsyncIteration):
+        asyncio.run(inbox.get())
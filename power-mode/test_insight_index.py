@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the tag-indexed insight store: checkin-hook's Redis client against
+the Upstash stand-in, and the coordinator's InsightPool.
+
+Run: python -m pytest power-mode/test_insight_index.py -q
+"""
+
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from coordinator import InsightPool
+from protocol import Insight, InsightType
+from upstash_adapter import UpstashRedisClient
+from upstash_standin import UpstashStandIn
+
+spec = importlib.util.spec_from_file_location("checkin_hook", Path(__file__).parent / "checkin-hook.py")
+checkin_hook = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(checkin_hook)
+
+
+@pytest.fixture
+def server():
+    with UpstashStandIn() as standin:
+        yield standin
+
+
+@pytest.fixture
+def client(server):
+    client = checkin_hook.PowerModeRedisClient()
+    client.redis = UpstashRedisClient(url=server.url, token=server.token)
+    client.connected = True
+    return client
+
+
+def insight(n, agent, *tags):
+    return {"id": f"{n:08x}", "content": f"insight {n}", "from_agent": agent,
+            "relevance_tags": list(tags)}
+
+
+def test_pull_reads_only_candidate_bodies(server, client):
+    client.push_insight(insight(1, "agent-a", "auth", "api"))
+    client.push_insight(insight(2, "agent-b", "auth"))
+    client.push_insight(insight(3, "agent-b", "db"))
+    client.push_insight(insight(4, "agent-a", "api", "db"))
+    for n in range(5, 300):
+        client.push_insight(insight(n, "agent-c", "css"))
+
+    server.reset_counts()
+    pulled = client.pull_insights(["auth", "api", "missing"], exclude_agent="agent-b", limit=3)
+
+    # Newest first, deduplicated across tags, own insights skipped
+    assert [i["id"] for i in pulled] == [f"{4:08x}", f"{1:08x}"]
+    assert server.requests == ["/pipeline", "/"]
+    # Retention is no longer capped at 100
+    assert len(server.state.hashes[checkin_hook.INSIGHT_BODIES_KEY]) == 299
+
+    assert client.pull_insights(["auth"], exclude_agent="agent-x", limit=1)[0]["id"] == f"{2:08x}"
+    assert client.pull_insights([], exclude_agent="agent-x") == []
+
+
+def test_expired_insights_are_skipped_and_pruned(server, client, monkeypatch):
+    client.push_insight(insight(1, "agent-a", "auth"))
+    later = time.time() + checkin_hook.INSIGHT_TTL_SECONDS + 1
+    monkeypatch.setattr(checkin_hook, "time", SimpleNamespace(time=lambda: later))
+
+    assert client.pull_insights(["auth"], exclude_agent="agent-b") == []
+
+    client.push_insight(insight(2, "agent-a", "auth"))
+    assert list(server.state.hashes[checkin_hook.INSIGHT_BODIES_KEY]) == [f"{2:08x}:agent-a"]
+    assert list(server.state.zsets[checkin_hook.INSIGHT_TAG_KEY.format(tag="auth")]) == \
+        [f"{2:08x}:agent-a"]
+    assert [i["id"] for i in client.pull_insights(["auth"], "agent-b")] == [f"{2:08x}"]
+
+
+def test_sorted_set_commands(server):
+    redis = UpstashRedisClient(url=server.url, token=server.token)
+    assert redis.zadd("z", {"a": 1, "b": 2.5, "c": 3}) == 3
+    assert redis.zadd("z", {"a": 4}) == 0
+    assert redis.zrangebyscore("z", "-inf", "+inf") == ["b", "c", "a"]
+    assert redis.zrevrangebyscore("z", "+inf", "(2.5", withscores=True) == [("a", 4.0), ("c", 3.0)]
+    assert redis.zrevrangebyscore("z", 10, 0, start=1, num=1) == ["c"]
+    assert redis.zremrangebyscore("z", "-inf", 3) == 2
+    assert redis.zrem("z", "a", "missing") == 1
+    assert redis.hset("h", mapping={"x": "1", "y": "2"}) == 2
+    assert redis.hmget("h", ["y", "missing", "x"]) == ["2", None, "1"]
+
+
+def make_insight(n, agent, *tags, content=None):
+    return Insight(id=f"i{n}", type=InsightType.DISCOVERY, content=content or f"insight {n}",
+                   from_agent=agent, relevance_tags=list(tags), confidence=0.8)
+
+
+def test_insight_pool_indexes_by_tag_and_content():
+    pool = InsightPool(max_insights=5)
+    for n in range(8):
+        pool.add(make_insight(n, f"agent-{n % 2}", "auth" if n % 3 else "db", "api"))
+    pool.add(make_insight(99, "agent-0", "auth", content="  INSIGHT 7 "))  # Duplicate of i7
+
+    assert [i.id for i in pool.insights] == ["i3", "i4", "i5", "i6", "i7"]
+    assert [i.id for i in pool.get_relevant(["auth", "db"], limit=10)] == ["i7", "i6", "i5", "i4", "i3"]
+    assert [i.id for i in pool.get_relevant(["db"], exclude_agent="agent-1")] == ["i6"]
+    assert [i.id for i in pool.get_relevant(["auth", "api"], exclude_agent="agent-0", limit=2)] == \
+        ["i7", "i5"]
+    assert pool.get_relevant(["missing"]) == []
+
+    # Trimmed content can be shared again
+    pool.add(make_insight(100, "agent-0", "db", content="insight 0"))
+    assert pool.insights[-1].id == "i100"
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for change-notified pub/sub in the file backends (change_notifier.py).
+
+Run: python -m pytest power-mode/test_pubsub_notifier.py -q
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from change_notifier import ChangeNotifier
+from file_fallback import FileBasedPowerMode, PubSubEmulator
+from segment_log import LogStructuredPowerMode
+
+NOTIFIER_BACKENDS = ["stat"] + (["inotify"] if sys.platform.startswith("linux") else [])
+
+
+def publish_later(client, channel, message, delay=0.1):
+    thread = threading.Thread(target=lambda: (time.sleep(delay), client.publish(channel, message)))
+    thread.start()
+    return thread
+
+
+@pytest.mark.parametrize("backend", NOTIFIER_BACKENDS)
+def test_notifier_wakes_only_for_watched_prefixes(tmp_path, backend):
+    """wait() times out on unrelated writes and returns on a watched one."""
+    notifier = ChangeNotifier(tmp_path, backend=backend, poll_interval=0.01)
+    assert notifier.backend == backend
+    notifier.arm(["results."])
+
+    (tmp_path / "heartbeat.sig").write_bytes(b".")
+    assert notifier.wait(["results."], timeout=0.1) is False
+
+    (tmp_path / "results.sig").write_bytes(b".")
+    assert notifier.wait(["results."], timeout=1) is True
+    # The change is consumed
+    assert notifier.wait(["results."], timeout=0.05) is False
+    notifier.close()
+
+
+@pytest.mark.parametrize("backend", NOTIFIER_BACKENDS)
+def test_json_subscriber_wakes_on_publish(tmp_path, monkeypatch, backend):
+    """A blocked subscriber is woken by a publish instead of a 100ms poll."""
+    monkeypatch.setenv("POPKIT_FILE_NOTIFIER", backend)
+    client = FileBasedPowerMode(str(tmp_path / "state.json"))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:results")
+
+    start = time.monotonic()
+    thread = publish_later(client, "pop:results", "done")
+    message = pubsub.get_message(timeout=5)
+    thread.join()
+
+    assert message["channel"] == "pop:results"
+    assert message["data"] == "done"
+    assert time.monotonic() - start < 2
+
+
+def test_json_idle_subscriber_never_reads_state(tmp_path, monkeypatch):
+    """Waiting on one channel doesn't read the state file for other channels."""
+    client = FileBasedPowerMode(str(tmp_path / "state.json"))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:results")
+
+    fetches = []
+    original = PubSubEmulator._fetch
+    monkeypatch.setattr(PubSubEmulator, "_fetch", lambda self: (fetches.append(1), original(self)))
+
+    client.publish("pop:heartbeat", "other channel")
+    assert pubsub.get_message(timeout=0.3) is None
+    assert fetches == []
+
+
+def test_json_cursors_live_outside_state_file(tmp_path):
+    """Consuming messages writes the client's cursor file, not shared state."""
+    client = FileBasedPowerMode(str(tmp_path / "state.json"))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:results")
+    client.publish("pop:results", "r1")
+    client.publish("pop:results", "r2")
+
+    state_before = client.state_file.read_bytes()
+    assert [pubsub.get_message(timeout=1)["data"] for _ in range(2)] == ["r1", "r2"]
+    assert client.state_file.read_bytes() == state_before
+
+    state = json.loads(state_before)
+    assert client.client_id not in state["read_positions"]
+    assert json.loads(pubsub.cursor_file.read_text()) == {"pop:results": 2}
+
+    # A new session with the same client id resumes after its cursor
+    client.publish("pop:results", "r3")
+    resumed = PubSubEmulator(client.state_file, client.lock_file, client.client_id)
+    resumed.subscribe("pop:results")
+    assert resumed.get_message(timeout=1)["data"] == "r3"
+
+
+def test_json_cursors_written_once_per_batch(tmp_path):
+    """Draining a batch writes the cursor file once; close() saves a partial batch."""
+    client = FileBasedPowerMode(str(tmp_path / "state.json"))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:results")
+    for i in range(5):
+        client.publish("pop:results", str(i))
+
+    saves = []
+    save_cursors = pubsub._save_cursors
+    pubsub._save_cursors = lambda: saves.append(dict(pubsub.read_positions)) or save_cursors()
+    assert [pubsub.get_message(timeout=1)["data"] for _ in range(5)] == [str(i) for i in range(5)]
+    assert saves == [{"pop:results": 5}]
+
+    for i in range(5, 8):
+        client.publish("pop:results", str(i))
+    assert pubsub.get_message(timeout=1)["data"] == "5"
+    assert json.loads(pubsub.cursor_file.read_text()) == {"pop:results": 5}
+    pubsub.close()
+    assert json.loads(pubsub.cursor_file.read_text()) == {"pop:results": 6}
+
+
+def test_json_ids_survive_message_trim(tmp_path):
+    """Cursors are message ids, so trimming to 100 messages doesn't skip any."""
+    client = FileBasedPowerMode(str(tmp_path / "state.json"))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:broadcast")
+
+    for i in range(105):
+        client.publish("pop:broadcast", str(i))
+    assert pubsub.get_message(timeout=1)["data"] == "5"  # 0-4 were trimmed
+    assert [pubsub.get_message(timeout=1)["data"] for _ in range(99)] == [str(i) for i in range(6, 105)]
+    assert pubsub.get_message(timeout=0.1) is None
+
+
+@pytest.mark.parametrize("backend", NOTIFIER_BACKENDS)
+def test_log_subscriber_wakes_on_publish(tmp_path, monkeypatch, backend):
+    """LogPubSub blocks on the channel directory notifier."""
+    monkeypatch.setenv("POPKIT_FILE_NOTIFIER", backend)
+    client = LogStructuredPowerMode(str(tmp_path / "log"))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:results")
+    assert pubsub._notifier.backend == backend
+
+    thread = publish_later(client, "pop:results", "done")
+    client.publish("pop:heartbeat", "ignored")
+    message = pubsub.get_message(timeout=5)
+    thread.join()
+
+    assert (message["channel"], message["data"]) == ("pop:results", "done")
+    assert pubsub.get_message(timeout=0.1) is None
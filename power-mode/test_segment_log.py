@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the log-structured Power Mode backend (segment_log.py).
+
+Run: python -m pytest power-mode/test_segment_log.py -q
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from file_fallback import FileBasedPowerMode, create_file_client
+from segment_log import LogStructuredPowerMode
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    return tmp_path / "power-mode-log"
+
+
+def run_ops(client):
+    """Same operation sequence for both backends; returns every result."""
+    return [
+        client.set("task:1", "pending"),
+        client.get("task:1"),
+        client.get("missing"),
+        client.hset("agent:1", "status", "active"),
+        client.hset("agent:1", mapping={"progress": "0.5", "name": "reviewer"}),
+        client.hget("agent:1", "progress"),
+        client.hgetall("agent:1"),
+        client.lpush("insights", "a"),
+        client.lpush("insights", "b"),
+        client.lrange("insights", 0, -1),
+        client.lrange("insights", 1, 2),
+        client.delete("task:1", "insights", "missing"),
+        client.get("task:1"),
+        client.lrange("insights", 0, -1),
+    ]
+
+
+def test_api_matches_json_backend(tmp_path, log_dir):
+    """Return values match FileBasedPowerMode for the shared API."""
+    json_client = FileBasedPowerMode(str(tmp_path / "state.json"))
+    log_client = LogStructuredPowerMode(str(log_dir))
+
+    assert run_ops(log_client) == run_ops(json_client)
+
+
+def test_redis_extras_used_by_coordinator(log_dir):
+    """hdel/ltrim/sadd/srem/expire behave like Redis."""
+    client = LogStructuredPowerMode(str(log_dir))
+
+    client.hset("pop:streams:s1", mapping={"agent-a": "1", "agent-b": "2"})
+    assert client.hdel("pop:streams:s1", "agent-a", "agent-z") == 1
+    assert client.hgetall("pop:streams:s1") == {"agent-b": "2"}
+
+    # Multi-value LPUSH inserts each value at the head in turn, as Redis does
+    client.lpush("pop:insights", *[str(i) for i in range(10)])
+    client.ltrim("pop:insights", 0, 2)
+    assert client.lrange("pop:insights", 0, -1) == ["9", "8", "7"]
+
+    assert client.sadd("active", "x", "y") == 2
+    assert client.sadd("active", "y", "z") == 1
+    assert client.srem("active", "x", "missing") == 1
+    assert client.smembers("active") == {"y", "z"}
+
+    assert client.expire("missing", 10) is False
+    client.set("pop:state:a", "v")
+    assert client.expire("pop:state:a", 0) is True
+    assert client.get("pop:state:a") is None
+
+
+def test_writes_are_visible_across_clients_and_survive_compaction(log_dir):
+    """Clients tail each other's appends; compaction keeps state and drops segments."""
+    writer = LogStructuredPowerMode(str(log_dir), segment_bytes=2048)
+    reader = LogStructuredPowerMode(str(log_dir), segment_bytes=2048)
+
+    writer.set("k", "v1")
+    assert reader.get("k") == "v1"
+
+    for i in range(200):
+        writer.hset("agent:1", "tool_calls", str(i))
+    writer.lpush("log", "x")
+
+    assert reader.hget("agent:1", "tool_calls") == "199"
+    assert reader.lrange("log", 0, -1) == ["x"]
+    assert (log_dir / "data.snapshot.json").exists()
+    # Old segments are pruned once folded into the snapshot
+    assert len(writer.data.segments()) <= 2
+
+    fresh = LogStructuredPowerMode(str(log_dir))
+    assert fresh.get("k") == "v1"
+    assert fresh.hget("agent:1", "tool_calls") == "199"
+
+
+def test_pubsub_tails_per_channel_logs(log_dir):
+    """Subscribers see messages published after subscribing, in order."""
+    coordinator = LogStructuredPowerMode(str(log_dir))
+    agent = LogStructuredPowerMode(str(log_dir))
+
+    agent.publish("pop:results", "before-subscribe")
+    pubsub = coordinator.pubsub()
+    pubsub.subscribe("pop:results", "pop:heartbeat")
+
+    assert agent.publish("pop:results", "r1") == 1
+    agent.publish("pop:heartbeat", "h1")
+    agent.publish("pop:results", "r2")
+    agent.publish("pop:other", "ignored")
+
+    received = []
+    while True:
+        message = pubsub.get_message(timeout=0.2)
+        if message is None:
+            break
+        received.append((message["channel"], message["data"]))
+
+    assert sorted(received) == [("pop:heartbeat", "h1"), ("pop:results", "r1"), ("pop:results", "r2")]
+    assert [d for c, d in received if c == "pop:results"] == ["r1", "r2"]
+
+
+def test_pubsub_follows_channel_rotation(log_dir, monkeypatch):
+    """A subscriber keeps its place across channel segment rotation."""
+    monkeypatch.setattr("segment_log.CHANNEL_SEGMENT_BYTES", 256)
+    client = LogStructuredPowerMode(str(log_dir))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:broadcast")
+
+    for i in range(5):
+        client.publish("pop:broadcast", f"message-{i:03d}-" + "x" * 40)
+    received = [pubsub.get_message(timeout=0.2)["data"][:11] for _ in range(5)]
+
+    assert received == [f"message-{i:03d}" for i in range(5)]
+    assert len(client.channel_log("pop:broadcast").segments()) > 1
+
+
+AGENT_SCRIPT = """
+import sys
+sys.path.insert(0, {power_mode!r})
+from segment_log import LogStructuredPowerMode
+client = LogStructuredPowerMode({log_dir!r}, segment_bytes=4096)
+agent = sys.argv[1]
+for i in range(25):
+    client.hset("pop:agents", agent, str(i))
+    client.lpush("pop:insights", f"{{agent}}-{{i}}")
+    client.publish("pop:heartbeat", f"{{agent}}-{{i}}")
+"""
+
+
+def test_ten_concurrent_agents(log_dir):
+    """Ten agent processes writing at once lose no operations."""
+    client = LogStructuredPowerMode(str(log_dir))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:heartbeat")
+
+    script = AGENT_SCRIPT.format(power_mode=str(Path(__file__).parent), log_dir=str(log_dir))
+    agents = [
+        subprocess.Popen([sys.executable, "-c", script, f"agent-{n}"])
+        for n in range(10)
+    ]
+    assert all(p.wait(timeout=120) == 0 for p in agents)
+
+    assert client.hgetall("pop:agents") == {f"agent-{n}": "24" for n in range(10)}
+    assert len(client.lrange("pop:insights", 0, -1)) == 250
+
+    heartbeats = []
+    deadline = time.time() + 10
+    while len(heartbeats) < 250 and time.time() < deadline:
+        message = pubsub.get_message(timeout=0.2)
+        if message:
+            heartbeats.append(message["data"])
+    assert len(heartbeats) == 250
+    # Per-publisher order is preserved
+    agent_0 = [h for h in heartbeats if h.startswith("agent-0-")]
+    assert agent_0 == [f"agent-0-{i}" for i in range(25)]
+
+
+def test_create_file_client_selects_backend(tmp_path, monkeypatch):
+    """Backend comes from the argument, then POPKIT_FILE_BACKEND, then config."""
+    assert isinstance(create_file_client("json", str(tmp_path / "s.json")), FileBasedPowerMode)
+    monkeypatch.setenv("POPKIT_FILE_BACKEND", "log")
+    assert isinstance(create_file_client(path=str(tmp_path / "log")), LogStructuredPowerMode)
+    with pytest.raises(ValueError):
+        create_file_client("bogus")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite WAL Power Mode backend (sqlite_backend.py).
+
+Run: python -m pytest power-mode/test_sqlite_backend.py -q
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from file_fallback import FileBasedPowerMode, create_file_client
+from mode_selector import ModeSelector, PowerMode
+from sqlite_backend import FETCH_BATCH, SQLitePowerMode
+from test_segment_log import run_ops
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "power-mode.db"
+
+
+def test_api_matches_json_backend(tmp_path, db_path):
+    """Return values match FileBasedPowerMode for the shared API."""
+    json_client = FileBasedPowerMode(str(tmp_path / "state.json"))
+    sqlite_client = SQLitePowerMode(str(db_path))
+
+    assert run_ops(sqlite_client) == run_ops(json_client)
+    assert sqlite_client.ping() is True
+
+
+def test_redis_extras_used_by_coordinator(db_path):
+    """hdel/ltrim/sadd/srem/expire and negative list indices behave like Redis."""
+    client = SQLitePowerMode(str(db_path))
+
+    client.hset("pop:streams:s1", mapping={"agent-a": "1", "agent-b": "2"})
+    assert client.hdel("pop:streams:s1", "agent-a", "agent-z") == 1
+    assert client.hgetall("pop:streams:s1") == {"agent-b": "2"}
+
+    assert client.lpush("pop:insights", *[str(i) for i in range(10)]) == 10
+    assert client.lrange("pop:insights", -3, -1) == ["2", "1", "0"]
+    client.ltrim("pop:insights", 0, 2)
+    assert client.lrange("pop:insights", 0, -1) == ["9", "8", "7"]
+    assert client.lpush("pop:insights", "10") == 4
+
+    assert client.sadd("active", "x", "y") == 2
+    assert client.sadd("active", "y", "z") == 1
+    assert client.srem("active", "x", "missing") == 1
+    assert client.smembers("active") == {"y", "z"}
+
+    assert client.expire("missing", 10) is False
+    client.set("pop:state:a", "v")
+    assert client.expire("pop:state:a", 0) is True
+    assert client.get("pop:state:a") is None
+    assert client.delete("pop:state:a") == 0
+
+
+def test_pubsub_reads_from_cursors_in_publish_order(db_path):
+    """Subscribers see only later messages, across channels, in publish order."""
+    coordinator = SQLitePowerMode(str(db_path))
+    agent = SQLitePowerMode(str(db_path))
+
+    agent.publish("pop:results", "before-subscribe")
+    pubsub = coordinator.pubsub()
+    pubsub.subscribe("pop:results", "pop:heartbeat")
+
+    assert agent.publish("pop:results", "r1") == 1
+    agent.publish("pop:heartbeat", "h1")
+    agent.publish("pop:other", "ignored")
+    agent.publish("pop:results", "r2")
+
+    received = []
+    while True:
+        message = pubsub.get_message(timeout=0.2)
+        if message is None:
+            break
+        received.append((message["channel"], message["data"]))
+
+    assert received == [("pop:results", "r1"), ("pop:heartbeat", "h1"), ("pop:results", "r2")]
+
+    # Cursors are rows, so a new session of the same client resumes from them
+    agent.publish("pop:results", "r3")
+    pubsub.close()
+    resumed = type(pubsub)(coordinator)
+    resumed.subscribe("pop:results")
+    assert resumed.get_message(timeout=1)["data"] == "r3"
+
+
+def test_pubsub_drains_backlog_past_fetch_batch(db_path):
+    """A backlog larger than FETCH_BATCH is delivered without a new publish."""
+    coordinator = SQLitePowerMode(str(db_path))
+    agent = SQLitePowerMode(str(db_path))
+    pubsub = coordinator.pubsub()
+    pubsub.subscribe("pop:results")
+    assert pubsub.get_message(timeout=0.1) is None
+
+    total = FETCH_BATCH + 100
+    for i in range(total):
+        agent.publish("pop:results", str(i))
+
+    saves = []
+    save_cursors = pubsub._save_cursors
+    pubsub._save_cursors = lambda: saves.append(len(pubsub._unsaved)) or save_cursors()
+    received = []
+    while True:
+        message = pubsub.get_message(timeout=0.2)
+        if message is None:
+            break
+        received.append(message["data"])
+
+    assert received == [str(i) for i in range(total)]
+    # One cursor write per fetched batch, not per message
+    assert saves == [1, 1]
+    cursor = coordinator._scalar(
+        "SELECT last_id FROM cursors WHERE client = ? AND channel = ?",
+        coordinator.client_id, "pop:results",
+    )
+    assert cursor == pubsub.read_positions["pop:results"]
+
+
+AGENT_SCRIPT = """
+import sys
+sys.path.insert(0, {power_mode!r})
+from sqlite_backend import SQLitePowerMode
+client = SQLitePowerMode({db_path!r})
+agent = sys.argv[1]
+for i in range(25):
+    client.hset("pop:agents", agent, str(i))
+    client.lpush("pop:insights", f"{{agent}}-{{i}}")
+    client.publish("pop:heartbeat", f"{{agent}}-{{i}}")
+"""
+
+
+def test_ten_concurrent_agents(db_path):
+    """Ten agent processes writing at once lose no operations."""
+    client = SQLitePowerMode(str(db_path))
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:heartbeat")
+
+    script = AGENT_SCRIPT.format(power_mode=str(Path(__file__).parent), db_path=str(db_path))
+    agents = [
+        subprocess.Popen([sys.executable, "-c", script, f"agent-{n}"])
+        for n in range(10)
+    ]
+    assert all(p.wait(timeout=120) == 0 for p in agents)
+
+    assert client.hgetall("pop:agents") == {f"agent-{n}": "24" for n in range(10)}
+    assert len(client.lrange("pop:insights", 0, -1)) == 250
+
+    heartbeats = []
+    deadline = time.time() + 10
+    while len(heartbeats) < 250 and time.time() < deadline:
+        message = pubsub.get_message(timeout=0.2)
+        if message:
+            heartbeats.append(message["data"])
+    assert len(heartbeats) == 250
+    agent_0 = [h for h in heartbeats if h.startswith("agent-0-")]
+    assert agent_0 == [f"agent-0-{i}" for i in range(25)]
+
+
+def test_selector_picks_sqlite_when_redis_unreachable(tmp_path, monkeypatch):
+    """With native and Upstash unavailable, SQLite wins over plain files."""
+    monkeypatch.delenv("UPSTASH_REDIS_REST_URL", raising=False)
+    monkeypatch.delenv("POPKIT_FILE_BACKEND", raising=False)
+    selector = ModeSelector({
+        "native": {"enabled": False},
+        "mode_priority": ["native", "upstash", "sqlite", "file"],
+        "file_mode": {"backend": "auto"},
+    })
+
+    assert selector.select_mode()[0] == PowerMode.SQLITE
+    assert selector.select_file_backend()[0] == "sqlite"
+
+    monkeypatch.setattr("sqlite_backend.SQLITE_AVAILABLE", False)
+    assert selector.select_mode()[0] == PowerMode.FILE
+    assert selector.select_file_backend()[0] == "log"
+
+    monkeypatch.setattr("sqlite_backend.SQLITE_AVAILABLE", True)
+    assert isinstance(create_file_client("auto", str(tmp_path / "p.db")), SQLitePowerMode)
+    assert isinstance(create_file_client("sqlite", str(tmp_path / "p.db")), SQLitePowerMode)
+
+
+def test_mode_info_and_cleanup_follow_selected_backend(tmp_path, monkeypatch):
+    """coordinator_auto describes and cleans the backend create_file_client uses."""
+    import coordinator_auto
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(coordinator_auto, "redis_is_running", lambda: False)
+    monkeypatch.setenv("POPKIT_FILE_BACKEND", "sqlite")
+
+    info = coordinator_auto.get_mode_info()
+    assert (info["mode"], info["file_backend"]) == ("file", "sqlite")
+    assert info["file_path"] == str(tmp_path / ".claude" / "popkit" / "power-mode.db")
+
+    client = create_file_client()
+    assert coordinator_auto.file_client_location(client) == Path(info["file_path"])
+    client.publish("ch", "old")
+    client.conn.execute("UPDATE messages SET timestamp = '2000-01-01T00:00:00'")
+    client.publish("ch", "new")
+    assert client.cleanup(max_age_hours=24) == 1
+    assert client.stats()["total_messages"] == 1
+
+    monkeypatch.setenv("POPKIT_FILE_BACKEND", "log")
+    assert coordinator_auto.get_mode_info()["file_path"].endswith("power-mode-log")
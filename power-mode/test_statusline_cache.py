@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the status line render cache (statusline.py).
+
+Run: python -m pytest power-mode/test_statusline_cache.py -q
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import statusline
+from statusline import RenderCache, WidgetConfig
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A git project with every widget's data file, and a fresh cache."""
+    project = tmp_path / "project"
+    popkit = project / ".claude" / "popkit"
+    popkit.mkdir(parents=True)
+    (project / ".git").mkdir()
+    (popkit / "power-mode-state.json").write_text(json.dumps({
+        "active": True, "active_issue": 45, "phase_index": 3, "total_phases": 7, "progress": 0.4
+    }))
+    (popkit / "efficiency-metrics.json").write_text(json.dumps({"patterns_matched": 5}))
+    (popkit / "health-state.json").write_text(json.dumps({"build": {"success": True}}))
+    (project / ".claude" / "STATUS.json").write_text(json.dumps({
+        "workflow": {"type": "feature-dev", "current_step": "Implementation", "progress": 0.7}
+    }))
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.chdir(project)
+    monkeypatch.setattr(statusline, "RENDER_CACHE_PATH", tmp_path / "statusline-cache.json")
+    monkeypatch.setattr(statusline, "_render_cache", None)
+    monkeypatch.setattr(statusline, "resolve_git_root", lambda: project)
+    return project
+
+
+def new_process(monkeypatch):
+    """Forget in-process state, as the next status line refresh would."""
+    monkeypatch.setattr(statusline, "_render_cache", None)
+
+
+def counting_widgets(monkeypatch):
+    calls = []
+    for name, widget in list(statusline.WIDGETS.items()):
+        def counted(compact, name=name, widget=widget):
+            calls.append(name)
+            return widget(compact)
+        monkeypatch.setitem(statusline.WIDGETS, name, counted)
+    return calls
+
+
+def test_unchanged_widgets_reuse_their_last_output(project, monkeypatch):
+    config = WidgetConfig(widgets=list(statusline.WIDGETS), compact_mode=False)
+    calls = counting_widgets(monkeypatch)
+
+    first = statusline.format_widget_status_line(config)
+    assert "#45" in first and "~2.5k saved" in first and "Implementation" in first
+    assert sorted(calls) == sorted(statusline.WIDGETS)
+
+    # A later process renders from the cache file without calling a widget
+    new_process(monkeypatch)
+    calls.clear()
+    assert statusline.format_widget_status_line(config) == first
+    assert calls == []
+    assert statusline.get_render_cache().hits == len(statusline.WIDGETS) + 1
+
+    # Changing one source re-renders only the widgets that read it
+    metrics = project / ".claude" / "popkit" / "efficiency-metrics.json"
+    metrics.write_text(json.dumps({"patterns_matched": 6}))
+    os.utime(metrics, ns=(0, metrics.stat().st_mtime_ns + 10**9))
+    new_process(monkeypatch)
+    assert "~3.0k saved" in statusline.format_widget_status_line(config)
+    assert calls == ["efficiency"]
+
+
+def test_git_root_is_resolved_once_per_directory(project, monkeypatch):
+    runs = []
+    monkeypatch.setattr(statusline, "resolve_git_root", lambda: runs.append(1) or project)
+
+    assert statusline.get_git_root() == project
+    statusline.get_render_cache().save()
+    new_process(monkeypatch)
+    assert statusline.get_project_root() == project
+    assert len(runs) == 1
+
+    # A root that is no longer a repository is resolved again
+    (project / ".git").rmdir()
+    monkeypatch.setattr(statusline, "resolve_git_root", lambda: runs.append(1) or None)
+    assert statusline.get_git_root() is None
+    assert statusline.get_git_root() is None
+    assert len(runs) == 2
+
+
+def test_disabled_cache_always_renders(project):
+    cache = RenderCache(enabled=False)
+    outputs = iter(["a", "b"])
+    assert cache.render("k", [], lambda: next(outputs)) == "a"
+    assert cache.render("k", [], lambda: next(outputs)) == "b"
+    assert cache.hits == 0
+
+
+def test_agent_shards_do_not_invalidate_power_mode(project, monkeypatch):
+    from agent_state import shard_paths, write_json_atomic
+
+    state_dir = project / ".claude" / "popkit"
+    monkeypatch.setattr(statusline, "get_state_file_path", lambda: state_dir / "power-mode-state.json")
+    shard, summary = shard_paths(state_dir, "agent-a")
+    write_json_atomic(summary, {"agent_id": "agent-a", "insights_shared": 1, "updated_at": "9"})
+    config = WidgetConfig(widgets=["power_mode"], compact_mode=False)
+    calls = counting_widgets(monkeypatch)
+    statusline.format_widget_status_line(config)
+
+    # Per-tool-call shard writes reuse the cached output
+    for n in range(3):
+        write_json_atomic(shard, {"tool_call_count": n})
+        new_process(monkeypatch)
+        statusline.format_widget_status_line(config)
+    assert calls == ["power_mode"]
+
+    # A new agent summary re-renders
+    write_json_atomic(shard_paths(state_dir, "agent-b")[1],
+                      {"agent_id": "agent-b", "insights_shared": 2, "updated_at": "9"})
+    new_process(monkeypatch)
+    assert "Agents:2" in statusline.format_widget_status_line(config)
+    assert calls == ["power_mode", "power_mode"]
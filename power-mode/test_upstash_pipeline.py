@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for Upstash REST pipelining (upstash_adapter.py) against the local
+stand-in server (upstash_standin.py).
+
+Run: python -m pytest power-mode/test_upstash_pipeline.py -q
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from upstash_adapter import UpstashRedisClient
+from upstash_standin import UpstashStandIn
+
+
+@pytest.fixture
+def server():
+    with UpstashStandIn() as standin:
+        yield standin
+
+
+@pytest.fixture
+def client(server):
+    return UpstashRedisClient(url=server.url, token=server.token)
+
+
+def test_direct_calls_cost_one_round_trip_each(server, client):
+    """Without a pipeline every command is its own HTTPS request."""
+    assert client.ping() is True
+    assert client.set("k", "v") is True
+    assert client.get("k") == "v"
+    assert client.hset("h", mapping={"a": "1", "b": "2"}) == 2
+    assert client.hgetall("h") == {"a": "1", "b": "2"}
+    assert server.round_trips == 5
+    assert server.requests == ["/"] * 5
+
+    with pytest.raises(ValueError):
+        UpstashRedisClient(url=server.url, token="wrong").ping()
+
+
+def test_pipeline_returns_parsed_results_in_one_round_trip(server, client):
+    """execute() sends every buffered command at once and parses each reply."""
+    pipe = client.pipeline()
+    pipe.set("k", "v").get("k").hset("h", "f", "1").hgetall("h")
+    pipe.lpush("l", "a", "b").lrange("l", 0, -1).expire("k", 60).ttl("missing")
+    assert len(pipe) == 8
+    assert server.round_trips == 0
+
+    results = pipe.execute()
+
+    assert results == [True, "v", 1, {"f": "1"}, 2, ["b", "a"], True, -2]
+    assert server.round_trips == 1
+    assert server.requests == ["/pipeline"]
+    assert pipe.execute() == []
+    assert server.round_trips == 1
+
+
+def test_publish_in_pipeline_reports_one_result(server, client):
+    """publish's stream EXPIRE is sent but not reported, like a direct call."""
+    with client.pipeline() as pipe:
+        pipe.publish("pop:broadcast", "m1").publish("pop:broadcast", "m2")
+    assert server.round_trips == 1
+    assert server.commands == 4
+
+    pipe = client.pipeline()
+    pipe.publish("pop:broadcast", "m3").get("missing")
+    assert pipe.execute() == [1, None]
+
+
+def test_transaction_uses_multi_exec(server, client):
+    """transaction=True goes through the atomic endpoint."""
+    with client.pipeline(transaction=True) as pipe:
+        pipe.hset("pop:state:a", mapping={"status": "active"})
+        pipe.hdel("pop:streams:s", "a")
+    assert server.requests == ["/multi-exec"]
+    assert client.hget("pop:state:a", "status") == "active"
+
+
+def test_auto_flush_on_size(server, client):
+    """Reaching max_commands sends the batch without an explicit execute()."""
+    pipe = client.pipeline(max_commands=4)
+    for i in range(10):
+        pipe.set(f"k{i}", str(i))
+
+    assert server.round_trips == 2
+    assert len(pipe) == 2
+    pipe.flush()
+    assert server.round_trips == 3
+    assert (pipe.round_trips, pipe.commands_sent, pipe.failed_commands) == (3, 10, 0)
+    assert client.get("k9") == "9"
+
+
+def test_auto_flush_on_time(server, client):
+    """A partly filled batch is sent max_delay after its first command."""
+    pipe = client.pipeline(max_commands=100, max_delay=0.05)
+    pipe.set("a", "1").set("b", "2")
+    assert server.round_trips == 0
+
+    deadline = time.monotonic() + 5
+    while server.round_trips == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert server.round_trips == 1
+    assert server.commands == 2
+    assert client.get("b") == "2"
+
+
+def test_pubsub_polls_all_channels_in_one_round_trip(server, client):
+    """Each poll reads every subscribed stream with a single pipeline request."""
+    pubsub = client.pubsub()
+    pubsub.subscribe("pop:results", "pop:heartbeat", "pop:insights")
+    time.sleep(0.002)
+    client.publish("pop:results", "r1")
+    client.publish("pop:heartbeat", "h1")
+    client.publish("pop:results", "r2")
+    server.reset_counts()
+
+    received = []
+    while True:
+        message = pubsub.get_message()
+        if message is None:
+            break
+        received.append((message["channel"], message["data"]))
+
+    assert sorted(received) == [("pop:heartbeat", "h1"), ("pop:results", "r1"), ("pop:results", "r2")]
+    # One poll returned everything (the rest came from the queue), one found nothing
+    assert server.requests == ["/pipeline", "/pipeline"]
+    assert server.commands == 6
+
+
+def test_coordinator_batches_fire_and_forget_writes(server, client):
+    """Broadcasts and heartbeat state go out in one flush, not one request each."""
+    from coordinator import Message, MessageType, PowerModeCoordinator
+
+    coordinator = PowerModeCoordinator()
+    coordinator.redis = client
+    coordinator._writes = coordinator._create_write_batcher()
+    assert coordinator._writes is not client
+
+    for i in range(5):
+        coordinator._broadcast(Message(
+            id=f"m{i}", type=MessageType.HEARTBEAT, from_agent="coordinator",
+            to_agent="*", payload={"i": i}
+        ))
+    coordinator._flush_writes()
+
+    assert server.round_trips == 1
+    assert server.commands == 10
+    stream = server.state.streams["popkit:pubsub:pop:broadcast"]
+    assert [json.loads(dict(zip(f[::2], f[1::2]))["message"])["payload"]["i"]
+            for _, f in stream] == list(range(5))
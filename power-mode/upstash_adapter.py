@@ -26,7 +26,7 @@ import json
 import os
 import time
 import threading
-from typing import Any, Callable, Dict, List, Optional, Set, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 from dataclasses import dataclass
@@ -82,7 +82,8 @@ class BaseRedisClient(ABC):
         pass
 
     @abstractmethod
-    def hset(self, name: str, mapping: Dict[str, str]) -> int:
+    def hset(self, name: str, key: Any = None, value: Optional[str] = None,
+             mapping: Optional[Dict[str, str]] = None) -> int:
         """Set hash fields."""
         pass
 
@@ -96,6 +97,11 @@ class BaseRedisClient(ABC):
         """Get all hash fields."""
         pass
 
+    @abstractmethod
+    def hmget(self, name: str, keys: List[str]) -> List[Optional[str]]:
+        """Get several hash fields (None for missing ones)."""
+        pass
+
     @abstractmethod
     def hdel(self, name: str, *keys: str) -> int:
         """Delete hash fields."""
@@ -141,6 +147,36 @@ class BaseRedisClient(ABC):
         """Get pub/sub interface."""
         pass
 
+    # Sorted set operations
+    @abstractmethod
+    def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        """Add members with scores to a sorted set."""
+        pass
+
+    @abstractmethod
+    def zrem(self, name: str, *values: str) -> int:
+        """Remove sorted set members."""
+        pass
+
+    @abstractmethod
+    def zrangebyscore(self, name: str, min: Union[float, str], max: Union[float, str],
+                      start: Optional[int] = None, num: Optional[int] = None,
+                      withscores: bool = False) -> List:
+        """Get sorted set members by score, lowest first."""
+        pass
+
+    @abstractmethod
+    def zrevrangebyscore(self, name: str, max: Union[float, str], min: Union[float, str],
+                         start: Optional[int] = None, num: Optional[int] = None,
+                         withscores: bool = False) -> List:
+        """Get sorted set members by score, highest first."""
+        pass
+
+    @abstractmethod
+    def zremrangebyscore(self, name: str, min: Union[float, str], max: Union[float, str]) -> int:
+        """Remove sorted set members within a score range."""
+        pass
+
     # Stream operations (native Redis Streams)
     @abstractmethod
     def xadd(self, name: str, fields: Dict[str, str], id: str = "*", maxlen: Optional[int] = None) -> str:
@@ -186,12 +222,69 @@ class BasePubSub(ABC):
 # UPSTASH REST API CLIENT
 # =============================================================================
 
+# Result parsers: one per reply shape, shared by direct calls and pipelines
+def _as_int(result: Any) -> int:
+    return result if isinstance(result, int) else 0
+
+
+def _as_list(result: Any) -> List:
+    return result if isinstance(result, list) else []
+
+
+def _as_dict(result: Any) -> Dict[str, str]:
+    if not result or not isinstance(result, list):
+        return {}
+    # Convert flat list to dict
+    return {result[i]: result[i + 1] for i in range(0, len(result), 2)}
+
+
+def _is_ok(result: Any) -> bool:
+    return result == "OK"
+
+
+def _is_one(result: Any) -> bool:
+    return result == 1
+
+
+def _as_ttl(result: Any) -> int:
+    return result if isinstance(result, int) else -2
+
+
+def _as_str(result: Any) -> str:
+    return result if isinstance(result, str) else ""
+
+
+def _published(result: Any) -> int:
+    return 1 if result else 0
+
+
+def _raw(result: Any) -> Any:
+    return result
+
+
+def _with_scores(result: Any) -> List[Tuple[str, float]]:
+    # Flat [member, score, ...] reply; scores arrive as strings
+    result = _as_list(result)
+    return [(result[i], float(result[i + 1])) for i in range(0, len(result) - 1, 2)]
+
+
+def _score_range(name: str, first: Union[float, str], second: Union[float, str],
+                 start: Optional[int], num: Optional[int], withscores: bool) -> List[str]:
+    args = [name, str(first), str(second)]
+    if withscores:
+        args.append("WITHSCORES")
+    if start is not None and num is not None:
+        args.extend(["LIMIT", str(start), str(num)])
+    return args
+
+
 class UpstashRedisClient(BaseRedisClient):
     """
     Redis client using Upstash REST API.
 
     Implements pub/sub using Redis Streams for cloud compatibility.
     All operations use HTTP REST API - no socket connections required.
+    Use pipeline() to send many commands in one round trip.
     """
 
     # Stream-based pub/sub prefix
@@ -210,24 +303,22 @@ class UpstashRedisClient(BaseRedisClient):
         # Ensure URL ends properly
         self.url = self.url.rstrip("/")
 
-    def _execute(self, *args: str) -> Any:
-        """Execute Redis command via Upstash REST API."""
+    def _request(self, path: str, payload: Any) -> Any:
+        """POST a JSON payload to the REST API; None on network errors."""
         headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
 
-        request = Request(self.url, method="POST")
+        request = Request(self.url + path, method="POST")
         for key, value in headers.items():
             request.add_header(key, value)
 
-        # Command as JSON array
-        body = json.dumps(list(args)).encode('utf-8')
+        body = json.dumps(payload).encode('utf-8')
 
         try:
             with urlopen(request, body, timeout=10) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                return result.get("result")
+                return json.loads(response.read().decode('utf-8'))
         except HTTPError as e:
             if e.code == 401:
                 raise ValueError("Invalid Upstash credentials")
@@ -235,86 +326,157 @@ class UpstashRedisClient(BaseRedisClient):
         except URLError:
             return None
 
+    def _execute(self, *args: str) -> Any:
+        """Execute Redis command via Upstash REST API."""
+        # Command as JSON array
+        result = self._request("", list(args))
+        return result.get("result") if isinstance(result, dict) else None
+
+    def _execute_many(self, commands: List[List[str]], transaction: bool = False) -> List[Any]:
+        """
+        Execute commands in one round trip.
+
+        Args:
+            commands: Commands as argument lists
+            transaction: Use /multi-exec (atomic) instead of /pipeline
+
+        Returns:
+            One raw result per command (None for failed commands)
+        """
+        response = self._request("/multi-exec" if transaction else "/pipeline", commands)
+        if not isinstance(response, list):
+            return [None] * len(commands)
+        return [r.get("result") if isinstance(r, dict) else None for r in response]
+
+    def _call(self, parse: Optional[Callable[[Any], Any]], *args: str) -> Any:
+        """Run one command and parse its reply (pipelines buffer instead)."""
+        result = self._execute(*args)
+        return parse(result) if parse else result
+
+    def pipeline(self, transaction: bool = False, max_commands: Optional[int] = None,
+                 max_delay: Optional[float] = None) -> 'UpstashPipeline':
+        """
+        Buffer commands and send them in one round trip.
+
+        Args:
+            transaction: Send as MULTI/EXEC (atomic) instead of a plain pipeline
+            max_commands: Flush automatically once this many commands are buffered
+            max_delay: Flush automatically this many seconds after the first
+                buffered command
+
+        Returns:
+            UpstashPipeline
+        """
+        return UpstashPipeline(self, transaction, max_commands, max_delay)
+
     def ping(self) -> bool:
-        return self._execute("PING") == "PONG"
+        return self._call(lambda r: r == "PONG", "PING")
 
     def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
         if ex:
-            result = self._execute("SET", key, value, "EX", str(ex))
-        else:
-            result = self._execute("SET", key, value)
-        return result == "OK"
+            return self._call(_is_ok, "SET", key, value, "EX", str(ex))
+        return self._call(_is_ok, "SET", key, value)
 
     def get(self, key: str) -> Optional[str]:
-        return self._execute("GET", key)
+        return self._call(_raw, "GET", key)
 
     def delete(self, *keys: str) -> int:
         if not keys:
             return 0
-        result = self._execute("DEL", *keys)
-        return result if isinstance(result, int) else 0
+        return self._call(_as_int, "DEL", *keys)
 
     def exists(self, *keys: str) -> int:
         if not keys:
             return 0
-        result = self._execute("EXISTS", *keys)
-        return result if isinstance(result, int) else 0
+        return self._call(_as_int, "EXISTS", *keys)
 
     def keys(self, pattern: str = "*") -> List[str]:
-        result = self._execute("KEYS", pattern)
-        return result if isinstance(result, list) else []
-
-    def hset(self, name: str, mapping: Dict[str, str]) -> int:
-        if not mapping:
+        return self._call(_as_list, "KEYS", pattern)
+
+    def hset(self, name: str, key: Any = None, value: Optional[str] = None,
+             mapping: Optional[Dict[str, str]] = None) -> int:
+        """Set hash field(s): hset(name, key, value) or hset(name, mapping)."""
+        if isinstance(key, dict) and value is None:
+            key, mapping = None, key
+        fields = dict(mapping or {})
+        if key is not None and value is not None:
+            fields[key] = value
+        if not fields:
             return 0
         args = ["HSET", name]
-        for k, v in mapping.items():
+        for k, v in fields.items():
             args.extend([k, v])
-        result = self._execute(*args)
-        return result if isinstance(result, int) else 0
+        return self._call(_as_int, *args)
 
     def hget(self, name: str, key: str) -> Optional[str]:
-        return self._execute("HGET", name, key)
+        return self._call(_raw, "HGET", name, key)
 
     def hgetall(self, name: str) -> Dict[str, str]:
-        result = self._execute("HGETALL", name)
-        if not result or not isinstance(result, list):
-            return {}
-        # Convert flat list to dict
-        return {result[i]: result[i+1] for i in range(0, len(result), 2)}
+        return self._call(_as_dict, "HGETALL", name)
+
+    def hmget(self, name: str, keys: List[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        return self._call(_as_list, "HMGET", name, *keys)
 
     def hdel(self, name: str, *keys: str) -> int:
         if not keys:
             return 0
-        result = self._execute("HDEL", name, *keys)
-        return result if isinstance(result, int) else 0
+        return self._call(_as_int, "HDEL", name, *keys)
 
     def rpush(self, name: str, *values: str) -> int:
         if not values:
             return 0
-        result = self._execute("RPUSH", name, *values)
-        return result if isinstance(result, int) else 0
+        return self._call(_as_int, "RPUSH", name, *values)
 
     def lpush(self, name: str, *values: str) -> int:
         if not values:
             return 0
-        result = self._execute("LPUSH", name, *values)
-        return result if isinstance(result, int) else 0
+        return self._call(_as_int, "LPUSH", name, *values)
 
     def lrange(self, name: str, start: int, end: int) -> List[str]:
-        result = self._execute("LRANGE", name, str(start), str(end))
-        return result if isinstance(result, list) else []
+        return self._call(_as_list, "LRANGE", name, str(start), str(end))
 
     def lpop(self, name: str) -> Optional[str]:
-        return self._execute("LPOP", name)
+        return self._call(_raw, "LPOP", name)
 
     def expire(self, name: str, time: int) -> bool:
-        result = self._execute("EXPIRE", name, str(time))
-        return result == 1
+        return self._call(_is_one, "EXPIRE", name, str(time))
 
     def ttl(self, name: str) -> int:
-        result = self._execute("TTL", name)
-        return result if isinstance(result, int) else -2
+        return self._call(_as_ttl, "TTL", name)
+
+    # =========================================================================
+    # SORTED SET OPERATIONS
+    # =========================================================================
+
+    def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        if not mapping:
+            return 0
+        args = ["ZADD", name]
+        for member, score in mapping.items():
+            args.extend([str(score), member])
+        return self._call(_as_int, *args)
+
+    def zrem(self, name: str, *values: str) -> int:
+        if not values:
+            return 0
+        return self._call(_as_int, "ZREM", name, *values)
+
+    def zrangebyscore(self, name: str, min: Union[float, str], max: Union[float, str],
+                      start: Optional[int] = None, num: Optional[int] = None,
+                      withscores: bool = False) -> List:
+        args = _score_range(name, min, max, start, num, withscores)
+        return self._call(_with_scores if withscores else _as_list, "ZRANGEBYSCORE", *args)
+
+    def zrevrangebyscore(self, name: str, max: Union[float, str], min: Union[float, str],
+                         start: Optional[int] = None, num: Optional[int] = None,
+                         withscores: bool = False) -> List:
+        args = _score_range(name, max, min, start, num, withscores)
+        return self._call(_with_scores if withscores else _as_list, "ZREVRANGEBYSCORE", *args)
+
+    def zremrangebyscore(self, name: str, min: Union[float, str], max: Union[float, str]) -> int:
+        return self._call(_as_int, "ZREMRANGEBYSCORE", name, str(min), str(max))
 
     # =========================================================================
     # PUB/SUB VIA STREAMS
@@ -330,16 +492,17 @@ class UpstashRedisClient(BaseRedisClient):
         stream_key = f"{self.PUBSUB_STREAM_PREFIX}{channel}"
 
         # XADD with MAXLEN to prevent unbounded growth
-        result = self._execute(
+        result = self._call(
+            _published,
             "XADD", stream_key, "MAXLEN", "~", "1000", "*",
             "message", message,
             "timestamp", str(int(time.time() * 1000))
         )
 
-        # Set TTL on stream
-        self._execute("EXPIRE", stream_key, str(DEFAULT_TTL))
+        # Set TTL on stream (reply not reported by pipelines)
+        self._call(None, "EXPIRE", stream_key, str(DEFAULT_TTL))
 
-        return 1 if result else 0
+        return result
 
     def pubsub(self) -> 'UpstashPubSub':
         """Get pub/sub interface using streams."""
@@ -356,8 +519,7 @@ class UpstashRedisClient(BaseRedisClient):
         args.append(id)
         for k, v in fields.items():
             args.extend([k, v])
-        result = self._execute(*args)
-        return result if isinstance(result, str) else ""
+        return self._call(_as_str, *args)
 
     def xread(self, streams: Dict[str, str], count: Optional[int] = None, block: Optional[int] = None) -> List:
         args = ["XREAD"]
@@ -368,22 +530,127 @@ class UpstashRedisClient(BaseRedisClient):
         args.append("STREAMS")
         args.extend(streams.keys())
         args.extend(streams.values())
-        result = self._execute(*args)
-        return result if isinstance(result, list) else []
+        return self._call(_as_list, *args)
 
     def xrange(self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None) -> List:
         args = ["XRANGE", name, min, max]
         if count:
             args.extend(["COUNT", str(count)])
-        result = self._execute(*args)
-        return result if isinstance(result, list) else []
+        return self._call(_as_list, *args)
 
     def xrevrange(self, name: str, max: str = "+", min: str = "-", count: Optional[int] = None) -> List:
         args = ["XREVRANGE", name, max, min]
         if count:
             args.extend(["COUNT", str(count)])
-        result = self._execute(*args)
-        return result if isinstance(result, list) else []
+        return self._call(_as_list, *args)
+
+
+# =============================================================================
+# PIPELINES
+# =============================================================================
+
+class UpstashPipeline(UpstashRedisClient):
+    """
+    Buffers commands and sends them through Upstash's /pipeline endpoint
+    (or /multi-exec for transactions) in a single HTTPS round trip.
+
+    Every client method is available; calls return the pipeline so they
+    can be chained, and execute() returns the parsed replies in order:
+
+        pipe = client.pipeline()
+        pipe.hset("pop:state:a", mapping=state).publish("pop:broadcast", msg)
+        ok, published = pipe.execute()
+
+    With max_commands and/or max_delay the pipeline also flushes itself,
+    which suits fire-and-forget writes (heartbeats, state updates): replies
+    of automatic flushes are discarded, only counted in failed_commands.
+    """
+
+    def __init__(self, client: UpstashRedisClient, transaction: bool = False,
+                 max_commands: Optional[int] = None, max_delay: Optional[float] = None):
+        self.client = client
+        self.url = client.url
+        self.token = client.token
+        self.transaction = transaction
+        self.max_commands = max_commands
+        self.max_delay = max_delay
+
+        self._buffer: List[Tuple[List[str], Optional[Callable[[Any], Any]]]] = []
+        self._buffer_lock = threading.Lock()
+        # Held across a send so flushes reach the server in buffer order
+        self._send_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+        self.round_trips = 0
+        self.commands_sent = 0
+        self.failed_commands = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __enter__(self) -> 'UpstashPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+        else:
+            self.reset()
+
+    def _call(self, parse: Optional[Callable[[Any], Any]], *args: str) -> 'UpstashPipeline':
+        """Buffer one command, flushing if a size or time limit is hit."""
+        with self._buffer_lock:
+            self._buffer.append((list(args), parse))
+            full = self.max_commands is not None and len(self._buffer) >= self.max_commands
+            if not full and self.max_delay is not None and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+        return self
+
+    def _send(self) -> List[Any]:
+        with self._send_lock:
+            with self._buffer_lock:
+                buffer, self._buffer = self._buffer, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not buffer:
+                return []
+
+            raw = self.client._execute_many([args for args, _ in buffer], self.transaction)
+            self.round_trips += 1
+            self.commands_sent += len(buffer)
+            self.failed_commands += sum(1 for r in raw if r is None)
+            return [parse(r) for (_, parse), r in zip(buffer, raw) if parse is not None]
+
+    def execute(self) -> List[Any]:
+        """Send buffered commands and return their parsed replies in order."""
+        return self._send()
+
+    def flush(self) -> None:
+        """Send buffered commands, discarding replies (automatic flushes)."""
+        try:
+            self._send()
+        except Exception:
+            self.failed_commands += 1
+
+    def reset(self) -> None:
+        """Drop buffered commands without sending them."""
+        with self._buffer_lock:
+            self._buffer = []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def pipeline(self, transaction: bool = False, max_commands: Optional[int] = None,
+                 max_delay: Optional[float] = None) -> 'UpstashPipeline':
+        return self.client.pipeline(transaction, max_commands, max_delay)
+
+    def pubsub(self) -> 'UpstashPubSub':
+        return self.client.pubsub()
 
 
 class UpstashPubSub(BasePubSub):
@@ -449,13 +716,14 @@ class UpstashPubSub(BasePubSub):
 
         messages = []
 
-        for channel in self.subscribed_channels:
+        # Read new entries since each channel's last_id, in one round trip
+        channels = sorted(self.subscribed_channels)
+        pipe = self.client.pipeline()
+        for channel in channels:
             stream_key = f"{self.client.PUBSUB_STREAM_PREFIX}{channel}"
-            last_id = self.last_ids.get(channel, "0")
-
-            # Read new entries since last_id
-            result = self.client.xrange(stream_key, f"({last_id}", "+", count=10)
+            pipe.xrange(stream_key, f"({self.last_ids.get(channel, '0')}", "+", count=10)
 
+        for channel, result in zip(channels, pipe.execute()):
             if result:
                 for entry in result:
                     if not isinstance(entry, list) or len(entry) < 2:
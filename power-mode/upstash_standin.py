@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Upstash REST Stand-In
+A local HTTP server speaking the subset of the Upstash REST API that
+upstash_adapter.py uses, backed by in-memory Redis-like data.
+
+It counts HTTPS round trips and commands, so tests and benchmarks can check
+how many requests a code path costs without a cloud account. An optional
+per-request latency simulates the network distance to Upstash.
+
+Endpoints (Bearer token auth, JSON bodies):
+    POST /             ["CMD", "arg", ...]          -> {"result": ...}
+    POST /pipeline     [["CMD", ...], ...]          -> [{"result": ...}, ...]
+    POST /multi-exec   [["CMD", ...], ...]          -> [{"result": ...}, ...]
+
+Usage:
+    with UpstashStandIn(latency=0.02) as server:
+        client = UpstashRedisClient(url=server.url, token=server.token)
+        ...
+        print(server.round_trips, server.commands)
+
+    python upstash_standin.py --port 8079   # then point UPSTASH_REDIS_REST_URL at it
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CommandError(Exception):
+    """A command the stand-in rejects (returned as {"error": ...})."""
+
+
+# =============================================================================
+# IN-MEMORY DATA
+# =============================================================================
+
+class RedisState:
+    """In-memory strings, hashes, lists, sorted sets and streams with key expiry."""
+
+    def __init__(self):
+        self.strings: Dict[str, str] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.lists: Dict[str, List[str]] = {}
+        self.zsets: Dict[str, Dict[str, float]] = {}
+        self.streams: Dict[str, List[Tuple[str, List[str]]]] = {}
+        self.expires: Dict[str, float] = {}
+        self._last_stream_id = (0, 0)
+
+    def _stores(self):
+        return (self.strings, self.hashes, self.lists, self.zsets, self.streams)
+
+    def _purge(self, key: str):
+        at = self.expires.get(key)
+        if at is not None and at <= time.time():
+            self._drop(key)
+
+    def _drop(self, key: str) -> bool:
+        self.expires.pop(key, None)
+        return any(store.pop(key, None) is not None for store in self._stores())
+
+    def _exists(self, key: str) -> bool:
+        self._purge(key)
+        return any(key in store for store in self._stores())
+
+    def _next_stream_id(self) -> str:
+        ms = int(time.time() * 1000)
+        last_ms, last_seq = self._last_stream_id
+        self._last_stream_id = (ms, 0) if ms > last_ms else (last_ms, last_seq + 1)
+        return "%d-%d" % self._last_stream_id
+
+    @staticmethod
+    def _parse_id(value: str, default_seq: int) -> Tuple[int, int]:
+        ms, _, seq = value.partition("-")
+        return int(ms), int(seq) if seq else default_seq
+
+    def _id_in_range(self, entry_id: str, low: str, high: str) -> bool:
+        key = self._parse_id(entry_id, 0)
+        if low != "-":
+            exclusive = low.startswith("(")
+            bound = self._parse_id(low.lstrip("("), 0)
+            if key < bound or (exclusive and key == bound):
+                return False
+        if high != "+":
+            exclusive = high.startswith("(")
+            bound = self._parse_id(high.lstrip("("), 2 ** 63)
+            if key > bound or (exclusive and key == bound):
+                return False
+        return True
+
+    @staticmethod
+    def _score_bound(value: str) -> Tuple[float, bool]:
+        """(score, exclusive) for a ZRANGEBYSCORE bound like "(1.5" or "-inf"."""
+        exclusive = value.startswith("(")
+        return float(value.lstrip("(")), exclusive
+
+    def _zrange_by_score(self, key: str, low: str, high: str, options: List[str],
+                         reverse: bool) -> List[str]:
+        low_score, low_open = self._score_bound(low)
+        high_score, high_open = self._score_bound(high)
+        withscores = any(o.upper() == "WITHSCORES" for o in options)
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]),
+                       reverse=reverse)
+        items = [(member, score) for member, score in items
+                 if (score > low_score if low_open else score >= low_score)
+                 and (score < high_score if high_open else score <= high_score)]
+        upper = [o.upper() for o in options]
+        if "LIMIT" in upper:
+            i = upper.index("LIMIT")
+            offset, count = int(options[i + 1]), int(options[i + 2])
+            items = items[offset:offset + count if count >= 0 else None]
+        if withscores:
+            return [x for member, score in items for x in (member, repr(score))]
+        return [member for member, _ in items]
+
+    def execute(self, args: List[str]) -> Any:
+        """Run one command; raises CommandError for unsupported input."""
+        if not args:
+            raise CommandError("ERR empty command")
+        cmd, rest = str(args[0]).upper(), [str(a) for a in args[1:]]
+        if rest:
+            self._purge(rest[0])
+
+        if cmd == "PING":
+            return "PONG"
+        if cmd == "SET":
+            self._drop(rest[0])
+            self.strings[rest[0]] = rest[1]
+            if len(rest) >= 4 and rest[2].upper() == "EX":
+                self.expires[rest[0]] = time.time() + int(rest[3])
+            return "OK"
+        if cmd == "GET":
+            return self.strings.get(rest[0])
+        if cmd == "DEL":
+            return sum(1 for key in rest if self._exists(key) and self._drop(key))
+        if cmd == "EXISTS":
+            return sum(1 for key in rest if self._exists(key))
+        if cmd == "KEYS":
+            import fnmatch
+            keys = {k for store in self._stores() for k in store if self._exists(k)}
+            return sorted(k for k in keys if fnmatch.fnmatchcase(k, rest[0]))
+        if cmd == "HSET":
+            fields = self.hashes.setdefault(rest[0], {})
+            pairs = list(zip(rest[1::2], rest[2::2]))
+            added = sum(1 for k, _ in pairs if k not in fields)
+            fields.update(pairs)
+            return added
+        if cmd == "HGET":
+            return self.hashes.get(rest[0], {}).get(rest[1])
+        if cmd == "HGETALL":
+            return [x for item in self.hashes.get(rest[0], {}).items() for x in item]
+        if cmd == "HMGET":
+            fields = self.hashes.get(rest[0], {})
+            return [fields.get(k) for k in rest[1:]]
+        if cmd == "HDEL":
+            fields = self.hashes.get(rest[0], {})
+            return sum(1 for k in rest[1:] if fields.pop(k, None) is not None)
+        if cmd in ("LPUSH", "RPUSH"):
+            lst = self.lists.setdefault(rest[0], [])
+            for value in rest[1:]:
+                if cmd == "LPUSH":
+                    lst.insert(0, value)
+                else:
+                    lst.append(value)
+            return len(lst)
+        if cmd == "LRANGE":
+            lst = self.lists.get(rest[0], [])
+            start, stop = int(rest[1]), int(rest[2])
+            return lst[start:stop + 1 if stop != -1 else None]
+        if cmd == "LPOP":
+            lst = self.lists.get(rest[0], [])
+            return lst.pop(0) if lst else None
+        if cmd == "ZADD":
+            members = self.zsets.setdefault(rest[0], {})
+            pairs = [(member, float(score)) for score, member in zip(rest[1::2], rest[2::2])]
+            added = sum(1 for member, _ in pairs if member not in members)
+            members.update(pairs)
+            return added
+        if cmd == "ZREM":
+            members = self.zsets.get(rest[0], {})
+            return sum(1 for member in rest[1:] if members.pop(member, None) is not None)
+        if cmd == "ZRANGEBYSCORE":
+            return self._zrange_by_score(rest[0], rest[1], rest[2], rest[3:], reverse=False)
+        if cmd == "ZREVRANGEBYSCORE":
+            return self._zrange_by_score(rest[0], rest[2], rest[1], rest[3:], reverse=True)
+        if cmd == "ZREMRANGEBYSCORE":
+            members = self.zsets.get(rest[0], {})
+            doomed = self._zrange_by_score(rest[0], rest[1], rest[2], [], reverse=False)
+            for member in doomed:
+                del members[member]
+            return len(doomed)
+        if cmd == "EXPIRE":
+            if not self._exists(rest[0]):
+                return 0
+            self.expires[rest[0]] = time.time() + int(rest[1])
+            return 1
+        if cmd == "TTL":
+            if not self._exists(rest[0]):
+                return -2
+            at = self.expires.get(rest[0])
+            return -1 if at is None else max(int(at - time.time()), 0)
+        if cmd == "XADD":
+            key, i, maxlen = rest[0], 1, None
+            if rest[i].upper() == "MAXLEN":
+                i += 1
+                if rest[i] in ("~", "="):
+                    i += 1
+                maxlen, i = int(rest[i]), i + 1
+            entry_id = self._next_stream_id() if rest[i] == "*" else rest[i]
+            stream = self.streams.setdefault(key, [])
+            stream.append((entry_id, rest[i + 1:]))
+            if maxlen is not None and len(stream) > maxlen:
+                del stream[:len(stream) - maxlen]
+            return entry_id
+        if cmd in ("XRANGE", "XREVRANGE"):
+            key, low, high = rest[0], rest[1], rest[2]
+            if cmd == "XREVRANGE":
+                low, high = high, low
+            count = int(rest[4]) if len(rest) >= 5 and rest[3].upper() == "COUNT" else None
+            entries = self.streams.get(key, [])
+            if cmd == "XREVRANGE":
+                entries = list(reversed(entries))
+            matched = [[eid, list(fields)] for eid, fields in entries
+                       if self._id_in_range(eid, low, high)]
+            return matched[:count] if count is not None else matched
+        if cmd == "XREAD":
+            upper = [a.upper() for a in rest]
+            count = int(rest[upper.index("COUNT") + 1]) if "COUNT" in upper else None
+            names = rest[upper.index("STREAMS") + 1:]
+            keys, after = names[:len(names) // 2], names[len(names) // 2:]
+            replies = []
+            for key, last in zip(keys, after):
+                self._purge(key)
+                entries = self.streams.get(key, [])
+                if last == "$":
+                    continue
+                matched = [[eid, list(fields)] for eid, fields in entries
+                           if self._id_in_range(eid, f"({last}", "+")]
+                if matched:
+                    replies.append([key, matched[:count] if count is not None else matched])
+            return replies or None  # BLOCK is ignored: reads never wait
+        raise CommandError(f"ERR unsupported command '{cmd}'")
+
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+class UpstashStandIn:
+    """Threaded local Upstash REST server with round-trip accounting."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 token: str = "standin-token", latency: float = 0.0):
+        """
+        Args:
+            host: Bind address
+            port: Bind port (0 = any free port)
+            token: Bearer token clients must send
+            latency: Seconds added to every request (simulated network RTT)
+        """
+        self.token = token
+        self.latency = latency
+        self.state = RedisState()
+        self.round_trips = 0
+        self.commands = 0
+        self.requests: List[str] = []  # Endpoint path per round trip
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counts(self):
+        with self._lock:
+            self.round_trips = 0
+            self.commands = 0
+            self.requests = []
+
+    def start(self) -> 'UpstashStandIn':
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'UpstashStandIn':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _run(self, command: List[str]) -> Dict[str, Any]:
+        try:
+            return {"result": self.state.execute(command)}
+        except (CommandError, IndexError, ValueError) as e:
+            return {"error": str(e) or "ERR syntax error"}
+
+    def handle(self, path: str, payload: Any) -> Tuple[int, Any]:
+        """Serve one request; returns (status, JSON body)."""
+        with self._lock:
+            self.round_trips += 1
+            self.requests.append(path)
+            if path == "/":
+                self.commands += 1
+                return 200, self._run(payload)
+            if path in ("/pipeline", "/multi-exec"):
+                if not isinstance(payload, list):
+                    return 400, {"error": "ERR pipeline body must be an array"}
+                self.commands += len(payload)
+                return 200, [self._run(command) for command in payload]
+            return 404, {"error": f"ERR unknown endpoint {path}"}
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if standin.latency:
+                    time.sleep(standin.latency)
+                if self.headers.get("Authorization") != f"Bearer {standin.token}":
+                    status, body = 401, {"error": "Unauthorized"}
+                else:
+                    length = int(self.headers.get("Content-Length", 0))
+                    try:
+                        payload = json.loads(self.rfile.read(length) or b"null")
+                        status, body = standin.handle(self.path.rstrip("/") or "/", payload)
+                    except ValueError:
+                        status, body = 400, {"error": "ERR invalid JSON"}
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# =============================================================================
+# CLI INTERFACE
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local Upstash REST stand-in")
+    parser.add_argument("--port", type=int, default=8079)
+    parser.add_argument("--token", default="standin-token")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated network RTT")
+    args = parser.parse_args()
+
+    server = UpstashStandIn(port=args.port, token=args.token, latency=args.latency_ms / 1000)
+    print(f"UPSTASH_REDIS_REST_URL={server.url}")
+    print(f"UPSTASH_REDIS_REST_TOKEN={server.token}")
+    server.start()
+    try:
+        while True:
+            time.sleep(5)
+            print(f"round trips: {server.round_trips}, commands: {server.commands}")
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+ANN Search Benchmark
+
+Recall@k vs. latency for EmbeddingStore's IVF index (ann_index.py) against
+exact search over the packed sidecar, across store sizes and n_probe values.
+
+Vectors are drawn around random cluster centers, which is closer to real
+embeddings than uniform noise (uniform data is IVF's worst case).
+
+Usage:
+    python ann_search_benchmark.py                          # 20k/100k vectors
+    python ann_search_benchmark.py --sizes 10000 --dim 256
+    python ann_search_benchmark.py --probes 4,8,16,32 --top-k 10
+    python ann_search_benchmark.py --json
+"""
+
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "hooks" / "utils"))
+
+from embedding_store import EmbeddingStore, EmbeddingRecord
+from vector_index import HAS_NUMPY
+
+
+@dataclass
+class AnnBenchmarkResult:
+    """Recall and latency for one store size and n_probe."""
+    vectors: int
+    dim: int
+    n_lists: int
+    n_probe: int
+    exact_median_ms: float
+    ann_median_ms: float
+    train_ms: float
+    speedup: float
+    recall_at_k: float
+
+
+def clustered_vectors(rng: random.Random, count: int, dim: int, clusters: int):
+    """Yield vectors scattered around `clusters` random centers."""
+    centers = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(clusters)]
+    for i in range(count):
+        center = centers[rng.randrange(clusters)]
+        yield [c + rng.gauss(0, 0.35) for c in center]
+
+
+def populate(store: EmbeddingStore, count: int, dim: int, rng: random.Random) -> None:
+    """Fill a store with clustered synthetic vectors."""
+    source_types = ["agent", "skill", "research", "pattern"]
+    batch = []
+    for i, vector in enumerate(clustered_vectors(rng, count, dim, max(16, count // 500))):
+        batch.append(EmbeddingRecord(
+            id=f"bench-{i}",
+            content=f"Synthetic content {i}",
+            embedding=vector,
+            source_type=source_types[i % len(source_types)],
+            source_id=f"source-{i}",
+        ))
+        if len(batch) >= 1000:
+            store.store_batch(batch)
+            batch = []
+    store.store_batch(batch)
+
+
+def time_searches(store: EmbeddingStore, queries: List[List[float]], top_k: int):
+    """Run queries and return (latencies_ms, result id lists)."""
+    latencies = []
+    id_lists = []
+    for query in queries:
+        start = time.perf_counter()
+        results = store.search(query, top_k=top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        id_lists.append([r.record.id for r in results])
+    return latencies, id_lists
+
+
+def run_size(count: int, dim: int, probes: List[int], num_queries: int,
+             top_k: int, seed: int) -> List[AnnBenchmarkResult]:
+    """Benchmark exact search and each n_probe for one store size."""
+    rng = random.Random(seed)
+    temp_dir = Path(tempfile.mkdtemp(prefix="popkit-ann-bench-"))
+    try:
+        db_path = temp_dir / "embeddings.db"
+        populate(EmbeddingStore(db_path, use_ann_index=False), count, dim, rng)
+        queries = list(clustered_vectors(rng, num_queries, dim, max(16, count // 500)))
+
+        exact_store = EmbeddingStore(db_path, use_ann_index=False)
+        exact_store.search(queries[0], top_k=top_k)  # Build the packed sidecar
+        exact_latencies, exact_ids = time_searches(exact_store, queries, top_k)
+        exact_median = statistics.median(exact_latencies)
+
+        ann_store = EmbeddingStore(db_path, use_ann_index=True, ann_threshold=0)
+        start = time.perf_counter()
+        ann = ann_store.rebuild_ann_index()
+        train_ms = (time.perf_counter() - start) * 1000
+
+        results = []
+        for n_probe in probes:
+            ann_store.ann_n_probe = n_probe
+            ann_latencies, ann_ids = time_searches(ann_store, queries, top_k)
+            ann_median = statistics.median(ann_latencies)
+            recall = statistics.mean(
+                len(set(a) & set(b)) / max(len(a), 1) for a, b in zip(exact_ids, ann_ids)
+            )
+            results.append(AnnBenchmarkResult(
+                vectors=count,
+                dim=dim,
+                n_lists=ann.n_lists,
+                n_probe=n_probe,
+                exact_median_ms=round(exact_median, 3),
+                ann_median_ms=round(ann_median, 3),
+                train_ms=round(train_ms, 1),
+                speedup=round(exact_median / ann_median, 1) if ann_median else 0.0,
+                recall_at_k=round(recall, 3),
+            ))
+        return results
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EmbeddingStore ANN recall/latency benchmark")
+    parser.add_argument("--sizes", default="20000,100000",
+                        help="Comma-separated store sizes")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector dimension")
+    parser.add_argument("--probes", default="1,4,8,16,32", help="Comma-separated n_probe values")
+    parser.add_argument("--queries", type=int, default=20, help="Queries per size")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query (k in recall@k)")
+    parser.add_argument("--seed", type=int, default=19, help="RNG seed")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    probes = [int(p) for p in args.probes.split(",") if p.strip()]
+    results = []
+    for size in sizes:
+        if not args.json:
+            print(f"Benchmarking {size} vectors x {args.dim} dims...", file=sys.stderr)
+        results.extend(run_size(size, args.dim, probes, args.queries, args.top_k, args.seed))
+
+    if args.json:
+        print(json.dumps({
+            "numpy": HAS_NUMPY,
+            "top_k": args.top_k,
+            "results": [asdict(r) for r in results]
+        }, indent=2))
+        return
+
+    print(f"\nBackend: {'numpy' if HAS_NUMPY else 'stdlib'}, k={args.top_k}\n")
+    print("| Vectors | Lists | n_probe | Exact p50 (ms) | ANN p50 (ms) | Train (ms) | Speedup | Recall@k |")
+    print("|---------|-------|---------|----------------|--------------|------------|---------|----------|")
+    for r in results:
+        print(
+            f"| {r.vectors} | {r.n_lists} | {r.n_probe} | {r.exact_median_ms:.2f} | "
+            f"{r.ann_median_ms:.2f} | {r.train_ms:.0f} | {r.speedup}x | {r.recall_at_k:.3f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
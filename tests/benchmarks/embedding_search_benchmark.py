@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Embedding Search Benchmark
+
+Compares EmbeddingStore search latency between:
+- Row-scan path: SELECT * + per-row vector decode + cosine similarity
+- Packed path: memory-mapped float32 sidecar (vector_index.py)
+
+Part of Issue #19 (Embeddings Enhancement)
+
+Usage:
+    python embedding_search_benchmark.py                       # 1k/10k/100k vectors
+    python embedding_search_benchmark.py --sizes 1000,5000     # Custom sizes
+    python embedding_search_benchmark.py --dim 256 --queries 20
+    python embedding_search_benchmark.py --json
+"""
+
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "hooks" / "utils"))
+
+from embedding_store import EmbeddingStore, EmbeddingRecord
+from vector_index import HAS_NUMPY
+
+
+@dataclass
+class SearchBenchmarkResult:
+    """Latency comparison for one store size."""
+    vectors: int
+    dim: int
+    queries: int
+    scan_median_ms: float
+    packed_median_ms: float
+    packed_build_ms: float
+    speedup: float
+    top_k_agreement: float
+
+
+def random_vector(rng: random.Random, dim: int) -> List[float]:
+    """Generate a random embedding-like vector."""
+    return [rng.uniform(-1.0, 1.0) for _ in range(dim)]
+
+
+def populate(store: EmbeddingStore, count: int, dim: int, rng: random.Random) -> None:
+    """Fill a store with synthetic agent/skill/research vectors."""
+    source_types = ["agent", "skill", "research", "project-skill"]
+    batch = []
+    for i in range(count):
+        batch.append(EmbeddingRecord(
+            id=f"bench-{i}",
+            content=f"Synthetic content {i}",
+            embedding=random_vector(rng, dim),
+            source_type=source_types[i % len(source_types)],
+            source_id=f"source-{i}",
+        ))
+        if len(batch) >= 1000:
+            store.store_batch(batch)
+            batch = []
+    store.store_batch(batch)
+
+
+def time_searches(store: EmbeddingStore, queries: List[List[float]], top_k: int):
+    """Run queries and return (latencies_ms, result id lists)."""
+    latencies = []
+    id_lists = []
+    for query in queries:
+        start = time.perf_counter()
+        results = store.search(query, top_k=top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        id_lists.append([r.record.id for r in results])
+    return latencies, id_lists
+
+
+def run_size(count: int, dim: int, num_queries: int, top_k: int, seed: int) -> SearchBenchmarkResult:
+    """Benchmark both search paths for one store size."""
+    rng = random.Random(seed)
+    temp_dir = Path(tempfile.mkdtemp(prefix="popkit-embed-bench-"))
+    try:
+        db_path = temp_dir / "embeddings.db"
+        populate(EmbeddingStore(db_path), count, dim, rng)
+        queries = [random_vector(rng, dim) for _ in range(num_queries)]
+
+        scan_store = EmbeddingStore(db_path, use_vector_index=False)
+        scan_latencies, scan_ids = time_searches(scan_store, queries, top_k)
+
+        packed_store = EmbeddingStore(db_path)
+        start = time.perf_counter()
+        packed_store.rebuild_vector_index()
+        build_ms = (time.perf_counter() - start) * 1000
+        packed_latencies, packed_ids = time_searches(packed_store, queries, top_k)
+
+        agreement = statistics.mean(
+            len(set(a) & set(b)) / max(len(a), 1) for a, b in zip(scan_ids, packed_ids)
+        )
+        scan_median = statistics.median(scan_latencies)
+        packed_median = statistics.median(packed_latencies)
+
+        return SearchBenchmarkResult(
+            vectors=count,
+            dim=dim,
+            queries=num_queries,
+            scan_median_ms=round(scan_median, 3),
+            packed_median_ms=round(packed_median, 3),
+            packed_build_ms=round(build_ms, 1),
+            speedup=round(scan_median / packed_median, 1) if packed_median else 0.0,
+            top_k_agreement=round(agreement, 3),
+        )
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EmbeddingStore search benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated store sizes")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector dimension")
+    parser.add_argument("--queries", type=int, default=5, help="Queries per size")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--seed", type=int, default=19, help="RNG seed")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    for size in sizes:
+        if not args.json:
+            print(f"Benchmarking {size} vectors x {args.dim} dims...", file=sys.stderr)
+        results.append(run_size(size, args.dim, args.queries, args.top_k, args.seed))
+
+    if args.json:
+        print(json.dumps({
+            "numpy": HAS_NUMPY,
+            "results": [asdict(r) for r in results]
+        }, indent=2))
+        return
+
+    print(f"\nPacked backend: {'numpy' if HAS_NUMPY else 'stdlib'}\n")
+    print("| Vectors | Dim | Scan p50 (ms) | Packed p50 (ms) | Build (ms) | Speedup | Top-k agree |")
+    print("|---------|-----|---------------|-----------------|------------|---------|-------------|")
+    for r in results:
+        print(
+            f"| {r.vectors} | {r.dim} | {r.scan_median_ms:.2f} | {r.packed_median_ms:.2f} | "
+            f"{r.packed_build_ms:.0f} | {r.speedup}x | {r.top_k_agreement:.2f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
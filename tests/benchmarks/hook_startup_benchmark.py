@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Hook Startup Benchmark
+
+Measures the cold-start import cost of every hook in hooks/hook_registry.json
+with `python -X importtime`. Each hook runs end to end as __main__ on a
+representative payload for its event (a Read call for tool hooks that match
+Read, otherwise the first tool they match), so imports its main() triggers
+on the common path count too, not only the module-level ones. The cost of the loader itself is subtracted using an
+empty script as the baseline. --import-only loads hooks as modules instead.
+
+A hook fails when its import cost exceeds its millisecond budget, so heavy
+imports (requests, sqlite3, API clients) show up in CI instead of silently
+slowing every tool call. Use hooks/utils/lazy_import.py to defer them.
+
+Usage:
+    python hook_startup_benchmark.py                          # Default 50ms budget
+    python hook_startup_benchmark.py --budget-ms 30
+    python hook_startup_benchmark.py --budget post-tool-use.py=40
+    python hook_startup_benchmark.py --hooks pre-tool-use.py --runs 10
+    python hook_startup_benchmark.py --import-only            # Module level only
+    python hook_startup_benchmark.py --json
+
+Exit code is 1 if any hook is over budget.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Tuple
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+
+DEFAULT_BUDGET_MS = 50.0
+
+IMPORT_LOADER = (
+    "import importlib.util, sys\n"
+    "spec = importlib.util.spec_from_file_location('hook_under_test', sys.argv[1])\n"
+    "module = importlib.util.module_from_spec(spec)\n"
+    "spec.loader.exec_module(module)\n"
+)
+
+# Runs the hook as __main__; exit code 2 (a blocking decision) is not an error
+RUN_LOADER = (
+    "import runpy, sys\n"
+    "try:\n"
+    "    runpy.run_path(sys.argv[1], run_name='__main__')\n"
+    "except SystemExit as e:\n"
+    "    if e.code not in (None, 0, 2):\n"
+    "        raise\n"
+)
+
+SESSION_ID = "hook-startup-benchmark"
+
+TOOL_EVENTS = ("PreToolUse", "PostToolUse")
+
+# tool_input used for each tool a hook may be matched on
+TOOL_INPUTS = {
+    "Read": {"file_path": "README.md"},
+    "Write": {"file_path": "notes.md", "content": "# Notes\n"},
+    "Edit": {"file_path": "notes.md", "old_string": "Notes", "new_string": "Todo"},
+    "Bash": {"command": "ls"},
+    "Task": {"description": "Review", "prompt": "Review the change", "subagent_type": "code-reviewer"},
+}
+
+# Payload per non-tool event; events not listed get {"session_id": ...}
+EVENT_PAYLOADS = {
+    "UserPromptSubmit": {"session_id": SESSION_ID, "prompt": "explain this file"},
+}
+
+
+@dataclass
+class HookStartupResult:
+    """Import cost for one hook."""
+    hook: str
+    import_ms: float
+    wall_ms: float
+    budget_ms: float
+    over_budget: bool
+    top_imports: List[Tuple[str, float]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def registry_events() -> Dict[str, Tuple[str, str]]:
+    """Unique hook scripts in the dispatch registry, in order -> (first event, its matcher)."""
+    registry = json.loads((HOOKS_DIR / "hook_registry.json").read_text(encoding="utf-8"))
+    events: Dict[str, Tuple[str, str]] = {}
+    for event, handlers in registry.get("events", {}).items():
+        for handler in handlers:
+            events.setdefault(handler["script"], (event, handler.get("matcher", "")))
+    return events
+
+
+def registry_hooks() -> List[str]:
+    """Unique hook scripts referenced by the dispatch registry, in order."""
+    return list(registry_events())
+
+
+def hook_payload(hook: str, events: Dict[str, Tuple[str, str]]) -> str:
+    """JSON stdin for running a hook end to end."""
+    event, matcher = events.get(hook, ("PreToolUse", ""))
+    if event not in TOOL_EVENTS:
+        return json.dumps(EVENT_PAYLOADS.get(event, {"session_id": SESSION_ID}))
+
+    tools = [t for t in matcher.split("|") if t in TOOL_INPUTS]
+    tool = "Read" if not matcher or "Read" in tools else (tools[0] if tools else "Read")
+    return json.dumps({
+        "session_id": SESSION_ID,
+        "tool_name": tool,
+        "tool_input": TOOL_INPUTS[tool],
+        "tool_response": {"success": True},
+    })
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Top-level cumulative import times (ms) from -X importtime output."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        # Nested imports are indented under their parent; count roots only
+        if name.startswith("  "):
+            continue
+        imports[name.strip()] = imports.get(name.strip(), 0.0) + int(cumulative) / 1000
+    return imports
+
+
+def load_once(script: Path, env: Dict[str, str], cwd: str,
+              payload: Optional[str] = None) -> Tuple[Dict[str, float], float, Optional[str]]:
+    """
+    Load a script in a fresh interpreter; returns (imports, wall ms, error).
+
+    With a payload the script runs as __main__ with it on stdin; without one
+    it is only imported.
+    """
+    loader = IMPORT_LOADER if payload is None else RUN_LOADER
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", loader, str(script)],
+        input=payload or "", capture_output=True, text=True,
+        env=env, cwd=cwd, timeout=60
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    error = None
+    if result.returncode != 0:
+        lines = [l for l in result.stderr.splitlines() if not l.startswith("import time:")]
+        error = lines[-1] if lines else f"exit code {result.returncode}"
+    return parse_importtime(result.stderr), wall_ms, error
+
+
+def measure(script: Path, runs: int, env: Dict[str, str], cwd: str, payload: Optional[str] = None):
+    """Median import total, median wall time, and the slowest root imports."""
+    totals, walls = [], []
+    per_module: Dict[str, List[float]] = {}
+    error = None
+    for _ in range(runs):
+        imports, wall_ms, error = load_once(script, env, cwd, payload)
+        totals.append(sum(imports.values()))
+        walls.append(wall_ms)
+        for name, ms in imports.items():
+            per_module.setdefault(name, []).append(ms)
+    medians = {name: statistics.median(values) for name, values in per_module.items()}
+    return statistics.median(totals), statistics.median(walls), medians, error
+
+
+def run_benchmark(hooks: List[str], runs: int, default_budget: float,
+                  budgets: Dict[str, float], import_only: bool = False) -> Tuple[float, List[HookStartupResult]]:
+    """Benchmark each hook against the empty-script baseline."""
+    events = registry_events()
+    with tempfile.TemporaryDirectory(prefix="popkit-hook-startup-") as temp_dir:
+        # Hooks must not read the developer's ~/.claude state while measured
+        env = {**os.environ, "HOME": temp_dir, "POPKIT_HOOK_DAEMON": "0"}
+        empty = Path(temp_dir) / "empty.py"
+        empty.write_text("")
+
+        base_payload = None if import_only else "{}"
+        base_total, base_wall, base_modules, _ = measure(empty, runs, env, temp_dir, base_payload)
+
+        results = []
+        for hook in hooks:
+            payload = None if import_only else hook_payload(hook, events)
+            total, wall, modules, error = measure(HOOKS_DIR / hook, runs, env, temp_dir, payload)
+            budget = budgets.get(hook, default_budget)
+            import_ms = max(total - base_total, 0.0)
+            top = sorted(
+                ((name, round(ms, 2)) for name, ms in modules.items() if name not in base_modules),
+                key=lambda item: item[1], reverse=True
+            )[:5]
+            results.append(HookStartupResult(
+                hook=hook,
+                import_ms=round(import_ms, 2),
+                wall_ms=round(max(wall - base_wall, 0.0), 2),
+                budget_ms=budget,
+                over_budget=error is not None or import_ms > budget,
+                top_imports=top,
+                error=error,
+            ))
+    return base_wall, results
+
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    """Parse repeated --budget hook.py=ms overrides."""
+    budgets = {}
+    for value in values:
+        hook, _, ms = value.partition("=")
+        if not ms:
+            raise argparse.ArgumentTypeError(f"expected hook.py=ms, got {value!r}")
+        budgets[hook.strip()] = float(ms)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hook cold-start import budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Import budget per hook in milliseconds")
+    parser.add_argument("--budget", action="append", default=[], metavar="HOOK=MS",
+                        help="Per-hook budget override (repeatable)")
+    parser.add_argument("--hooks", default="",
+                        help="Comma-separated hook scripts (default: all registered)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per hook (median)")
+    parser.add_argument("--import-only", action="store_true",
+                        help="Only import each hook instead of running it on a payload")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    hooks = [h.strip() for h in args.hooks.split(",") if h.strip()] or registry_hooks()
+    base_wall, results = run_benchmark(hooks, args.runs, args.budget_ms, parse_budgets(args.budget),
+                                       args.import_only)
+    failed = [r for r in results if r.over_budget]
+
+    if args.json:
+        print(json.dumps({
+            "python": sys.version.split()[0],
+            "baseline_wall_ms": round(base_wall, 2),
+            "results": [asdict(r) for r in results],
+            "failed": [r.hook for r in failed],
+        }, indent=2))
+    else:
+        print(f"\nBaseline interpreter start: {base_wall:.1f}ms (python {sys.version.split()[0]})\n")
+        print("| Hook | Imports (ms) | Wall over baseline (ms) | Budget (ms) | Status | Slowest imports |")
+        print("|------|--------------|-------------------------|-------------|--------|-----------------|")
+        for r in results:
+            status = "ERROR" if r.error else ("OVER" if r.over_budget else "ok")
+            slowest = ", ".join(f"{name} {ms:.1f}" for name, ms in r.top_imports[:3])
+            print(f"| {r.hook} | {r.import_ms:.1f} | {r.wall_ms:.1f} | {r.budget_ms:.0f} | {status} | {slowest} |")
+        for r in results:
+            if r.error:
+                print(f"\n{r.hook}: {r.error}", file=sys.stderr)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
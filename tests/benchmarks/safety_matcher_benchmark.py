@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Safety Matcher Benchmark
+
+Compares PreToolUse blocked-command checking between:
+- Per-rule path: re.search over every rule (the original check_safety_violations)
+- Matcher path: literal-prefiltered SafetyRuleMatcher (hooks/utils/safety_matcher.py)
+
+Each path is timed "cold" (fresh process: re cache purged / matcher rebuilt
+from its on-disk plan for every command) and "warm" (hook daemon, compiled
+state reused). The corpus is a set of real-world Bash commands as issued by
+agents; pass --corpus to use your own (e.g. ~/.bash_history).
+
+Usage:
+    python safety_matcher_benchmark.py
+    python safety_matcher_benchmark.py --corpus ~/.bash_history --repeat 20
+    python safety_matcher_benchmark.py --json
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import importlib.util
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Callable, List
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+sys.path.insert(0, str(HOOKS_DIR / "utils"))
+
+from safety_matcher import SafetyRuleMatcher
+
+# Representative agent-issued commands, plus a few the rules must catch
+CORPUS = [
+    "git status",
+    "git diff --stat HEAD~1",
+    "git log --oneline -20",
+    "git add src/ && git commit -m 'Fix login redirect'",
+    "git checkout -b feature/search-filters",
+    "git push -u origin feature/search-filters",
+    "git rebase origin/main",
+    "gh pr create --title 'Add search filters' --body-file /tmp/pr.md",
+    "gh issue list --label bug --limit 20",
+    "npm install",
+    "npm run build",
+    "npm test -- --watch=false",
+    "npx tsc --noEmit",
+    "npx eslint src --ext .ts,.tsx",
+    "pnpm -r run lint",
+    "yarn add -D vitest",
+    "python -m pytest -q tests/",
+    "python -m pytest tests/test_models.py -k 'delete' -x",
+    "pip install -r requirements.txt",
+    "python manage.py migrate",
+    "ruff check . --fix",
+    "mypy src/",
+    "cargo build --release",
+    "cargo test -- --nocapture",
+    "go test ./...",
+    "make -j8",
+    "docker compose up -d db",
+    "docker build -t api:dev .",
+    "kubectl get pods -n staging",
+    "ls -la",
+    "ls -la ~/.config",
+    "find . -name '*.py' -not -path './node_modules/*'",
+    "grep -rn 'TODO' src/ | head -50",
+    "cat package.json | jq '.scripts'",
+    "wc -l src/**/*.ts",
+    "mkdir -p build/reports",
+    "cp .env.example .env.local",
+    "mv dist/app.js dist/app.min.js",
+    "rm -rf node_modules/.cache",
+    "rm -f coverage/lcov.info",
+    "chmod +x scripts/deploy.sh",
+    "curl -s http://localhost:3000/health",
+    "curl -sS -X POST localhost:8080/api/items -d @fixtures/item.json",
+    "echo $PATH",
+    "export NODE_ENV=test && npm test",
+    "tail -n 100 logs/app.log",
+    "psql $DATABASE_URL -c 'select count(*) from users'",
+    "sqlite3 data/app.db '.tables'",
+    "tar -czf release.tar.gz dist/",
+    "du -sh node_modules",
+    "ps aux | grep node",
+    "lsof -i :3000",
+    "python scripts/format_models.py --delta",
+    "sed -i 's/old_name/new_name/g' src/config.ts",
+    "awk '{print $1}' access.log | sort | uniq -c | sort -rn | head",
+    # Must be blocked
+    "rm -rf /",
+    "sudo rm -rf /var/lib/app",
+    "chmod 777 /srv/www",
+    "psql -c 'DROP DATABASE production'",
+    "dd if=/dev/zero of=/dev/sda",
+]
+
+
+@dataclass
+class MatcherBenchmarkResult:
+    """Per-command latency for both paths."""
+    commands: int
+    blocked: int
+    per_rule_cold_us: float
+    matcher_cold_us: float
+    per_rule_warm_us: float
+    matcher_warm_us: float
+    cold_speedup: float
+    warm_speedup: float
+    agreement: bool
+
+
+def load_rules() -> List[str]:
+    """Blocked-command rules from pre-tool-use.py."""
+    spec = importlib.util.spec_from_file_location("pre_tool_use_hook", HOOKS_DIR / "pre-tool-use.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SAFETY_RULES["blocked_commands"]
+
+
+def per_rule(rules: List[str], command: str) -> List[str]:
+    """The original check: one re.search per rule."""
+    return [p for p in rules if re.search(p, command, re.IGNORECASE)]
+
+
+def time_per_command(fn: Callable[[str], object], commands: List[str], repeat: int) -> float:
+    """Median over repeats of the mean microseconds per command."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for command in commands:
+            fn(command)
+        samples.append((time.perf_counter() - start) * 1e6 / len(commands))
+    return statistics.median(samples)
+
+
+def run(commands: List[str], repeat: int) -> MatcherBenchmarkResult:
+    rules = load_rules()
+
+    with tempfile.TemporaryDirectory(prefix="popkit-safety-bench-") as cache_dir:
+        warm = SafetyRuleMatcher(rules, cache_dir=Path(cache_dir))
+        agreement = all(
+            [m.pattern for m in warm.search(c)] == per_rule(rules, c) for c in commands
+        )
+        blocked = sum(1 for c in commands if warm.search(c))
+
+        def per_rule_cold(command):
+            re.purge()
+            return per_rule(rules, command)
+
+        def matcher_cold(command):
+            re.purge()
+            return SafetyRuleMatcher(rules, cache_dir=Path(cache_dir)).search(command)
+
+        per_rule_cold_us = time_per_command(per_rule_cold, commands, repeat)
+        matcher_cold_us = time_per_command(matcher_cold, commands, repeat)
+        per_rule_warm_us = time_per_command(lambda c: per_rule(rules, c), commands, repeat)
+        matcher_warm_us = time_per_command(warm.search, commands, repeat)
+
+    return MatcherBenchmarkResult(
+        commands=len(commands),
+        blocked=blocked,
+        per_rule_cold_us=round(per_rule_cold_us, 2),
+        matcher_cold_us=round(matcher_cold_us, 2),
+        per_rule_warm_us=round(per_rule_warm_us, 2),
+        matcher_warm_us=round(matcher_warm_us, 2),
+        cold_speedup=round(per_rule_cold_us / matcher_cold_us, 1) if matcher_cold_us else 0.0,
+        warm_speedup=round(per_rule_warm_us / matcher_warm_us, 1) if matcher_warm_us else 0.0,
+        agreement=agreement,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Safety rule matcher benchmark")
+    parser.add_argument("--corpus", help="File with one Bash command per line")
+    parser.add_argument("--repeat", type=int, default=10, help="Timing repeats (median)")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    commands = CORPUS
+    if args.corpus:
+        text = Path(args.corpus).expanduser().read_text(encoding="utf-8", errors="replace")
+        commands = [line.strip() for line in text.splitlines() if line.strip()]
+
+    result = run(commands, args.repeat)
+
+    if args.json:
+        print(json.dumps(asdict(result), indent=2))
+    else:
+        print(f"\n{result.commands} commands ({result.blocked} blocked), "
+              f"results agree: {result.agreement}\n")
+        print("| Mode | Per-rule (us/cmd) | Matcher (us/cmd) | Speedup |")
+        print("|------|-------------------|------------------|---------|")
+        print(f"| Cold | {result.per_rule_cold_us:.1f} | {result.matcher_cold_us:.1f} | {result.cold_speedup}x |")
+        print(f"| Warm | {result.per_rule_warm_us:.1f} | {result.matcher_warm_us:.1f} | {result.warm_speedup}x |")
+
+    sys.exit(0 if result.agreement else 1)
+
+
+if __name__ == "__main__":
+    main()
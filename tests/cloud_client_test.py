@@ -8,6 +8,9 @@ Part of Issue #68 (Hosted Redis Service).
 import json
 import sys
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from datetime import datetime
@@ -16,12 +19,96 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent / "power-mode"))
 
 from cloud_client import (
+    HTTPConnectionPool,
     PopKitCloudClient,
     CloudConfig,
     UsageStats,
     get_redis_client,
     is_cloud_available
 )
+from protocol import AgentIdentity, AgentState
+
+
+class CloudStandIn:
+    """Local keep-alive HTTP server that records requests and connections."""
+
+    def __init__(self, batch_endpoint: bool = True, stall: float = 0.0, drop_idle: bool = False):
+        self.batch_endpoint = batch_endpoint
+        self.stall = stall          # Seconds to wait before answering a POST
+        self.drop_idle = drop_idle  # Close each connection after one response
+        self.requests = []      # (method, path, body)
+        self.connections = 0
+        self._lock = threading.Lock()
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep connections open
+
+            def setup(self):
+                super().setup()
+                with standin._lock:
+                    standin.connections += 1
+
+            def _reply(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length)) if length else None
+                with standin._lock:
+                    standin.requests.append((self.command, self.path, body))
+                if self.command == "POST" and standin.stall:
+                    time.sleep(standin.stall)
+                status, reply = 200, {"ok": True}
+                if self.path.endswith("/health"):
+                    reply = {"status": "ok"}
+                elif self.path.endswith("/redis/batch") and not standin.batch_endpoint:
+                    status, reply = 404, {"error": "Not found"}
+                data = json.dumps(reply).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                if standin.drop_idle:
+                    self.close_connection = True  # Without telling the client
+
+            do_GET = do_POST = _reply
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def paths(self):
+        return [path for _, path, _ in self.requests]
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def connected_client(server, flush_interval=60.0):
+    client = PopKitCloudClient(CloudConfig(
+        api_key="pk_test", base_url=server.url, flush_interval=flush_interval
+    ))
+    assert client.connect()
+    return client
+
+
+def agent_state(agent_id: str, progress: float) -> AgentState:
+    return AgentState(
+        agent=AgentIdentity(id=agent_id, name="code-reviewer", session_id="s1"),
+        progress=progress, current_task="review", files_touched=[], tools_used=[],
+        tool_call_count=0, decisions=[], blockers=[]
+    )
 
 
 def test_cloud_config_from_env():
@@ -186,6 +273,175 @@ def test_cloud_disabled():
     print("  PASS\n")
 
 
+def test_requests_reuse_keepalive_connection():
+    """Sequential requests share one pooled connection"""
+    print("Test: Keep-alive connection pool")
+
+    with CloudStandIn() as server:
+        client = connected_client(server)
+        for _ in range(5):
+            assert client.check_for_messages("agent-1") == []
+
+        assert server.connections == 1
+        assert client.get_usage()["connections_opened"] == 1
+        assert client.usage.requests_today == 6
+        client.disconnect()
+    print("  [OK] 6 requests over 1 connection")
+
+    print("  PASS\n")
+
+
+def test_pushes_coalesce_into_one_batch():
+    """State, heartbeat and stream pushes go out as one batch per flush"""
+    print("Test: Coalesced pushes")
+
+    with CloudStandIn() as server:
+        client = connected_client(server)
+        for progress in (0.1, 0.2, 0.3):
+            client.push_state("agent-1", {"progress": progress})
+            client.push_heartbeat("agent-1", agent_state("agent-1", progress))
+        client.push_heartbeat("agent-2", agent_state("agent-2", 0.5))
+        client.publish_stream_start("agent-1", "s1", "Bash")
+        for i in range(3):
+            client.publish_stream_chunk({"session_id": "s1", "chunk_index": i})
+        client.publish_stream_end("agent-1", "s1")
+        assert server.paths() == ["/v1/health"]
+
+        client.flush()
+        assert server.paths() == ["/v1/health", "/v1/redis/batch"]
+        entries = server.requests[-1][2]["requests"]
+        states = [e["body"]["state"] for e in entries if e["path"] == "/redis/state"]
+        assert states == [{"progress": 0.3}]
+        beats = [e["body"]["message"]["payload"] for e in entries
+                 if e["body"].get("channel") == "pop:heartbeat"]
+        assert [(b["agent"]["id"], b["progress"]) for b in beats] == [("agent-1", 0.3), ("agent-2", 0.5)]
+        stream = [e["body"]["message"] for e in entries if e["body"].get("channel") == "pop:coordinator"]
+        assert [m.get("type", m.get("chunk_index")) for m in stream] == \
+            ["STREAM_START", 0, 1, 2, "STREAM_END"]
+        print("  [OK] 13 pushes merged into 1 request of 8 entries")
+
+        usage = client.get_usage()
+        assert usage["batches"] == 1 and usage["batched_commands"] == 8
+        assert usage["requests_today"] == 2
+        assert server.connections == 1
+        print("  [OK] Batch tracked in usage")
+
+        client.flush()
+        assert len(server.requests) == 2
+        client.disconnect()
+
+    print("  PASS\n")
+
+
+def test_pushes_flush_on_interval():
+    """Pending pushes are sent once the flush interval passes"""
+    print("Test: Timed flush")
+
+    with CloudStandIn() as server:
+        client = connected_client(server, flush_interval=0.05)
+        client.push_state("agent-1", {"progress": 1.0})
+        deadline = time.monotonic() + 5
+        while len(server.requests) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.paths()[-1] == "/v1/redis/batch"
+
+        # flush_interval=0 sends each push directly
+        direct = connected_client(server, flush_interval=0)
+        direct.push_state("agent-1", {"progress": 1.0})
+        assert server.paths()[-1] == "/v1/redis/state"
+    print("  [OK] Flushed by timer; 0 disables coalescing")
+
+    print("  PASS\n")
+
+
+def test_batch_falls_back_without_endpoint():
+    """Servers without /redis/batch get the pushes one by one"""
+    print("Test: Batch fallback")
+
+    with CloudStandIn(batch_endpoint=False) as server:
+        client = connected_client(server)
+        client.push_state("agent-1", {"progress": 0.5})
+        client.push_state("agent-2", {"progress": 0.7})
+        client.flush()
+        assert server.paths() == ["/v1/health", "/v1/redis/batch",
+                                  "/v1/redis/state", "/v1/redis/state"]
+
+        client.push_state("agent-1", {"progress": 0.9})
+        client.flush()
+        assert server.paths()[-1] == "/v1/redis/state"
+        assert server.paths().count("/v1/redis/batch") == 1
+        assert server.connections == 1
+    print("  [OK] Sent individually, batch endpoint not retried")
+
+    print("  PASS\n")
+
+
+def test_pool_retries_only_unsent_requests():
+    """Dropped idle connections are retried; timed-out POSTs are not re-sent"""
+    print("Test: Connection pool retry policy")
+
+    with CloudStandIn(drop_idle=True) as server:
+        pool = HTTPConnectionPool(timeout=5)
+        for _ in range(3):
+            assert pool.request("POST", server.url + "/redis/state", b"{}")[0] == 200
+        assert len(server.requests) == 3
+        assert pool.connections_opened == server.connections == 3
+        pool.close()
+    print("  [OK] Idle connection closed by the server is replaced")
+
+    with CloudStandIn(stall=0.5) as server:
+        pool = HTTPConnectionPool(timeout=0.1)
+        assert pool.request("GET", server.url + "/health")[0] == 200
+        try:
+            pool.request("POST", server.url + "/redis/state", b"{}")
+            assert False, "expected a timeout"
+        except OSError:
+            pass
+        time.sleep(0.6)
+        assert server.paths() == ["/v1/health", "/v1/redis/state"]
+        pool.close()
+    print("  [OK] Timed-out POST on a reused connection raised, sent once")
+
+    print("  PASS\n")
+
+
+def test_client_replays_only_unsent_posts():
+    """_request re-sends a POST only when it never reached the server"""
+    print("Test: Client retry policy")
+
+    with CloudStandIn(stall=0.5) as server, patch("cloud_client.RETRY_DELAY", 0):
+        client = connected_client(server)
+        client._pool = HTTPConnectionPool(timeout=0.1)
+        try:
+            client._request("POST", "/redis/state", {"agent_id": "agent-1"})
+            assert False, "expected a network error"
+        except RuntimeError:
+            pass
+        time.sleep(0.6)
+        assert server.paths().count("/v1/redis/state") == 1
+        print("  [OK] Timed-out POST sent once")
+
+        url = server.url
+    # The stand-in is gone: every attempt fails to connect and is retried
+    client._pool = HTTPConnectionPool(timeout=0.1)
+    with patch("cloud_client.RETRY_DELAY", 0):
+        try:
+            client._request("POST", "/redis/state", {"agent_id": "agent-1"})
+            assert False, "expected a network error"
+        except RuntimeError as e:
+            assert "Could not connect" in str(e)
+    assert client._pool.connections_opened == 4
+    import cloud_client  # Current class: other tests reload the module
+    try:
+        HTTPConnectionPool(timeout=0.1).request("POST", url + "/redis/state", b"{}")
+        assert False, "expected RequestNotSentError"
+    except cloud_client.RequestNotSentError:
+        pass
+    print("  [OK] Unsent POST retried")
+
+    print("  PASS\n")
+
+
 def run_all_tests():
     """Run all tests"""
     print("=" * 50)
@@ -198,6 +454,12 @@ def run_all_tests():
     test_client_without_connection()
     test_get_redis_client_fallback()
     test_cloud_disabled()
+    test_requests_reuse_keepalive_connection()
+    test_pushes_coalesce_into_one_batch()
+    test_pushes_flush_on_interval()
+    test_batch_falls_back_without_endpoint()
+    test_pool_retries_only_unsent_requests()
+    test_client_replays_only_unsent_posts()
 
     print("=" * 50)
     print("All tests passed!")
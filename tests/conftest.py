@@ -0,0 +1,15 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_embedding_cache(tmp_path, monkeypatch):
+    """Keep VoyageClient's persistent cache out of ~/.claude during tests."""
+    monkeypatch.setenv("POPKIT_EMBEDDING_CACHE", str(tmp_path / "embedding-cache.db"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_router_cache(tmp_path, monkeypatch):
+    """Keep SemanticRouter's compiled route cache out of ~/.claude during tests."""
+    monkeypatch.setenv("POPKIT_ROUTER_CACHE", str(tmp_path / "router-cache.json"))
@@ -0,0 +1,129 @@
+"""Tests for the compiled keyword/file/error route matchers."""
+import fnmatch
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# Add hooks/utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'hooks', 'utils'))
+
+import compiled_router
+from compiled_router import GlobSet, LiteralSet, load_compiled_routes
+
+
+ROUTING = {
+    "keywords": {
+        "test": ["test-writer-fixer"],
+        "testing": ["test-writer-fixer"],
+        "est": ["a"],
+        "Bug": ["bug-whisperer"],
+        "code review": ["code-reviewer"],
+        "a+b": ["b"],
+    },
+    "filePatterns": {
+        "*.ts": ["code-reviewer"],
+        "*.test.ts": ["test-writer-fixer"],
+        "src/[ab]*.py": ["python-pro"],
+        "*.md": ["documentation-maintainer"],
+    },
+    "errorPatterns": {
+        "TypeError": ["bug-whisperer"],
+        "Error": ["log-analyzer"],
+    },
+}
+
+
+def naive_literals(patterns, text):
+    return [i for i, p in enumerate(patterns) if p.lower() in text.lower()]
+
+
+def test_literal_set_matches_every_substring_like_in():
+    patterns = list(ROUTING["keywords"]) + ["BUG", ""]
+    matcher = LiteralSet(patterns)
+
+    assert matcher.matches("Testing the BUG fix in code review (a+b)") == [0, 1, 2, 3, 4, 5, 6, 7]
+    assert matcher.matches("nothing here") == [7]
+
+    rng = random.Random(5)
+    alphabet = "abtesg +"
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert matcher.matches(text) == naive_literals(patterns, text), text
+
+
+def test_glob_set_agrees_with_fnmatch():
+    patterns = list(ROUTING["filePatterns"]) + ["*", "??.py", "docs/*"]
+    matcher = GlobSet(patterns)
+
+    for path in ["app.test.ts", "app.ts", "src/a_mod.py", "src/c.py", "README.md",
+                 "docs/x/y.md", "ab.py", "line\nbreak.ts", ""]:
+        expected = [i for i, p in enumerate(patterns) if fnmatch.fnmatch(path, p)]
+        assert matcher.matches(path) == expected, path
+
+    assert GlobSet([]).matches("anything") == []
+
+
+def test_disk_cache_keyed_by_config_mtime(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"routing": ROUTING}))
+    cache_path = tmp_path / "router-cache.json"
+
+    first = load_compiled_routes(ROUTING, config_path, cache_path)
+    assert json.loads(cache_path.read_text())["sources"] == first.sources()
+
+    # A warm cache skips trie building and glob translation
+    def fail(*args):
+        raise AssertionError("recompiled despite a warm cache")
+
+    monkeypatch.setattr(compiled_router, "literal_trie_regex", fail)
+    monkeypatch.setattr(compiled_router, "glob_set_regex", fail)
+    cached = load_compiled_routes(ROUTING, config_path, cache_path)
+    assert cached.keywords.matches("bug test") == first.keywords.matches("bug test")
+    assert cached.file_patterns.matches("x.test.ts") == [0, 1]
+
+    # Editing the config invalidates it
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with pytest.raises(AssertionError):
+        load_compiled_routes(ROUTING, config_path, cache_path)
+
+
+def test_cache_path_from_env(tmp_path, monkeypatch):
+    """POPKIT_ROUTER_CACHE picks the cache file, or turns the disk cache off."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"routing": ROUTING}))
+    monkeypatch.setenv("POPKIT_ROUTER_CACHE", str(tmp_path / "env-cache.json"))
+
+    load_compiled_routes(ROUTING, config_path)
+    assert (tmp_path / "env-cache.json").exists()
+
+    monkeypatch.setenv("POPKIT_ROUTER_CACHE", "off")
+    assert compiled_router.resolve_cache_path() is None
+    assert compiled_router.resolve_cache_path(tmp_path / "x.json") == tmp_path / "x.json"
+    monkeypatch.delenv("POPKIT_ROUTER_CACHE")
+    assert compiled_router.resolve_cache_path() == compiled_router.DEFAULT_CACHE_PATH
+
+
+def test_router_reads_nested_routing_section(tmp_path, monkeypatch):
+    import semantic_router
+
+    monkeypatch.setattr(semantic_router, "CONFIG_PATH", tmp_path / "config.json")
+    (tmp_path / "config.json").write_text(json.dumps({"routing": ROUTING}))
+    monkeypatch.setattr(semantic_router, "is_available", lambda: False)
+
+    router = semantic_router.SemanticRouter(project_path=str(tmp_path))
+
+    results = router._keyword_route("fix the bug", top_k=5)
+    assert [(r.agent, r.reason) for r in results] == [("bug-whisperer", "Keyword match: 'Bug'")]
+    assert [r.agent for r in router._file_pattern_route("src/app.test.ts")] == \
+        ["code-reviewer", "test-writer-fixer"]
+    assert [r.agent for r in router._error_pattern_route("TypeError: x")] == \
+        ["bug-whisperer", "log-analyzer"]
+    assert (tmp_path / "router-cache.json").exists()
+
+    # Replacing the config recompiles without touching the file cache
+    router._config = {"keywords": {"deploy": ["devops-automator"]}}
+    assert [r.agent for r in router._keyword_route("deploy it", top_k=5)] == ["devops-automator"]
@@ -0,0 +1,216 @@
+"""Tests for the per-event hook dispatcher."""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+from dispatch import (
+    HandlerSpec,
+    HandlerResult,
+    HookDispatcher,
+    build_hooks_json,
+    load_registry,
+    merge_json_outputs,
+    merge_results,
+    union_matcher,
+)
+
+
+@pytest.fixture
+def restore_stdio(monkeypatch):
+    """The dispatcher swaps sys stdio; put pytest's streams back afterwards."""
+    for name in ("stdin", "stdout", "stderr"):
+        monkeypatch.setattr(sys, name, getattr(sys, name))
+
+
+def write_hook(directory, name, body):
+    (directory / name).write_text(body)
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+def test_registry_covers_every_hook_in_hooks_json():
+    """hooks.json is generated from the registry, one command per event."""
+    registry = load_registry()
+    hooks_json = json.loads((HOOKS_DIR / "hooks.json").read_text())
+
+    assert hooks_json == build_hooks_json(registry)
+    for event, matchers in hooks_json["hooks"].items():
+        assert len(matchers) == 1
+        assert matchers[0]["hooks"][0]["command"].endswith(f"dispatch.py {event}")
+
+    post = {h.script for h in registry["PostToolUse"]}
+    assert {"post-tool-use.py", "quality-gate.py", "doc-sync.py"} <= post
+
+
+def test_handler_matcher_semantics():
+    """Matchers use hooks.json semantics (exact/alternation regex, empty = all)."""
+    assert HandlerSpec("a", "a.py", matcher="Write|Edit").matches("Edit")
+    assert not HandlerSpec("a", "a.py", matcher="Write|Edit").matches("MultiEdit")
+    assert HandlerSpec("a", "a.py", matcher="").matches("Anything")
+    assert union_matcher([
+        HandlerSpec("a", "a.py", matcher="Bash|Task"),
+        HandlerSpec("b", "b.py", matcher="Task|Skill"),
+    ]) == "Bash|Task|Skill"
+
+
+# =============================================================================
+# Merging
+# =============================================================================
+
+def test_merge_json_outputs_prefers_restrictive_decisions():
+    """Block beats approve, continue is AND-ed, lists and contexts combine."""
+    merged = merge_json_outputs([
+        {"decision": "approve", "reason": None, "warnings": ["w1"], "tool_name": "Bash"},
+        {"decision": "block", "reason": "dangerous", "warnings": ["w2"], "continue": True},
+        {"continue": False, "hookSpecificOutput": {"additionalContext": "ctx1"}},
+        {"hookSpecificOutput": {"additionalContext": "ctx2", "permissionDecision": "deny"}},
+    ])
+
+    assert merged["decision"] == "block"
+    assert merged["reason"] == "dangerous"
+    assert merged["warnings"] == ["w1", "w2"]
+    assert merged["tool_name"] == "Bash"
+    assert merged["continue"] is False
+    assert merged["hookSpecificOutput"]["additionalContext"] == "ctx1\n\nctx2"
+    assert merged["hookSpecificOutput"]["permissionDecision"] == "deny"
+
+
+def test_merge_results_exit_codes_and_text():
+    """Exit code 2 wins; plain text becomes context for prompt events."""
+    results = [
+        HandlerResult("a", 1, stdout='{"status": "ok"}', stderr="a failed"),
+        HandlerResult("b", 2, stdout="remember this", stderr="b blocked"),
+    ]
+    stdout, stderr, code = merge_results("UserPromptSubmit", results)
+
+    assert code == 2
+    assert "a failed" in stderr and "b blocked" in stderr
+    output = json.loads(stdout)
+    assert output["status"] == "ok"
+    assert output["hookSpecificOutput"]["additionalContext"] == "remember this"
+
+
+# =============================================================================
+# Dispatching
+# =============================================================================
+
+ECHO = '''
+import sys, json
+data = json.load(sys.stdin)
+print(json.dumps({"seen": [NAME], "tool": data["tool_name"]}))
+print(NAME + " ran", file=sys.stderr)
+'''
+
+
+def test_dispatcher_runs_matching_handlers_in_parallel(tmp_path, restore_stdio):
+    """Independent handlers overlap; each gets its own stdin and stdout."""
+    for name in ("one", "two", "three"):
+        write_hook(tmp_path, f"{name}.py",
+                   "import time\ntime.sleep(0.3)\n" + ECHO.replace("NAME", repr(name)))
+
+    registry = {"PostToolUse": [
+        HandlerSpec("one", "one.py", matcher="Write"),
+        HandlerSpec("two", "two.py", matcher="Write|Edit"),
+        HandlerSpec("three", "three.py", matcher="Bash"),
+    ]}
+    dispatcher = HookDispatcher(registry, tmp_path)
+    payload = {"tool_name": "Write"}
+    handlers = dispatcher.select("PostToolUse", payload)
+    assert [h.name for h in handlers] == ["one", "two"]
+
+    start = time.monotonic()
+    results = dispatcher.run(handlers, json.dumps(payload))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.55
+    assert [json.loads(r.stdout)["seen"] for r in results] == [["one"], ["two"]]
+    assert results[1].stderr == "two ran\n"
+
+    stdout, _, code = merge_results("PostToolUse", results)
+    assert code == 0
+    assert json.loads(stdout)["seen"] == ["one", "two"]
+
+
+def test_dispatcher_honours_depends_on_and_timeouts(tmp_path, restore_stdio):
+    """Dependencies run in order; a hung handler is reported, not awaited."""
+    log = tmp_path / "order.log"
+    write_hook(tmp_path, "first.py",
+               f"import time\ntime.sleep(0.1)\nopen({str(log)!r}, 'a').write('first\\n')\n")
+    write_hook(tmp_path, "second.py",
+               f"open({str(log)!r}, 'a').write('second\\n')\nimport sys\nsys.exit(3)\n")
+    write_hook(tmp_path, "hang.py",
+               f"import time\ntime.sleep(0.5)\nopen({str(log)!r}, 'a').write('hang\\n')\n")
+    write_hook(tmp_path, "after.py", f"open({str(log)!r}, 'a').write('after\\n')\n")
+
+    dispatcher = HookDispatcher({}, tmp_path)
+    results = dispatcher.run([
+        HandlerSpec("second", "second.py", depends_on=["first"]),
+        HandlerSpec("first", "first.py"),
+        HandlerSpec("hang", "hang.py", timeout=200),
+        HandlerSpec("after", "after.py", depends_on=["hang"]),
+    ], "{}")
+
+    assert log.read_text() == "first\nsecond\n"
+    assert results[0].exit_code == 3
+    assert results[2].timed_out
+    assert not results[3].timed_out and "skipped" in results[3].stderr
+
+    # The hung handler finishes in the background; its dependent never runs
+    deadline = time.monotonic() + 5
+    while "hang" not in log.read_text() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.1)
+    assert log.read_text() == "first\nsecond\nhang\n"
+
+
+def test_isolated_handler_is_killed_on_timeout(tmp_path, restore_stdio):
+    """An isolated handler runs in a child process that stops at its timeout."""
+    marker = tmp_path / "finished"
+    write_hook(tmp_path, "slow.py",
+               f"import time\ntime.sleep(0.5)\nopen({str(marker)!r}, 'w').write('late')\n")
+    write_hook(tmp_path, "echo.py", ECHO.replace("NAME", repr("echo")))
+
+    dispatcher = HookDispatcher({}, tmp_path)
+    results = dispatcher.run([
+        HandlerSpec("slow", "slow.py", timeout=200, isolated=True),
+        HandlerSpec("echo", "echo.py", isolated=True),
+    ], json.dumps({"tool_name": "Write"}))
+
+    assert results[0].timed_out
+    assert json.loads(results[1].stdout) == {"seen": ["echo"], "tool": "Write"}
+    assert results[1].stderr == "echo ran\n"
+    time.sleep(0.6)
+    assert not marker.exists()
+    specs = {h.name: h for h in load_registry()["PostToolUse"]}
+    assert specs["quality-gate"].isolated and not specs["post-tool-use"].isolated
+
+
+def test_dispatch_entry_point_end_to_end(tmp_path):
+    """dispatch.py parses stdin once and prints one merged response."""
+    payload = {"tool_name": "Read", "tool_input": {"file_path": "README.md"}}
+    result = subprocess.run(
+        [sys.executable, str(HOOKS_DIR / "dispatch.py"), "Notification"],
+        input=json.dumps({"message": "hello"}), capture_output=True, text=True,
+        env={**os.environ, "HOME": str(tmp_path)}, cwd=tmp_path, timeout=60
+    )
+    assert result.returncode == 0
+    # One JSON document on stdout regardless of how many handlers ran
+    json.loads(result.stdout)
+
+    result = subprocess.run(
+        [sys.executable, str(HOOKS_DIR / "dispatch.py"), "PreToolUse"],
+        input=json.dumps({**payload, "tool_name": "mcp__unmatched"}),
+        capture_output=True, text=True, cwd=tmp_path, timeout=60
+    )
+    assert result.returncode == 0
+    assert result.stdout == ""
@@ -0,0 +1,258 @@
+"""Tests for the persistent Voyage embedding cache."""
+import hashlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add hooks/utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'hooks', 'utils'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'hooks'))
+
+from embedding_cache import EmbeddingCache
+from voyage_client import VoyageClient
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def fake_embedding(text, input_type, dim=8):
+    digest = hashlib.sha256(f"{input_type}:{text}".encode()).digest()
+    return [b / 255 for b in digest[:dim]]
+
+
+class FakeVoyage:
+    """Local stand-in for the Voyage embeddings endpoint."""
+
+    def __init__(self):
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.requests.append(body)
+                data = json.dumps({
+                    "data": [{"embedding": fake_embedding(t, body["input_type"])} for t in body["input"]],
+                    "model": body["model"],
+                    "usage": {"total_tokens": len(body["input"])}
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/embeddings"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def texts_sent(self):
+        return [t for body in self.requests for t in body["input"]]
+
+
+@pytest.fixture
+def voyage():
+    fake = FakeVoyage()
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "embedding-cache.db"
+
+
+def new_client(voyage, cache_path):
+    """A fresh client, as a new hook process would create."""
+    return VoyageClient(api_key="test-key", api_url=voyage.url, cache_path=cache_path)
+
+
+# =============================================================================
+# VoyageClient
+# =============================================================================
+
+def test_cache_survives_new_client(voyage, cache_path):
+    """A prompt seen by one process is not re-embedded by the next."""
+    first = new_client(voyage, cache_path).embed_query("fix the login bug")
+    assert len(voyage.requests) == 1
+
+    client = new_client(voyage, cache_path)
+    assert client.embed_query("fix the login bug") == pytest.approx(first)
+    assert len(voyage.requests) == 1
+
+    stats = client.cache_stats
+    assert (stats["hits"], stats["misses"]) == (1, 0)
+    assert (stats["total_hits"], stats["total_misses"]) == (1, 1)
+    assert stats["entries"] == 1
+
+
+def test_query_and_document_cached_separately(voyage, cache_path):
+    """The key includes the input type, so the same text is embedded twice."""
+    new_client(voyage, cache_path).embed_query("auth")
+    client = new_client(voyage, cache_path)
+    client.embed_document("auth")
+    client.embed_document("auth")
+
+    assert [body["input_type"] for body in voyage.requests] == ["query", "document"]
+
+
+def test_batch_sends_only_uncached_texts(voyage, cache_path):
+    """embed() fills cached positions from disk and requests the rest."""
+    new_client(voyage, cache_path).embed(["a", "b"])
+    voyage.requests.clear()
+
+    results = new_client(voyage, cache_path).embed(["a", "c", "b", "d"])
+
+    assert voyage.texts_sent == ["c", "d"]
+    assert results == [pytest.approx(fake_embedding(t, "document")) for t in "acbd"]
+
+
+def test_disabled_cache_never_touches_disk(voyage, tmp_path, monkeypatch):
+    """cache_enabled=False, or POPKIT_EMBEDDING_CACHE=off, keeps nothing on disk."""
+    monkeypatch.setenv("POPKIT_EMBEDDING_CACHE", "off")
+    VoyageClient(api_key="test-key", api_url=voyage.url).embed_query("q")
+    VoyageClient(api_key="test-key", api_url=voyage.url).embed_query("q")
+    assert len(voyage.requests) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+# =============================================================================
+# EmbeddingCache
+# =============================================================================
+
+def key(n):
+    return hashlib.sha256(str(n).encode()).hexdigest()[:24]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time for last_used bookkeeping."""
+    import embedding_cache
+    from types import SimpleNamespace
+
+    now = [1000.0]
+    monkeypatch.setattr(embedding_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_lru_eviction_by_size(cache_path, clock):
+    """Past max_bytes the least recently used vectors are dropped."""
+    import embedding_cache
+
+    vector = [0.5] * 256  # 1 KiB as float32
+    cache = EmbeddingCache(cache_path, max_bytes=4096)
+    for n in range(4):
+        clock[0] += 1
+        cache.put_many({key(n): vector})
+    clock[0] += embedding_cache.TOUCH_INTERVAL + 1
+    assert cache.get_many([key(0)]).keys() == {key(0)}  # Refresh entry 0
+
+    cache.put_many({key(4): vector})
+
+    assert set(cache.get_many([key(n) for n in range(5)])) == {key(0), key(3), key(4)}
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (3, 3072, 2)
+
+
+def test_recent_hits_are_served_without_writing(cache_path, clock):
+    """Hits read without a write lock; counts reach the totals with the next write."""
+    import embedding_cache
+
+    writer = EmbeddingCache(cache_path)
+    writer.put_many({key(1): [1.0], key(2): [2.0]})
+
+    reader = EmbeddingCache(cache_path)
+    reader.get_many([key(1)])  # Opens the connection
+    changes = reader._conn.total_changes
+    # Another process holding the write lock doesn't block lookups
+    writer._conn.execute("BEGIN IMMEDIATE")
+    try:
+        for _ in range(3):
+            assert reader.get_many([key(1), key(2), key(3)]) == {key(1): [1.0], key(2): [2.0]}
+    finally:
+        writer._conn.execute("ROLLBACK")
+    assert reader._conn.total_changes == changes
+    assert (reader.stats()["total_hits"], reader.stats()["total_misses"]) == (7, 3)
+
+    # Old entries are touched, flushing the pending counts in the same write
+    clock[0] += embedding_cache.TOUCH_INTERVAL + 1
+    reader.get_many([key(2)])
+    assert reader._conn.total_changes > changes
+    assert writer.stats()["total_hits"] == 8
+    last_used = dict(writer._conn.execute("SELECT key, last_used FROM vectors"))
+    assert last_used[bytes.fromhex(key(2))] == clock[0]
+    assert last_used[bytes.fromhex(key(1))] == 1000.0
+
+    reader.get_many([key(3)])
+    reader.close()
+    assert writer.stats()["total_misses"] == 4
+
+
+def test_codec_import_stays_light():
+    """The cache (and so voyage_client) no longer imports the store or its indexes."""
+    import subprocess
+
+    utils_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'hooks', 'utils')
+    code = ("import sys; sys.path.insert(0, %r); import voyage_client; "
+            "print(sorted(m for m in ('embedding_store', 'vector_index', 'ann_index', 'numpy') "
+            "if m in sys.modules))" % utils_dir)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_replacing_entry_keeps_byte_count(cache_path):
+    cache = EmbeddingCache(cache_path)
+    cache.put_many({key(1): [1.0, 2.0]})
+    cache.put_many({key(1): [3.0, 4.0]})
+
+    assert cache.get_many([key(1)]) == {key(1): [3.0, 4.0]}
+    assert cache.stats()["bytes"] == 8
+    assert cache.clear() == 1
+    assert cache.stats()["bytes"] == 0
+
+
+def test_unwritable_cache_falls_back_to_network(voyage, tmp_path):
+    """A cache path that can't be opened only costs cache misses."""
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    client = new_client(voyage, blocker / "cache.db")
+
+    assert client.embed_query("q") == pytest.approx(fake_embedding("q", "query"))
+    assert client.embed_query("q") == pytest.approx(fake_embedding("q", "query"))
+    assert len(voyage.requests) == 1  # Second call served from memory
+
+
+# =============================================================================
+# ResearchIndexManager
+# =============================================================================
+
+def test_research_embed_all_batches_and_reuses_cache(voyage, tmp_path, monkeypatch):
+    """embed_all sends one request, and re-embedding hits the persistent cache."""
+    import utils.embedding_store
+    import utils.voyage_client
+    from utils.research_index import ResearchEntry, ResearchIndexManager
+
+    monkeypatch.setenv("VOYAGE_API_KEY", "test-key")
+    monkeypatch.setattr(utils.voyage_client, "VOYAGE_API_URL", voyage.url)
+    monkeypatch.setattr(utils.embedding_store, "DEFAULT_DB_PATH", tmp_path / "embeddings.db")
+
+    manager = ResearchIndexManager(str(tmp_path / "project"))
+    for n in range(3):
+        manager.create(ResearchEntry(id="", type="finding", title=f"Finding {n}", content="..."))
+
+    assert manager.embed_all() == (3, 0)
+    assert len(voyage.requests) == 1
+    assert manager.embed_all() == (0, 0)
+
+    assert manager.embed_all(force=True) == (3, 0)
+    assert len(voyage.requests) == 1
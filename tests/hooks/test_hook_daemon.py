@@ -0,0 +1,203 @@
+"""Tests for the warm hook daemon and its client shim."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+from hook_daemon import registered_hooks
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="hook daemon requires POSIX fork/AF_UNIX"
+)
+
+ECHO_HOOK = '''
+import os, sys, json
+data = json.loads(sys.stdin.read())
+print(json.dumps({"got": data, "var": os.environ.get("ECHO_VAR"), "argv": sys.argv[1:]}))
+print("echo-stderr", file=sys.stderr)
+sys.exit(data.get("code", 0))
+'''
+
+
+@pytest.fixture
+def plugin(tmp_path):
+    """Isolated hooks dir with the shim, daemon and an echo hook."""
+    hooks = tmp_path / "hooks"
+    hooks.mkdir()
+    shutil.copy(HOOKS_DIR / "hook_client.py", hooks)
+    shutil.copy(HOOKS_DIR / "hook_daemon.py", hooks)
+    (hooks / "utils").mkdir()
+    shutil.copy(HOOKS_DIR / "utils" / "lazy_import.py", hooks / "utils")
+    (hooks / "echo-hook.py").write_text(ECHO_HOOK)
+    (hooks / "hooks.json").write_text(json.dumps({"hooks": {"Stop": [{"matcher": "", "hooks": [
+        {"type": "command", "command": 'python "${CLAUDE_PLUGIN_ROOT}/hooks/hook_client.py" echo-hook.py'}
+    ]}]}}))
+
+    env = dict(os.environ)
+    env["POPKIT_HOOKD_DIR"] = str(tmp_path / "run")
+    env["POPKIT_HOOKD_IDLE"] = "30"
+    yield hooks, env
+
+    subprocess.run([sys.executable, str(hooks / "hook_daemon.py"), "stop"],
+                   env=env, capture_output=True, timeout=10)
+
+
+def run_client(hooks, env, payload, *args):
+    return subprocess.run(
+        [sys.executable, str(hooks / "hook_client.py"), "echo-hook.py", *args],
+        input=json.dumps(payload), capture_output=True, text=True, env=env, timeout=30
+    )
+
+
+def wait_for_socket(run_dir, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if list(run_dir.glob("*.sock")):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_registered_hooks_parses_shim_commands():
+    """Hook names are read from hooks.json shim commands."""
+    names = registered_hooks(HOOKS_DIR / "hooks.json")
+    assert "pre-tool-use.py" in names
+    assert "post-tool-use.py" in names
+    assert "hook_client.py" not in names
+
+
+def test_in_process_fallback_when_disabled(plugin):
+    """With the daemon disabled the hook runs in the shim's own process."""
+    hooks, env = plugin
+    env["POPKIT_HOOK_DAEMON"] = "0"
+    env["ECHO_VAR"] = "inline"
+
+    result = run_client(hooks, env, {"code": 3}, "--flag")
+
+    assert result.returncode == 3
+    assert json.loads(result.stdout) == {"got": {"code": 3}, "var": "inline", "argv": ["--flag"]}
+    assert "echo-stderr" in result.stderr
+    assert not (Path(env["POPKIT_HOOKD_DIR"])).exists()
+
+
+def test_daemon_runs_hook_on_client_stdio(plugin):
+    """A running daemon serves the hook with the client's env, stdio and exit code."""
+    hooks, env = plugin
+    subprocess.Popen([sys.executable, str(hooks / "hook_daemon.py"), "serve"], env=env)
+    assert wait_for_socket(Path(env["POPKIT_HOOKD_DIR"]))
+
+    env["ECHO_VAR"] = "warm"
+    result = run_client(hooks, env, {"code": 4})
+
+    assert result.returncode == 4
+    assert json.loads(result.stdout)["var"] == "warm"
+    assert "echo-stderr" in result.stderr
+
+    status = subprocess.run(
+        [sys.executable, str(hooks / "hook_daemon.py"), "status"],
+        env=env, capture_output=True, text=True, timeout=10
+    )
+    info = json.loads(status.stdout)
+    assert info["requests_served"] == 1
+    assert "echo-hook.py" in info["hooks_loaded"]
+
+
+def test_fallback_spawns_daemon(plugin):
+    """The first call runs in-process and starts a daemon for later calls."""
+    hooks, env = plugin
+
+    result = run_client(hooks, env, {"code": 0})
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout)["got"] == {"code": 0}
+    assert wait_for_socket(Path(env["POPKIT_HOOKD_DIR"]))
+
+
+def test_foreign_runtime_dir_is_never_used(plugin):
+    """A runtime dir that is not private to this user gets no request and no daemon."""
+    hooks, env = plugin
+    run_dir = Path(env["POPKIT_HOOKD_DIR"])
+    run_dir.mkdir(mode=0o755)
+    os.chmod(run_dir, 0o755)
+
+    result = run_client(hooks, env, {"code": 5})
+    assert result.returncode == 5
+    assert json.loads(result.stdout)["got"] == {"code": 5}
+
+    daemon = subprocess.run([sys.executable, str(hooks / "hook_daemon.py"), "serve"],
+                            env=env, capture_output=True, timeout=10)
+    assert daemon.returncode == 1
+    assert list(run_dir.iterdir()) == []
+
+
+def test_runtime_dir_prefers_xdg(monkeypatch, tmp_path):
+    """XDG_RUNTIME_DIR is used when set, and created private."""
+    import hook_client
+
+    monkeypatch.delenv("POPKIT_HOOKD_DIR", raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert hook_client.runtime_dir() == str(tmp_path / "popkit-hookd")
+    assert hook_client.ensure_runtime_dir()
+    assert hook_client.is_private_dir(hook_client.runtime_dir())
+
+
+def daemon_status(hooks, env):
+    status = subprocess.run(
+        [sys.executable, str(hooks / "hook_daemon.py"), "status"],
+        env=env, capture_output=True, text=True, timeout=10
+    )
+    return json.loads(status.stdout) if status.returncode == 0 else None
+
+
+def test_preload_imports_utils_without_running_hooks(plugin, tmp_path):
+    """Preload warms hooks/utils imports but never executes a hook body."""
+    hooks, env = plugin
+    (hooks / "utils" / "warm_util.py").write_text(
+        f"import os\nopen({str(tmp_path / 'warm')!r}, 'w').write(str(os.getpid()))\n"
+    )
+    (hooks / "echo-hook.py").write_text(
+        f"import warm_util\nopen({str(tmp_path / 'ran')!r}, 'w').write('ran')\n" + ECHO_HOOK
+    )
+
+    daemon = subprocess.Popen([sys.executable, str(hooks / "hook_daemon.py"), "serve"], env=env)
+    assert wait_for_socket(Path(env["POPKIT_HOOKD_DIR"]))
+
+    assert not (tmp_path / "ran").exists()
+    assert (tmp_path / "warm").read_text() == str(daemon.pid)
+
+
+def test_daemon_retires_when_hooks_tree_changes(plugin):
+    """After a plugin update the stale daemon declines, exits and is replaced."""
+    hooks, env = plugin
+    run_dir = Path(env["POPKIT_HOOKD_DIR"])
+    daemon = subprocess.Popen([sys.executable, str(hooks / "hook_daemon.py"), "serve"], env=env)
+    assert wait_for_socket(run_dir)
+    assert run_client(hooks, env, {"code": 0}).returncode == 0
+
+    helper = hooks / "utils" / "helper.py"
+    helper.write_text("VALUE = 2\n")
+    future = time.time() + 10
+    os.utime(helper, (future, future))
+
+    env["ECHO_VAR"] = "updated"
+    result = run_client(hooks, env, {"code": 6})
+
+    assert result.returncode == 6
+    assert json.loads(result.stdout)["var"] == "updated"
+    assert daemon.wait(timeout=10) == 0
+
+    deadline = time.time() + 10
+    info = None
+    while time.time() < deadline and not info:
+        info = daemon_status(hooks, env)
+        time.sleep(0.05)
+    assert info and info["pid"] != daemon.pid
+    assert info["requests_served"] == 0
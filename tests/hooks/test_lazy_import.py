@@ -0,0 +1,113 @@
+"""Tests for deferred hook imports."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+sys.path.insert(0, str(HOOKS_DIR / "utils"))
+
+from lazy_import import available, lazy_import, is_loaded
+
+
+def test_module_loads_on_first_attribute_access(tmp_path, monkeypatch):
+    """The module body only runs when an attribute is read."""
+    (tmp_path / "lazy_probe.py").write_text(
+        "import os\nos.environ['LAZY_PROBE_RAN'] = '1'\nVALUE = 42\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delenv("LAZY_PROBE_RAN", raising=False)
+    monkeypatch.delitem(sys.modules, "lazy_probe", raising=False)
+
+    probe = lazy_import("lazy_probe")
+    assert probe is not None
+    assert not is_loaded(probe)
+    assert "LAZY_PROBE_RAN" not in os.environ
+
+    assert probe.VALUE == 42
+    assert is_loaded(probe)
+    assert os.environ["LAZY_PROBE_RAN"] == "1"
+    # A second lazy_import returns the same, already-loaded module
+    assert lazy_import("lazy_probe") is probe
+
+
+def test_missing_module_returns_none():
+    """Missing modules are None, and never available."""
+    assert lazy_import("popkit_no_such_module") is None
+    assert not is_loaded(None)
+
+
+def test_available_reports_import_errors_inside_module(tmp_path, monkeypatch):
+    """A found module whose own imports fail is unavailable, not an error later."""
+    (tmp_path / "lazy_broken.py").write_text("import popkit_no_such_dependency\n")
+    (tmp_path / "lazy_ok.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ("lazy_broken", "lazy_ok"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    broken = lazy_import("lazy_broken")
+    assert broken is not None
+    assert not available(broken)
+    assert not available(broken)
+    assert "lazy_broken" not in sys.modules
+
+    ok = lazy_import("lazy_ok")
+    assert available(ok) and is_loaded(ok)
+    assert not available(None)
+
+
+def test_read_calls_do_not_load_network_clients(tmp_path):
+    """Running the tool hooks on a Read call never imports requests or urllib."""
+    payload = json.dumps({"session_id": "s1", "tool_name": "Read",
+                          "tool_input": {"file_path": "README.md"}})
+    script = (
+        "import io, json, runpy, sys\n"
+        "for name in ('pre-tool-use.py', 'post-tool-use.py'):\n"
+        f"    sys.stdin = io.StringIO({payload!r})\n"
+        "    try:\n"
+        f"        runpy.run_path({str(HOOKS_DIR)!r} + '/' + name, run_name='__main__')\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        "from lazy_import import is_loaded\n"
+        "names = ['requests', 'urllib.request', 'premium_checker']\n"
+        "print(json.dumps({n: is_loaded(sys.modules.get(n)) for n in names}))\n"
+    )
+    # A stand-in requests that is importable whether or not the real one is
+    probe_dir = tmp_path / "probe"
+    probe_dir.mkdir()
+    (probe_dir / "requests.py").write_text(
+        "def post(*args, **kwargs):\n    raise OSError('offline')\n"
+    )
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("POPKIT_OBSERVABILITY_URL", "POPKIT_ORCHESTRATOR_URL")}
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True,
+        env={**env, "HOME": str(tmp_path), "PYTHONPATH": str(probe_dir)},
+        cwd=tmp_path, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    assert not any(loaded.values()), loaded
+
+
+def test_tool_hooks_do_not_load_heavy_modules(tmp_path):
+    """Loading the tool hooks leaves requests/sqlite3/clients unexecuted."""
+    script = (
+        "import importlib.util, json, sys\n"
+        "for name in ('pre-tool-use.py', 'post-tool-use.py'):\n"
+        "    spec = importlib.util.spec_from_file_location(name[:-3].replace('-', '_'),\n"
+        f"        {str(HOOKS_DIR)!r} + '/' + name)\n"
+        "    spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+        "from lazy_import import is_loaded\n"
+        "names = ['requests', 'sqlite3', 'premium_checker', 'response_router',\n"
+        "         'local_telemetry', 'project_client']\n"
+        "print(json.dumps({n: is_loaded(sys.modules.get(n)) for n in names}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True,
+        env={**os.environ, "HOME": str(tmp_path)}, cwd=tmp_path, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    loaded = json.loads(result.stdout)
+    assert not any(loaded.values()), loaded
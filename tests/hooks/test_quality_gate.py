@@ -0,0 +1,254 @@
+"""Tests for parallel, dependency-aware quality gate execution."""
+import importlib.util
+import json
+import shlex
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+
+
+@pytest.fixture(scope="module")
+def quality_gate():
+    spec = importlib.util.spec_from_file_location("quality_gate_hook", HOOKS_DIR / "quality-gate.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def py(code):
+    """Shell command running a Python snippet."""
+    return f"{shlex.quote(sys.executable)} -c {shlex.quote(code)}"
+
+
+def sleep_then(seconds, log=None, name="", exit_code=0):
+    code = f"import time, sys; time.sleep({seconds})"
+    if log:
+        code += f"; open({str(log)!r}, 'a').write({name!r} + '\\n')"
+    return py(code + f"; sys.exit({exit_code})")
+
+
+def make_hook(quality_gate, tmp_path, monkeypatch, gates, **options):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".claude").mkdir(exist_ok=True)
+    (tmp_path / ".claude" / "quality-gates.json").write_text(
+        json.dumps({"gates": gates, "options": options}))
+    return quality_gate.QualityGateHook()
+
+
+def test_independent_gates_run_concurrently(quality_gate, tmp_path, monkeypatch):
+    """Wall time is one gate's duration, not the sum."""
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [
+        {"name": "lint", "command": sleep_then(0.5)},
+        {"name": "typecheck", "command": sleep_then(0.5)},
+        {"name": "mypy", "command": sleep_then(0.5)},
+    ], max_parallel=3)
+
+    start = time.monotonic()
+    results = hook.run_all_gates()
+
+    assert results["passed"] is True
+    assert {g["name"] for g in results["gates"]} == {"lint", "typecheck", "mypy"}
+    assert time.monotonic() - start < 1.2
+    assert results["duration"] < 1.2
+
+
+def test_dependencies_order_gates(quality_gate, tmp_path, monkeypatch):
+    """build waits for typecheck; lint runs alongside typecheck."""
+    log = tmp_path / "order.log"
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [
+        {"name": "build", "command": sleep_then(0, log, "build"), "depends_on": ["typecheck"]},
+        {"name": "typecheck", "command": sleep_then(0.4, log, "typecheck")},
+        {"name": "lint", "command": sleep_then(0.1, log, "lint")},
+    ], max_parallel=2)
+
+    results = hook.run_all_gates()
+
+    assert log.read_text().split() == ["lint", "typecheck", "build"]
+    # Results stream in completion order
+    assert [g["name"] for g in results["gates"]] == ["lint", "typecheck", "build"]
+
+
+def test_failed_dependency_skips_dependents(quality_gate, tmp_path, monkeypatch):
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [
+        {"name": "typecheck", "command": py("import sys; print('a.ts(1,2): error TS1: bad'); sys.exit(1)")},
+        {"name": "build", "command": sleep_then(0), "depends_on": ["typecheck"]},
+        {"name": "test", "command": sleep_then(0), "depends_on": ["build"]},
+    ], fail_fast=False)
+
+    results = hook.run_all_gates()
+
+    assert results["passed"] is False
+    assert [g["name"] for g in results["gates"]] == ["typecheck"]
+    assert results["total_errors"] == 1
+    assert results["skipped_gates"] == [
+        {"name": "build", "reason": "dependency 'typecheck' failed"},
+        {"name": "test", "reason": "dependency 'build' failed"},
+    ]
+
+
+def test_fail_fast_cancels_running_siblings(quality_gate, tmp_path, monkeypatch):
+    """The first failure kills gates still running instead of waiting for them."""
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [
+        {"name": "lint", "command": sleep_then(0.2, exit_code=1)},
+        {"name": "typecheck", "command": sleep_then(30)},
+        {"name": "build", "command": sleep_then(0), "depends_on": ["typecheck"]},
+    ], max_parallel=2)
+
+    start = time.monotonic()
+    results = hook.run_all_gates()
+
+    assert time.monotonic() - start < 10
+    assert [g["name"] for g in results["gates"]] == ["lint"]
+    assert sorted(results["skipped_gates"], key=lambda g: g["name"]) == [
+        {"name": "build", "reason": "cancelled (fail-fast)"},
+        {"name": "typecheck", "reason": "cancelled (fail-fast)"},
+    ]
+    assert hook._procs == {}
+
+
+def test_max_parallel_bounds_concurrency(quality_gate, tmp_path, monkeypatch):
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [
+        {"name": f"gate{n}", "command": sleep_then(0.3)} for n in range(3)
+    ], max_parallel=1)
+
+    start = time.monotonic()
+    assert hook.run_all_gates()["passed"] is True
+    assert time.monotonic() - start >= 0.9
+
+
+def test_detected_build_depends_on_typecheck(quality_gate, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tsconfig.json").write_text("{}")
+    (tmp_path / "package.json").write_text(json.dumps({"scripts": {"build": "tsc", "lint": "eslint ."}}))
+
+    gates = {g["name"]: g for g in quality_gate.QualityGateHook().detect_gates()}
+
+    assert gates["build"]["depends_on"] == ["typescript"]
+    assert "depends_on" not in gates["lint"]
+
+
+# =============================================================================
+# Incremental mode
+# =============================================================================
+
+def record_args(log):
+    """Gate command that logs the file arguments it was given."""
+    return py(f"import sys; open({str(log)!r}, 'a').write(' '.join(sys.argv[1:]) + '\\n')") + " {files}"
+
+
+def edit(hook, path, content):
+    path.write_text(content)
+    hook.update_state_counters("Edit", {"file_path": str(path)})
+
+
+def test_incremental_gate_checks_only_changed_files(quality_gate, tmp_path, monkeypatch):
+    log = tmp_path / "args.log"
+    (tmp_path / "src").mkdir()
+    gate = {"name": "lint", "command": "exit 1", "incremental_command": record_args(log),
+            "extensions": [".ts"]}
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [gate])
+
+    edit(hook, tmp_path / "src" / "a.ts", "let a = 1")
+    edit(hook, tmp_path / "src" / "b.ts", "let b = 2")
+    edit(hook, tmp_path / "README.md", "docs")
+    results = hook.run_all_gates()
+
+    assert results["passed"] and results["incremental"]
+    assert log.read_text().splitlines() == ["src/a.ts src/b.ts"]
+    assert hook.state["changed_files"] == []
+
+    # Same content again: served from the pass cache without running
+    edit(hook, tmp_path / "src" / "a.ts", "let a = 1")
+    results = hook.run_all_gates()
+    assert results["gates"][0]["cached"] is True
+    assert len(log.read_text().splitlines()) == 1
+
+    edit(hook, tmp_path / "src" / "a.ts", "let a = 3")
+    hook.run_all_gates()
+    assert log.read_text().splitlines()[-1] == "src/a.ts"
+
+
+def test_unlisted_file_types_run_the_full_command(quality_gate, tmp_path, monkeypatch):
+    """Edits the gate's extensions don't cover are checked, not passed as cached."""
+    log = tmp_path / "args.log"
+    full = py(f"open({str(log)!r}, 'a').write('full\\n')")
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [
+        {"name": "lint", "command": full, "incremental_command": record_args(log),
+         "extensions": [".ts"]},
+        {"name": "typecheck", "command": full, "extensions": [".ts"]},
+    ])
+
+    edit(hook, tmp_path / "App.vue", "<template></template>")
+    results = hook.run_all_gates()
+    assert results["passed"] and not any(g.get("cached") for g in results["gates"])
+    assert log.read_text().splitlines() == ["full", "full"]
+    assert hook.state["changed_files"] == []
+
+    # Documentation alone: only a gate with a file-scoped form is skipped
+    edit(hook, tmp_path / "README.md", "docs")
+    results = {g["name"]: g for g in hook.run_all_gates()["gates"]}
+    assert results["lint"]["cached"] is True
+    assert not results["typecheck"].get("cached")
+    assert log.read_text().splitlines() == ["full", "full", "full"]
+
+
+def test_failed_incremental_run_keeps_changed_files(quality_gate, tmp_path, monkeypatch):
+    gate = {"name": "lint", "command": "exit 0", "incremental_command": "exit 1 {files}",
+            "extensions": [".ts"]}
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [gate])
+    edit(hook, tmp_path / "a.ts", "bad")
+
+    assert hook.run_all_gates()["passed"] is False
+    assert hook.state["changed_files"] == ["a.ts"]
+    assert hook.load_pass_cache() == {}
+
+
+def test_config_change_forces_full_run(quality_gate, tmp_path, monkeypatch):
+    log = tmp_path / "args.log"
+    gate = {"name": "lint", "command": py(f"open({str(log)!r}, 'a').write('full\\n')"),
+            "incremental_command": record_args(log), "extensions": [".ts"]}
+    hook = make_hook(quality_gate, tmp_path, monkeypatch, [gate])
+
+    edit(hook, tmp_path / "a.ts", "let a = 1")
+    edit(hook, tmp_path / "package.json", "{}")
+    results = hook.run_all_gates()
+
+    assert results["incremental"] is False
+    assert log.read_text().splitlines() == ["full"]
+    assert hook.state["full_run_required"] is False
+
+
+def test_python_import_closure_adds_importers(quality_gate, tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "core.py").write_text("def f(): pass\n")
+    (pkg / "api.py").write_text("from .core import f\n")
+    (tmp_path / "app.py").write_text("import pkg.api\n")
+    (tmp_path / "other.py").write_text("import json\n")
+    (tmp_path / "broken.py").write_text("def (:\n")
+
+    closure = quality_gate.python_import_closure(tmp_path, ["pkg/core.py"])
+
+    assert closure == ["app.py", "pkg/api.py", "pkg/core.py"]
+    assert quality_gate.python_import_closure(tmp_path, ["pkg/core.py"], limit=2) is None
+
+
+def test_detected_gates_have_incremental_forms(quality_gate, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tsconfig.json").write_text("{}")
+    (tmp_path / "package.json").write_text(json.dumps({"scripts": {"lint": "eslint ."}}))
+    (tmp_path / ".claude").mkdir()
+    (tmp_path / ".claude" / "quality-gates.json").write_text(
+        json.dumps({"gates": [{"name": "typescript", "command": "tsc -b"}]}))
+
+    gates = {g["name"]: g for g in quality_gate.QualityGateHook().get_effective_gates()}
+
+    assert gates["lint"]["incremental_command"] == "npx eslint {files}"
+    # A custom command has no known file-scoped form
+    assert "incremental_command" not in gates["typescript"]
+    assert ".ts" in gates["typescript"]["extensions"]
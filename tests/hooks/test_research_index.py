@@ -0,0 +1,121 @@
+"""Tests for the research index BM25 keyword search."""
+import json
+import os
+import sys
+
+import pytest
+
+# Add hooks/utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'hooks', 'utils'))
+
+from research_index import (
+    KEYWORD_INDEX_FILE,
+    ResearchEntry,
+    ResearchIndexManager,
+)
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def manager(tmp_path):
+    return ResearchIndexManager(str(tmp_path))
+
+
+def make_entry(title, content="", tags=None, entry_type="decision", project="app"):
+    return ResearchEntry(
+        id="", type=entry_type, title=title, content=content,
+        tags=tags or [], project=project,
+    )
+
+
+@pytest.fixture
+def populated(manager):
+    ids = {
+        "redis": manager.create(make_entry(
+            "Use Redis for session storage",
+            "Sessions live in Redis with a TTL.",
+            tags=["redis", "sessions", "caching"],
+        )),
+        "postgres": manager.create(make_entry(
+            "Postgres for billing data",
+            "Billing needs transactions; Redis is only a cache in front of it.",
+            tags=["database"],
+        )),
+        "auth": manager.create(make_entry(
+            "Authentication token rotation",
+            "Refresh tokens rotate on every use.",
+            tags=["security"], entry_type="finding", project="api",
+        )),
+    }
+    return ids
+
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+def test_ranks_tag_and_title_matches_above_body(manager, populated):
+    results = manager.search_keywords("redis")
+
+    assert [r.entry.id for r in results] == [populated["redis"], populated["postgres"]]
+    assert [r.rank for r in results] == [1, 2]
+    assert all(r.match_type == "keyword" for r in results)
+    assert 0 < results[1].similarity < results[0].similarity <= 1
+
+
+def test_filters_and_prefix_matches(manager, populated):
+    assert [r.entry.id for r in manager.search_keywords("auth")] == [populated["auth"]]
+    assert manager.search_keywords("auth", project="app") == []
+    assert manager.search_keywords("redis", entry_type="finding") == []
+    assert manager.search_keywords("the and of") == []
+
+
+def test_only_top_results_are_loaded(manager, populated, monkeypatch):
+    for i in range(20):
+        manager.create(make_entry(f"Note {i}", "redis appears once here"))
+
+    loaded = []
+    original_get = manager.get
+    monkeypatch.setattr(manager, "get", lambda entry_id: loaded.append(entry_id) or original_get(entry_id))
+
+    results = manager.search_keywords("redis session", limit=3)
+
+    assert len(results) == 3
+    assert results[0].entry.id == populated["redis"]
+    assert loaded == [r.entry.id for r in results]
+
+
+def test_update_and_delete_keep_postings_in_sync(manager, populated, tmp_path):
+    entry = manager.get(populated["postgres"])
+    entry.title = "MySQL for billing data"
+    entry.content = "Billing needs transactions."
+    manager.update(entry)
+
+    assert [r.entry.id for r in manager.search_keywords("redis")] == [populated["redis"]]
+    assert [r.entry.id for r in manager.search_keywords("mysql")] == [populated["postgres"]]
+    assert manager.search_keywords("postgres") == []
+
+    manager.delete(populated["redis"])
+    assert manager.search_keywords("redis") == []
+
+    stored = json.loads((tmp_path / ".claude" / "research" / KEYWORD_INDEX_FILE).read_text())
+    assert "redis" not in stored["postings"]
+    assert "postgres" not in stored["postings"]
+    assert set(stored["docs"]) == {populated["postgres"], populated["auth"]}
+
+
+def test_index_persists_and_rebuilds_when_missing(manager, populated, tmp_path):
+    keyword_path = tmp_path / ".claude" / "research" / KEYWORD_INDEX_FILE
+    expected = [(r.entry.id, r.similarity) for r in manager.search_keywords("billing redis")]
+
+    reopened = ResearchIndexManager(str(tmp_path))
+    assert [(r.entry.id, r.similarity) for r in reopened.search_keywords("billing redis")] == expected
+
+    # Indexes written before keywords.json existed are rebuilt on first search
+    keyword_path.unlink()
+    upgraded = ResearchIndexManager(str(tmp_path))
+    assert [(r.entry.id, r.similarity) for r in upgraded.search_keywords("billing redis")] == expected
+    assert keyword_path.exists()
@@ -0,0 +1,113 @@
+"""Tests for the precompiled safety rule matcher."""
+import importlib.util
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+sys.path.insert(0, str(HOOKS_DIR / "utils"))
+
+from safety_matcher import SafetyRuleMatcher, get_matcher, required_literal
+
+
+def load_pre_tool_use():
+    spec = importlib.util.spec_from_file_location("pre_tool_use_hook", HOOKS_DIR / "pre-tool-use.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def pre_tool_use():
+    return load_pre_tool_use()
+
+
+COMMANDS = [
+    "git status",
+    "npm run build && npm test",
+    "rm -rf /",
+    "sudo rm -rf node_modules",
+    "psql -c 'drop   database prod'",
+    "chmod 777 deploy.sh",
+    "echo ':(){ :|:& };:'",
+    "python -m pytest -q tests/",
+    "dd if=/dev/zero of=/tmp/blob bs=1M count=1",
+    "FORMAT C:",
+    "ls -la ~/.ssh",
+    "cat model.py | grep del",
+    "ſudo rm -rf build",
+]
+
+
+def test_required_literal_extraction():
+    """Literals come from the top-level sequence and are case-folded."""
+    assert required_literal(r"DROP\s+DATABASE", re.IGNORECASE) == "database"
+    assert required_literal(r"\/etc\/passwd") == "/etc/passwd"
+    assert required_literal(r"\.env") == ".env"
+    # Top-level alternation has no single required literal
+    assert required_literal(r":(){ :|:& };:", re.IGNORECASE) is None
+    assert required_literal(r"a|b") is None
+
+
+def test_matcher_agrees_with_per_rule_search(pre_tool_use):
+    """The prefiltered matcher fires exactly the rules re.search would."""
+    rules = pre_tool_use.SAFETY_RULES["blocked_commands"]
+    matcher = SafetyRuleMatcher(rules)
+
+    for command in COMMANDS:
+        expected = [p for p in rules if re.search(p, command, re.IGNORECASE)]
+        assert [m.pattern for m in matcher.search(command)] == expected, command
+
+
+def test_matcher_reports_rule_and_skips_compiling_for_safe_text():
+    """Safe text never compiles a rule; a hit reports index and matched text."""
+    matcher = SafetyRuleMatcher([r"chmod\s+777", r"rm\s+-rf\s+/"])
+
+    assert matcher.search("git log --oneline") == []
+    assert matcher._compiled == {}
+
+    [match] = matcher.search("sudo CHMOD  777 /srv")
+    assert (match.index, match.pattern, match.matched) == (0, r"chmod\s+777", "CHMOD  777")
+
+
+def test_plan_is_cached_on_disk_by_rule_hash(tmp_path):
+    """The literal plan is reused across instances and invalidated by rule changes."""
+    rules = [r"chmod\s+777", r"chown\s+root"]
+    first = SafetyRuleMatcher(rules, cache_dir=tmp_path)
+    [plan_file] = tmp_path.glob("safety-rules-*.json")
+    assert json.loads(plan_file.read_text())["literals"] == ["chmod", "chown"]
+
+    # A cached plan is read as-is rather than re-derived
+    plan = json.loads(plan_file.read_text())
+    plan["literals"] = ["chmod", "chown root"]
+    plan_file.write_text(json.dumps(plan))
+    assert SafetyRuleMatcher(rules, cache_dir=tmp_path).literals == ["chmod", "chown root"]
+
+    SafetyRuleMatcher(rules + [r"DROP\s+TABLE"], cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("safety-rules-*.json"))) == 2
+    assert get_matcher(rules) is get_matcher(list(rules))
+    assert first.rules_hash != SafetyRuleMatcher(rules, flags=0).rules_hash
+
+
+def test_pre_tool_use_reports_fired_rules(pre_tool_use, tmp_path, monkeypatch):
+    """PreToolUseHook blocks with the same messages and lists the rules that fired."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("CLAUDE_SESSION_ID", "test")
+    monkeypatch.setattr(pre_tool_use.Path, "home", classmethod(lambda cls: tmp_path))
+    hook = pre_tool_use.PreToolUseHook()
+
+    assert hook.check_safety_violations("Bash", {"command": "sudo rm -rf /"}) == [
+        r"Blocked dangerous command: rm\s+-rf\s+/",
+        r"Blocked dangerous command: sudo\s+rm\s+-rf",
+        "Dangerous tool usage blocked: Bash:sudo",
+    ]
+
+    result = hook.process_tool_request("Write", {"file_path": "/app/.env", "content": ""})
+    assert result["action"] == "block"
+    assert result["safety_check"]["rules"] == [{
+        "category": "sensitive_paths", "index": 8, "rule": r"\.env", "matched": ".env"
+    }]
+    assert list((tmp_path / ".claude" / "config").glob("safety-rules-*.json"))
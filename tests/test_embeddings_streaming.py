@@ -367,6 +367,297 @@ class TestEmbeddingStore(unittest.TestCase):
             columns = [row[1] for row in cursor.fetchall()]
             self.assertIn("project_path", columns)
 
+    def test_packed_index_matches_row_scan(self):
+        """Test packed index search returns the same ranking as the row scan."""
+        import random
+        from embedding_store import EmbeddingStore, EmbeddingRecord
+
+        rng = random.Random(7)
+        self.store.store_batch([
+            EmbeddingRecord(
+                id=f"vec-{i}",
+                content=f"Vector {i}",
+                embedding=[rng.uniform(-1, 1) for _ in range(16)],
+                source_type="agent" if i % 2 else "skill",
+                source_id=f"vec-{i}",
+                project_path="/p" if i % 3 == 0 else None
+            )
+            for i in range(60)
+        ])
+        scan_store = EmbeddingStore(db_path=self.db_path, use_vector_index=False)
+        query = [rng.uniform(-1, 1) for _ in range(16)]
+
+        packed = self.store.search(query, source_type="agent", top_k=5, exclude_ids=["vec-1"])
+        scanned = scan_store.search(query, source_type="agent", top_k=5, exclude_ids=["vec-1"])
+        self.assertEqual([r.record.id for r in packed], [r.record.id for r in scanned])
+        self.assertEqual([r.rank for r in packed], [1, 2, 3, 4, 5])
+        for a, b in zip(packed, scanned):
+            self.assertAlmostEqual(a.similarity, b.similarity, places=5)
+
+        packed = self.store.search_project(query, "/p", top_k=8, global_boost=-0.1)
+        scanned = scan_store.search_project(query, "/p", top_k=8, global_boost=-0.1)
+        self.assertEqual([r.record.id for r in packed], [r.record.id for r in scanned])
+
+    def test_packed_index_tracks_writes(self):
+        """Test the sidecar is rebuilt after rows change."""
+        from embedding_store import EmbeddingRecord
+        from vector_index import PackedVectorIndex
+
+        self.store.store(EmbeddingRecord(
+            id="a", content="A", embedding=[1.0, 0.0], source_type="doc", source_id="a"
+        ))
+        self.assertEqual([r.record.id for r in self.store.search([1.0, 0.0])], ["a"])
+        self.assertTrue(self.store.index_path.exists())
+
+        self.store.store(EmbeddingRecord(
+            id="b", content="B", embedding=[0.0, 1.0], source_type="doc", source_id="b"
+        ))
+        results = self.store.search([0.0, 1.0], top_k=1)
+        self.assertEqual(results[0].record.id, "b")
+
+        self.store.delete("b")
+        results = self.store.search([0.0, 1.0], top_k=5)
+        self.assertEqual([r.record.id for r in results], ["a"])
+
+        on_disk = PackedVectorIndex.load(self.store.index_path)
+        self.assertEqual(on_disk.ids, ["a"])
+        on_disk.close()
+
+    def test_packed_index_catches_up_from_change_log(self):
+        """Test writes are served from the delta until enough rows change."""
+        import embedding_store
+        from embedding_store import EmbeddingStore, EmbeddingRecord
+        from vector_index import PackedVectorIndex
+
+        def record(i, vector):
+            return EmbeddingRecord(id=f"r{i}", content=f"R{i}", embedding=vector,
+                                   source_type="doc", source_id=f"r{i}")
+
+        self.store.store_batch([record(i, [1.0, i / 10]) for i in range(5)])
+        self.store.search([1.0, 0.0])
+        built = self.store.index_path.stat().st_mtime_ns
+
+        # Another instance writes; this one catches up without a rebuild
+        other = EmbeddingStore(db_path=self.db_path)
+        other.store(record(9, [0.0, 1.0]))
+        other.delete("r4")
+        other.store(record(0, [-1.0, 0.0]))
+        self.assertEqual([r.record.id for r in self.store.search([0.0, 1.0], top_k=2)],
+                         ["r9", "r3"])
+        self.assertEqual([r.record.id for r in self.store.search([-1.0, 0.0], top_k=1)], ["r0"])
+        self.assertEqual(self.store.index_path.stat().st_mtime_ns, built)
+
+        # Past the threshold the sidecar is rebuilt and the log pruned
+        with patch.object(embedding_store, "VECTOR_DELTA_MAX_ROWS", 3):
+            other.store(record(5, [0.5, 0.5]))
+            self.assertEqual(len(self.store.search([1.0, 0.0], top_k=10, min_similarity=-1.0)), 6)
+        on_disk = PackedVectorIndex.load(self.store.index_path)
+        self.assertEqual(sorted(on_disk.ids), ["r0", "r1", "r2", "r3", "r5", "r9"])
+        on_disk.close()
+        with self.store._get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM index_log").fetchone()[0], 0)
+
+    def test_mixed_dimensions_fall_back_to_scan(self):
+        """Test stores with mixed vector sizes still search correctly."""
+        from embedding_store import EmbeddingRecord
+
+        self.store.store(EmbeddingRecord(
+            id="short", content="S", embedding=[1.0, 0.0], source_type="doc", source_id="s"
+        ))
+        self.store.store(EmbeddingRecord(
+            id="long", content="L", embedding=[1.0, 0.0, 0.0], source_type="doc", source_id="l"
+        ))
+
+        results = self.store.search([1.0, 0.0, 0.0], min_similarity=0.5)
+        self.assertEqual([r.record.id for r in results], ["long"])
+
+    def test_binary_storage_and_lazy_decode(self):
+        """Test vectors are stored as float32 BLOBs and decoded on access."""
+        from embedding_store import EmbeddingRecord
+
+        self.store.store(EmbeddingRecord(
+            id="blob-1", content="Blob", embedding=[0.5, -0.25, 1.0],
+            source_type="doc", source_id="blob-1"
+        ))
+
+        with self.store._get_connection() as conn:
+            kind, dim = conn.execute(
+                "SELECT typeof(embedding), embedding_dim FROM embeddings WHERE id = 'blob-1'"
+            ).fetchone()
+        self.assertEqual(kind, "blob")
+        self.assertEqual(dim, 3)
+
+        record = self.store.get("blob-1")
+        self.assertFalse(record.is_decoded)
+        self.assertEqual(record.dimension, 3)
+        self.assertEqual(record.embedding, [0.5, -0.25, 1.0])
+        self.assertTrue(record.is_decoded)
+        self.assertEqual(record.to_dict()["embedding"], [0.5, -0.25, 1.0])
+
+    def test_json_rows_migrate_to_binary(self):
+        """Test legacy JSON-text rows are converted in place on open."""
+        import sqlite3
+        from embedding_store import EmbeddingStore
+
+        legacy_path = Path(self.temp_dir) / "legacy.db"
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("""
+            CREATE TABLE embeddings (
+                id TEXT PRIMARY KEY, content TEXT NOT NULL, embedding TEXT NOT NULL,
+                source_type TEXT NOT NULL, source_id TEXT NOT NULL, metadata TEXT,
+                created_at TEXT NOT NULL, embedding_model TEXT DEFAULT 'voyage-3.5',
+                embedding_dim INTEGER, content_hash TEXT
+            )
+        """)
+        for i, vector in enumerate([[1.0, 0.0], [0.0, 1.0]]):
+            conn.execute(
+                "INSERT INTO embeddings VALUES (?, ?, ?, 'doc', ?, '{}', 'now', NULL, NULL, NULL)",
+                (f"old-{i}", f"Old {i}", json.dumps(vector), f"old-{i}")
+            )
+        conn.commit()
+        conn.close()
+
+        store = EmbeddingStore(db_path=legacy_path)
+        with store._get_connection() as conn:
+            kinds = conn.execute(
+                "SELECT DISTINCT typeof(embedding) FROM embeddings"
+            ).fetchall()
+            self.assertEqual(kinds, [("blob",)])
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], 2)
+
+        self.assertEqual(store.get("old-1").embedding, [0.0, 1.0])
+        results = store.search([0.0, 1.0], top_k=1)
+        self.assertEqual(results[0].record.id, "old-1")
+
+    def test_filtered_search_returns_exact_top_k(self):
+        """Test metadata/project filters apply before scoring, on both search paths."""
+        from embedding_store import EmbeddingStore, EmbeddingRecord
+
+        # The closest vectors are all in the wrong project or of the wrong type
+        records = []
+        for i in range(40):
+            records.append(EmbeddingRecord(
+                id=f"r{i}",
+                content=f"Entry {i}",
+                embedding=[1.0, i / 40],
+                source_type="research",
+                source_id=f"r{i}",
+                metadata={
+                    "type": "finding" if i % 4 == 3 else "decision",
+                    "tags": ["redis", "cache"] if i % 2 else ["auth"],
+                },
+                project_path="/a" if i >= 20 else "/b"
+            ))
+        self.store.store_batch(records)
+        scan_store = EmbeddingStore(db_path=self.db_path, use_vector_index=False)
+
+        for store in (self.store, scan_store):
+            results = store.search_filtered(
+                [1.0, 0.0], source_type="research", project_path="/a",
+                metadata={"type": "finding"}, top_k=3
+            )
+            self.assertEqual([r.record.id for r in results], ["r23", "r27", "r31"])
+            self.assertEqual([r.rank for r in results], [1, 2, 3])
+
+            results = store.search_filtered(
+                [1.0, 0.0], metadata={"tags": "auth", "type": ["decision", "finding"]}, top_k=2
+            )
+            self.assertEqual([r.record.id for r in results], ["r0", "r2"])
+
+            self.assertEqual(store.search_filtered([1.0, 0.0], metadata={"type": "spike"}), [])
+            self.assertEqual(
+                len(store.search_project([1.0, 0.0], "/b", source_type=["research", "agent"], top_k=50)),
+                20
+            )
+
+        # Metadata follows updates and deletes
+        self.store.store(EmbeddingRecord(
+            id="r23", content="Entry 23", embedding=[1.0, 23 / 40], source_type="research",
+            source_id="r23", metadata={"type": "decision"}, project_path="/a"
+        ))
+        self.store.delete("r27")
+        results = self.store.search_filtered(
+            [1.0, 0.0], project_path="/a", metadata={"type": "finding"}, top_k=3
+        )
+        self.assertEqual([r.record.id for r in results], ["r31", "r35", "r39"])
+
+    def test_ann_index_recall_and_incremental_updates(self):
+        """Test the IVF index finds the exact top-k and follows writes."""
+        import random
+        from embedding_store import EmbeddingStore, EmbeddingRecord
+        from ann_index import IVFIndex
+
+        rng = random.Random(3)
+        centers = [[rng.gauss(0, 1) for _ in range(8)] for _ in range(10)]
+        records = [
+            EmbeddingRecord(
+                id=f"v{i}", content=f"V{i}",
+                embedding=[c + rng.gauss(0, 0.2) for c in centers[i % 10]],
+                source_type="agent" if i % 2 else "skill", source_id=f"v{i}"
+            )
+            for i in range(400)
+        ]
+        self.store.store_batch(records)
+
+        exact = EmbeddingStore(db_path=self.db_path, use_ann_index=False)
+        ann_store = EmbeddingStore(db_path=self.db_path, use_ann_index=True, ann_threshold=100)
+        queries = [[c + rng.gauss(0, 0.3) for c in center] for center in centers]
+
+        for query in queries:
+            expected = [r.record.id for r in exact.search(query, top_k=5)]
+            found = ann_store.search(query, top_k=5)
+            self.assertEqual([r.record.id for r in found], expected)
+            # Filters below the threshold stay exact
+            self.assertEqual(
+                [r.record.id for r in ann_store.search(query, source_type="agent", top_k=3)],
+                [r.record.id for r in exact.search(query, source_type="agent", top_k=3)]
+            )
+        self.assertTrue(ann_store.ann_path.exists())
+
+        # store/delete are scored from the delta without rewriting either file
+        saved_ann = ann_store.ann_path.read_bytes()
+        sidecar_mtime = ann_store.index_path.stat().st_mtime_ns
+        ann_store.store(EmbeddingRecord(
+            id="new", content="New", embedding=centers[0], source_type="skill", source_id="new"
+        ))
+        ann_store.delete("v0")
+        found = [r.record.id for r in ann_store.search(centers[0], top_k=50)]
+        self.assertEqual(found[0], "new")
+        self.assertNotIn("v0", found)
+        self.assertEqual(ann_store.ann_path.read_bytes(), saved_ann)
+        self.assertEqual(ann_store.index_path.stat().st_mtime_ns, sidecar_mtime)
+
+        # Bulk deletes from another store instance are picked up on search
+        exact.clear(source_type="agent")
+        results = ann_store.search(queries[1], top_k=5)
+        self.assertTrue(all(r.record.source_type == "skill" for r in results))
+
+        # A sidecar rebuild folds the changes into the saved index without a retrain
+        ann_store.rebuild_vector_index()
+        ann_store.search(queries[1], top_k=5)
+        saved = IVFIndex.load(ann_store.ann_path)
+        self.assertIn("new", saved.assignments)
+        self.assertNotIn("v0", saved.assignments)
+        self.assertEqual(len(saved.assignments), 200)
+        self.assertEqual(saved.trained_count, 400)
+
+    def test_metadata_index_backfills_existing_rows(self):
+        """Test rows stored before the metadata table existed are filterable."""
+        from embedding_store import EmbeddingStore, EmbeddingRecord
+
+        self.store.store(EmbeddingRecord(
+            id="old", content="Old", embedding=[1.0, 0.0], source_type="doc",
+            source_id="old", metadata={"tier": "core"}
+        ))
+        with self.store._get_connection() as conn:
+            conn.execute("DROP TABLE embedding_metadata")
+            for name in ("insert", "update", "delete"):
+                conn.execute(f"DROP TRIGGER trg_embeddings_{name}_metadata")
+
+        reopened = EmbeddingStore(db_path=self.db_path)
+        results = reopened.search_filtered([1.0, 0.0], metadata={"tier": "core"})
+        self.assertEqual([r.record.id for r in results], ["old"])
+
 
 # =============================================================================
 # TEST: VOYAGE CLIENT (Issue #19)
@@ -526,6 +817,121 @@ class TestStreamManager(unittest.TestCase):
         self.assertEqual(len(chunks_received), 1)
         self.assertEqual(len(sessions_completed), 1)
 
+    def test_long_sessions_spill_to_disk(self):
+        """Test only the newest chunks stay in memory and nothing is lost."""
+        from stream_manager import StreamManager
+        from protocol import StreamChunk
+
+        spill_dir = Path(tempfile.mkdtemp())
+        manager = StreamManager(max_chunks=4, spill_dir=spill_dir)
+        session_id = manager.start_session("agent-1", "Bash")
+        for i in range(10):
+            manager.add_chunk(StreamChunk(
+                session_id=session_id, agent_id="agent-1", chunk_index=i,
+                content=f"c{i};", is_final=(i == 9)
+            ))
+
+        session = manager.get_session(session_id)
+        self.assertEqual([c.chunk_index for c in session.chunks], [6, 7, 8, 9])
+        self.assertEqual(session.spilled_chunks, 6)
+        self.assertEqual(session.chunk_count, 10)
+        self.assertEqual(session.content_length, len("".join(f"c{i};" for i in range(10))))
+        self.assertEqual([c.chunk_index for c in session.iter_chunks()], list(range(10)))
+        self.assertEqual(session.total_content, "".join(session.iter_content()))
+        self.assertTrue(session.total_content.startswith("c0;c1;"))
+        self.assertEqual(manager.get_stats().total_bytes, session.content_length)
+
+        spill_file = spill_dir / f"{session_id}.jsonl"
+        self.assertEqual(len(spill_file.read_text().splitlines()), 6)
+        manager.cleanup_completed(max_age_seconds=-1)
+        self.assertFalse(spill_file.exists())
+
+        # Without a spill directory every chunk stays in memory
+        in_memory = StreamManager(max_chunks=4, spill_dir=None)
+        session_id = in_memory.start_session("agent-2")
+        for i in range(10):
+            in_memory.add_chunk(StreamChunk(
+                session_id=session_id, agent_id="agent-2", chunk_index=i, content="x"
+            ))
+        self.assertEqual(len(in_memory.get_session(session_id).chunks), 10)
+
+    def test_failed_spill_keeps_spilled_chunks_readable(self):
+        """Test a spill write error stops spilling without losing spilled chunks."""
+        from stream_manager import StreamSession
+        from protocol import StreamChunk
+
+        spill_path = Path(tempfile.mkdtemp()) / "s.jsonl"
+        session = StreamSession(session_id="s", agent_id="agent-1",
+                                max_memory_chunks=2, spill_path=spill_path)
+        chunks = [StreamChunk(session_id="s", agent_id="agent-1", chunk_index=i,
+                              content=f"c{i};") for i in range(6)]
+        for chunk in chunks[:4]:
+            session.append(chunk)
+        self.assertEqual(session.spilled_chunks, 2)
+
+        failing = MagicMock()
+        failing.write.side_effect = OSError("disk full")
+        session._spill_file.close()
+        session._spill_file = failing
+        for chunk in chunks[4:]:
+            session.append(chunk)
+        failing.write.assert_called_once()
+
+        self.assertEqual(session.spilled_chunks, 2)
+        self.assertEqual([c.chunk_index for c in session.chunks], [2, 3, 4, 5])
+        self.assertEqual(session.total_content, "c0;c1;c2;c3;c4;c5;")
+        session._spill_file = None
+        session.discard()
+        self.assertFalse(spill_path.exists())
+
+    def test_journal_replays_snapshot_and_deltas(self):
+        """Test save_state appends deltas and load_state restores sessions."""
+        from stream_manager import StreamManager, JOURNAL_FILE, SNAPSHOT_FILE
+        from protocol import StreamChunk
+
+        temp_dir = Path(tempfile.mkdtemp())
+        journal_dir = temp_dir / "journal"
+        state_file = temp_dir / "state.json"
+        manager = StreamManager(spill_dir=temp_dir / "spill", journal_dir=journal_dir,
+                                snapshot_every=6)
+
+        done = manager.start_session("agent-1", "Bash")
+        live = manager.start_session("agent-2", "Read", metadata={"k": "v"})
+        gone = manager.start_session("agent-3")
+        for i in range(3):
+            manager.add_chunk(StreamChunk(session_id=done, agent_id="agent-1",
+                                          chunk_index=i, content=f"d{i}", is_final=(i == 2)))
+        manager.save_state(state_file)  # 6 records: snapshot
+        self.assertTrue((journal_dir / SNAPSHOT_FILE).exists())
+        self.assertEqual((journal_dir / JOURNAL_FILE).read_text(), "")
+
+        manager.add_chunk(StreamChunk(session_id=live, agent_id="agent-2",
+                                      chunk_index=0, content="l0"))
+        manager.end_session(gone, error="boom")
+        manager.save_state(state_file)  # 2 more: appended only
+        self.assertEqual(len((journal_dir / JOURNAL_FILE).read_text().splitlines()), 2)
+        written = manager.persisted_bytes
+        manager.save_state(state_file)
+        self.assertEqual(manager.persisted_bytes, written)
+
+        restored = StreamManager(spill_dir=temp_dir / "spill2", journal_dir=journal_dir)
+        summary = restored.load_state(state_file)
+        self.assertEqual(summary["active_streams"], 1)
+        self.assertEqual(len(restored._sessions), 3)
+        self.assertEqual(restored.get_session(done).total_content, "d0d1d2")
+        self.assertTrue(restored.get_session(done).is_complete)
+        self.assertEqual(restored.get_session(live).total_content, "l0")
+        self.assertEqual(restored.get_session(live).metadata, {"k": "v"})
+        self.assertFalse(restored.get_session(live).is_complete)
+        self.assertEqual(restored.get_session(gone).error, "boom")
+
+        # Restored managers keep journaling from where the journal left off
+        restored.cleanup_completed(max_age_seconds=-1)
+        restored.save_state(state_file)
+        again = StreamManager(spill_dir=None, journal_dir=journal_dir)
+        again.load_state(state_file)
+        self.assertEqual(list(again._sessions), [live])
+
 
 # =============================================================================
 # TEST: SEMANTIC ROUTER (Issue #19)